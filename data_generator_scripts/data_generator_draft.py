@@ -4,14 +4,18 @@ import argparse
 import os
 import pandas as pd
 import timeit
+import utils.instrumentation as instrumentation
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+from data_generator_scripts.data_generator_player_index import DataGeneratorPlayerIndex, PLAYER_RESOLVER_CACHE_FILE_NAME
+from data_generator_scripts.data_generator_player_resolver import DataGeneratorPlayerResolver
 from espn_html_parser_scripts.espn_html_parser import EspnHtmlParser
 from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
 
 DEFAULT_ESPN_HTML_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_html_files")
 DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_fantasy_api_scripts", "espn_fantasy_api_downloads")
+DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "nhlapi_scripts", "nhlapi_downloads")
 DEFAULT_OUTPUT_DIR = SCRIPT_DIR
 
 US_STATE_CODES = [
@@ -45,12 +49,15 @@ WESTERN_CONFERENCE_TEAM_ABBREVS = [
 class DataGeneratorDraft():
     def __init__(self, espn_html_root_folder=DEFAULT_ESPN_HTML_ROOT_FOLDER,
                        espn_fantasy_api_downloads_root_folder=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
-                       out_dir_path=DEFAULT_OUTPUT_DIR):
+                       out_dir_path=DEFAULT_OUTPUT_DIR,
+                       nhlapi_downloads_root_folder=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER):
         """ Default constructor. """
         self._espn_html_root_folder = espn_html_root_folder
         self._espn_fantasy_api_downloads_root_folder = espn_fantasy_api_downloads_root_folder
         self._out_dir_path = out_dir_path
+        self._nhlapi_downloads_root_folder = nhlapi_downloads_root_folder
 
+    @instrumentation.Timer("data_generator_draft.get_df")
     def get_df(self):
         """ Generate dataframe. """
         # ------------------------------------------- Merge data from multiple sources -------------------------------------------
@@ -61,21 +68,35 @@ class DataGeneratorDraft():
         # Parse draft details data from ESPN fantasy API
         downloads_parser = EspnFantasyApiDownloadsParser(self._espn_fantasy_api_downloads_root_folder)
         espn_fantasy_draft_details_df = downloads_parser.get_draft_details_df()
-        espn_fantasy_athletes_info_df = downloads_parser.get_athletes_df()
         espn_fantasy_all_players_info_df = downloads_parser.get_all_players_info_df()
 
+        # Player index holds player details and maps IDs of all data sources (only rebuilt when its inputs change)
+        player_index_df = DataGeneratorPlayerIndex(espn_fantasy_api_downloads_root_folder=self._espn_fantasy_api_downloads_root_folder,
+                                                   nhlapi_downloads_root_folder=self._nhlapi_downloads_root_folder,
+                                                   out_dir_path=self._out_dir_path).get_df()
+        nhl_player_key_map = player_index_df[player_index_df['NHL Player ID'].notna()].set_index('NHL Player ID')['Player Key']
+        player_index_df = player_index_df[player_index_df['ESPN Player ID'].notna()]
+        player_index_df = player_index_df.drop(columns=['Player Name', 'Name Variants']).rename(columns={'ESPN Player ID': 'Player ID'})
+
         # Merge ESPN fantasy API draft details into ESPN HTML draft dataframe
         # We only care about the player ID here to get additional player info later
         # This assumes the ESPN HTML draft data is in the same order as ESPN fantasy API draft details
-        merged_df = espn_html_draft_df.merge(espn_fantasy_draft_details_df[['Draft Number', 'Round Number', 'Season', 'Player ID']],
-                                             how='left', on=['Draft Number', 'Round Number', 'Season'])
+        espn_fantasy_draft_details_df = espn_fantasy_draft_details_df[['Draft Number', 'Round Number', 'Season', 'Player ID']].astype({'Player ID': 'Int64'})
+        merged_df = espn_html_draft_df.merge(espn_fantasy_draft_details_df, how='left', on=['Draft Number', 'Round Number', 'Season'])
+
+        # Merge player index into draft dataframe to get additional player details
+        merged_df = merged_df.merge(player_index_df, how='left', on='Player ID')
 
-        # Merge athlete info into draft dataframe to get additional player details
-        espn_fantasy_athletes_info_df = espn_fantasy_athletes_info_df.drop(columns=['Player Name'])
-        merged_df = merged_df.merge(espn_fantasy_athletes_info_df, how='left', on='Player ID')
+        # Resolve NHL players of picks without an ESPN player ID or NHL link (Example: seasons without draft details)
+        # by their name, team and season from the draft recap
+        unlinked = merged_df['NHL Player ID'].isna()
+        if unlinked.any():
+            resolver = DataGeneratorPlayerResolver(self._nhlapi_downloads_root_folder, os.path.join(self._out_dir_path, PLAYER_RESOLVER_CACHE_FILE_NAME))
+            merged_df.loc[unlinked, 'NHL Player ID'] = resolver.resolve_df(merged_df[unlinked], 'Player', team_column='Team', season_column='Season')
+            merged_df['Player Key'] = merged_df['Player Key'].fillna(merged_df['NHL Player ID'].map(nhl_player_key_map)).astype('Int64')
 
         # Merge all players info into draft dataframe to get season-by-season stats
-        espn_fantasy_all_players_info_df = espn_fantasy_all_players_info_df.drop(columns=['Player Name'])
+        espn_fantasy_all_players_info_df = espn_fantasy_all_players_info_df.drop(columns=['Player Name']).astype({'Player ID': 'Int64'})
         merged_df = merged_df.merge(espn_fantasy_all_players_info_df, how='left', on=['Player ID', 'Season'])
 
         # ------------------------------------------- Data cleaning and transformations -------------------------------------------
@@ -202,25 +223,41 @@ class DataGeneratorDraft():
         except TypeError:
             return float('nan')
 
-if __name__ == "__main__":
-    start_time = timeit.default_timer()
-
-    parser = argparse.ArgumentParser()
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
     parser.add_argument("--espn_html_root_folder", type=str, default=DEFAULT_ESPN_HTML_ROOT_FOLDER,
                         help="Root folder path containing ESPN HTML files.")
     parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
                         help="Root folder path containing ESPN Fantasy API downloaded files.")
+    parser.add_argument("--nhlapi_downloads_root_folder", type=str, default=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing NHL API downloaded files.")
     parser.add_argument("--out_dir_path", type=str, default=DEFAULT_OUTPUT_DIR,
                         help="Output directory path to save generated data.")
-    args = parser.parse_args()
+    instrumentation.add_arguments(parser)
+
+def main(args):
+    """ Generates draft data. """
+    start_time = timeit.default_timer()
+
+    instrumentation.start_run("data_generator_draft", profile=args.profile)
 
     print("Generating draft data...")
     data_generator = DataGeneratorDraft(
         espn_html_root_folder=args.espn_html_root_folder,
         espn_fantasy_api_downloads_root_folder=args.espn_fantasy_api_downloads_root_folder,
-        out_dir_path=args.out_dir_path
+        out_dir_path=args.out_dir_path,
+        nhlapi_downloads_root_folder=args.nhlapi_downloads_root_folder
     )
 
     draft_df = data_generator.get_df()
-    draft_df.to_csv(os.path.join(args.out_dir_path, "draft_df.csv"), index=False)
-    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
+    with instrumentation.Timer("write_csv"):
+        draft_df.to_csv(os.path.join(args.out_dir_path, "draft_df.csv"), index=False)
+    instrumentation.increment("rows_written", len(draft_df))
+
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
@@ -4,24 +4,42 @@ import argparse
 from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
 import os
 import timeit
+import utils.instrumentation as instrumentation
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_fantasy_api_scripts", "espn_fantasy_api_downloads")
 DEFAULT_OUTPUT_DIR = SCRIPT_DIR
 
-if __name__ == "__main__":
-    start_time = timeit.default_timer()
-
-    parser = argparse.ArgumentParser()
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
     parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
                         help="Root folder path containing ESPN Fantasy API downloaded files.")
     parser.add_argument("--out_dir_path", type=str, default=DEFAULT_OUTPUT_DIR,
                         help="Output directory path to save generated data.")
-    args = parser.parse_args()
+    parser.add_argument("--start_season", type=str, default=None,
+                        help="First season to generate data of (Example: 20232024). Defaults to the first downloaded season.")
+    parser.add_argument("--end_season", type=str, default=None,
+                        help="Last season to generate data of (Example: 20242025). Defaults to the last downloaded season.")
+    instrumentation.add_arguments(parser)
+
+def main(args):
+    """ Generates ESPN fantasy API all players info data. """
+    start_time = timeit.default_timer()
+
+    instrumentation.start_run("data_generator_espn_fantasy_api_all_players_info", profile=args.profile)
 
     print("Generating ESPN fantasy API all players info data...")
-    df = EspnFantasyApiDownloadsParser(args.espn_fantasy_api_downloads_root_folder).get_all_players_info_df()
+    df = EspnFantasyApiDownloadsParser(args.espn_fantasy_api_downloads_root_folder).get_all_players_info_df(args.start_season, args.end_season)
     df = df.sort_values(by='Season').reset_index(drop=True)
-    df.to_csv(os.path.join(args.out_dir_path, "espn_fantasy_api_all_players_info_df.csv"), index=False)
-    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
+    with instrumentation.Timer("write_csv"):
+        df.to_csv(os.path.join(args.out_dir_path, "espn_fantasy_api_all_players_info_df.csv"), index=False)
+    instrumentation.increment("rows_written", len(df))
+
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
@@ -1,16 +1,21 @@
 #!/usr/bin/env python
 """ Generates ESPN fantasy API daily rosters data. """
 import argparse
-from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser, get_daily_rosters_totals_columns, get_daily_rosters_totals_df
 import os
 import timeit
 from tqdm import tqdm
+from utils.csv_writer import CsvWriter
+import utils.instrumentation as instrumentation
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_fantasy_api_scripts", "espn_fantasy_api_downloads")
 DEFAULT_OUTPUT_DIR = SCRIPT_DIR
 
+DAILY_ROSTERS_FILE_NAME = "espn_fantasy_api_daily_rosters_df.csv"
+DAILY_ROSTERS_TOTALS_FILE_NAME = "espn_fantasy_api_daily_rosters_totals_df.csv"
+
 class ProgressHandler():
     """ Helper class to handle progress updates processing daily rosters data. """
     def __init__(self):
@@ -48,39 +53,77 @@ class ProgressHandlerMultiprocess():
         if current_count == total_count:
             print(f"Processing {season} [{current_count}/{total_count}] finished in {round(timeit.default_timer() - self._start_time, 1)}s.")
 
-if __name__ == "__main__":
-    start_time = timeit.default_timer()
-
-    parser = argparse.ArgumentParser()
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
     parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
                         help="Root folder path containing ESPN Fantasy API downloaded files.")
     parser.add_argument("--out_dir_path", type=str, default=DEFAULT_OUTPUT_DIR,
                         help="Output directory path to save generated data.")
-    args = parser.parse_args()
+    parser.add_argument("--use_store", action="store_true",
+                        help="Load daily rosters from each season's memory-mapped store if up-to-date, otherwise parse and save to it.")
+    parser.add_argument("--start_season", type=str, default=None,
+                        help="First season to generate data of (Example: 20232024). Defaults to the first downloaded season.")
+    parser.add_argument("--end_season", type=str, default=None,
+                        help="Last season to generate data of (Example: 20242025). Defaults to the last downloaded season.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write one scoring period at a time instead of the whole history at once (slower, but memory does not grow with history).")
+    instrumentation.add_arguments(parser)
+
+def main(args):
+    """ Generates ESPN fantasy API daily rosters data. """
+    start_time = timeit.default_timer()
+
+    instrumentation.start_run("data_generator_espn_fantasy_api_daily_rosters", profile=args.profile)
 
     print("Generating ESPN fantasy API daily rosters data...")
     parser = EspnFantasyApiDownloadsParser(args.espn_fantasy_api_downloads_root_folder)
     multiprocess = True
 
-    # Set-up progress bar handling
-    progress_handlers = []
-    progress_handlers_funcs = {}
-    for i, season_string in enumerate(parser.get_seasons()):
-        if multiprocess:
-            p = ProgressHandlerMultiprocess()
-        else:
-            p = ProgressHandler()
-        progress_handlers.append(p)
-        progress_handlers_funcs[season_string] = p.update_progress_bar
-
-    # Parse daily rosters data
-    df = parser.get_daily_rosters_df(progress_func_handlers=progress_handlers_funcs, multiprocess=multiprocess)
-
-    # Sort
-    df = df.sort_values(by=['season', 'scoringPeriodId']).reset_index(drop=True)
-
-    # Output    
-    df.to_csv(os.path.join(args.out_dir_path, "espn_fantasy_api_daily_rosters_df.csv"), index=False)
+    if args.stream:
+        # Stream each scoring period straight to the output files, already in order of season and scoring period
+        columns = parser.get_daily_rosters_columns(args.start_season, args.end_season)
+        with CsvWriter(os.path.join(args.out_dir_path, DAILY_ROSTERS_FILE_NAME), columns) as writer, \
+             CsvWriter(os.path.join(args.out_dir_path, DAILY_ROSTERS_TOTALS_FILE_NAME), get_daily_rosters_totals_columns(columns)) as totals_writer:
+            for df in parser.iter_daily_rosters_dfs(args.start_season, args.end_season, use_store=args.use_store):
+                writer.write(df)
+                totals_writer.write(get_daily_rosters_totals_df(df))
+        instrumentation.increment("rows_written", writer.get_num_rows() + totals_writer.get_num_rows())
+    else:
+        # Set-up progress bar handling
+        progress_handlers = []
+        progress_handlers_funcs = {}
+        for i, season_string in enumerate(parser.get_seasons(args.start_season, args.end_season)):
+            if multiprocess:
+                p = ProgressHandlerMultiprocess()
+            else:
+                p = ProgressHandler()
+            progress_handlers.append(p)
+            progress_handlers_funcs[season_string] = p.update_progress_bar
+
+        # Parse daily rosters data
+        df = parser.get_daily_rosters_df(progress_func_handlers=progress_handlers_funcs, multiprocess=multiprocess, use_store=args.use_store,
+                                         start_season=args.start_season, end_season=args.end_season)
+
+        # Sort
+        with instrumentation.Timer("sort"):
+            df = df.sort_values(by=['season', 'scoringPeriodId']).reset_index(drop=True)
+
+        # Output
+        with instrumentation.Timer("write_csv"):
+            df.to_csv(os.path.join(args.out_dir_path, DAILY_ROSTERS_FILE_NAME), index=False)
+        instrumentation.increment("rows_written", len(df))
+
+        # Output totals of each owner and scoring period
+        with instrumentation.Timer("write_totals_csv"):
+            totals_df = get_daily_rosters_totals_df(df)
+            totals_df.to_csv(os.path.join(args.out_dir_path, DAILY_ROSTERS_TOTALS_FILE_NAME), index=False)
+        instrumentation.increment("rows_written", len(totals_df))
 
     # Finish
-    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
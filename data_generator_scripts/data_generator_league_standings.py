@@ -1,30 +1,86 @@
 #!/usr/bin/env python
-""" Generates league standings data. """
+""" Generates league standings data. Standings come from archived ESPN HTML
+    files, and are derived from ESPN fantasy API daily rosters for any other
+    season with downloaded scoring periods. """
 import argparse
 import os
+import pandas as pd
 import timeit
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_standings import EspnFantasyApiStandings
 from espn_html_parser_scripts.espn_html_parser import EspnHtmlParser
+import utils.instrumentation as instrumentation
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_ESPN_HTML_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_html_files")
+DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_fantasy_api_scripts", "espn_fantasy_api_downloads")
 DEFAULT_OUTPUT_DIR = SCRIPT_DIR
 
-if __name__ == "__main__":
-    start_time = timeit.default_timer()
+def get_espn_fantasy_api_standings_dfs(espn_fantasy_api_downloads_root_folder, exclude_seasons):
+    """ Returns tuple of standings points and stats dataframes derived from daily
+        rosters of all seasons, excluding the given list of seasons (integers). """
+    points_df = pd.DataFrame()
+    stats_df = pd.DataFrame()
+    if not os.path.isdir(espn_fantasy_api_downloads_root_folder):
+        return points_df, stats_df
 
-    parser = argparse.ArgumentParser()
+    standings = EspnFantasyApiStandings(espn_fantasy_api_downloads_root_folder)
+    for season_string in sorted(EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder).get_seasons()):
+        if int(season_string) in exclude_seasons:
+            continue
+
+        standings_dict = standings.get_standings_dict(season_string)
+        if standings_dict is None or standings_dict['season_points'].empty:
+            continue
+
+        for df in standings_dict.values():
+            df['Season'] = int(season_string)
+        points_df = pd.concat([points_df, standings_dict['season_points']])
+        stats_df = pd.concat([stats_df, standings_dict['season_stats']])
+
+    return points_df, stats_df
+
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
     parser.add_argument("--espn_html_root_folder", type=str, default=DEFAULT_ESPN_HTML_ROOT_FOLDER,
                         help="Root folder path containing ESPN HTML files.")
+    parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing ESPN Fantasy API downloaded files.")
     parser.add_argument("--out_dir_path", type=str, default=DEFAULT_OUTPUT_DIR,
                         help="Output directory path to save generated data.")
-    args = parser.parse_args()
+    instrumentation.add_arguments(parser)
+
+def main(args):
+    """ Generates league standings data. """
+    start_time = timeit.default_timer()
+
+    instrumentation.start_run("data_generator_league_standings", profile=args.profile)
 
     print("Generating league standings data...")
-    standing_stats_df = EspnHtmlParser(args.espn_html_root_folder).get_league_standings_stats_df()
-    standing_stats_df = standing_stats_df.sort_values(by=['Season', 'RK']).reset_index(drop=True)
-    standing_stats_df.to_csv(os.path.join(args.out_dir_path, "standings_stats_df.csv"), index=False)
-
-    standing_pts_df = EspnHtmlParser(args.espn_html_root_folder).get_league_standings_points_df()
-    standing_pts_df = standing_pts_df.sort_values(by=['Season', 'RK']).reset_index(drop=True)
-    standing_pts_df.to_csv(os.path.join(args.out_dir_path, "standings_points_df.csv"), index=False)
-    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
+    with instrumentation.Timer("standings_html"):
+        standing_stats_df = EspnHtmlParser(args.espn_html_root_folder).get_league_standings_stats_df()
+        standing_pts_df = EspnHtmlParser(args.espn_html_root_folder).get_league_standings_points_df()
+
+    # Derive standings of seasons without archived HTML files
+    with instrumentation.Timer("standings_espn_fantasy_api"):
+        html_seasons = set(standing_pts_df['Season'].unique()) if not standing_pts_df.empty else set()
+        api_pts_df, api_stats_df = get_espn_fantasy_api_standings_dfs(args.espn_fantasy_api_downloads_root_folder, html_seasons)
+        standing_stats_df = pd.concat([standing_stats_df, api_stats_df])
+        standing_pts_df = pd.concat([standing_pts_df, api_pts_df])
+
+    with instrumentation.Timer("standings_stats"):
+        standing_stats_df = standing_stats_df.sort_values(by=['Season', 'RK']).reset_index(drop=True)
+        standing_stats_df.to_csv(os.path.join(args.out_dir_path, "standings_stats_df.csv"), index=False)
+
+    with instrumentation.Timer("standings_points"):
+        standing_pts_df = standing_pts_df.sort_values(by=['Season', 'RK']).reset_index(drop=True)
+        standing_pts_df.to_csv(os.path.join(args.out_dir_path, "standings_points_df.csv"), index=False)
+    instrumentation.increment("rows_written", len(standing_stats_df) + len(standing_pts_df))
+
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
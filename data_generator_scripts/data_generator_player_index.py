@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+""" Generates a persistent player index that maps player identifiers from all
+    data sources to a single canonical player key.
+
+    Each player in the index has:
+    - Player Key: Canonical key. Stable between runs once assigned.
+    - ESPN Player ID: ID used by the ESPN fantasy API and ESPN athletes API.
+    - NHL Player ID: ID used by the NHL API (see NhlapiDataGenerator).
+    - Name Variants: Names the player appears as across data sources.
+    - Player attributes from ESPN athletes data (birth place, height, etc.).
+
+    All keys and IDs are typed as nullable integers (Int64) so joins don't
+    depend on float IDs that can't be compared exactly.
+
+    NHL players are linked to ESPN players with an exact match of normalized
+    name and date of birth first. Remaining ESPN players are linked with the
+    fuzzy matching of DataGeneratorPlayerResolver. NHL players that can't be
+    linked get their own key.
+
+    The index is saved to file with a fingerprint of its input files and is
+    only rebuilt when any input changes.
+"""
+import argparse
+from data_generator_scripts.data_generator_player_resolver import DataGeneratorPlayerResolver, get_nhl_roster_file_paths, normalize_name
+from datetime import date
+from espn_fantasy_api_scripts.espn_fantasy_api_archive import get_archive_path
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_store import EspnFantasyApiAthletesStore, STORE_FILE_NAME
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from nhlapi_scripts.nhlapi_data_generator import NhlapiDataGenerator
+import json
+import os
+import pandas as pd
+import timeit
+from utils.file_catalog import get_catalog
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_fantasy_api_scripts", "espn_fantasy_api_downloads")
+DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "nhlapi_scripts", "nhlapi_downloads")
+DEFAULT_OUTPUT_DIR = SCRIPT_DIR
+
+PLAYER_INDEX_FILE_NAME = "player_index.json"
+PLAYER_INDEX_VERSION = 2
+PLAYER_RESOLVER_CACHE_FILE_NAME = "player_resolver_cache.json"
+
+# Columns with their types. Name variants are joined by NAME_VARIANTS_SEPARATOR.
+PLAYER_INDEX_COLUMNS = {'Player Key': 'Int64',
+                        'ESPN Player ID': 'Int64',
+                        'NHL Player ID': 'Int64',
+                        'Player Name': 'object',
+                        'Name Variants': 'object',
+                        'Player Birth Place': 'object',
+                        'Player Height': 'object',
+                        'Player Weight': 'object',
+                        'Player DOB': 'object'}
+NAME_VARIANTS_SEPARATOR = "|"
+
+def parse_espn_dob(dob_string):
+    """ Returns a date from an ESPN date of birth string (dd/mm/yyyy). Returns None if invalid. """
+    try:
+        day, month, year = [int(s) for s in dob_string.split("/")]
+        return date(year, month, day)
+    except (AttributeError, ValueError):
+        return None
+
+def parse_nhl_dob(dob_string):
+    """ Returns a date from an NHL API date of birth string (yyyy-mm-dd). Returns None if invalid. """
+    try:
+        return date.fromisoformat(dob_string)
+    except (TypeError, ValueError):
+        return None
+
+class DataGeneratorPlayerIndex():
+    def __init__(self, espn_fantasy_api_downloads_root_folder=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
+                       nhlapi_downloads_root_folder=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                       out_dir_path=DEFAULT_OUTPUT_DIR):
+        """ Default constructor. """
+        self._espn_fantasy_api_downloads_root_folder = espn_fantasy_api_downloads_root_folder
+        self._nhlapi_downloads_root_folder = nhlapi_downloads_root_folder
+        self._index_path = os.path.join(out_dir_path, PLAYER_INDEX_FILE_NAME)
+        self._resolver_cache_path = os.path.join(out_dir_path, PLAYER_RESOLVER_CACHE_FILE_NAME)
+
+    @instrumentation.Timer("data_generator_player_index.get_df")
+    def get_df(self):
+        """ Returns dataframe of the player index. Loads the saved index if its
+            inputs have not changed, otherwise updates and saves it. """
+        # Bring athletes store up-to-date with downloaded athletes files first so
+        # the fingerprint reflects them
+        if os.path.isdir(self._espn_fantasy_api_downloads_root_folder):
+            EspnFantasyApiAthletesStore(self._espn_fantasy_api_downloads_root_folder).ingest_folder(
+                os.path.join(self._espn_fantasy_api_downloads_root_folder, "athletes"))
+
+        fingerprint = self._get_fingerprint()
+        saved = self._load()
+        if saved is not None and saved['fingerprint'] == fingerprint:
+            return self._to_df(saved['players'])
+
+        df = self._build(self._to_df(saved['players']) if saved is not None else None)
+        self._save(df, fingerprint)
+        return df
+
+    def get_espn_player_key_map(self, df=None):
+        """ Returns dictionary mapping ESPN player IDs to player keys. """
+        df = self.get_df() if df is None else df
+        df = df[df['ESPN Player ID'].notna()]
+        return dict(zip(df['ESPN Player ID'].astype(int), df['Player Key'].astype(int)))
+
+    def get_name_player_keys_map(self, df=None):
+        """ Returns dictionary mapping normalized names to a list of player keys.
+            Multiple players can have the same name. """
+        df = self.get_df() if df is None else df
+        name_map = {}
+        for player_key, name_variants in zip(df['Player Key'], df['Name Variants']):
+            for name in name_variants.split(NAME_VARIANTS_SEPARATOR):
+                keys = name_map.setdefault(normalize_name(name), [])
+                if int(player_key) not in keys:
+                    keys.append(int(player_key))
+        return name_map
+
+    def _build(self, previous_df):
+        """ Builds the player index from all data sources. Players in the previous
+            index keep their player keys. """
+        players = {}
+        if os.path.isdir(self._espn_fantasy_api_downloads_root_folder):
+            # ESPN athletes data is the main source of player attributes
+            for record in EspnFantasyApiAthletesStore(self._espn_fantasy_api_downloads_root_folder).get_records():
+                player = self._get_espn_player(players, record['id'])
+                player.update({'Player Name': record.get('fullName'),
+                               'Player Birth Place': record.get('displayBirthPlace'),
+                               'Player Height': record.get('displayHeight'),
+                               'Player Weight': record.get('displayWeight'),
+                               'Player DOB': record.get('displayDOB')})
+                player['names'].add(record.get('fullName'))
+
+            # Players in all players info that may not have athletes data
+            all_players_info_df = EspnFantasyApiDownloadsParser(self._espn_fantasy_api_downloads_root_folder).get_all_players_info_df(columns=['Player ID', 'Player Name'])
+            for player_id, player_name in self._get_unique_pairs(all_players_info_df, 'Player ID', 'Player Name'):
+                player = self._get_espn_player(players, player_id)
+                player['names'].add(player_name)
+                if player['Player Name'] is None:
+                    player['Player Name'] = player_name
+
+        # Link NHL players by exact normalized name and date of birth
+        espn_name_dob_map = {}
+        for key, player in players.items():
+            dob = parse_espn_dob(player['Player DOB'])
+            if dob is None:
+                continue
+
+            for name in set(normalize_name(name) for name in player['names']):
+                espn_name_dob_map.setdefault((name, dob), []).append(key)
+
+        nhl_df = NhlapiDataGenerator(self._nhlapi_downloads_root_folder).get_df() if os.path.isdir(self._nhlapi_downloads_root_folder) else pd.DataFrame()
+        nhl_players = self._get_unique_pairs(nhl_df, 'id', 'Player', 'Player Birth Date')
+        linked_nhl_ids = {}
+        for nhl_id, player_name, dob_string in nhl_players:
+            matches = espn_name_dob_map.get((normalize_name(player_name), parse_nhl_dob(dob_string)), [])
+            if len(matches) == 1 and players[matches[0]]['NHL Player ID'] is None:
+                players[matches[0]]['NHL Player ID'] = nhl_id
+                linked_nhl_ids[nhl_id] = matches[0]
+
+        # Link remaining ESPN players by fuzzy matching
+        resolver = DataGeneratorPlayerResolver(self._nhlapi_downloads_root_folder, self._resolver_cache_path, nhl_players_df=nhl_df)
+        for key, player in players.items():
+            if player['NHL Player ID'] is not None or player['Player Name'] is None:
+                continue
+
+            nhl_id = resolver.resolve(player['Player Name'], dob=parse_espn_dob(player['Player DOB']))
+            if nhl_id is not None and nhl_id not in linked_nhl_ids:
+                player['NHL Player ID'] = nhl_id
+                linked_nhl_ids[nhl_id] = key
+        resolver.save_cache()
+
+        # NHL players that can't be linked get their own key
+        for nhl_id, player_name, dob_string in nhl_players:
+            player = players[linked_nhl_ids[nhl_id]] if nhl_id in linked_nhl_ids else players.setdefault(('nhl', nhl_id), self._new_player())
+            player['Player Name'] = player['Player Name'] or player_name
+            player['NHL Player ID'] = nhl_id
+            player['names'].add(player_name)
+
+        return self._assign_player_keys(players, previous_df)
+
+    def _assign_player_keys(self, players, previous_df):
+        """ Returns dataframe of players with player keys. Keys of players in the
+            previous index are kept and new players get the next available keys. """
+        previous_keys = {}
+        next_key = 1
+        if previous_df is not None and not previous_df.empty:
+            for player_key, espn_id, nhl_id in zip(previous_df['Player Key'], previous_df['ESPN Player ID'], previous_df['NHL Player ID']):
+                if pd.notna(espn_id):
+                    previous_keys[('espn', int(espn_id))] = int(player_key)
+                if pd.notna(nhl_id):
+                    previous_keys[('nhl', int(nhl_id))] = int(player_key)
+            next_key = int(previous_df['Player Key'].max()) + 1
+
+        rows = []
+        used_keys = set()
+        for player in players.values():
+            player_key = None
+            for id_key in [('espn', player['ESPN Player ID']), ('nhl', player['NHL Player ID'])]:
+                if id_key in previous_keys and previous_keys[id_key] not in used_keys:
+                    player_key = previous_keys[id_key]
+                    break
+
+            if player_key is None:
+                player_key = next_key
+                next_key += 1
+            used_keys.add(player_key)
+
+            rows.append({'Player Key': player_key,
+                         'ESPN Player ID': player['ESPN Player ID'],
+                         'NHL Player ID': player['NHL Player ID'],
+                         'Player Name': player['Player Name'],
+                         'Name Variants': NAME_VARIANTS_SEPARATOR.join(sorted(n for n in player['names'] if isinstance(n, str))),
+                         'Player Birth Place': player['Player Birth Place'],
+                         'Player Height': player['Player Height'],
+                         'Player Weight': player['Player Weight'],
+                         'Player DOB': player['Player DOB']})
+
+        instrumentation.increment("rows_produced.player_index", len(rows))
+        return self._to_df(rows)
+
+    def _get_espn_player(self, players, espn_id):
+        """ Returns the player with the given ESPN player ID, adding it if needed. """
+        player = players.setdefault(('espn', int(espn_id)), self._new_player())
+        player['ESPN Player ID'] = int(espn_id)
+        return player
+
+    def _new_player(self):
+        """ Returns a new player dictionary. """
+        return {'ESPN Player ID': None, 'NHL Player ID': None, 'Player Name': None, 'names': set(),
+                'Player Birth Place': None, 'Player Height': None, 'Player Weight': None, 'Player DOB': None}
+
+    def _get_unique_pairs(self, df, id_column, *columns):
+        """ Returns unique (ID, columns...) tuples of a dataframe, skipping rows without an ID. """
+        if df.empty or id_column not in df:
+            return []
+
+        df = df[[id_column, *columns]].dropna(subset=[id_column]).drop_duplicates()
+        return [(int(row[0]), *row[1:]) for row in df.itertuples(index=False)]
+
+    def _to_df(self, rows):
+        """ Returns dataframe of player index rows with typed columns. """
+        df = pd.DataFrame(rows, columns=list(PLAYER_INDEX_COLUMNS))
+        return df.astype(PLAYER_INDEX_COLUMNS).sort_values(by='Player Key').reset_index(drop=True)
+
+    def _get_fingerprint(self):
+        """ Returns a fingerprint of all input files (size and modified time) used
+            to check if the saved index is up-to-date. All players info is either a
+            single file, pages (see EspnFantasyApiLoader) or in the season's archive. """
+        file_paths = [os.path.join(self._espn_fantasy_api_downloads_root_folder, STORE_FILE_NAME)]
+        if os.path.isdir(self._espn_fantasy_api_downloads_root_folder):
+            for season_string in os.listdir(self._espn_fantasy_api_downloads_root_folder):
+                season_folder_path = os.path.join(self._espn_fantasy_api_downloads_root_folder, season_string)
+                file_paths.append(os.path.join(season_folder_path, f"{season_string}_all_players_info.json"))
+                file_paths.append(get_archive_path(season_folder_path))
+            for file_info in get_catalog(self._espn_fantasy_api_downloads_root_folder).get_files(kind='all_players_info_page'):
+                file_paths.append(os.path.join(self._espn_fantasy_api_downloads_root_folder, file_info['path']))
+        file_paths += get_nhl_roster_file_paths(self._nhlapi_downloads_root_folder)
+
+        fingerprint = {'version': PLAYER_INDEX_VERSION}
+        for file_path in sorted(file_paths):
+            if os.path.isfile(file_path):
+                stat = os.stat(file_path)
+                fingerprint[os.path.abspath(file_path)] = [stat.st_size, stat.st_mtime]
+        return fingerprint
+
+    def _load(self):
+        """ Returns saved index dictionary in the form: {'fingerprint': <dict>, 'players': <list>}.
+            Returns None if not saved. """
+        try:
+            with open(self._index_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save(self, df, fingerprint):
+        """ Saves index with the fingerprint of its inputs. """
+        players = json.loads(df.to_json(orient='records'))
+        os.makedirs(os.path.dirname(os.path.abspath(self._index_path)), exist_ok=True)
+        with open(self._index_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'players': players}, f)
+
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
+    parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing ESPN Fantasy API downloaded files.")
+    parser.add_argument("--nhlapi_downloads_root_folder", type=str, default=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing NHL API downloaded files.")
+    parser.add_argument("--out_dir_path", type=str, default=DEFAULT_OUTPUT_DIR,
+                        help="Output directory path to save generated data.")
+    instrumentation.add_arguments(parser)
+
+def main(args):
+    """ Generates player index data. """
+    start_time = timeit.default_timer()
+
+    instrumentation.start_run("data_generator_player_index", profile=args.profile)
+
+    print("Generating player index...")
+    data_generator = DataGeneratorPlayerIndex(
+        espn_fantasy_api_downloads_root_folder=args.espn_fantasy_api_downloads_root_folder,
+        nhlapi_downloads_root_folder=args.nhlapi_downloads_root_folder,
+        out_dir_path=args.out_dir_path
+    )
+
+    player_index_df = data_generator.get_df()
+    with instrumentation.Timer("write_csv"):
+        player_index_df.to_csv(os.path.join(args.out_dir_path, "player_index_df.csv"), index=False)
+    instrumentation.increment("rows_written", len(player_index_df))
+
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+""" Resolves player names from ESPN data (Example: draft recaps keyed by
+    "First Last", team and season) to NHL API player IDs.
+
+    NHL players (see NhlapiDataGenerator) are grouped into blocks so a name is
+    only compared against a handful of candidates instead of all players:
+    - Last name key (Example: "Lafrenière" -> "lafreniere")
+    - Birth date
+    - Team and season
+
+    Each candidate is scored by name similarity, with bonuses for matching
+    birth date, team and season. Candidates with a different birth date are
+    never matched. A name resolves only if the best score passes a minimum
+    and is clearly ahead of the next best candidate.
+
+    Results are cached to a JSON file with a fingerprint of the NHL roster
+    files they were resolved against. Cached matches are kept when rosters
+    change, but cached misses are retried since a new roster may resolve them.
+"""
+import argparse
+from datetime import date
+from difflib import SequenceMatcher
+import json
+from nhlapi_scripts.nhlapi_data_generator import NhlapiDataGenerator
+import os
+import pandas as pd
+import re
+from unidecode import unidecode
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "..", "nhlapi_scripts", "nhlapi_downloads")
+DEFAULT_CACHE_PATH = os.path.join(SCRIPT_DIR, "player_resolver_cache.json")
+
+# Scoring of candidates. Name similarity is between 0 and 1.
+MIN_SCORE = 0.9
+MIN_SCORE_MARGIN = 0.05
+BIRTH_DATE_SCORE = 0.2
+TEAM_SEASON_SCORE = 0.1
+SEASON_SCORE = 0.05
+
+# Name suffixes ignored for the last name key
+NAME_SUFFIXES = ['jr', 'sr', 'ii', 'iii', 'iv']
+
+# ESPN team abbreviations that differ from NHL API team abbreviations
+ESPN_TO_NHL_TEAM_ABBREVS = {'CLS': 'CBJ', 'LA': 'LAK', 'MON': 'MTL', 'NJ': 'NJD', 'SJ': 'SJS',
+                            'TB': 'TBL', 'UTAH': 'UTA', 'VGS': 'VGK'}
+
+def normalize_name(name):
+    """ Returns a normalized name used to compare names across data sources.
+        Example: "Alexis Lafrenière" -> "alexislafreniere"
+        Example: "T.J. Brodie" -> "tjbrodie" """
+    if not isinstance(name, str):
+        return ""
+    return re.sub(r"[^a-z]", "", unidecode(name).lower())
+
+def get_last_name_key(name):
+    """ Returns the normalized last name of a full name, ignoring suffixes.
+        Example: "Alexis Lafrenière" -> "lafreniere"
+        Example: "Tim Stützle Jr." -> "stutzle" """
+    if not isinstance(name, str):
+        return ""
+
+    parts = [normalize_name(part) for part in unidecode(name).split()]
+    parts = [part for part in parts if part and part not in NAME_SUFFIXES]
+    return parts[-1] if parts else ""
+
+def normalize_team_abbrev(team_abbrev):
+    """ Returns an NHL API team abbreviation from an ESPN or NHL API team abbreviation.
+        Example: "Pit" -> "PIT", "Mon" -> "MTL" """
+    if not isinstance(team_abbrev, str) or team_abbrev.strip() == "":
+        return None
+
+    team_abbrev = team_abbrev.strip().upper()
+    return ESPN_TO_NHL_TEAM_ABBREVS.get(team_abbrev, team_abbrev)
+
+def get_nhl_roster_file_paths(nhlapi_downloads_root_folder):
+    """ Returns list of all NHL team roster file paths used to find NHL players. """
+    file_paths = []
+    if os.path.isdir(nhlapi_downloads_root_folder):
+        for season_string in os.listdir(nhlapi_downloads_root_folder):
+            folder_path = os.path.join(nhlapi_downloads_root_folder, season_string, "team_rosters")
+            if os.path.isdir(folder_path):
+                file_paths += [os.path.join(folder_path, f) for f in os.listdir(folder_path)]
+    return sorted(file_paths)
+
+class DataGeneratorPlayerResolver():
+    def __init__(self, nhlapi_downloads_root_folder=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                       cache_path=DEFAULT_CACHE_PATH, nhl_players_df=None):
+        """ Constructor. nhl_players_df is an already-generated dataframe of
+            NhlapiDataGenerator, otherwise it is generated when first needed. """
+        self._nhlapi_downloads_root_folder = nhlapi_downloads_root_folder
+        self._cache_path = cache_path
+        self._nhl_players_df = nhl_players_df
+        self._fingerprint = self._get_fingerprint()
+        self._cache = self._load_cache()
+        self._candidates = None
+        self._blocks = None
+
+    def resolve(self, name, team=None, season=None, dob=None):
+        """ Returns NHL player ID of a player. team is an ESPN or NHL API team
+            abbreviation, season is an integer (Example: 20152016) and dob is
+            a date. Returns None if the player can't be resolved. """
+        query_key = json.dumps([normalize_name(name), normalize_team_abbrev(team),
+                                int(season) if pd.notna(season) else None,
+                                dob.isoformat() if isinstance(dob, date) else None])
+        if query_key in self._cache:
+            instrumentation.increment("player_resolver.cache_hits")
+            return self._cache[query_key]
+
+        nhl_id = self._resolve(name, normalize_team_abbrev(team), int(season) if pd.notna(season) else None,
+                               dob if isinstance(dob, date) else None)
+        self._cache[query_key] = nhl_id
+        return nhl_id
+
+    @instrumentation.Timer("player_resolver.resolve_df")
+    def resolve_df(self, df, name_column, team_column=None, season_column=None, dob_column=None):
+        """ Returns a series (Int64) of NHL player IDs of each row in a dataframe.
+            Each unique combination of columns is only resolved once. Columns
+            that are None are not used to resolve. Saves the cache afterwards. """
+        columns = [column for column in [name_column, team_column, season_column, dob_column] if column is not None]
+        nhl_ids = {}
+        for row in df[columns].drop_duplicates().itertuples(index=False):
+            values = dict(zip(columns, row))
+            nhl_ids[tuple(row)] = self.resolve(values[name_column],
+                                               team=values.get(team_column),
+                                               season=values.get(season_column),
+                                               dob=values.get(dob_column))
+        self.save_cache()
+
+        return pd.Series([nhl_ids[tuple(row)] for row in df[columns].itertuples(index=False)],
+                         index=df.index, dtype='Int64')
+
+    def save_cache(self):
+        """ Saves cached results with the fingerprint of NHL roster files. """
+        os.makedirs(os.path.dirname(os.path.abspath(self._cache_path)), exist_ok=True)
+        temp_path = f"{self._cache_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'fingerprint': self._fingerprint, 'results': self._cache}, f)
+        os.replace(temp_path, self._cache_path)
+
+    def _resolve(self, name, team, season, dob):
+        """ Returns NHL player ID of the best scoring candidate. Returns None if no
+            candidate scores high enough or the best is ambiguous. """
+        self._build_blocks()
+        instrumentation.increment("player_resolver.cache_misses")
+
+        normalized_name = normalize_name(name)
+        if normalized_name == "":
+            return None
+
+        candidate_ids = set(self._blocks.get(('last', get_last_name_key(name)), []))
+        if dob is not None:
+            candidate_ids.update(self._blocks.get(('dob', dob), []))
+        if team is not None and season is not None:
+            candidate_ids.update(self._blocks.get(('team', team, season), []))
+        instrumentation.increment("player_resolver.candidates", len(candidate_ids))
+
+        scores = []
+        for nhl_id in candidate_ids:
+            candidate = self._candidates[nhl_id]
+            if dob is not None and candidate['dob'] is not None and dob != candidate['dob']:
+                continue
+
+            score = max(SequenceMatcher(None, normalized_name, candidate_name).ratio() for candidate_name in candidate['names'])
+            if dob is not None and dob == candidate['dob']:
+                score += BIRTH_DATE_SCORE
+            if team is not None and season is not None and (team, season) in candidate['team_seasons']:
+                score += TEAM_SEASON_SCORE
+            elif season is not None and season in candidate['seasons']:
+                score += SEASON_SCORE
+            scores.append((score, nhl_id))
+
+        scores.sort(reverse=True)
+        if not scores or scores[0][0] < MIN_SCORE:
+            return None
+        if len(scores) > 1 and scores[0][0] - scores[1][0] < MIN_SCORE_MARGIN:
+            return None
+        return scores[0][1]
+
+    def _build_blocks(self):
+        """ Builds candidates and blocking index from NHL players. Only done once. """
+        if self._blocks is not None:
+            return
+
+        nhl_players_df = self._nhl_players_df
+        if nhl_players_df is None:
+            nhl_players_df = NhlapiDataGenerator(self._nhlapi_downloads_root_folder).get_df() if os.path.isdir(self._nhlapi_downloads_root_folder) else pd.DataFrame()
+
+        self._candidates = {}
+        self._blocks = {}
+        if nhl_players_df.empty:
+            return
+
+        for nhl_id, player_name, team, season, dob_string in nhl_players_df[['id', 'Player', 'Team', 'Season', 'Player Birth Date']].itertuples(index=False):
+            candidate = self._candidates.setdefault(int(nhl_id), {'names': set(), 'dob': None, 'team_seasons': set(), 'seasons': set()})
+            candidate['names'].add(normalize_name(player_name))
+            candidate['team_seasons'].add((normalize_team_abbrev(team), int(season)))
+            candidate['seasons'].add(int(season))
+            try:
+                candidate['dob'] = date.fromisoformat(dob_string)
+            except (TypeError, ValueError):
+                pass
+
+            self._blocks.setdefault(('last', get_last_name_key(player_name)), set()).add(int(nhl_id))
+            self._blocks.setdefault(('team', normalize_team_abbrev(team), int(season)), set()).add(int(nhl_id))
+
+        for nhl_id, candidate in self._candidates.items():
+            if candidate['dob'] is not None:
+                self._blocks.setdefault(('dob', candidate['dob']), set()).add(nhl_id)
+
+    def _get_fingerprint(self):
+        """ Returns a fingerprint of NHL roster files (size and modified time). """
+        fingerprint = {}
+        for file_path in get_nhl_roster_file_paths(self._nhlapi_downloads_root_folder):
+            stat = os.stat(file_path)
+            fingerprint[os.path.abspath(file_path)] = [stat.st_size, stat.st_mtime]
+        return fingerprint
+
+    def _load_cache(self):
+        """ Returns dictionary of cached results. Misses resolved against different
+            NHL roster files are dropped. """
+        try:
+            with open(self._cache_path, 'r') as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        if saved.get('fingerprint') == self._fingerprint:
+            return saved.get('results', {})
+        return {query_key: nhl_id for query_key, nhl_id in saved.get('results', {}).items() if nhl_id is not None}
+
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
+    parser.add_argument("name", type=str, help="Player name to resolve.")
+    parser.add_argument("--team", type=str, default=None, help="Team abbreviation of the player.")
+    parser.add_argument("--season", type=int, default=None, help="Season of the team (Example: 20152016).")
+    parser.add_argument("--dob", type=date.fromisoformat, default=None, help="Date of birth of the player (yyyy-mm-dd).")
+    parser.add_argument("--nhlapi_downloads_root_folder", type=str, default=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing NHL API downloaded files.")
+    parser.add_argument("--cache_path", type=str, default=DEFAULT_CACHE_PATH, help="Path of the results cache file.")
+
+def main(args):
+    """ Resolves a player name and prints the result. """
+    resolver = DataGeneratorPlayerResolver(args.nhlapi_downloads_root_folder, args.cache_path)
+    print(resolver.resolve(args.name, team=args.team, season=args.season, dob=args.dob))
+    resolver.save_cache()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+""" Aggregate cube of daily rosters summed for each player, season, owner and
+    active flag (see EspnFantasyApiDownloadsParser.get_daily_rosters_df), with
+    the number of scoring periods, applied total and every stat of STATS_MAP.
+
+    The cube is indexed by its grain (CUBE_GRAIN_COLUMNS), so slices only
+    compare the integer codes of each index level and rollups (Example:
+    per-player season totals, per-owner contributions, active/bench splits)
+    only sum rows of the cube instead of grouping the full daily rosters
+    every time.
+
+    The cube is saved in the downloads root folder (aggregate_cube.csv) with a
+    state file (aggregate_cube_state.json) of the last scoring period added of
+    each season, so only scoring periods downloaded since the last update are
+    parsed. The latest scoring period can still change during the day, so it
+    is never saved and is always added on top of the saved cube, as are
+    scoring periods after one that isn't downloaded (same as
+    EspnFantasyApiStandings).
+
+    Example usage:
+        cube = EspnFantasyApiAggregateCube(root_folder)
+        cube.update()
+        cube.get_rollup_df(['id', 'season'])                               # Player season totals
+        cube.get_rollup_df(['owner', 'id'], season="20242025", active=True)  # Owner contributions
+        cube.get_slice_df(owner=["Owner 1", "Owner 2"], active=False)      # Bench of 2 owners
+"""
+import argparse
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser, get_last_contiguous_scoring_period
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
+import json
+import numpy as np
+import os
+import pandas as pd
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STATE_VERSION = 1
+
+CUBE_GRAIN_COLUMNS = ['id', 'season', 'owner', 'active']
+CUBE_MEASURE_COLUMNS = ['numScoringPeriods', 'appliedTotal'] + list(dict.fromkeys(STATS_MAP.values()))
+
+def get_cube_df(daily_rosters_df):
+    """ Returns dataframe of daily rosters summed at the grain of the cube, indexed
+        and sorted by CUBE_GRAIN_COLUMNS, with a column for each of CUBE_MEASURE_COLUMNS.
+        Stats missing from daily rosters count as 0. """
+    if daily_rosters_df.empty:
+        return pd.DataFrame(columns=CUBE_MEASURE_COLUMNS, index=pd.MultiIndex.from_tuples([], names=CUBE_GRAIN_COLUMNS), dtype=np.float64)
+
+    df = daily_rosters_df.reindex(columns=CUBE_GRAIN_COLUMNS + CUBE_MEASURE_COLUMNS[1:])
+    df[CUBE_MEASURE_COLUMNS[1:]] = df[CUBE_MEASURE_COLUMNS[1:]].apply(pd.to_numeric, errors='coerce').fillna(0)
+    df = df.astype({'id': np.int64, 'season': str, 'owner': str, 'active': bool})
+    grouped = df.groupby(CUBE_GRAIN_COLUMNS, sort=True)
+    cube_df = grouped[CUBE_MEASURE_COLUMNS[1:]].sum()
+    cube_df.insert(0, 'numScoringPeriods', grouped.size().astype(np.float64))
+    return cube_df
+
+def add_cube_dfs(cube_df, other_cube_df):
+    """ Returns sum of two cubes, sorted by the grain of the cube. """
+    if other_cube_df.empty:
+        return cube_df
+    if cube_df.empty:
+        return other_cube_df
+    return cube_df.add(other_cube_df, fill_value=0).sort_index()
+
+class EspnFantasyApiAggregateCube():
+    def __init__(self, espn_fantasy_api_downloads_root_folder=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")):
+        """ Constructor. Takes in the root folder of ESPN fantasy API downloads.
+            Loads the saved cube, if any. Call update() to add new scoring periods. """
+        self._root_folder = espn_fantasy_api_downloads_root_folder
+        self._loader = EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder)
+        self._downloads_parser = EspnFantasyApiDownloadsParser(espn_fantasy_api_downloads_root_folder)
+        self._state, self._saved_cube_df = self._load()
+        self._cube_df = self._saved_cube_df
+
+    @instrumentation.Timer("aggregate_cube.update")
+    def update(self):
+        """ Adds scoring periods of all seasons downloaded since the last update.
+            Complete scoring periods are saved. """
+        complete_cube_dfs = []
+        latest_cube_dfs = []
+        for season_string in self._loader.get_seasons():
+            league_info_dict = self._loader.get_league_info_dict(season_string)
+            if league_info_dict is None:
+                continue
+
+            latest_scoring_period = min(league_info_dict['status']['latestScoringPeriod'], league_info_dict['status']['finalScoringPeriod'])
+            saved_scoring_period = self._state['scoringPeriods'].get(season_string, 0)
+            if saved_scoring_period >= latest_scoring_period:
+                continue
+
+            # Full seasons can be read from the daily rosters store
+            if saved_scoring_period == 0:
+                df = self._downloads_parser.get_daily_rosters_df_by_season(season_string, None, use_store=True)
+            else:
+                df = self._downloads_parser.get_daily_rosters_df_by_season(season_string, None, first_scoring_period=saved_scoring_period + 1)
+            if df.empty:
+                continue
+
+            # Complete scoring periods are saved up to the first one that isn't parsed
+            self._state['fullNames'].update(zip(df['id'].astype(np.int64).astype(str), df['fullName']))
+            scoring_periods = df['scoringPeriodId'].to_numpy()
+            first_scoring_period = max(saved_scoring_period + 1, league_info_dict['status']['firstScoringPeriod'])
+            last_complete_scoring_period = get_last_contiguous_scoring_period(scoring_periods, first_scoring_period, latest_scoring_period - 1)
+            complete = (scoring_periods > saved_scoring_period) & (scoring_periods <= last_complete_scoring_period)
+            complete_cube_dfs.append(get_cube_df(df[complete]))
+            latest_cube_dfs.append(get_cube_df(df[scoring_periods > max(saved_scoring_period, last_complete_scoring_period)]))
+            instrumentation.increment("aggregate_cube.rows_added", int(complete.sum()))
+            if last_complete_scoring_period > saved_scoring_period:
+                self._state['scoringPeriods'][season_string] = last_complete_scoring_period
+
+        if complete_cube_dfs:
+            for cube_df in complete_cube_dfs:
+                self._saved_cube_df = add_cube_dfs(self._saved_cube_df, cube_df)
+            self._save()
+
+        self._cube_df = self._saved_cube_df
+        for cube_df in latest_cube_dfs:
+            self._cube_df = add_cube_dfs(self._cube_df, cube_df)
+
+    def get_df(self):
+        """ Returns dataframe of the full cube with the grain as columns. """
+        return self._cube_df.reset_index()
+
+    def get_slice_df(self, id=None, season=None, owner=None, active=None):
+        """ Returns dataframe of rows of the cube matching the given values of each level
+            of the grain, with the grain as columns. Each value can be a single value or a
+            list of values. Levels not given match all values. """
+        if self._cube_df.empty:
+            return self.get_df()
+
+        # Rows are matched on the integer codes of each level of the index
+        index = self._cube_df.index
+        mask = np.ones(len(index), dtype=bool)
+        for i, value in enumerate([id, season, owner, active]):
+            if value is not None:
+                values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+                mask &= np.isin(index.codes[i], index.levels[i].get_indexer(values))
+
+        with instrumentation.Timer("aggregate_cube.get_slice_df"):
+            return self._cube_df[mask].reset_index()
+
+    def get_rollup_df(self, by, **filters):
+        """ Returns dataframe of the cube summed for each combination of the given levels
+            of the grain (Example: ['id', 'season'] for player season totals). Optionally
+            only rows matching filters (see get_slice_df). Rollups by player ID have the
+            player's name. """
+        slice_df = self.get_slice_df(**filters)
+        rollup_df = slice_df.groupby(list(by), sort=True)[CUBE_MEASURE_COLUMNS].sum().reset_index()
+        if 'id' in by:
+            rollup_df.insert(list(by).index('id') + 1, 'fullName', rollup_df['id'].astype(str).map(self._state['fullNames']))
+        return rollup_df
+
+    def _get_cube_path(self):
+        """ Returns path of the saved cube. """
+        return os.path.join(self._root_folder, "aggregate_cube.csv")
+
+    def _get_state_path(self):
+        """ Returns path of the state file of the saved cube. """
+        return os.path.join(self._root_folder, "aggregate_cube_state.json")
+
+    def _load(self):
+        """ Returns tuple of (<state>, <cube dataframe>) saved in the root folder. Returns
+            an empty state and cube if not saved or saved with a different version. """
+        empty_state = {'version': STATE_VERSION, 'scoringPeriods': {}, 'fullNames': {}}
+        try:
+            with open(self._get_state_path(), 'r') as f:
+                state = json.load(f)
+            df = pd.read_csv(self._get_cube_path(), dtype={'season': str, 'owner': str})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return empty_state, get_cube_df(pd.DataFrame())
+
+        if state.get('version') != STATE_VERSION:
+            return empty_state, get_cube_df(pd.DataFrame())
+
+        df['active'] = df['active'].astype(bool)
+        return state, df.set_index(CUBE_GRAIN_COLUMNS).sort_index()
+
+    def _save(self):
+        """ Saves cube and then its state in the root folder. """
+        temp_path = f"{self._get_cube_path()}.tmp"
+        self._saved_cube_df.reset_index().to_csv(temp_path, index=False)
+        os.replace(temp_path, self._get_cube_path())
+
+        temp_path = f"{self._get_state_path()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self._state, f)
+        os.replace(temp_path, self._get_state_path())
+
+if __name__ == "__main__":
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("by", type=str, nargs="+", choices=CUBE_GRAIN_COLUMNS, help="Levels of the cube to sum by (Example: owner active).")
+    arg_parse.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads"),
+                           help="Root folder path containing ESPN Fantasy API downloaded files.")
+    arg_parse.add_argument("--season", type=str, nargs="*", default=None, help="Seasons to include (Example: 20242025). Defaults to all.")
+    arg_parse.add_argument("--owner", type=str, nargs="*", default=None, help="Owners to include. Defaults to all.")
+    args = arg_parse.parse_args()
+
+    cube = EspnFantasyApiAggregateCube(args.espn_fantasy_api_downloads_root_folder)
+    cube.update()
+    print(cube.get_rollup_df(args.by, season=args.season, owner=args.owner).to_string(index=False))
\ No newline at end of file
@@ -2,6 +2,7 @@
 """ Loads dictionary that's from the json that contains all players data. """
 from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 class EspnFantasyApiAllPlayersInfoParser():
     def __init__(self, season_string, all_players_info_dict):
@@ -9,8 +10,9 @@ class EspnFantasyApiAllPlayersInfoParser():
         self._season_year = str(season_string[4:])
         self._data_dict = all_players_info_dict
 
-    def get_all_players_info_as_dicts(self):
-        """ Return all players with some additional data as a list of dictionaries """
+    def get_all_players_info_as_dicts(self, columns=None):
+        """ Return all players with some additional data as a list of dictionaries.
+            Optionally only the given columns, so other stats are never mapped """
         all_players_dicts = []
         player_stat = {}
         for player in self._data_dict['players']:
@@ -26,17 +28,22 @@ class EspnFantasyApiAllPlayersInfoParser():
                                 'Player ID': float(player['player'].get('id')), # Cast to float in case there is "nan"
                                 'Fantasy Points': player_stat.get('appliedTotal')}
 
-            all_players_dict.update(self._map_stats_index_to_names(player_stat.get('stats', {})))
+            all_players_dict.update(self._map_stats_index_to_names(player_stat.get('stats', {}), columns))
+            if columns is not None:
+                all_players_dict = {key: val for key, val in all_players_dict.items() if key in columns}
             all_players_dicts.append(all_players_dict)
 
         return all_players_dicts
 
-    def get_all_players_info_as_df(self):
-        """ Return all players with some additional data as a dataframe"""
-        return pd.DataFrame(self.get_all_players_info_as_dicts())
+    def get_all_players_info_as_df(self, columns=None):
+        """ Return all players with some additional data as a dataframe. Optionally only the given columns """
+        df = pd.DataFrame(self.get_all_players_info_as_dicts(columns))
+        instrumentation.increment("rows_produced.all_players_info", len(df))
+        return df
 
-    def _map_stats_index_to_names(self, stats_dict):
+    def _map_stats_index_to_names(self, stats_dict, columns=None):
         """ Converts each stat from a generic number to the actual stat name.
+            Optionally only stats in the given columns.
             Example: If 0 = "G", 1 = "A", 2 = "PTS"
                      {0: x, 1: y, 2: z} -> {'G': x, 'A': y, 'PTS': z} """
-        return {STATS_MAP[int(key)]: val for key, val in stats_dict.items()}
\ No newline at end of file
+        return {STATS_MAP[int(key)]: val for key, val in stats_dict.items() if columns is None or STATS_MAP[int(key)] in columns}
\ No newline at end of file
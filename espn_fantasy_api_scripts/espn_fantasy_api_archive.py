@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+""" Archive format for downloaded ESPN fantasy API data that repeats across files.
+
+    Files such as realtime stats snapshots and scoring periods repeat almost
+    identical sub-documents (Example: mSettings, mNav and team metadata) in every
+    file. The archive splits each JSON document into sub-documents and stores
+    each unique sub-document once as a compressed, content-addressed chunk.
+    Each document is stored as a small manifest referencing its chunks, so a
+    document that only changed slightly from a previous one only adds chunks
+    for the parts that changed.
+
+    An archive is a single zip file per season:
+
+    <season_folder>
+    - XXXXYYYY_archive.zip
+      -> chunks/<sha256>           (compressed JSON of a unique sub-document)
+      -> documents/<relative path> (manifest of a JSON document)
+      -> files/<relative path>     (compressed non-JSON file, Example: realtime stats deltas)
+
+    Manifests are trees of nodes in the form:
+    - {'d': {<key>: <node>, ...}}: Dictionary
+    - {'l': [<node>, ...]}: List
+    - {'c': <sha256>}: Chunk
+    - {'v': <value>}: Small value stored inline
+
+    EspnFantasyApiLoader reads from a season's archive transparently for any
+    file that is not found on disk.
+"""
+import argparse
+import hashlib
+import json
+import os
+import zipfile
+import utils.instrumentation as instrumentation
+
+# Folders within a season folder that are archived by default
+ARCHIVE_FOLDERS = ["realtime_stats", "scoring_periods"]
+
+# Number of levels of sub-documents to split into chunks
+# Example: scoring period -> teams -> team -> roster
+MAX_CHUNK_DEPTH = 4
+
+# Values that serialize smaller than this are stored inline in the manifest
+MIN_CHUNK_SIZE = 256
+
+# Number of decompressed chunks kept in memory when reading
+MAX_CACHED_CHUNKS = 1024
+
+def get_archive_path(season_folder_path):
+    """ Returns path of the archive for a season folder. """
+    season_string = os.path.basename(os.path.normpath(season_folder_path))
+    return os.path.join(season_folder_path, f"{season_string}_archive.zip")
+
+class EspnFantasyApiArchive():
+    def __init__(self, archive_path):
+        """ Constructor. Takes in path to the archive file. The archive file is
+            created when data is first added to it. """
+        self._archive_path = archive_path
+        self._zip_file = None
+        self._zip_mode = None
+        self._names = set()
+        self._chunk_cache = {}
+
+        if os.path.exists(archive_path):
+            self._open('r')
+
+    def __getstate__(self):
+        """ Open file handles can't be pickled (Example: when passed to other
+            processes). The archive is re-opened when it is next read from. """
+        state = self.__dict__.copy()
+        state['_zip_file'] = None
+        state['_zip_mode'] = None
+        return state
+
+    def exists(self):
+        """ Returns True if the archive file exists. """
+        return os.path.exists(self._archive_path)
+
+    def list_files(self, folder=""):
+        """ Returns names of all documents and files in the archive under the given
+            folder (relative to the season folder). Example: list_files("scoring_periods") """
+        names = []
+        for name in self._names:
+            for root in ["documents/", "files/"]:
+                if not name.startswith(root):
+                    continue
+
+                relative_path = name[len(root):]
+                relative_folder, file_name = relative_path.rsplit("/", 1) if "/" in relative_path else ("", relative_path)
+                if relative_folder == folder.replace(os.sep, "/"):
+                    names.append(file_name)
+
+        return sorted(names)
+
+    def contains(self, relative_path):
+        """ Returns True if the archive contains a document or file at the relative path. """
+        relative_path = relative_path.replace(os.sep, "/")
+        return f"documents/{relative_path}" in self._names or f"files/{relative_path}" in self._names
+
+    def load_json(self, relative_path):
+        """ Returns JSON data of a document in the archive. Returns None if the
+            archive does not contain the document. """
+        name = f"documents/{relative_path.replace(os.sep, '/')}"
+        if name not in self._names:
+            return None
+
+        self._open('r')
+        manifest = json.loads(self._zip_file.read(name))
+        instrumentation.increment("files_decoded")
+        return self._build(manifest)
+
+    def read_file(self, relative_path):
+        """ Returns bytes of a non-JSON file in the archive. Returns None if the
+            archive does not contain the file. """
+        name = f"files/{relative_path.replace(os.sep, '/')}"
+        if name not in self._names:
+            return None
+
+        self._open('r')
+        return self._zip_file.read(name)
+
+    def add_json(self, relative_path, json_data):
+        """ Adds a JSON document to the archive at the relative path. Returns
+            False if the archive already contains a document at the path. """
+        name = f"documents/{relative_path.replace(os.sep, '/')}"
+        if name in self._names:
+            return False
+
+        self._open('a')
+        manifest = self._split(json_data, 0)
+        self._write(name, json.dumps(manifest, separators=(',', ':')))
+        return True
+
+    def add_file(self, relative_path, data):
+        """ Adds a non-JSON file to the archive at the relative path. Returns
+            False if the archive already contains a file at the path. """
+        name = f"files/{relative_path.replace(os.sep, '/')}"
+        if name in self._names:
+            return False
+
+        self._open('a')
+        self._write(name, data)
+        return True
+
+    def close(self):
+        """ Closes the archive file. """
+        if self._zip_file is not None:
+            self._zip_file.close()
+            self._zip_file = None
+            self._zip_mode = None
+
+    def _open(self, mode):
+        """ Opens the archive file in the given mode if not already open in it.
+            An archive open for appending can also be read from. """
+        if self._zip_file is not None and (self._zip_mode == mode or mode == 'r'):
+            return
+
+        self.close()
+        self._zip_file = zipfile.ZipFile(self._archive_path, mode, compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+        self._zip_mode = mode
+        self._names = set(self._zip_file.namelist())
+
+    def _write(self, name, data):
+        """ Writes an entry to the archive. """
+        self._zip_file.writestr(name, data)
+        self._names.add(name)
+
+    def _split(self, value, depth):
+        """ Recursively splits a value into a manifest node, storing chunks as needed. """
+        serialized = json.dumps(value, separators=(',', ':'))
+        if len(serialized) < MIN_CHUNK_SIZE:
+            return {'v': value}
+
+        # Only split containers that have large children, otherwise the manifest
+        # ends up holding all the data in small inline values
+        if depth < MAX_CHUNK_DEPTH and self._has_large_children(value):
+            if isinstance(value, dict):
+                return {'d': {k: self._split(v, depth + 1) for k, v in value.items()}}
+            return {'l': [self._split(v, depth + 1) for v in value]}
+
+        # Content-addressed chunk is only written once
+        chunk_hash = hashlib.sha256(serialized.encode()).hexdigest()
+        name = f"chunks/{chunk_hash}"
+        if name not in self._names:
+            self._write(name, serialized)
+        return {'c': chunk_hash}
+
+    def _has_large_children(self, value):
+        """ Returns True if a dictionary or list has any child that is large enough to be a chunk. """
+        if isinstance(value, dict):
+            children = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            return False
+
+        return any(len(json.dumps(child, separators=(',', ':'))) >= MIN_CHUNK_SIZE for child in children)
+
+    def _build(self, node):
+        """ Recursively rebuilds a value from a manifest node. """
+        if 'v' in node:
+            return node['v']
+
+        if 'd' in node:
+            return {k: self._build(v) for k, v in node['d'].items()}
+
+        if 'l' in node:
+            return [self._build(v) for v in node['l']]
+
+        # Chunks are cached decompressed, but decoded every time so callers
+        # can't modify each other's data
+        chunk_hash = node['c']
+        if chunk_hash not in self._chunk_cache:
+            if len(self._chunk_cache) >= MAX_CACHED_CHUNKS:
+                self._chunk_cache.clear()
+            self._chunk_cache[chunk_hash] = self._zip_file.read(f"chunks/{chunk_hash}")
+        return json.loads(self._chunk_cache[chunk_hash])
+
+def archive_season_folder(season_folder_path, folders=ARCHIVE_FOLDERS, remove_originals=False):
+    """ Adds all files in the given folders of a season folder to the season's
+        archive. Each JSON document is read back and verified before original
+        files are removed (if requested). Returns a dictionary summary in the
+        form: {'num_files': <count>, 'original_bytes': <size>, 'archive_bytes': <size>} """
+    archive = EspnFantasyApiArchive(get_archive_path(season_folder_path))
+    archived_file_paths = []
+    original_bytes = 0
+
+    for folder in folders:
+        folder_path = os.path.join(season_folder_path, folder)
+        if not os.path.isdir(folder_path):
+            continue
+
+        for file_name in sorted(os.listdir(folder_path)):
+            file_path = os.path.join(folder_path, file_name)
+            if not os.path.isfile(file_path):
+                continue
+
+            relative_path = f"{folder}/{file_name}"
+            if file_name.endswith(".json"):
+                with open(file_path, 'r') as f:
+                    json_data = json.load(f)
+                archive.add_json(relative_path, json_data)
+
+                # Verify data can be read back identically before trusting the archive
+                if archive.load_json(relative_path) != json_data:
+                    print(f"Verification failed: {relative_path}. Keeping original file.")
+                    continue
+            else:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                archive.add_file(relative_path, data)
+
+                if archive.read_file(relative_path) != data:
+                    print(f"Verification failed: {relative_path}. Keeping original file.")
+                    continue
+
+            archived_file_paths.append(file_path)
+            original_bytes += os.path.getsize(file_path)
+
+    archive.close()
+
+    if remove_originals:
+        for file_path in archived_file_paths:
+            os.remove(file_path)
+
+    archive_path = get_archive_path(season_folder_path)
+    return {'num_files': len(archived_file_paths),
+            'original_bytes': original_bytes,
+            'archive_bytes': os.path.getsize(archive_path) if os.path.exists(archive_path) else 0}
+
+if __name__ == "__main__":
+    """ Main function. Archives season folders of an ESPN fantasy API downloads folder. """
+    from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("--input_dir", "-i", required=True, type=str, help="Root path of ESPN fantasy API downloads.")
+    arg_parse.add_argument("--seasons", "-s", required=False, nargs="*", default=None, help="Season strings to archive (Example: 20242025). Defaults to all seasons.")
+    arg_parse.add_argument("--remove_originals", required=False, action="store_true", help="Remove original files once they are archived and verified.")
+    args = arg_parse.parse_args()
+
+    seasons = args.seasons if args.seasons is not None else EspnFantasyApiLoader(args.input_dir).get_seasons()
+    for season_string in sorted(seasons):
+        summary = archive_season_folder(os.path.join(args.input_dir, season_string), remove_originals=args.remove_originals)
+        print(f"{season_string}: Archived {summary['num_files']} files from {summary['original_bytes']} to {summary['archive_bytes']} bytes.")
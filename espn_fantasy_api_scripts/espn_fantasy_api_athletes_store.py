@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+""" Consolidated store of ESPN athletes data.
+
+    Athletes data is downloaded as one JSON file per player, but only a few
+    fields of each are used. The store keeps just those fields for all
+    players in a single append-only JSON lines file in the root of the
+    ESPN fantasy API downloads folder (athletes.jsonl). Each line has the form:
+
+    {'id': <player ID>, 'fullName': ..., 'displayBirthPlace': ..., 'displayHeight': ...,
+     'displayWeight': ..., 'displayDOB': ..., 'updated': <unix time>}
+
+    A player updated more than once has multiple lines. The latest line wins.
+    Loading all players is a single sequential read of the file, and single
+    players can be looked up by ID through an index of line offsets.
+"""
+import json
+import os
+import time
+import utils.instrumentation as instrumentation
+
+STORE_FILE_NAME = "athletes.jsonl"
+
+# Fields kept from each athlete's data
+ATHLETE_FIELDS = ['id', 'fullName', 'displayBirthPlace', 'displayHeight', 'displayWeight', 'displayDOB']
+
+class EspnFantasyApiAthletesStore():
+    def __init__(self, root_folder_path):
+        """ Constructor. Takes in the root folder of ESPN fantasy API downloads. """
+        self._store_path = os.path.join(root_folder_path, STORE_FILE_NAME)
+        self._index = {}
+        self._indexed_size = 0
+
+    def append(self, json_data_list, updated=None):
+        """ Appends data of the ESPN athletes API to the store. Data without an
+            athlete is skipped. updated defaults to the current time. Returns
+            the number of athletes appended. """
+        updated = updated if updated is not None else time.time()
+        lines = []
+        for json_data in json_data_list:
+            athlete_dict = (json_data or {}).get('athlete')
+            if not athlete_dict or athlete_dict.get('id') is None:
+                continue
+
+            record = {field: athlete_dict.get(field) for field in ATHLETE_FIELDS}
+            record['id'] = int(record['id'])
+            record['updated'] = updated
+            lines.append(json.dumps(record) + "\n")
+
+        if lines:
+            self._remove_partial_line()
+            with open(self._store_path, 'a') as f:
+                f.writelines(lines)
+        return len(lines)
+
+    @instrumentation.Timer("athletes_store.ingest_folder")
+    def ingest_folder(self, folder_path):
+        """ Appends per-player athletes JSON files of a folder that are not in the
+            store yet, or that were modified after they were last stored. Returns
+            the number of athletes appended. """
+        if not os.path.isdir(folder_path):
+            return 0
+
+        updated_times = self.get_updated_times()
+        num_appended = 0
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                name, ext = os.path.splitext(entry.name)
+                if ext != ".json" or not name.isdigit():
+                    continue
+
+                mtime = entry.stat().st_mtime
+                if int(name) in updated_times and updated_times[int(name)] >= mtime:
+                    continue
+
+                with open(entry.path, 'r') as f:
+                    json_data = json.load(f)
+                instrumentation.increment("files_decoded")
+                num_appended += self.append([json_data], updated=mtime)
+
+        return num_appended
+
+    @instrumentation.Timer("athletes_store.get_records")
+    def get_records(self):
+        """ Returns a list of the latest record of every athlete, sorted by ID. """
+        records = {}
+        if os.path.exists(self._store_path):
+            with open(self._store_path, 'r') as f:
+                for line in f:
+                    # Skip a partially written last line (Example: interrupted append)
+                    if not line.endswith("\n"):
+                        continue
+
+                    record = json.loads(line)
+                    records[record['id']] = record
+
+        return [records[id] for id in sorted(records)]
+
+    def get_updated_times(self):
+        """ Returns a dictionary of athlete IDs to the unix time they were last updated. """
+        return {record['id']: record['updated'] for record in self.get_records()}
+
+    def get(self, player_id):
+        """ Returns the latest record of an athlete. Returns None if not in the store. """
+        self._update_index()
+        offset = self._index.get(int(player_id))
+        if offset is None:
+            return None
+
+        with open(self._store_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def compact(self):
+        """ Rewrites the store with only the latest record of every athlete. """
+        records = self.get_records()
+        temp_path = f"{self._store_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        os.replace(temp_path, self._store_path)
+
+        self._index = {}
+        self._indexed_size = 0
+
+    def _update_index(self):
+        """ Updates the index of athlete IDs to line offsets with any lines appended
+            since it was last updated. """
+        if not os.path.exists(self._store_path):
+            return
+
+        # Store was rewritten (Example: compacted by another instance)
+        if os.path.getsize(self._store_path) < self._indexed_size:
+            self._index = {}
+            self._indexed_size = 0
+
+        with open(self._store_path, 'rb') as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+
+                self._index[json.loads(line)['id']] = offset
+                offset += len(line)
+            self._indexed_size = offset
+
+    def _remove_partial_line(self):
+        """ Truncates a partially written last line (Example: interrupted append)
+            so appended lines start on a new line. """
+        if not os.path.exists(self._store_path) or os.path.getsize(self._store_path) == 0:
+            return
+
+        with open(self._store_path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+
+            # Search backwards for the end of the last complete line
+            position = f.tell()
+            while position > 0:
+                chunk_start = max(0, position - 4096)
+                f.seek(chunk_start)
+                newline_index = f.read(position - chunk_start).rfind(b"\n")
+                if newline_index >= 0:
+                    f.truncate(chunk_start + newline_index + 1)
+                    return
+                position = chunk_start
+            f.truncate(0)
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+""" Keeps the downloaded ESPN athletes data folder in sync with the players of interest.
+
+    Players of interest are drafted players and players with games played in
+    the given seasons. Their IDs are read straight from the raw draft details
+    and all players info JSON files, without building dataframes.
+
+    Only athletes that are missing from the athletes folder (or older than a
+    maximum age, if given) are downloaded, in bounded batches. Progress is
+    saved to a checkpoint file after each batch so an interrupted sync
+    resumes where it left off instead of starting over. The checkpoint is
+    removed once the sync finishes.
+
+    Checkpoint file has the form:
+    {'pending': [<player ID>, ...], 'failed': [<player ID>, ...]}
+"""
+import json
+import os
+import time
+import timeit
+import utils.instrumentation as instrumentation
+
+DEFAULT_BATCH_SIZE = 200
+CHECKPOINT_FILE_NAME = "athletes_sync_checkpoint.json"
+
+# Stat ID of games played (see STATS_MAP)
+GP_STAT_ID = "34"
+
+def get_needed_player_ids(loader, start_year, end_year):
+    """ Returns a set of player IDs that are drafted or have games played in
+        any season between start and end years (inclusive) using the given
+        EspnFantasyApiLoader. """
+    player_ids = set()
+    for year in range(start_year, end_year + 1):
+        season_string = f"{year - 1}{year}"
+
+        draft_details_dict = loader.get_draft_details_dict(season_string)
+        if draft_details_dict is not None:
+            for pick in draft_details_dict.get('draftDetail', {}).get('picks', []):
+                if pick.get('playerId') is not None:
+                    player_ids.add(int(pick['playerId']))
+
+        # Season total stats are in the form: {'id': "00<year>", 'stats': {<stat ID>: <value>, ...}}
+        all_players_info_dict = loader.get_all_players_info_dict(season_string)
+        if all_players_info_dict is not None:
+            for player in all_players_info_dict.get('players', []):
+                player_dict = player.get('player', {})
+                for stat in player_dict.get('stats', []):
+                    if stat.get('id') == f"00{year}" and stat.get('stats', {}).get(GP_STAT_ID) is not None:
+                        player_ids.add(int(player_dict['id']))
+                        break
+
+    return player_ids
+
+class EspnFantasyApiAthletesSync():
+    def __init__(self, espn_api_downloader, batch_size=DEFAULT_BATCH_SIZE, max_age_days=None):
+        """ Constructor. Takes in an EspnApiDownloader used to download athletes data.
+            Athletes data older than max_age_days is downloaded again. Data never
+            expires if max_age_days is None. """
+        self._downloader = espn_api_downloader
+        self._batch_size = batch_size
+        self._max_age_days = max_age_days
+        self._folder_path = espn_api_downloader.get_athletes_folder_path()
+        self._checkpoint_path = os.path.join(os.path.dirname(self._folder_path), CHECKPOINT_FILE_NAME)
+
+    def get_player_ids_to_download(self, player_ids):
+        """ Returns sorted list of the given player IDs that are missing or stale
+            in the athletes folder. """
+        existing = {}
+        if os.path.isdir(self._folder_path):
+            with os.scandir(self._folder_path) as it:
+                for entry in it:
+                    name, ext = os.path.splitext(entry.name)
+                    if ext == ".json" and name.isdigit():
+                        existing[int(name)] = entry.stat().st_mtime
+
+        min_mtime = time.time() - self._max_age_days * 24 * 60 * 60 if self._max_age_days is not None else None
+        return sorted(id for id in player_ids if id not in existing or (min_mtime is not None and existing[id] < min_mtime))
+
+    def sync(self, player_ids_func):
+        """ Downloads athletes data that is missing or stale. player_ids_func is
+            called to get the set of player IDs of interest, unless resuming
+            from a checkpoint of an interrupted sync. Returns a dictionary summary
+            in the form: {'num_downloaded': <count>, 'failed': [<player ID>, ...]} """
+        checkpoint = self._load_checkpoint()
+        if checkpoint is not None:
+            print(f"Resuming from checkpoint: {len(checkpoint['pending'])} athletes pending.")
+        else:
+            with instrumentation.Timer("athletes_sync.get_player_ids"):
+                player_ids = player_ids_func()
+            checkpoint = {'pending': self.get_player_ids_to_download(player_ids), 'failed': []}
+            print(f"{len(checkpoint['pending'])} of {len(player_ids)} athletes to download.")
+
+        start_time = timeit.default_timer()
+        num_downloaded = 0
+        while checkpoint['pending']:
+            batch = checkpoint['pending'][:self._batch_size]
+            saved_ids = set(self._downloader.download_athletes_data(batch))
+            num_downloaded += len(saved_ids)
+
+            # Athletes without data are not retried until the next sync
+            checkpoint['failed'] += [id for id in batch if id not in saved_ids]
+            checkpoint['pending'] = checkpoint['pending'][len(batch):]
+            self._save_checkpoint(checkpoint)
+
+        if os.path.exists(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
+        print(f"Synced {num_downloaded} athletes ({len(checkpoint['failed'])} failed) in {round(timeit.default_timer() - start_time, 1)}s.")
+        return {'num_downloaded': num_downloaded, 'failed': checkpoint['failed']}
+
+    def _load_checkpoint(self):
+        """ Returns checkpoint dictionary of an interrupted sync, or None if there is none. """
+        try:
+            with open(self._checkpoint_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save_checkpoint(self, checkpoint):
+        """ Saves checkpoint dictionary. Written to a temporary file first so the
+            checkpoint is never partially written. """
+        temp_path = f"{self._checkpoint_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, self._checkpoint_path)
\ No newline at end of file
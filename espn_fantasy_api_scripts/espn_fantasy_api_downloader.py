@@ -3,19 +3,38 @@
     Downloaded data will be organized into season folders. """
 import argparse
 from datetime import datetime
-from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_store import EspnFantasyApiAthletesStore
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_sync import DEFAULT_BATCH_SIZE, EspnFantasyApiAthletesSync, get_needed_player_ids
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import ALL_PLAYERS_INFO_FOLDER, EspnFantasyApiLoader
 import json
+import math
 import os
+import shutil
+import time
 import timeit
+import utils.instrumentation as instrumentation
+import utils.json_delta as json_delta
 from utils.requests_util import RequestsUtil
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 DEFAULT_DOWNLOADS_DIR = os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")
 DEFAULT_LEAGUE_ID = 54078
+ESPN_FANTASY_API_BASE_URL = "https://lm-api-reads.fantasy.espn.com/"
+ESPN_API_BASE_URL = "https://site.web.api.espn.com/"
+REALTIME_STATS_ENDPOINT = "view=mLiveScoring&view=mMatchupScore&view=mRoster&view=mSettings&view=mStandings&view=mStatus&view=mTeam"
+REALTIME_STATS_DATETIME_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+# All players info can be downloaded in pages of players instead of a single request
+ALL_PLAYERS_INFO_MAX_PLAYERS = 9999
+DEFAULT_ALL_PLAYERS_INFO_PAGE_SIZE = 500
+DEFAULT_ALL_PLAYERS_INFO_CONCURRENT_PAGES = 8
+DEFAULT_ALL_PLAYERS_INFO_PAGE_RETRIES = 3
+DEFAULT_ALL_PLAYERS_INFO_RETRY_DELAY = 1.0
 
 class EspnFantasyApiDownloader:
-    def __init__(self, season, league_id, root_output_folder=DEFAULT_DOWNLOADS_DIR, cookies={}):
-        """ Constructor. """
+    def __init__(self, season, league_id, root_output_folder=DEFAULT_DOWNLOADS_DIR, cookies={}, base_url=ESPN_FANTASY_API_BASE_URL):
+        """ Constructor. The base URL can be overridden to point requests to a
+            different server (e.g.: a local mock server for testing). """
         # Store in a season string folder "XXXXYYYY"
         # Example: 2022 season corresponds to: "20212022"
         self._season_string = f"{season - 1}{season}"
@@ -28,9 +47,10 @@ class EspnFantasyApiDownloader:
 
         # Older seasons used a different access point
         if season < 2018:
-            self._req = RequestsUtil(f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/fhl/leagueHistory/{league_id}?seasonId={season}&")
+            self._league_url = f"{base_url}apis/v3/games/fhl/leagueHistory/{league_id}?seasonId={season}&"
         else:
-            self._req = RequestsUtil(f"https://lm-api-reads.fantasy.espn.com/apis/v3/games/fhl/seasons/{season}/segments/0/leagues/{league_id}?")
+            self._league_url = f"{base_url}apis/v3/games/fhl/seasons/{season}/segments/0/leagues/{league_id}?"
+        self._req = RequestsUtil(self._league_url)
 
     def download_league_info(self):
         """ Downloads data containing general information about the league. """
@@ -59,19 +79,86 @@ class EspnFantasyApiDownloader:
             file to indicate when this was taken. """
         output_folder_path = os.path.join(self._root_output_folder, "realtime_stats")
         os.makedirs(output_folder_path, exist_ok=True)
-        dt = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        dt = datetime.now().strftime(REALTIME_STATS_DATETIME_FORMAT)
 
         output_path = os.path.join(output_folder_path, f"{self._season_string}_realtime_stats_{dt}.json")
         print(f"Downloading to: {output_path}")
         start_time = timeit.default_timer()
-        if not self._req.save_json_from_endpoint("view=mLiveScoring&view=mMatchupScore&view=mRoster&view=mSettings&view=mStandings&view=mStatus&view=mTeam",
-                                                 output_folder_path,
+        if not self._req.save_json_from_endpoint(REALTIME_STATS_ENDPOINT,
+                                                 output_path,
                                                  cookies=self._cookies):
             print(f"Download failed.")
             return
 
         print(f"Downloaded in {round(timeit.default_timer() - start_time, 1)}s.")
 
+    def poll_realtime_stats(self, interval=60, max_polls=None):
+        """ Polls realtime data on an interval until max_polls is reached (or
+            forever if None, until interrupted). Uses a persistent session to
+            keep the connection alive between polls.
+
+            The first snapshot is saved in full to "<season>_realtime_stats_<datetime>.json".
+            Each following snapshot is compared to the previous one and only changes
+            are appended as a line to "<season>_realtime_stats_<datetime>_deltas.jsonl"
+            in the form: {'timestamp': <datetime>, 'delta': <delta>}. Polls without
+            any changes are not saved. See utils/json_delta.py for the delta format.
+
+            Failed polls (Example: connection errors) are skipped.
+
+            Returns the number of snapshots that had changes saved. """
+        import requests
+
+        output_folder_path = os.path.join(self._root_output_folder, "realtime_stats")
+        os.makedirs(output_folder_path, exist_ok=True)
+
+        req = RequestsUtil(self._league_url, persistent_session=True)
+        snapshot_path = None
+        deltas_path = None
+        previous_json_data = None
+        num_saved = 0
+        num_polls = 0
+        try:
+            while max_polls is None or num_polls < max_polls:
+                # Wait between polls, but not before the first one
+                if num_polls > 0:
+                    time.sleep(interval)
+                num_polls += 1
+
+                dt = datetime.now().strftime(REALTIME_STATS_DATETIME_FORMAT)
+                try:
+                    json_data = req.load_json_from_endpoint(REALTIME_STATS_ENDPOINT, cookies=self._cookies)
+                except requests.exceptions.RequestException:
+                    json_data = None
+                if json_data is None:
+                    print(f"Poll failed at {dt}.")
+                    continue
+
+                # First successful poll is saved in full
+                if previous_json_data is None:
+                    snapshot_path = os.path.join(output_folder_path, f"{self._season_string}_realtime_stats_{dt}.json")
+                    deltas_path = f"{os.path.splitext(snapshot_path)[0]}_deltas.jsonl"
+                    with open(snapshot_path, 'w') as out_file:
+                        json.dump(json_data, out_file)
+                    print(f"Saved snapshot to: {snapshot_path}")
+                    previous_json_data = json_data
+                    num_saved += 1
+                    continue
+
+                # Following polls only save changes
+                delta = json_delta.diff(previous_json_data, json_data)
+                if delta:
+                    with open(deltas_path, 'a') as out_file:
+                        out_file.write(json.dumps({'timestamp': dt, 'delta': delta}, separators=(',', ':')) + "\n")
+                    print(f"Saved {len(delta)} changes at {dt}.")
+                    num_saved += 1
+                previous_json_data = json_data
+        except KeyboardInterrupt:
+            print("Polling stopped.")
+        finally:
+            req.close()
+
+        return num_saved
+
     def download_scoring_period(self, id):
         """ Downloads a single scoring period of the season and league. """
         output_folder_path = os.path.join(self._root_output_folder, "scoring_periods")
@@ -126,12 +213,17 @@ class EspnFantasyApiDownloader:
         num_saved = self._req.save_jsons_from_endpoints_async(download_dict_list, cookies=self._cookies)
         print(f"Downloaded {num_saved} files in {round(timeit.default_timer() - start_time, 1)}s.")
 
-    def download_all_players_info(self):
-        """ Downloads data containing information about all players """
+    def download_all_players_info(self, page_size=None):
+        """ Downloads data containing information about all players. Downloads in
+            a single request, unless a page size is given (see download_all_players_info_pages()). """
+        if page_size is not None:
+            self.download_all_players_info_pages(page_size)
+            return
+
         output_path = os.path.join(self._root_output_folder, f"{self._season_string}_all_players_info.json")
         print(f"Downloading to: {output_path}")
         start_time = timeit.default_timer()
-        x_fantasy_filter = {"players": {"limit": 9999, "sortDraftRanks": {"sortPriority": 100, "sortAsc": True, "value": "STANDARD"}}}
+        x_fantasy_filter = self._get_all_players_info_filter(0, ALL_PLAYERS_INFO_MAX_PLAYERS)
 
         if not self._req.save_json_from_endpoint("view=kona_playercard", output_path, headers={"X-Fantasy-Filter": json.dumps(x_fantasy_filter)}, cookies=self._cookies):
             print(f"Download failed.")
@@ -139,63 +231,175 @@ class EspnFantasyApiDownloader:
 
         print(f"Downloaded in {round(timeit.default_timer() - start_time, 1)}s.")
 
+    def download_all_players_info_pages(self, page_size=DEFAULT_ALL_PLAYERS_INFO_PAGE_SIZE, num_concurrent_pages=DEFAULT_ALL_PLAYERS_INFO_CONCURRENT_PAGES,
+                                              max_retries=DEFAULT_ALL_PLAYERS_INFO_PAGE_RETRIES, retry_delay=DEFAULT_ALL_PLAYERS_INFO_RETRY_DELAY,
+                                              max_players=ALL_PLAYERS_INFO_MAX_PLAYERS):
+        """ Downloads data containing information about all players in pages of
+            page_size players, requesting num_concurrent_pages pages at a time.
+            Each page is saved to its own file in the form:
+            all_players_info/XXXXYYYY_all_players_info_page<page number>.json
+            Pages are requested until a page has less than page_size players, up
+            to max_players players. Each page request is retried up to max_retries
+            times on temporary errors, and pages of a batch that still failed are
+            requested once more on their own.
+            Pages are downloaded to a temporary folder that replaces an earlier
+            download only if every page succeeded, so pages of different downloads
+            are never mixed. Returns number of pages saved (0 if any page failed). """
+        req = RequestsUtil(self._league_url, max_retries=max_retries, retry_delay=retry_delay)
+        max_pages = math.ceil(max_players / page_size)
+        output_folder_path = os.path.join(self._root_output_folder, ALL_PLAYERS_INFO_FOLDER)
+        temp_folder_path = f"{output_folder_path}.tmp"
+        shutil.rmtree(temp_folder_path, ignore_errors=True)
+        os.makedirs(temp_folder_path)
+        print(f"Downloading to: {output_folder_path}")
+        start_time = timeit.default_timer()
+
+        num_saved = 0
+        failed_pages = []
+        last_page = None
+        first_page = 0
+        while last_page is None and first_page < max_pages:
+            pages = list(range(first_page, min(first_page + num_concurrent_pages, max_pages)))
+            page_data_dict = self._load_all_players_info_pages(req, pages, page_size)
+
+            # Request failed pages of the batch once more, without the pages that succeeded
+            retry_pages = [page for page in pages if page_data_dict[page][1] is None]
+            if retry_pages:
+                page_data_dict.update(self._load_all_players_info_pages(req, retry_pages, page_size))
+
+            # Last page is the first one that isn't full
+            for page in pages:
+                players = page_data_dict[page][1]
+                if players is not None and len(players) < page_size:
+                    last_page = page
+                    break
+
+            for page in pages:
+                json_data, players = page_data_dict[page]
+                if last_page is not None and page > last_page:
+                    break
+                if players is None:
+                    failed_pages.append(page)
+                    continue
+
+                with open(os.path.join(temp_folder_path, f"{self._season_string}_all_players_info_page{page}.json"), 'w') as out_file:
+                    json.dump(json_data, out_file)
+                num_saved += 1
+
+            # Stop if no page could be downloaded so a broken connection doesn't request pages forever
+            if all(page_data_dict[page][1] is None for page in pages):
+                break
+            first_page += num_concurrent_pages
+
+        # Keep an earlier download if any page failed
+        if failed_pages:
+            shutil.rmtree(temp_folder_path)
+            print(f"Failed to download pages: {failed_pages}")
+            return 0
+
+        shutil.rmtree(output_folder_path, ignore_errors=True)
+        os.replace(temp_folder_path, output_folder_path)
+        print(f"Downloaded {num_saved} pages in {round(timeit.default_timer() - start_time, 1)}s.")
+        return num_saved
+
+    def _load_all_players_info_pages(self, req, pages, page_size):
+        """ Returns dictionary of the downloaded data and list of players of each
+            page, in the form: {<page>: (<json data>, <players>)}
+            Players are None if the page's request failed. """
+        headers_list = [{"X-Fantasy-Filter": json.dumps(self._get_all_players_info_filter(page * page_size, page_size))} for page in pages]
+        json_data_list = req.load_jsons_from_endpoints_async(["view=kona_playercard"] * len(pages), cookies=self._cookies, headers_list=headers_list)
+
+        # Older seasons are wrapped in a list. Failed requests have no players.
+        page_data_dict = {}
+        for page, json_data in zip(pages, json_data_list):
+            data_dict = json_data[0] if isinstance(json_data, list) and json_data else json_data
+            page_data_dict[page] = (json_data, data_dict.get('players') if isinstance(data_dict, dict) else None)
+        return page_data_dict
+
+    def _get_all_players_info_filter(self, offset, limit):
+        """ Returns X-Fantasy-Filter of all players info for a range of players.
+            Players are sorted by draft rank so pages don't overlap. """
+        return {"players": {"offset": offset, "limit": limit, "sortDraftRanks": {"sortPriority": 100, "sortAsc": True, "value": "STANDARD"}}}
+
 class EspnApiDownloader():
-    def __init__(self, root_output_folder=DEFAULT_DOWNLOADS_DIR, cookies={}):
-        """ Default constructor. """
+    def __init__(self, root_output_folder=DEFAULT_DOWNLOADS_DIR, cookies={}, base_url=ESPN_API_BASE_URL):
+        """ Default constructor. The base URL can be overridden to point requests
+            to a different server (e.g.: a local mock server for testing). """
         self._root_output_folder = root_output_folder
         self._cookies = cookies
-        self._req = RequestsUtil("https://site.web.api.espn.com/apis/common/v3/sports/hockey/nhl/")
+        self._req = RequestsUtil(f"{base_url}apis/common/v3/sports/hockey/nhl/")
         os.makedirs(root_output_folder, exist_ok=True)
 
+    def get_athletes_folder_path(self):
+        """ Returns path of the folder athletes data is downloaded to. """
+        return os.path.join(self._root_output_folder, "athletes")
+
     def download_athletes_data(self, player_id_list):
-        """ Downloads data for all given player IDs from ESPN athletes API. """
-        output_folder_path = os.path.join(self._root_output_folder, "athletes")
+        """ Downloads data for all given player IDs from ESPN athletes API.
+            Each player is saved to its own file and to the consolidated athletes
+            store (see espn_fantasy_api_athletes_store.py). Responses without
+            athlete data (Example: failed requests) are not saved. Returns a
+            list of player IDs that were saved. """
+        output_folder_path = self.get_athletes_folder_path()
         os.makedirs(output_folder_path, exist_ok=True)
 
-        # Build links to download athlete data for each player ID
-        download_dict_list = [{'endpoint': f"athletes/{player_id}",
-                               'out_file_path': os.path.join(output_folder_path, f"{player_id}.json")}
-                                for player_id in player_id_list]
         # Download
+        player_id_list = list(player_id_list)
         print(f"Downloading to: {output_folder_path}")
         start_time = timeit.default_timer()
-        num_saved = self._req.save_jsons_from_endpoints_async(download_dict_list, cookies=self._cookies)
-        print(f"Downloaded {num_saved} files in {round(timeit.default_timer() - start_time, 1)}s.")
-
-def _filter_all_players_info_df(all_players_info_df, start_year, end_year):
-    """ Helper function to filter all players info data. """
-    # Filter for seasons of interest
-    start_season_int = int(str(f"{start_year - 1}{start_year}"))
-    end_season_int = int(str(f"{end_year - 1}{end_year}"))
-    df = all_players_info_df[(all_players_info_df['Season'] >= start_season_int) & (all_players_info_df['Season'] <= end_season_int)]
-
-    # Filter for players that have an actual GP
-    df = df[df['GP'].notna()]
-
-    return df
-
-def _filter_draft_details_df(draft_details_df, start_year, end_year):
-    """ Helper function to filter draft details data. """
-    # Filter for seasons of interest
-    start_season_int = int(str(f"{start_year - 1}{start_year}"))
-    end_season_int = int(str(f"{end_year - 1}{end_year}"))
-    df = draft_details_df[(draft_details_df['Season'] >= start_season_int) & (draft_details_df['Season'] <= end_season_int)]
-
-    return df
-
-if __name__ == "__main__":
-    """ Main function. """
-    start_time = timeit.default_timer()
-
-    # Read arguments
-    arg_parse = argparse.ArgumentParser()
+        json_data_list = self._req.load_jsons_from_endpoints_async([f"athletes/{player_id}" for player_id in player_id_list], cookies=self._cookies)
+
+        saved_player_ids = []
+        saved_json_data_list = []
+        for player_id, json_data in zip(player_id_list, json_data_list):
+            if not json_data or not json_data.get('athlete'):
+                continue
+
+            # Write to a temporary file first so an interrupted download never
+            # leaves a partial file that looks already downloaded
+            out_file_path = os.path.join(output_folder_path, f"{player_id}.json")
+            with open(f"{out_file_path}.tmp", 'w') as out_file:
+                json.dump(json_data, out_file)
+            os.replace(f"{out_file_path}.tmp", out_file_path)
+            saved_player_ids.append(player_id)
+            saved_json_data_list.append(json_data)
+
+        # Also add to the consolidated store so loading athletes doesn't need to open every file
+        EspnFantasyApiAthletesStore(self._root_output_folder).append(saved_json_data_list)
+
+        print(f"Downloaded {len(saved_player_ids)}/{len(player_id_list)} files in {round(timeit.default_timer() - start_time, 1)}s.")
+        return saved_player_ids
+
+    def ingest_athletes_folder(self):
+        """ Adds athletes files that are not in the consolidated store yet (Example:
+            downloaded before the store existed) to the store. Returns the number
+            of athletes added. """
+        return EspnFantasyApiAthletesStore(self._root_output_folder).ingest_folder(self.get_athletes_folder_path())
+
+def add_arguments(arg_parse):
+    """ Adds command line arguments to an argument parser. """
     arg_parse.add_argument("--start_year", "-s", required=True, type=int, help="Starting season of data to download (Example: 2018 will download 20172018).")
     arg_parse.add_argument("--end_year", "-e", required=True, type=int, help="End season of data to download (Example: 2026 will download 20252026).")
     arg_parse.add_argument("--league_id", "-l", required=False, default=DEFAULT_LEAGUE_ID, type=int, help="League ID.")
     arg_parse.add_argument("--output_path", "-o", required=False, default=DEFAULT_DOWNLOADS_DIR,
                                                   type=str, help="Output path of where downloaded data will go. Defaults to a folder within script directory.")
     arg_parse.add_argument("--espn_s2", required=False, type=str, help="espn_s2 string used for a cookie for ESPN fantasy API requests.")
-    args = arg_parse.parse_args()
+    arg_parse.add_argument("--poll_realtime_stats", required=False, action="store_true",
+                                                    help="Only poll realtime stats of the end year season until interrupted (or --max_polls is reached).")
+    arg_parse.add_argument("--poll_interval", required=False, default=60, type=float, help="Seconds between realtime stats polls.")
+    arg_parse.add_argument("--max_polls", required=False, default=None, type=int, help="Maximum number of realtime stats polls.")
+    arg_parse.add_argument("--all_players_info_page_size", required=False, default=None, type=int,
+                                                           help="Download all players info in pages of this many players instead of a single request.")
+    arg_parse.add_argument("--athletes_batch_size", required=False, default=DEFAULT_BATCH_SIZE, type=int, help="Number of athletes to download per batch.")
+    arg_parse.add_argument("--athletes_max_age_days", required=False, default=None, type=float,
+                                                      help="Download athletes data again if older than this many days. Defaults to never.")
+    instrumentation.add_arguments(arg_parse)
+
+def main(args):
+    """ Downloads data of all seasons given by the parsed command line arguments. """
+    start_time = timeit.default_timer()
+
+    instrumentation.start_run("espn_fantasy_api_downloader", profile=args.profile)
 
     league_id = args.league_id
     start_year = args.start_year
@@ -203,28 +407,35 @@ if __name__ == "__main__":
     output_path = args.output_path
     espn_s2 = args.espn_s2
 
+    # Poll mode only tracks realtime stats of the latest season
+    if args.poll_realtime_stats:
+        espn_fantasy_api = EspnFantasyApiDownloader(end_year, league_id, root_output_folder=output_path, cookies={'espn_s2': espn_s2})
+        espn_fantasy_api.poll_realtime_stats(interval=args.poll_interval, max_polls=args.max_polls)
+        instrumentation.finish_run(args.report_path)
+        print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
+        return
+
     # Download various data for all given seasons
     for season in range(start_year, end_year + 1):
-        espn_fantasy_api = EspnFantasyApiDownloader(season, league_id, root_output_folder=output_path, cookies={'espn_s2': espn_s2})
-        espn_fantasy_api.download_league_info()
-        espn_fantasy_api.download_draft_details()
-        espn_fantasy_api.download_scoring_periods()
-        espn_fantasy_api.download_all_players_info()
-
-    # Download athlete data for draft and all players across all seasons
+        with instrumentation.Timer(f"download_season.{season}"):
+            espn_fantasy_api = EspnFantasyApiDownloader(season, league_id, root_output_folder=output_path, cookies={'espn_s2': espn_s2})
+            espn_fantasy_api.download_league_info()
+            espn_fantasy_api.download_draft_details()
+            espn_fantasy_api.download_scoring_periods()
+            espn_fantasy_api.download_all_players_info(page_size=args.all_players_info_page_size)
+
+    # Sync athlete data for draft and all players across all seasons
     # Ensure draft and all players info data is downloaded first
     espn_api = EspnApiDownloader(root_output_folder=output_path, cookies={'espn_s2': espn_s2})
-    all_players_info_df = EspnFantasyApiDownloadsParser(output_path).get_all_players_info_df()
-    draft_details_df = EspnFantasyApiDownloadsParser(output_path).get_draft_details_df()
-
-    # Filter to reduce amount of player data to download
-    all_players_info_df = _filter_all_players_info_df(all_players_info_df, start_year, end_year)
-    draft_details_df = _filter_draft_details_df(draft_details_df, start_year, end_year)
+    athletes_sync = EspnFantasyApiAthletesSync(espn_api, batch_size=args.athletes_batch_size, max_age_days=args.athletes_max_age_days)
+    with instrumentation.Timer("download_athletes"):
+        espn_api.ingest_athletes_folder()
+        athletes_sync.sync(lambda: get_needed_player_ids(EspnFantasyApiLoader(output_path), start_year, end_year))
 
-    # Convert IDs to ints because this column can be floats
-    all_players_info_df['Player ID'] = all_players_info_df['Player ID'].astype(int)
-    draft_details_df['Player ID'] = draft_details_df['Player ID'].astype(int)
-    player_id_list = set(list(all_players_info_df['Player ID']) + list(draft_details_df['Player ID']))
-    espn_api.download_athletes_data(player_id_list)
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
 
-    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
+if __name__ == "__main__":
+    arg_parse = argparse.ArgumentParser()
+    add_arguments(arg_parse)
+    main(arg_parse.parse_args())
\ No newline at end of file
@@ -17,18 +17,67 @@
       -> 20252026_league_info.json
       ...
 
+    Daily rosters of a season can optionally be saved to a memory-mapped store
+    in the season folder (XXXXYYYY_daily_rosters_store). See espn_fantasy_api_roster_store.py.
+
+    Daily rosters have an 'active' column that is False for players in a bench or
+    injured reserve lineup slot (see get_lineup_slots_df()). Totals of each owner,
+    scoring period and active flag are saved alongside the store
+    (XXXXYYYY_daily_rosters_totals.csv) so most consumers don't need the full rosters.
+
+    Dataframes of all seasons can be limited to a range of seasons and columns so
+    only the seasons needed are parsed. Lazy versions (get_*_lazy_df()) parse each
+    season on first use and keep it for later calls (see espn_fantasy_api_lazy_seasons_df.py).
 """
 from espn_fantasy_api_scripts.espn_fantasy_api_all_players_info_parser import EspnFantasyApiAllPlayersInfoParser
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_store import EspnFantasyApiAthletesStore
 from espn_fantasy_api_scripts.espn_fantasy_api_draft_details_parser import EspnFantasyApiDraftDetailsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_lazy_seasons_df import EspnFantasyApiLazySeasonsDf, filter_seasons, project_columns
 from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_roster_store import EspnFantasyApiRosterStore, STORE_VERSION
 from espn_fantasy_api_scripts.espn_fantasy_api_scoring_period_parser import EspnFantasyApiScoringPeriodParser
-import json
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import INACTIVE_LINEUP_SLOT_IDS, LINEUP_SLOTS_MAP, STATS_MAP
 import multiprocessing
+import numpy as np
 import os
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Columns that daily rosters totals are grouped by
+DAILY_ROSTERS_TOTALS_GROUP_COLUMNS = ['season', 'owner', 'scoringPeriodId', 'active']
+
+# Columns of daily rosters that are not summed in totals
+DAILY_ROSTERS_PLAYER_COLUMNS = ['fullName', 'id', 'lineupSlotId']
+
+def get_daily_rosters_totals_columns(daily_rosters_columns):
+    """ Returns list of columns of daily rosters totals from list of daily rosters columns. """
+    return (DAILY_ROSTERS_TOTALS_GROUP_COLUMNS + ['numPlayers']
+            + [c for c in daily_rosters_columns if c not in DAILY_ROSTERS_TOTALS_GROUP_COLUMNS and c not in DAILY_ROSTERS_PLAYER_COLUMNS])
+
+def get_daily_rosters_totals_df(daily_rosters_df):
+    """ Returns dataframe of daily rosters summed for each season, owner, scoring period
+        and active flag. Has the same stat columns as the daily rosters dataframe. """
+    if daily_rosters_df.empty:
+        return pd.DataFrame(columns=DAILY_ROSTERS_TOTALS_GROUP_COLUMNS)
+
+    value_columns = get_daily_rosters_totals_columns(daily_rosters_df.columns)[len(DAILY_ROSTERS_TOTALS_GROUP_COLUMNS) + 1:]
+    df = daily_rosters_df.groupby(DAILY_ROSTERS_TOTALS_GROUP_COLUMNS, sort=True)[value_columns].sum()
+    df.insert(0, 'numPlayers', daily_rosters_df.groupby(DAILY_ROSTERS_TOTALS_GROUP_COLUMNS, sort=True).size())
+    return df.reset_index()
+
+def get_last_contiguous_scoring_period(scoring_periods, first_scoring_period, last_scoring_period):
+    """ Returns the last scoring period from the first up to the last scoring period
+        (inclusive) where every scoring period from the first one is in the given
+        scoring periods (Example: scoringPeriodId of parsed daily rosters). Returns
+        first_scoring_period - 1 if the first scoring period is missing. """
+    scoring_periods = set(np.unique(scoring_periods).tolist())
+    scoring_period = first_scoring_period - 1
+    while scoring_period < last_scoring_period and scoring_period + 1 in scoring_periods:
+        scoring_period += 1
+    return scoring_period
+
 class EspnFantasyApiDownloadsParser():
     def __init__(self, espn_fantasy_api_downloads_root_folder):
         """ Default constructor. """
@@ -36,55 +85,97 @@ class EspnFantasyApiDownloadsParser():
         self._loader = EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder)
         self._seasons = self._loader.get_seasons()
 
-    def get_seasons(self):
-        """ Returns number of seasons of data available in ESPN fantasy API downloads folder. """
-        return self._seasons
-
-    def get_draft_details_df(self):
-        """ Returns a dataframe of draft details for all seasons. """
-        combined_df = pd.DataFrame()
-        for season_string in self._seasons:
-            draft_details_dict = self._loader.get_draft_details_dict(season_string)
-            if draft_details_dict is not None:
-                draft_details_parser = EspnFantasyApiDraftDetailsParser(draft_details_dict)
-                df = draft_details_parser.get_draft_details_as_df()
-                df['Season'] = int(season_string)
-                combined_df = pd.concat([combined_df, df])
-
-        return combined_df
-
-    def get_all_players_info_df(self):
-        """ Returns a dataframe of all players info for all seasons. """
-        combined_df = pd.DataFrame()
-        for season_string in self._seasons:
-            all_players_info_dict = self._loader.get_all_players_info_dict(season_string)
-            if all_players_info_dict is not None:
-                all_players_info_parser = EspnFantasyApiAllPlayersInfoParser(season_string, all_players_info_dict)
-                df = all_players_info_parser.get_all_players_info_as_df()
-                df['Season'] = int(season_string)
-                combined_df = pd.concat([combined_df, df])
-
-        return combined_df
-
-    def get_daily_rosters_df(self, progress_func_handlers=None, multiprocess=True):
+    def get_seasons(self, start_season=None, end_season=None):
+        """ Returns list of seasons of data available in ESPN fantasy API downloads folder.
+            Optionally only seasons within the start and end seasons (inclusive). """
+        return filter_seasons(self._seasons, start_season, end_season)
+
+    @instrumentation.Timer("downloads_parser.get_draft_details_df")
+    def get_draft_details_df(self, start_season=None, end_season=None, columns=None):
+        """ Returns a dataframe of draft details for all seasons. Optionally only
+            seasons within the start and end seasons (inclusive) and the given columns
+            (only those are parsed, see get_draft_details_df_by_season()). """
+        if columns is None:
+            return self.get_draft_details_lazy_df().filter(start_season, end_season).get_df()
+        dfs = [self.get_draft_details_df_by_season(season_string, columns) for season_string in self.get_seasons(start_season, end_season)]
+        return pd.concat(dfs) if dfs else pd.DataFrame()
+
+    def get_draft_details_lazy_df(self):
+        """ Returns a lazy collection of draft details of each season. """
+        return EspnFantasyApiLazySeasonsDf(self._seasons, self.get_draft_details_df_by_season)
+
+    def get_draft_details_df_by_season(self, season_string, columns=None):
+        """ Returns a dataframe of draft details for a given season. Optionally only
+            the given columns, in the given order. """
+        draft_details_dict = self._loader.get_draft_details_dict(season_string)
+        if draft_details_dict is None:
+            return pd.DataFrame()
+
+        df = EspnFantasyApiDraftDetailsParser(draft_details_dict).get_draft_details_as_df(columns)
+        df['Season'] = int(season_string)
+        return project_columns(df, columns)
+
+    @instrumentation.Timer("downloads_parser.get_all_players_info_df")
+    def get_all_players_info_df(self, start_season=None, end_season=None, columns=None):
+        """ Returns a dataframe of all players info for all seasons. Optionally only
+            seasons within the start and end seasons (inclusive) and the given columns
+            (only those are parsed, see get_all_players_info_df_by_season()). """
+        if columns is None:
+            return self.get_all_players_info_lazy_df().filter(start_season, end_season).get_df()
+        dfs = [self.get_all_players_info_df_by_season(season_string, columns) for season_string in self.get_seasons(start_season, end_season)]
+        return pd.concat(dfs) if dfs else pd.DataFrame()
+
+    def get_all_players_info_lazy_df(self):
+        """ Returns a lazy collection of all players info of each season. """
+        return EspnFantasyApiLazySeasonsDf(self._seasons, self.get_all_players_info_df_by_season)
+
+    def get_all_players_info_df_by_season(self, season_string, columns=None):
+        """ Returns a dataframe of all players info for a given season. If downloaded
+            in pages, each page is parsed on its own so only one page is loaded at a time.
+            Optionally only the given columns are kept of each page, in the given order. """
+        dfs = [EspnFantasyApiAllPlayersInfoParser(season_string, page_dict).get_all_players_info_as_df(columns)
+               for page_dict in self._loader.iter_all_players_info_dicts(season_string)]
+        if not dfs:
+            return pd.DataFrame()
+
+        df = pd.concat(dfs, ignore_index=True)
+        df['Season'] = int(season_string)
+        return project_columns(df, columns)
+
+    def get_daily_rosters_lazy_df(self, use_store=False):
+        """ Returns a lazy collection of daily rosters of each season.
+            See get_daily_rosters_df_by_season(). """
+        return EspnFantasyApiLazySeasonsDf(self._seasons, lambda season_string: self.get_daily_rosters_df_by_season(season_string, None, use_store))
+
+    @instrumentation.Timer("downloads_parser.get_daily_rosters_df")
+    def get_daily_rosters_df(self, progress_func_handlers=None, multiprocess=True, use_store=False, start_season=None, end_season=None, columns=None,
+                             raw_stats=False):
         """ Returns a dataframe of all daily rosters for all seasons.
             Provides function handler callbacks for caller to check
             progress. progress_func_handlers must be a dict of handlers
             where each key corresponds to the season being processed
-            (use get_seasons() to check available seasons). """
+            (use get_seasons() to check available seasons). If use_store
+            or raw_stats is True, see get_daily_rosters_df_by_season().
+            Optionally only seasons within the start and end seasons
+            (inclusive) and the given columns. """
         combined_roster_dfs = pd.DataFrame()
+        seasons = self.get_seasons(start_season, end_season)
+        progress_func_handlers = progress_func_handlers or {}
+        if not seasons:
+            return combined_roster_dfs
 
         if not multiprocess:
             # Loop through each available season's worth of data
-            for season_string in self._seasons:
-                df = self.get_daily_rosters_df_by_season(season_string, progress_func_handlers[season_string])
+            for season_string in seasons:
+                df = self.get_daily_rosters_df_by_season(season_string, progress_func_handlers.get(season_string), use_store, columns=columns, raw_stats=raw_stats)
                 combined_roster_dfs = pd.concat([combined_roster_dfs, df])
         else:
             # Use multiprocessing to process each available season's data
-            pool = multiprocessing.Pool(processes=len(self._seasons))
+            pool = multiprocessing.Pool(processes=len(seasons))
             results = []
-            for season_string in self._seasons:
-                async_result = pool.apply_async(func=self.get_daily_rosters_df_by_season, args=(season_string, progress_func_handlers[season_string]))
+            for season_string in seasons:
+                async_result = pool.apply_async(func=self.get_daily_rosters_df_by_season, args=(season_string, progress_func_handlers.get(season_string), use_store),
+                                                kwds={'columns': columns, 'raw_stats': raw_stats})
                 results.append(async_result)
 
             pool.close()
@@ -94,9 +185,32 @@ class EspnFantasyApiDownloadsParser():
 
         return combined_roster_dfs
 
-    def get_daily_rosters_df_by_season(self, season_string, progress_func_handler):
+    def get_daily_rosters_df_by_season(self, season_string, progress_func_handler, use_store=False, first_scoring_period=None, columns=None,
+                                       raw_stats=False):
         """ Returns a dataframe of all daily rosters for a given season.
-            Provides a function handler for caller to check progress. """
+            Provides a function handler for caller to check progress.
+            If use_store is True, data is loaded from the season's daily
+            rosters store if it is up-to-date. Otherwise, data is parsed
+            and saved to the store for next time. If first_scoring_period
+            is given, only scoring periods from it onwards are parsed
+            (the store is not used). If raw_stats is True, raw stat counts
+            are added as raw_<stat> columns (Example: 'raw_HIT') for
+            EspnFantasyApiScoringEngine (the store is not used). If columns
+            are given, only those columns are kept (and only those are read
+            from the store). """
+        if use_store and first_scoring_period is None and not raw_stats:
+            df = self.load_daily_rosters_store_df(season_string, columns)
+            if df is not None:
+                return df
+
+            df = self.get_daily_rosters_df_by_season(season_string, progress_func_handler)
+            self.save_daily_rosters_store(season_string, df)
+            return project_columns(df, columns)
+
+        if columns is not None:
+            return project_columns(self.get_daily_rosters_df_by_season(season_string, progress_func_handler, first_scoring_period=first_scoring_period,
+                                                                       raw_stats=raw_stats), columns)
+
         combined_roster_dfs = pd.DataFrame()
 
         # Get owner ID mappings
@@ -108,27 +222,14 @@ class EspnFantasyApiDownloadsParser():
             return combined_roster_dfs
 
         # Get scoring period start and ends
-        scoring_period_start = league_info_dict['status']['firstScoringPeriod']
+        scoring_period_start = max(league_info_dict['status']['firstScoringPeriod'], first_scoring_period or 0)
         scoring_period_end = min(league_info_dict['status']['latestScoringPeriod'], league_info_dict['status']['finalScoringPeriod'])
+        inactive_lineup_slot_ids = self._get_inactive_lineup_slot_ids(season_string)
 
-        # Store roster data for each scoring period and owner
+        # Store roster data for each scoring period
         for scoring_period in range(scoring_period_start, scoring_period_end + 1):
-            for owner_id in owner_id_map:
-                # Parse roster dataframe from scoring period data
-                scoring_period_dict = self._loader.get_scoring_period_dict(season_string, scoring_period)
-                if scoring_period_dict is None:
-                    continue
-
-                scoring_period_parser = EspnFantasyApiScoringPeriodParser(scoring_period_dict)
-                roster_df = scoring_period_parser.get_owner_roster_applied_stats_as_df(owner_id)
-
-                # Add some more metadata to roster dataframe
-                roster_df['scoringPeriodId'] = scoring_period
-                roster_df['owner'] = owner_id_map[owner_id]
-                roster_df['season'] = season_string
-
-                # Combine to overall dataframe
-                combined_roster_dfs = pd.concat([combined_roster_dfs, roster_df])
+            roster_df = self._get_scoring_period_rosters_df(season_string, scoring_period, owner_id_map, inactive_lineup_slot_ids, raw_stats)
+            combined_roster_dfs = pd.concat([combined_roster_dfs, roster_df])
 
             # Provide information for progress processing
             if progress_func_handler is not None:
@@ -136,26 +237,203 @@ class EspnFantasyApiDownloadsParser():
 
         return combined_roster_dfs
 
-    def get_athletes_df(self):
-        """ Returns a datarame of all downloaded athletes data. """
-        athlete_dicts = []
-        folder_path = os.path.join(self._root_folder, "athletes")
-        for f in os.listdir(folder_path):
-            file_path = os.path.join(folder_path, f)
-            if not os.path.isfile(file_path):
+    def iter_daily_rosters_dfs(self, start_season=None, end_season=None, use_store=False, columns=None):
+        """ Generator of daily rosters dataframes of one scoring period at a time, in
+            order of season and scoring period. Only one scoring period is parsed at
+            a time, so memory does not grow with the number of seasons. If use_store
+            is True, seasons with an up-to-date store are read from it instead of
+            parsed (the store is not saved). A season read from the store is loaded
+            as a whole (numeric columns are memory-mapped) and each scoring period
+            is sliced from it by the stored scoringPeriodId array. Optionally only
+            seasons within the start and end seasons (inclusive) and the given columns. """
+        # scoringPeriodId is always read from the store to split it into scoring periods
+        store_columns = None if columns is None else list(dict.fromkeys(['scoringPeriodId'] + list(columns)))
+        for season_string in sorted(self.get_seasons(start_season, end_season), key=int):
+            df = self.load_daily_rosters_store_df(season_string, store_columns) if use_store else None
+            if df is not None:
+                scoring_periods = df['scoringPeriodId'].to_numpy()
+                order = np.argsort(scoring_periods, kind='stable')
+                boundaries = np.flatnonzero(np.diff(scoring_periods[order])) + 1
+                for rows in np.split(order, boundaries) if len(order) else []:
+                    yield project_columns(df.iloc[rows], columns)
                 continue
 
-            athlete_dict = json.load(open(file_path, 'r')).get('athlete', {})
-            if not athlete_dict:
+            league_info_dict = self._loader.get_league_info_dict(season_string)
+            if league_info_dict is None:
                 continue
 
-            athlete_dicts.append({'Player ID': float(athlete_dict.get('id')), # Cast to float in case there is "nan"
-                                  'Player Name': athlete_dict.get('fullName'),
-                                  'Player Birth Place': athlete_dict.get('displayBirthPlace'),
-                                  'Player Height': athlete_dict.get('displayHeight'),
-                                  'Player Weight': athlete_dict.get('displayWeight'),
-                                  'Player DOB': athlete_dict.get('displayDOB')})
+            owner_id_map = self._loader.get_members_id_map(season_string)
+            inactive_lineup_slot_ids = self._get_inactive_lineup_slot_ids(season_string)
+            scoring_period_start = league_info_dict['status']['firstScoringPeriod']
+            scoring_period_end = self._get_latest_scoring_period(season_string)
+            for scoring_period in range(scoring_period_start, scoring_period_end + 1):
+                roster_df = self._get_scoring_period_rosters_df(season_string, scoring_period, owner_id_map, inactive_lineup_slot_ids)
+                if not roster_df.empty:
+                    yield project_columns(roster_df, columns)
+
+    def get_daily_rosters_columns(self, start_season=None, end_season=None):
+        """ Returns list of all columns of daily rosters of the seasons within the
+            start and end seasons (inclusive), without parsing any scoring periods.
+            Stat columns are the stats scored in any of the seasons. """
+        stat_ids = set()
+        for season_string in self.get_seasons(start_season, end_season):
+            stat_ids.update(self._loader.get_applied_stats_map(season_string) or {})
+
+        return (['fullName', 'id', 'lineupSlotId', 'active'] + [STATS_MAP[stat_id] for stat_id in STATS_MAP if stat_id in stat_ids]
+                + ['appliedTotal', 'GP', 'scoringPeriodId', 'owner', 'season'])
+
+    def _get_scoring_period_rosters_df(self, season_string, scoring_period, owner_id_map, inactive_lineup_slot_ids, raw_stats=False):
+        """ Returns a dataframe of rosters of all owners for a given scoring period,
+            with raw stat counts if raw_stats is True. Returns an empty dataframe
+            if the scoring period is not downloaded. """
+        scoring_period_dict = self._loader.get_scoring_period_dict(season_string, scoring_period)
+        if scoring_period_dict is None:
+            return pd.DataFrame()
+
+        roster_dfs = []
+        scoring_period_parser = EspnFantasyApiScoringPeriodParser(scoring_period_dict)
+        for owner_id in owner_id_map:
+            # Parse roster dataframe from scoring period data
+            roster_df = scoring_period_parser.get_owner_roster_applied_stats_as_df(owner_id, raw_stats)
+
+            # Add some more metadata to roster dataframe
+            roster_df['scoringPeriodId'] = scoring_period
+            roster_df['owner'] = owner_id_map[owner_id]
+            roster_df['season'] = season_string
+            roster_dfs.append(roster_df)
+
+        roster_df = pd.concat(roster_dfs) if roster_dfs else pd.DataFrame()
+
+        # Flag players in active lineup slots
+        if 'lineupSlotId' in roster_df:
+            roster_df.insert(roster_df.columns.get_loc('lineupSlotId') + 1, 'active', ~roster_df['lineupSlotId'].isin(inactive_lineup_slot_ids))
+        return roster_df
+
+    def _get_inactive_lineup_slot_ids(self, season_string):
+        """ Returns list of lineup slot IDs that are not active for a given season. """
+        lineup_slots_df = self.get_lineup_slots_df(season_string)
+        return lineup_slots_df.loc[~lineup_slots_df['active'], 'lineupSlotId'].tolist()
+
+    def get_lineup_slots_df(self, season_string):
+        """ Returns a dataframe of lineup slots of a given season with the number of
+            roster spots of each slot from the league settings. Has the columns:
+            lineupSlotId, lineupSlot, count, active
+            Bench and injured reserve slots are not active. Returns an empty
+            dataframe if the season has no league info. """
+        lineup_slot_counts_map = self._loader.get_lineup_slot_counts_map(season_string)
+        if lineup_slot_counts_map is None:
+            return pd.DataFrame(columns=['lineupSlotId', 'lineupSlot', 'count', 'active'])
+
+        lineup_slot_ids = sorted(set(LINEUP_SLOTS_MAP) | set(lineup_slot_counts_map))
+        return pd.DataFrame({'lineupSlotId': lineup_slot_ids,
+                             'lineupSlot': [LINEUP_SLOTS_MAP.get(id, str(id)) for id in lineup_slot_ids],
+                             'count': [lineup_slot_counts_map.get(id, 0) for id in lineup_slot_ids],
+                             'active': [id not in INACTIVE_LINEUP_SLOT_IDS for id in lineup_slot_ids]})
+
+    @instrumentation.Timer("downloads_parser.get_daily_rosters_totals_df")
+    def get_daily_rosters_totals_df(self, use_store=False):
+        """ Returns a dataframe of daily rosters totals for all seasons.
+            See get_daily_rosters_totals_df_by_season(). """
+        dfs = [self.get_daily_rosters_totals_df_by_season(season_string, use_store) for season_string in self._seasons]
+        return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+
+    def get_daily_rosters_totals_df_by_season(self, season_string, use_store=False):
+        """ Returns a dataframe of daily rosters of a given season summed for each
+            owner, scoring period and active flag. If use_store is True, totals are
+            loaded from the season's totals file if it is up-to-date. Otherwise,
+            daily rosters are parsed and saved to the store and totals file. """
+        if use_store:
+            df = self.load_daily_rosters_totals_df(season_string)
+            if df is not None:
+                return df
+
+        return get_daily_rosters_totals_df(self.get_daily_rosters_df_by_season(season_string, None, use_store))
+
+    def get_daily_rosters_store(self, season_string):
+        """ Returns the daily rosters store of a given season. """
+        return EspnFantasyApiRosterStore(os.path.join(self._root_folder, season_string, f"{season_string}_daily_rosters_store"))
+
+    def save_daily_rosters_store(self, season_string, df=None):
+        """ Saves daily rosters of a given season to the season's store. Parses
+            the daily rosters if no dataframe is given. Returns True if saved. """
+        if df is None:
+            df = self.get_daily_rosters_df_by_season(season_string, None)
+
+        latest_scoring_period = self._get_latest_scoring_period(season_string)
+        if df.empty or latest_scoring_period is None:
+            return False
+
+        if not self.get_daily_rosters_store(season_string).save(df, {'latestScoringPeriod': latest_scoring_period}):
+            return False
+
+        # Totals are written after the store, with the latest scoring period to check if out-of-date
+        totals_df = get_daily_rosters_totals_df(df)
+        totals_df.insert(0, 'latestScoringPeriod', latest_scoring_period)
+        temp_path = f"{self._get_daily_rosters_totals_path(season_string)}.tmp"
+        totals_df.to_csv(temp_path, index=False)
+        os.replace(temp_path, self._get_daily_rosters_totals_path(season_string))
+        return True
+
+    def load_daily_rosters_store_df(self, season_string, columns=None):
+        """ Returns a dataframe of daily rosters of a given season from the season's
+            store. Numeric columns are memory-mapped views of the store. Optionally
+            only the given columns. Returns None if the store does not exist or is
+            out-of-date with the downloaded data. """
+        store = self.get_daily_rosters_store(season_string)
+        metadata = store.get_metadata()
+        if metadata is None or metadata.get('version') != STORE_VERSION or metadata.get('latestScoringPeriod') != self._get_latest_scoring_period(season_string):
+            return None
+
+        return store.get_df(columns)
+
+    def load_daily_rosters_totals_df(self, season_string):
+        """ Returns a dataframe of daily rosters totals of a given season from the
+            season's totals file. Returns None if the file does not exist or is
+            out-of-date with the downloaded data. """
+        try:
+            df = pd.read_csv(self._get_daily_rosters_totals_path(season_string), dtype={'season': str, 'owner': str})
+        except FileNotFoundError:
+            return None
+
+        if df.empty or df['latestScoringPeriod'].iloc[0] != self._get_latest_scoring_period(season_string):
+            return None
+
+        instrumentation.increment("rows_produced.daily_rosters_totals", len(df))
+        return df.drop(columns=['latestScoringPeriod'])
+
+    def _get_daily_rosters_totals_path(self, season_string):
+        """ Returns path of the daily rosters totals file of a season. """
+        return os.path.join(self._root_folder, season_string, f"{season_string}_daily_rosters_totals.csv")
+
+    def _get_latest_scoring_period(self, season_string):
+        """ Returns the last scoring period of daily rosters data for a given season.
+            Used to check if a store is out-of-date. Returns None if not available. """
+        league_info_dict = self._loader.get_league_info_dict(season_string)
+        if league_info_dict is None:
+            return None
 
+        return min(league_info_dict['status']['latestScoringPeriod'], league_info_dict['status']['finalScoringPeriod'])
+
+    @instrumentation.Timer("downloads_parser.get_athletes_df")
+    def get_athletes_df(self, ingest_folder=False):
+        """ Returns a datarame of all downloaded athletes data. Reads from the
+            consolidated athletes store. Downloaded athletes files that are not in
+            the store yet (Example: downloaded before the store existed) are only
+            added to the store first if ingest_folder is True. """
+        store = EspnFantasyApiAthletesStore(self._root_folder)
+        if ingest_folder:
+            store.ingest_folder(os.path.join(self._root_folder, "athletes"))
+
+        athlete_dicts = []
+        for record in store.get_records():
+            athlete_dicts.append({'Player ID': float(record.get('id')), # Cast to float in case there is "nan"
+                                  'Player Name': record.get('fullName'),
+                                  'Player Birth Place': record.get('displayBirthPlace'),
+                                  'Player Height': record.get('displayHeight'),
+                                  'Player Weight': record.get('displayWeight'),
+                                  'Player DOB': record.get('displayDOB')})
+
+        instrumentation.increment("rows_produced.athletes", len(athlete_dicts))
         return pd.DataFrame(athlete_dicts)
 
 if __name__ == "__main__":
@@ -171,7 +449,7 @@ if __name__ == "__main__":
     print("Done.")
 
     print("Processing athletes data...")
-    espn_fantasy_api_downloads_parser.get_athletes_df().to_csv("athletes.csv", index=False)
+    espn_fantasy_api_downloads_parser.get_athletes_df(ingest_folder=True).to_csv("athletes.csv", index=False)
     print("Done.")
 
     print("Processing daily rosters...")
@@ -1,16 +1,16 @@
 #!/usr/bin/env python
 """ Loads dictionary that's from the json that contains draft details. """
 from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
-from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 class EspnFantasyApiDraftDetailsParser():
     def __init__(self, draft_details_dict):
         """ Constructor. Takes in already-loaded dictionary from draft details JSON file """
         self._data_dict = draft_details_dict
 
-    def get_draft_details_as_dicts(self):
-        """ Return draft details as a list of dictionaries """
+    def get_draft_details_as_dicts(self, columns=None):
+        """ Return draft details as a list of dictionaries. Optionally only the given columns """
         draft_details_dict = []
         for picks in self._data_dict['draftDetail']['picks']:
             draft_details_dict.append({
@@ -21,8 +21,12 @@ class EspnFantasyApiDraftDetailsParser():
                 'Player ID': picks['playerId'],
             })
 
+        if columns is not None:
+            draft_details_dict = [{key: val for key, val in d.items() if key in columns} for d in draft_details_dict]
         return draft_details_dict
 
-    def get_draft_details_as_df(self):
-        """ Return draft details as a dataframe """
-        return pd.DataFrame(self.get_draft_details_as_dicts())
\ No newline at end of file
+    def get_draft_details_as_df(self, columns=None):
+        """ Return draft details as a dataframe. Optionally only the given columns """
+        df = pd.DataFrame(self.get_draft_details_as_dicts(columns))
+        instrumentation.increment("rows_produced.draft_details", len(df))
+        return df
\ No newline at end of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+""" Lazy collection of per-season dataframes.
+
+    Seasons are only loaded when a caller asks for them, and each season is
+    loaded at most once. Filtering to a range of seasons returns a new lazy
+    collection that shares already loaded seasons, so filtering before
+    materializing only costs the I/O of the seasons kept.
+
+    Example: Only 2 seasons of all players info are parsed
+        lazy_df = EspnFantasyApiDownloadsParser(root_folder).get_all_players_info_lazy_df()
+        df = lazy_df.filter(start_season="20232024", end_season="20242025").get_df(columns=['Player ID', 'Player Name'])
+"""
+import pandas as pd
+import utils.instrumentation as instrumentation
+
+def filter_seasons(season_strings, start_season=None, end_season=None):
+    """ Returns list of season strings within the start and end seasons (inclusive).
+        Seasons can be given as strings or integers (Example: "20242025" or 20242025). """
+    return [s for s in season_strings
+            if (start_season is None or int(s) >= int(start_season)) and (end_season is None or int(s) <= int(end_season))]
+
+def project_columns(df, columns=None):
+    """ Returns dataframe with only the given columns, skipping any not in the dataframe. """
+    if columns is None:
+        return df
+    return df[[c for c in columns if c in df]]
+
+class EspnFantasyApiLazySeasonsDf():
+    def __init__(self, season_strings, load_season_df_func, cache=None):
+        """ Constructor. Takes in list of season strings and a function that takes
+            in a season string and returns the season's dataframe. """
+        self._season_strings = list(season_strings)
+        self._load_season_df_func = load_season_df_func
+        self._cache = cache if cache is not None else {}
+
+    def get_seasons(self):
+        """ Returns list of season strings in the collection. """
+        return list(self._season_strings)
+
+    def is_loaded(self, season_string):
+        """ Returns True if the season's dataframe is already loaded. """
+        return season_string in self._cache
+
+    def filter(self, start_season=None, end_season=None):
+        """ Returns a lazy collection of only seasons within the start and end seasons
+            (inclusive). Seasons loaded by either collection are shared. """
+        return EspnFantasyApiLazySeasonsDf(filter_seasons(self._season_strings, start_season, end_season),
+                                           self._load_season_df_func, self._cache)
+
+    def get_season_df(self, season_string, columns=None):
+        """ Returns dataframe of a single season, loading it on first use.
+            Returns None if season is not in the collection. """
+        if season_string not in self._season_strings:
+            print(f"Season {season_string} not in {self._season_strings}.")
+            return None
+
+        if season_string in self._cache:
+            instrumentation.increment("lazy_seasons_df.cache_hits")
+        else:
+            self._cache[season_string] = self._load_season_df_func(season_string)
+            instrumentation.increment("lazy_seasons_df.seasons_loaded")
+
+        return project_columns(self._cache[season_string], columns)
+
+    def get_df(self, columns=None):
+        """ Returns dataframe of all seasons in the collection combined, loading any
+            seasons not loaded yet. Optionally only keeps the given columns. """
+        dfs = [self.get_season_df(season_string, columns) for season_string in self._season_strings]
+        return pd.concat(dfs) if dfs else pd.DataFrame()
\ No newline at end of file
@@ -1,8 +1,15 @@
 #!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_archive import EspnFantasyApiArchive, get_archive_path
 from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
 import json
 import os
 import re
+from utils.file_catalog import get_catalog
+import utils.instrumentation as instrumentation
+import utils.json_delta as json_delta
+
+# Folder of a season with all players info downloaded in pages
+ALL_PLAYERS_INFO_FOLDER = "all_players_info"
 
 class EspnFantasyApiLoader():
     """ Holds a reference to the root ESPN fantasy API data folder and provides APIs
@@ -16,6 +23,10 @@ class EspnFantasyApiLoader():
               -> 20192020_scoring_period2.json
               -> ...
             - realtime_stats
+            - all_players_info (if downloaded in pages)
+              -> 20192020_all_players_info_page0.json
+              -> 20192020_all_players_info_page1.json
+              -> ...
             - ...
           20202021
             - league_info.json
@@ -25,31 +36,24 @@ class EspnFantasyApiLoader():
               -> ...
             - realtime_stats
             - ...
+
+    Files that are not found on disk are read from the season's archive
+    (XXXXYYYY_archive.zip) if one exists. See espn_fantasy_api_archive.py.
+
+    Seasons and files on disk are looked up in the catalog of the root data
+    folder (see utils/file_catalog.py), which is refreshed when the loader is
+    created. Files added after that are not seen by the loader.
     """
     def __init__(self, root_folder_path):
         """ Constructor. Takes in path to root data folder. """
         self._root_folder_path = root_folder_path
+        self._catalog = get_catalog(root_folder_path)
+        self._archives = {}
 
     def get_seasons(self):
-        """ Returns a list of season folders from the root.
+        """ Returns a sorted list of season folders from the root.
             Folder must be in the form XXXXYYYY. """
-        # Regex pattern to find a season string
-        #   - ^ used to denote start of string searching
-        #   - $ used to denote end of string searching
-        #   - + used to denote any repeating numbers between [0-9]
-        # Examples:
-        #  - "20192020" (ok)
-        #  - "aaa20192020" (no)
-        #  - "20192020aaa" (no)
-        season_string_re_pattern = "^[0-9]+$"
-
-        ret_list = []
-        for item in os.listdir(self._root_folder_path):
-            item_path = os.path.join(self._root_folder_path, item)
-            if os.path.isdir(item_path) and re.match(season_string_re_pattern, item):
-                ret_list.append(item)
-
-        return ret_list
+        return self._catalog.get_seasons()
 
     def get_members_id_map(self, season_string):
         """ Returns a dictionary mapping of IDs to members for given season.
@@ -60,6 +64,21 @@ class EspnFantasyApiLoader():
 
         return {m['id']: f"{m['firstName']} {m['lastName']}" for m in league_info_dict['members']}
 
+    def get_team_names_map(self, season_string):
+        """ Returns a dictionary mapping of owner IDs to team names for given season.
+            Dictionary has the form: {'<id1>': <team name>, '<id2>': <team name> .. } """
+        league_info_dict = self._load_json(season_string, f"{season_string}_league_info.json")
+        if league_info_dict is None:
+            return None
+
+        # Older seasons have a team location and nickname instead of a name
+        team_names_map = {}
+        for team in league_info_dict.get('teams', []):
+            team_name = team.get('name', f"{team.get('location', '')} {team.get('nickname', '')}".strip())
+            for owner_id in team.get('owners', []):
+                team_names_map[owner_id] = team_name
+        return team_names_map
+
     def get_applied_stats_map(self, season_string):
         """ Returns a dictionary mapping of stats IDs to stats for the stats kept track
             of a given season. """
@@ -73,6 +92,17 @@ class EspnFantasyApiLoader():
 
         return stats_map
 
+    def get_lineup_slot_counts_map(self, season_string):
+        """ Returns a dictionary mapping of lineup slot IDs to the number of roster
+            spots of each slot for a given season. Dictionary has the form:
+            {<lineup slot ID>: <count>, ...} Empty if the league info has no roster settings. """
+        league_info_dict = self._load_json(season_string, f"{season_string}_league_info.json")
+        if league_info_dict is None:
+            return None
+
+        lineup_slot_counts = league_info_dict.get('settings', {}).get('rosterSettings', {}).get('lineupSlotCounts', {})
+        return {int(lineup_slot_id): count for lineup_slot_id, count in lineup_slot_counts.items()}
+
     def get_league_info_dict(self, season_string):
         """ Returns a dictionary of the league information for the given season. """
         return self._load_json(season_string, f"{season_string}_league_info.json")
@@ -86,22 +116,126 @@ class EspnFantasyApiLoader():
         return self._load_json(season_string, "scoring_periods", f"{season_string}_scoring_period{id}.json")
 
     def get_all_players_info_dict(self, season_string):
-        """ Returns a dictionary of all players informations."""
-        return self._load_json(season_string, f"{season_string}_all_players_info.json")
-
+        """ Returns a dictionary of all players informations. Players of all pages
+            are combined if downloaded in pages (see iter_all_players_info_dicts()). """
+        page_file_names = self._get_all_players_info_page_file_names(season_string)
+        if not page_file_names:
+            return self._load_json(season_string, f"{season_string}_all_players_info.json")
+
+        all_players_info_dict = None
+        for page_dict in self.iter_all_players_info_dicts(season_string):
+            if all_players_info_dict is None:
+                all_players_info_dict = dict(page_dict, players=[])
+            all_players_info_dict['players'].extend(page_dict.get('players', []))
+        return all_players_info_dict
+
+    def iter_all_players_info_dicts(self, season_string):
+        """ Generator of dictionaries of all players informations, one page at a time
+            in page order if downloaded in pages (all_players_info/XXXXYYYY_all_players_info_page<N>.json).
+            Players already in an earlier page are removed, in case players moved
+            between pages during the download. Otherwise, yields the single all
+            players info dictionary, if any. """
+        page_file_names = self._get_all_players_info_page_file_names(season_string)
+        if not page_file_names:
+            all_players_info_dict = self._load_json(season_string, f"{season_string}_all_players_info.json")
+            if all_players_info_dict is not None:
+                yield all_players_info_dict
+            return
+
+        player_ids = set()
+        for file_name in page_file_names:
+            page_dict = self._load_json(season_string, ALL_PLAYERS_INFO_FOLDER, file_name)
+            if page_dict is None:
+                continue
+
+            players = [player for player in page_dict.get('players', []) if player.get('id') not in player_ids]
+            player_ids.update(player.get('id') for player in players)
+            yield dict(page_dict, players=players)
+
+    def get_realtime_stats_dicts(self, season_string):
+        """ Returns a list of all realtime stats snapshots for the given season in
+            time order. Each item is a dictionary in the form: {'timestamp': <datetime string>, 'data': <dict>}.
+            Snapshots saved as deltas by polling are reconstructed in full.
+
+            Note: Loads all snapshots into memory. """
+        # Realtime stats files are in the form: XXXXYYYY_realtime_stats_<datetime>.json
+        # Polled changes are stored next to them: XXXXYYYY_realtime_stats_<datetime>_deltas.jsonl
+        prefix = f"{season_string}_realtime_stats_"
+        snapshots = []
+        file_names = self._list_files(season_string, "realtime_stats")
+        for file_name in file_names:
+            if not (file_name.startswith(prefix) and file_name.endswith(".json")):
+                continue
+
+            json_data = self._load_json(season_string, "realtime_stats", file_name)
+            snapshots.append({'timestamp': file_name[len(prefix):-len(".json")], 'data': json_data})
+
+            deltas_file_name = f"{os.path.splitext(file_name)[0]}_deltas.jsonl"
+            if deltas_file_name not in file_names:
+                continue
+
+            # Older seasons are unwrapped when loaded, apply deltas to the raw data instead
+            raw_json_data = [json_data] if self._parse_year_from_season_string(season_string) < 2018 else json_data
+            for line in self._read_lines(season_string, "realtime_stats", deltas_file_name):
+                d = json.loads(line)
+                raw_json_data = json_delta.patch(raw_json_data, d['delta'])
+                json_data = raw_json_data[0] if self._parse_year_from_season_string(season_string) < 2018 else raw_json_data
+                snapshots.append({'timestamp': d['timestamp'], 'data': json_data})
+
+        return sorted(snapshots, key=lambda d: d['timestamp'])
+
+    @instrumentation.Timer("loader.load_json")
     def _load_json(self, season_string, *args):
         """ Reads a JSON file as dictionary from given season and arguments.
             Example: self._load_json(20202021, "20202021_league_info.json")
             Example: self._load_json(20202021, "scoring_periods", "20202021_scoring_period1.json") """
-        file_path = os.path.join(self._root_folder_path, season_string, *args)
-        if not os.path.exists(file_path):
-            return None
+        if self._catalog.exists(season_string, *args):
+            with open(os.path.join(self._root_folder_path, season_string, *args), 'r') as f:
+                json_data = json.load(f)
+            instrumentation.increment("files_decoded")
+        else:
+            json_data = self._get_archive(season_string).load_json("/".join(args))
+            if json_data is None:
+                return None
 
         # Handle special case of data in different format for older seasons
         if self._parse_year_from_season_string(season_string) < 2018:
-            return json.load(open(file_path, 'r'))[0]
+            return json_data[0]
         else:
-            return json.load(open(file_path, 'r'))
+            return json_data
+
+    def _list_files(self, season_string, folder):
+        """ Returns sorted names of files in a folder of a season, both on disk
+            and in the season's archive. """
+        file_names = set(self._get_archive(season_string).list_files(folder))
+        file_names.update(self._catalog.list_files(season_string, folder))
+
+        return sorted(file_names)
+
+    def _get_all_players_info_page_file_names(self, season_string):
+        """ Returns names of downloaded all players info page files of a season in page order. """
+        page_numbers = {}
+        for file_name in self._list_files(season_string, ALL_PLAYERS_INFO_FOLDER):
+            match = re.fullmatch(rf"{season_string}_all_players_info_page(\d+)\.json", file_name)
+            if match:
+                page_numbers[file_name] = int(match.group(1))
+
+        return sorted(page_numbers, key=page_numbers.get)
+
+    def _read_lines(self, season_string, *args):
+        """ Returns lines of a text file of a season, on disk or in the season's archive. """
+        if self._catalog.exists(season_string, *args):
+            with open(os.path.join(self._root_folder_path, season_string, *args), 'r') as f:
+                return f.readlines()
+
+        data = self._get_archive(season_string).read_file("/".join(args))
+        return data.decode().splitlines() if data is not None else []
+
+    def _get_archive(self, season_string):
+        """ Returns the archive of a season. Archives are opened once and kept open. """
+        if season_string not in self._archives:
+            self._archives[season_string] = EspnFantasyApiArchive(get_archive_path(os.path.join(self._root_folder_path, season_string)))
+        return self._archives[season_string]
 
     def _parse_year_from_season_string(self, season_string):
         """ Returns the current year given a season string as an integer.
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+""" Memory-mapped columnar store for a season's daily rosters data.
+
+    Daily rosters of a season are read-only once the season is over, but
+    parsing them requires decoding every scoring period JSON file. The store
+    saves the parsed data once as fixed-width NumPy arrays so later loads are
+    memory-mapped views of the files instead. Multiple processes loading the
+    same store share one physical copy in the page cache.
+
+    A store is a folder in the form:
+
+    <store_folder>
+    - metadata.json         (column order, dictionaries for names and owners, etc.)
+    - id.npy                (int64)
+    - lineupSlotId.npy      (int16)
+    - active.npy            (bool, False if in a bench or injured reserve lineup slot)
+    - scoringPeriodId.npy   (int16)
+    - appliedTotal.npy      (float64, NaN if no stats for the scoring period)
+    - GP.npy                (float64, NaN if no game played)
+    - stats.npy             (float64 matrix of [stat, row], NaN if stat is not available)
+    - fullName_codes.npy    (int32 index into metadata names)
+    - owner_codes.npy       (int16 index into metadata owners)
+"""
+import json
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import utils.instrumentation as instrumentation
+
+STORE_VERSION = 2
+
+# Columns stored as their own array. Any other column is a stat column.
+ID_COLUMNS = {'id': np.int64, 'lineupSlotId': np.int16, 'active': np.bool_, 'scoringPeriodId': np.int16}
+VALUE_COLUMNS = ['appliedTotal', 'GP']
+
+# Columns stored as codes into a list of unique values
+DICTIONARY_COLUMNS = {'fullName': np.int32, 'owner': np.int16}
+
+# Column with the same value in every row, stored in metadata only
+SEASON_COLUMN = 'season'
+
+class EspnFantasyApiRosterStore():
+    def __init__(self, store_folder_path):
+        """ Constructor. Takes in path to the store folder. """
+        self._store_folder_path = store_folder_path
+
+    def exists(self):
+        """ Returns True if a complete store exists in the folder. """
+        return os.path.isfile(os.path.join(self._store_folder_path, "metadata.json"))
+
+    def get_metadata(self):
+        """ Returns metadata dictionary of the store. Returns None if store does not exist. """
+        if not self.exists():
+            return None
+
+        with open(os.path.join(self._store_folder_path, "metadata.json"), 'r') as f:
+            return json.load(f)
+
+    @instrumentation.Timer("roster_store.save")
+    def save(self, df, extra_metadata=None):
+        """ Saves a daily rosters dataframe of a single season to the store, replacing
+            any previous data. Extra metadata is saved as part of the metadata dictionary. """
+        df = df.reset_index(drop=True)
+        stat_columns = [c for c in df.columns if c not in ID_COLUMNS and c not in VALUE_COLUMNS
+                        and c not in DICTIONARY_COLUMNS and c != SEASON_COLUMN]
+
+        seasons = df[SEASON_COLUMN].unique() if SEASON_COLUMN in df else []
+        if len(seasons) > 1:
+            print(f"Cannot save multiple seasons to a single store: {list(seasons)}")
+            return False
+
+        metadata = {'version': STORE_VERSION,
+                    'num_rows': len(df),
+                    'columns': list(df.columns),
+                    'stat_columns': stat_columns,
+                    SEASON_COLUMN: str(seasons[0]) if len(seasons) > 0 else None}
+        metadata.update(extra_metadata if extra_metadata is not None else {})
+
+        # Write everything to a temporary folder first so a partially written
+        # store is never loaded
+        temp_folder_path = f"{self._store_folder_path}.tmp"
+        shutil.rmtree(temp_folder_path, ignore_errors=True)
+        os.makedirs(temp_folder_path)
+
+        for column, dtype in ID_COLUMNS.items():
+            values = df[column].to_numpy(dtype=dtype) if column in df else np.zeros(len(df), dtype=dtype)
+            np.save(os.path.join(temp_folder_path, f"{column}.npy"), values)
+
+        for column in VALUE_COLUMNS:
+            values = pd.to_numeric(df[column]).to_numpy(dtype=np.float64) if column in df else np.full(len(df), np.nan)
+            np.save(os.path.join(temp_folder_path, f"{column}.npy"), values)
+
+        # Stats are stored as [stat, row] so each stat column is a contiguous view
+        stats = np.empty((len(stat_columns), len(df)), dtype=np.float64)
+        for i, column in enumerate(stat_columns):
+            stats[i] = pd.to_numeric(df[column]).to_numpy(dtype=np.float64)
+        np.save(os.path.join(temp_folder_path, "stats.npy"), stats)
+
+        for column, dtype in DICTIONARY_COLUMNS.items():
+            values = df[column] if column in df else pd.Series([""] * len(df))
+            codes, uniques = pd.factorize(values)
+            np.save(os.path.join(temp_folder_path, f"{column}_codes.npy"), codes.astype(dtype))
+            metadata[column] = [str(u) for u in uniques]
+
+        with open(os.path.join(temp_folder_path, "metadata.json"), 'w') as f:
+            json.dump(metadata, f)
+
+        shutil.rmtree(self._store_folder_path, ignore_errors=True)
+        os.replace(temp_folder_path, self._store_folder_path)
+        return True
+
+    @instrumentation.Timer("roster_store.load")
+    def load(self):
+        """ Returns a dictionary of memory-mapped arrays of the store in the form:
+            {'id': <array>, 'lineupSlotId': <array>, ..., 'stats': <array>, 'fullName_codes': <array>, ...}
+            Arrays are copy-on-write: modifying them does not modify the store.
+            Returns None if store does not exist. """
+        if not self.exists():
+            return None
+
+        names = list(ID_COLUMNS) + VALUE_COLUMNS + ["stats"] + [f"{column}_codes" for column in DICTIONARY_COLUMNS]
+        return {name: np.load(os.path.join(self._store_folder_path, f"{name}.npy"), mmap_mode='c') for name in names}
+
+    def get_df(self, columns=None):
+        """ Returns the stored daily rosters as a dataframe with the original column
+            order. Numeric columns are views of the memory-mapped arrays. Optionally
+            only the given columns in the given order (skipping any not stored), so
+            other arrays are never read. Returns None if store does not exist. """
+        metadata = self.get_metadata()
+        arrays = self.load()
+        if metadata is None or arrays is None:
+            return None
+
+        # Plain array views of the memory-mapped arrays so they behave like any other column
+        arrays = {name: np.asarray(array) for name, array in arrays.items()}
+
+        columns_dict = {}
+        column_names = metadata['columns'] if columns is None else [c for c in columns if c in metadata['columns']]
+        for column in column_names:
+            if column in ID_COLUMNS or column in VALUE_COLUMNS:
+                columns_dict[column] = arrays[column]
+            elif column in DICTIONARY_COLUMNS:
+                columns_dict[column] = np.asarray(metadata[column], dtype=object)[arrays[f"{column}_codes"]]
+            elif column == SEASON_COLUMN:
+                columns_dict[column] = np.full(metadata['num_rows'], metadata[SEASON_COLUMN], dtype=object)
+            else:
+                columns_dict[column] = arrays['stats'][metadata['stat_columns'].index(column)]
+
+        df = pd.DataFrame(columns_dict, copy=False)
+        instrumentation.increment("rows_produced.roster_store", len(df))
+        return df
\ No newline at end of file
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+""" Recomputes fantasy points of daily rosters under any scoring settings.
+
+    Raw stat counts are read from the raw stat columns of daily rosters (Example:
+    'raw_HIT'), so stats the league never scored can still be given points.
+    Daily rosters without raw stat columns (Example: stores saved before they
+    were added) fall back to dividing applied stats by the points of each stat
+    in the season's scoring settings (see EspnFantasyApiLoader.get_applied_stats_map).
+    Stats that were not scored in those seasons can't be recovered and count as 0.
+
+    Raw counts are kept as a matrix of [row, stat], so points for many scoring
+    settings are a single matrix multiply with a matrix of [stat, setting].
+
+    Scoring settings have the same form as the league's scoring items:
+    {<stat ID>: <points>, ...}
+
+    Example: Compare the league's settings with a what-if where hits are worth more
+        engine = EspnFantasyApiScoringEngine(daily_rosters_df, {season: loader.get_applied_stats_map(season) for season in seasons})
+        totals_df = engine.get_totals_df({'actual': actual_settings, 'hits': {**actual_settings, 31: 0.5}})
+"""
+import argparse
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import RAW_STATS_PREFIX, STATS_MAP
+import json
+import numpy as np
+import os
+import pandas as pd
+import timeit
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")
+
+# Column of daily rosters data that holds the season string
+SEASON_COLUMN = 'season'
+
+def get_scoring_settings(applied_stats_map):
+    """ Returns scoring settings from a season's applied stats map.
+        Example: {13: {'stat': "G", 'points': 2.0}} -> {13: 2.0} """
+    return {stat_id: d['points'] for stat_id, d in applied_stats_map.items()}
+
+class EspnFantasyApiScoringEngine():
+    def __init__(self, daily_rosters_df, applied_stats_maps):
+        """ Constructor. Takes in a daily rosters dataframe (see EspnFantasyApiDownloadsParser)
+            and a dictionary of each season string to its applied stats map. """
+        self._df = daily_rosters_df
+        self._stat_ids = sorted(STATS_MAP)
+        self._stat_columns = [STATS_MAP[stat_id] for stat_id in self._stat_ids]
+
+        # Points of each stat in each season as a matrix of [season, stat]
+        season_codes, season_strings = pd.factorize(daily_rosters_df[SEASON_COLUMN].astype(str))
+        self._season_codes = season_codes
+        self._season_strings = list(season_strings)
+        self._season_points = np.zeros((len(self._season_strings), len(self._stat_ids)))
+        for season_index, season_string in enumerate(self._season_strings):
+            for stat_id, d in (applied_stats_maps.get(season_string) or {}).items():
+                self._season_points[season_index, self._stat_ids.index(stat_id)] = d['points']
+
+        self._raw_stats = None
+        self._season_has_raw_stats = None
+
+    def get_stat_ids(self):
+        """ Returns list of stat IDs of the columns of the raw stats matrix. """
+        return list(self._stat_ids)
+
+    @instrumentation.Timer("scoring_engine.get_raw_stats")
+    def get_raw_stats(self):
+        """ Returns matrix of [row, stat] of raw stat counts. Counts missing from the
+            raw stat columns are recovered from applied stats. Computed once and
+            reused for all scoring settings. """
+        if self._raw_stats is None:
+            raw_stats = np.full((len(self._df), len(self._stat_ids)), np.nan)
+            applied_stats = np.zeros((len(self._df), len(self._stat_ids)))
+            for i, column in enumerate(self._stat_columns):
+                if f"{RAW_STATS_PREFIX}{column}" in self._df:
+                    raw_stats[:, i] = pd.to_numeric(self._df[f"{RAW_STATS_PREFIX}{column}"], errors='coerce').to_numpy(dtype=np.float64)
+                if column in self._df:
+                    applied_stats[:, i] = pd.to_numeric(self._df[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+            # Seasons with raw counts of each stat in any row, as a matrix of [season, stat]
+            has_raw_stats = ~np.isnan(raw_stats)
+            self._season_has_raw_stats = np.zeros((len(self._season_strings), len(self._stat_ids)), dtype=bool)
+            np.logical_or.at(self._season_has_raw_stats, self._season_codes, has_raw_stats)
+
+            # Fallback: points of each row's season, broadcast to [row, stat]
+            row_points = self._season_points[self._season_codes]
+            recovered_stats = np.divide(applied_stats, row_points, out=np.zeros_like(applied_stats), where=row_points != 0)
+
+            # Rows of seasons with raw counts of a stat didn't record it if missing
+            fallback = ~has_raw_stats & ~self._season_has_raw_stats[self._season_codes]
+            self._raw_stats = np.where(has_raw_stats, raw_stats, np.where(fallback, recovered_stats, 0.0))
+        return self._raw_stats
+
+    def get_weights(self, scoring_settings_list):
+        """ Returns matrix of [stat, setting] of points from a list of scoring settings. """
+        weights = np.zeros((len(self._stat_ids), len(scoring_settings_list)))
+        for j, scoring_settings in enumerate(scoring_settings_list):
+            for stat_id, points in scoring_settings.items():
+                weights[self._stat_ids.index(int(stat_id)), j] = points
+        return weights
+
+    def get_unscored_stat_ids(self, scoring_settings_list):
+        """ Returns dictionary of season strings to list of stat IDs given points in
+            any of the scoring settings, but neither scored nor recorded as raw
+            counts in the season's data. """
+        used = self.get_weights(scoring_settings_list).any(axis=1)
+        self.get_raw_stats()
+        unscored = {}
+        for season_index, season_string in enumerate(self._season_strings):
+            missing = used & (self._season_points[season_index] == 0) & ~self._season_has_raw_stats[season_index]
+            if missing.any():
+                unscored[season_string] = [self._stat_ids[i] for i in np.flatnonzero(missing)]
+        return unscored
+
+    @instrumentation.Timer("scoring_engine.get_points")
+    def get_points(self, scoring_settings_list):
+        """ Returns matrix of [row, setting] of fantasy points of every daily roster
+            row under each of the given scoring settings. """
+        instrumentation.increment("scoring_engine.settings_scored", len(scoring_settings_list))
+        return self.get_raw_stats() @ self.get_weights(scoring_settings_list)
+
+    def get_season_points(self):
+        """ Returns array of fantasy points of every daily roster row under the
+            scoring settings of its own season. Matches the applied totals. """
+        return np.einsum('ij,ij->i', self.get_raw_stats(), self._season_points[self._season_codes])
+
+    def get_points_df(self, scoring_settings_dict):
+        """ Returns dataframe of fantasy points of every daily roster row with a
+            column for each scoring settings name. Input is a dictionary in the
+            form: {<name>: <scoring settings>, ...} """
+        points = self.get_points(list(scoring_settings_dict.values()))
+        return pd.DataFrame(points, columns=list(scoring_settings_dict), index=self._df.index)
+
+    def get_totals_df(self, scoring_settings_dict, by=(SEASON_COLUMN, 'owner')):
+        """ Returns dataframe of fantasy points totals grouped by the given columns,
+            with a column for each scoring settings name. """
+        points_df = self.get_points_df(scoring_settings_dict)
+        for column in by:
+            points_df[column] = self._df[column].to_numpy()
+        return points_df.groupby(list(by), sort=True)[list(scoring_settings_dict)].sum().reset_index()
+
+if __name__ == "__main__":
+    start_time = timeit.default_timer()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scoring_settings_path", type=str,
+                        help="JSON file of scoring settings to compare in the form: {<name>: {<stat ID>: <points>, ...}, ...}")
+    parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing ESPN Fantasy API downloaded files.")
+    parser.add_argument("--out_file_path", type=str, default=os.path.join(SCRIPT_DIR, "scoring_engine_totals_df.csv"),
+                        help="Output file path of totals by season and owner.")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start_run("espn_fantasy_api_scoring_engine", profile=args.profile)
+
+    with open(args.scoring_settings_path, 'r') as f:
+        scoring_settings_dict = json.load(f)
+
+    downloads_parser = EspnFantasyApiDownloadsParser(args.espn_fantasy_api_downloads_root_folder)
+    loader = EspnFantasyApiLoader(args.espn_fantasy_api_downloads_root_folder)
+    seasons = downloads_parser.get_seasons()
+    daily_rosters_df = downloads_parser.get_daily_rosters_df({season: None for season in seasons}, raw_stats=True)
+
+    engine = EspnFantasyApiScoringEngine(daily_rosters_df, {season: loader.get_applied_stats_map(season) for season in seasons})
+    for season_string, stat_ids in engine.get_unscored_stat_ids(list(scoring_settings_dict.values())).items():
+        print(f"Stats not available in {season_string} (counted as 0): {[STATS_MAP[stat_id] for stat_id in stat_ids]}")
+
+    totals_df = engine.get_totals_df(scoring_settings_dict)
+    totals_df.to_csv(args.out_file_path, index=False)
+    instrumentation.increment("rows_written", len(totals_df))
+
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
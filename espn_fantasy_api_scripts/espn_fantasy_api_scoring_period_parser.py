@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 """ Parser to extract information for a given scoring_period.json file. """
-from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import RAW_STATS_PREFIX, STATS_MAP
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 class EspnFantasyApiScoringPeriodParser():
     def __init__(self, scoring_period_dict):
@@ -9,39 +10,62 @@ class EspnFantasyApiScoringPeriodParser():
         self._data_dict = scoring_period_dict
         self._scoring_period_id = self._data_dict['scoringPeriodId']
 
-    def get_owner_roster_applied_stats_as_dicts(self, owner_id):
+    def get_owner_ids(self):
+        """ Returns list of owner IDs of each team. Teams without an owner are skipped. """
+        return [team_roster['owners'][0] for team_roster in self._data_dict.get('teams', []) if team_roster.get('owners')]
+
+    def get_owner_roster_as_dicts(self, owner_id):
+        """ For a given owner ID, return the current roster (player name, ID and lineup
+            slot ID) as a list of dictionaries, without stats. Assumes one owner per team. """
+        return [{'fullName': roster_entry['playerPoolEntry']['player']['fullName'],
+                 'id': roster_entry['playerPoolEntry']['player']['id'],
+                 'lineupSlotId': roster_entry['lineupSlotId']} for roster_entry in self._get_owner_roster_entries(owner_id)]
+
+    def get_owner_roster_applied_stats_as_dicts(self, owner_id, raw_stats=False):
         """ For a given owner ID, return the current roster with some additional data
-            as a list of dictionaries. Assumes one owner per team. """
+            as a list of dictionaries. Assumes one owner per team. Each player has
+            applied stats (Example: 'G'), and raw stat counts (Example: 'raw_G')
+            if raw_stats is True. """
         roster_dicts = []
-        for team_roster in self._data_dict['teams']:
-            if team_roster['owners'][0] != owner_id:
-                continue
-
+        for roster_entry in self._get_owner_roster_entries(owner_id):
             # Append various information to list of dictionaries
-            for roster_entry in team_roster['roster']['entries']:
-                roster_dict = {'fullName': roster_entry['playerPoolEntry']['player']['fullName'],
-                               'id': roster_entry['playerPoolEntry']['player']['id'],
-                               'lineupSlotId': roster_entry['lineupSlotId']}
+            roster_dict = {'fullName': roster_entry['playerPoolEntry']['player']['fullName'],
+                           'id': roster_entry['playerPoolEntry']['player']['id'],
+                           'lineupSlotId': roster_entry['lineupSlotId']}
 
-                # First, get dictionary from list of stats that correspond to this scoring period ID
-                applied_stats_dict = self._get_scoring_period_applied_stats_dict(roster_entry['playerPoolEntry']['player']['stats'])
+            # First, get dictionary from list of stats that correspond to this scoring period ID
+            applied_stats_dict = self._get_scoring_period_applied_stats_dict(roster_entry['playerPoolEntry']['player']['stats'])
 
-                # Then, map applied stat indicies to actual names
-                if applied_stats_dict is not None:
-                    roster_dict.update(self._map_stats_index_to_names(applied_stats_dict['appliedStats']))
-                    roster_dict['appliedTotal'] = applied_stats_dict['appliedTotal']
+            # Then, map applied stat indicies to actual names
+            if applied_stats_dict is not None:
+                roster_dict.update(self._map_stats_index_to_names(applied_stats_dict['appliedStats']))
+                roster_dict['appliedTotal'] = applied_stats_dict['appliedTotal']
 
-                    # Empty applied and regular stats dictionaries don't count as a game played
-                    if applied_stats_dict['appliedStats'] and applied_stats_dict['stats']:
-                        roster_dict['GP'] = 1
+                # Empty applied and regular stats dictionaries don't count as a game played
+                if applied_stats_dict['appliedStats'] and applied_stats_dict['stats']:
+                    roster_dict['GP'] = 1
 
-                roster_dicts.append(roster_dict)
+                if raw_stats:
+                    roster_dict.update({f"{RAW_STATS_PREFIX}{name}": val for name, val in self._map_stats_index_to_names(applied_stats_dict.get('stats') or {}).items()})
+
+            roster_dicts.append(roster_dict)
         return roster_dicts
 
-    def get_owner_roster_applied_stats_as_df(self, owner_id):
+    def get_owner_roster_applied_stats_as_df(self, owner_id, raw_stats=False):
         """ For a given owner ID, return the current roster with some additional data
-            as a dataframe. Assumes one owner per team. """
-        return pd.DataFrame(self.get_owner_roster_applied_stats_as_dicts(owner_id))
+            as a dataframe. Assumes one owner per team. See get_owner_roster_applied_stats_as_dicts(). """
+        df = pd.DataFrame(self.get_owner_roster_applied_stats_as_dicts(owner_id, raw_stats))
+        instrumentation.increment("rows_produced.scoring_period", len(df))
+        return df
+
+    def _get_owner_roster_entries(self, owner_id):
+        """ Returns list of roster entries of the team of a given owner ID.
+            Teams without an owner are skipped. """
+        roster_entries = []
+        for team_roster in self._data_dict.get('teams', []):
+            if team_roster.get('owners') and team_roster['owners'][0] == owner_id:
+                roster_entries.extend(team_roster.get('roster', {}).get('entries', []))
+        return roster_entries
 
     def _get_scoring_period_applied_stats_dict(self, stats_list):
         """ Given a list of stat dictionaries, retrieve just the dictionary
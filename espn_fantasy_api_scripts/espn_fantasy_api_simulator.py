@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+""" Monte Carlo simulator of the rest of a season. Projects final standings
+    and playoff odds of each team from the latest realtime stats snapshot
+    (schedule, records and rosters of the mMatchupScore and mStandings views)
+    and each player's points in every downloaded scoring period.
+
+    Each player in an active lineup slot of the latest snapshot scores the
+    points of a random scoring period from their own history (bootstrap),
+    including scoring periods without a game (0 points). Players without a
+    history score 0. Draws of all players, remaining scoring periods and
+    simulations of a chunk are made in one batched pass as an array of
+    [simulation, player, scoring period], then summed to points of each team
+    and matchup period with matrix multiplies.
+
+    Only undecided regular season matchups are simulated, on top of their
+    current points. Remaining scoring periods are the ones after the scoring
+    period of the snapshot. Teams are ranked by wins (ties count as half a
+    win), then points for.
+
+    Simulations are split into chunks of a fixed size, each with its own
+    random generator spawned from the seed (numpy SeedSequence), so results
+    only depend on the seed and number of simulations, not the number of
+    processes the chunks are spread across.
+
+    Example usage:
+        simulator = EspnFantasyApiSimulator(root_folder)
+        odds_df = simulator.get_playoff_odds_df("20242025", num_simulations=100000, seed=54078)
+"""
+import argparse
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import INACTIVE_LINEUP_SLOT_IDS
+import multiprocessing
+import numpy as np
+import os
+import pandas as pd
+import timeit
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_NUM_SIMULATIONS = 10000
+DEFAULT_CHUNK_SIZE = 250
+
+# Number of random bits of each draw of a scoring period from a player's history
+RANDOM_BITS = 16
+
+# Winner of a matchup that isn't complete in realtime stats
+UNDECIDED_WINNER = "UNDECIDED"
+
+def simulate(inputs, num_simulations, seed=None, num_processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Runs simulations of the rest of a season (see EspnFantasyApiSimulator.get_simulation_inputs)
+        split into chunks across a pool of processes (all CPUs if not given). Returns dictionary in the form:
+        {'seed_counts': <[team, seed] number of simulations each team finished in each seed>,
+         'wins': <[team] sum of wins of all simulations>, 'points_for': <[team] sum of points for of all simulations>} """
+    chunk_sizes = [min(chunk_size, num_simulations - start) for start in range(0, num_simulations, chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    chunk_args = [(inputs, seed_sequence, size) for seed_sequence, size in zip(seed_sequences, chunk_sizes)]
+
+    if num_processes == 1 or len(chunk_args) <= 1:
+        results = [_simulate_chunk(args) for args in chunk_args]
+    else:
+        pool = multiprocessing.Pool(processes=min(num_processes or os.cpu_count() or 1, len(chunk_args)))
+        results = pool.map(_simulate_chunk, chunk_args)
+        pool.close()
+        pool.join()
+
+    instrumentation.increment("simulator.simulations", num_simulations)
+    num_teams = len(inputs['wins'])
+    combined = {'seed_counts': np.zeros((num_teams, num_teams), dtype=np.int64), 'wins': np.zeros(num_teams), 'points_for': np.zeros(num_teams)}
+    for result in results:
+        for key in combined:
+            combined[key] += result[key]
+    return combined
+
+def _simulate_chunk(args):
+    """ Runs a chunk of simulations. Takes in a tuple of (<inputs>, <seed sequence>, <number of simulations>).
+        Returns dictionary of results of the chunk (see simulate). """
+    inputs, seed_sequence, num_simulations = args
+    rng = np.random.default_rng(seed_sequence)
+    history = inputs['history']
+    num_teams = len(inputs['wins'])
+    num_players, num_periods = history.shape[0], inputs['period_matchups'].shape[0]
+
+    # Points of a random scoring period of each player's history as [simulation, player, scoring period]
+    # 16-bit draws are scaled to each player's number of scoring periods with a multiply and shift,
+    # then offset to the player's row of the flattened history
+    history_index = rng.integers(0, 2**RANDOM_BITS, size=(num_simulations, num_players, num_periods), dtype=np.uint16).astype(np.int32)
+    history_index *= inputs['history_counts'][None, :, None]
+    history_index >>= RANDOM_BITS
+    history_index += (np.arange(num_players, dtype=np.int32) * history.shape[1])[None, :, None]
+    points = history.ravel().take(history_index)
+
+    # Points of each team in each matchup period as [simulation, matchup period, team]
+    team_period_points = np.matmul(points.transpose(0, 2, 1), inputs['player_teams'])
+    team_matchup_points = np.einsum('spt,pm->smt', team_period_points, inputs['period_matchups'])
+
+    # Final points of each undecided matchup as [simulation, matchup]
+    matchup_index = inputs['matchup_periods']
+    home_points = inputs['home_points'] + team_matchup_points[:, matchup_index, inputs['home_teams']]
+    away_points = inputs['away_points'] + team_matchup_points[:, matchup_index, inputs['away_teams']]
+
+    home_onehot = np.eye(num_teams)[inputs['home_teams']]
+    away_onehot = np.eye(num_teams)[inputs['away_teams']]
+    home_wins = (home_points > away_points) + 0.5 * (home_points == away_points)
+    wins = inputs['wins'] + home_wins @ home_onehot + (1 - home_wins) @ away_onehot
+    points_for = inputs['points_for'] + home_points @ home_onehot + away_points @ away_onehot
+
+    # Rank teams by wins, then points for
+    order = np.lexsort((-points_for, -wins), axis=-1)
+    seed_counts = np.zeros((num_teams, num_teams), dtype=np.int64)
+    np.add.at(seed_counts, (order, np.arange(num_teams)[None, :]), 1)
+    return {'seed_counts': seed_counts, 'wins': wins.sum(axis=0), 'points_for': points_for.sum(axis=0)}
+
+class EspnFantasyApiSimulator():
+    def __init__(self, espn_fantasy_api_downloads_root_folder=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")):
+        """ Constructor. Takes in the root folder of ESPN fantasy API downloads. """
+        self._loader = EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder)
+        self._downloads_parser = EspnFantasyApiDownloadsParser(espn_fantasy_api_downloads_root_folder)
+
+    @instrumentation.Timer("simulator.get_simulation_inputs")
+    def get_simulation_inputs(self, season_string):
+        """ Returns dictionary of arrays needed to simulate the rest of a season from
+            its latest realtime stats snapshot. Returns None if the season has no
+            realtime stats. """
+        snapshots = self._loader.get_realtime_stats_dicts(season_string)
+        if not snapshots:
+            print(f"No realtime stats found for {season_string}.")
+            return None
+        data = snapshots[-1]['data']
+
+        owner_id_map = self._loader.get_members_id_map(season_string)
+        teams = sorted(data['teams'], key=lambda team: team['id'])
+        team_index = {team['id']: i for i, team in enumerate(teams)}
+        records = [team.get('record', {}).get('overall', {}) for team in teams]
+
+        # Undecided regular season matchups and their remaining scoring periods
+        schedule_settings = data['settings']['scheduleSettings']
+        matchups = [matchup for matchup in data.get('schedule', [])
+                    if matchup['matchupPeriodId'] <= schedule_settings['matchupPeriodCount']
+                    and matchup.get('winner') == UNDECIDED_WINNER and 'away' in matchup]
+        matchup_period_ids = sorted(set(matchup['matchupPeriodId'] for matchup in matchups))
+        period_ids = sorted(set(id for matchup_period_id in matchup_period_ids
+                                for id in schedule_settings['matchupPeriods'][str(matchup_period_id)] if id > data['scoringPeriodId']))
+        period_matchups = np.zeros((len(period_ids), len(matchup_period_ids)))
+        for m, matchup_period_id in enumerate(matchup_period_ids):
+            for id in schedule_settings['matchupPeriods'][str(matchup_period_id)]:
+                if id in period_ids:
+                    period_matchups[period_ids.index(id), m] = 1
+
+        # Players in active lineup slots and their points in every scoring period they were rostered
+        players = [(team_index[team['id']], entry['playerPoolEntry']['player']['id'])
+                   for team in teams for entry in team.get('roster', {}).get('entries', []) if entry['lineupSlotId'] not in INACTIVE_LINEUP_SLOT_IDS]
+        history_df = self._downloads_parser.get_daily_rosters_df_by_season(season_string, None, use_store=True, columns=['id', 'appliedTotal'])
+        player_histories = {}
+        if not history_df.empty:
+            points = pd.to_numeric(history_df['appliedTotal'], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+            for id, indices in history_df.groupby('id').indices.items():
+                player_histories[id] = points[indices]
+        history_counts = np.array([len(player_histories.get(id, [])) for _, id in players], dtype=np.int64)
+        history = np.zeros((len(players), max(history_counts.max(initial=0), 1)), dtype=np.float32)
+        for i, (_, id) in enumerate(players):
+            history[i, :history_counts[i]] = player_histories.get(id, [])
+
+        return {'team_names': [team.get('name', f"{team.get('location', '')} {team.get('nickname', '')}".strip()) for team in teams],
+                'owners': [owner_id_map.get(team['owners'][0], team['owners'][0]) for team in teams],
+                'records': records,
+                'wins': np.array([record.get('wins', 0) + 0.5 * record.get('ties', 0) for record in records], dtype=np.float64),
+                'points_for': np.array([record.get('pointsFor', 0.0) for record in records], dtype=np.float64),
+                'playoff_team_count': schedule_settings.get('playoffTeamCount', 0),
+                'history': history,
+                'history_counts': np.maximum(history_counts, 1).astype(np.int32),
+                'player_teams': np.eye(len(teams), dtype=np.float32)[[t for t, _ in players]].reshape(len(players), len(teams)),
+                'period_matchups': period_matchups.astype(np.float32),
+                'matchup_periods': np.array([matchup_period_ids.index(matchup['matchupPeriodId']) for matchup in matchups], dtype=np.intp),
+                'home_teams': np.array([team_index[matchup['home']['teamId']] for matchup in matchups], dtype=np.intp),
+                'away_teams': np.array([team_index[matchup['away']['teamId']] for matchup in matchups], dtype=np.intp),
+                'home_points': np.array([matchup['home'].get('totalPoints', 0.0) for matchup in matchups], dtype=np.float64),
+                'away_points': np.array([matchup['away'].get('totalPoints', 0.0) for matchup in matchups], dtype=np.float64)}
+
+    @instrumentation.Timer("simulator.get_playoff_odds_df")
+    def get_playoff_odds_df(self, season_string, num_simulations=DEFAULT_NUM_SIMULATIONS, seed=None, num_processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """ Returns dataframe of projected standings of a season with the columns:
+            Team, Owner, W, L, T, PF, Proj W, Proj PF, Playoffs, Seed 1, ..., Seed N
+            Playoffs and seed columns are the fraction of simulations. Sorted by
+            playoff odds. Returns None if the season has no realtime stats. """
+        inputs = self.get_simulation_inputs(season_string)
+        if inputs is None:
+            return None
+
+        results = simulate(inputs, num_simulations, seed, num_processes, chunk_size)
+        seed_odds = results['seed_counts'] / num_simulations
+        df = pd.DataFrame({'Team': inputs['team_names'], 'Owner': inputs['owners'],
+                           'W': [record.get('wins', 0) for record in inputs['records']],
+                           'L': [record.get('losses', 0) for record in inputs['records']],
+                           'T': [record.get('ties', 0) for record in inputs['records']],
+                           'PF': inputs['points_for'],
+                           'Proj W': results['wins'] / num_simulations,
+                           'Proj PF': results['points_for'] / num_simulations,
+                           'Playoffs': seed_odds[:, :inputs['playoff_team_count']].sum(axis=1)})
+        for i in range(len(df)):
+            df[f"Seed {i + 1}"] = seed_odds[:, i]
+        return df.sort_values(['Playoffs', 'Proj W', 'Proj PF'], ascending=False, ignore_index=True)
+
+if __name__ == "__main__":
+    start_time = timeit.default_timer()
+
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("season_string", type=str, help="Season to simulate (Example: 20242025).")
+    arg_parse.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads"),
+                           help="Root folder path containing ESPN Fantasy API downloaded files.")
+    arg_parse.add_argument("--num_simulations", "-n", type=int, default=DEFAULT_NUM_SIMULATIONS, help="Number of simulations.")
+    arg_parse.add_argument("--seed", type=int, default=None, help="Seed of the random generator, for repeatable results.")
+    arg_parse.add_argument("--num_processes", type=int, default=None, help="Number of processes to run simulations in. Defaults to the number of CPUs.")
+    arg_parse.add_argument("--chunk_size", type=int, default=DEFAULT_CHUNK_SIZE, help="Number of simulations drawn in each batch.")
+    args = arg_parse.parse_args()
+
+    odds_df = EspnFantasyApiSimulator(args.espn_fantasy_api_downloads_root_folder).get_playoff_odds_df(
+        args.season_string, args.num_simulations, args.seed, args.num_processes, args.chunk_size)
+    if odds_df is not None:
+        print(odds_df.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
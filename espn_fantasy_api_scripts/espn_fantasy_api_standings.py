@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+""" Derives league standings from daily rosters data, for seasons that have
+    scoring periods downloaded but no archived league standings HTML file.
+
+    Standings have the same tables as EspnHtmlParserLeagueStandings:
+    - Season points: RK, Team, Owner, <points of each scored stat>, TOT, CHG
+    - Season stats: RK, Team, Owner, <raw count of each scored stat>, Moves
+
+    Only players in active lineup slots count towards standings (see
+    EspnFantasyApiDownloadsParser.get_lineup_slots_df). Raw stat counts are
+    read from the raw stats of daily rosters (see EspnFantasyApiScoringEngine).
+    Moves are counted from inferred transactions (see EspnFantasyApiTransactions
+    and get_moves_df). CHG is the points gained in the latest scoring period.
+
+    Totals are kept in a state file of the season (XXXXYYYY_standings_state.json)
+    so only scoring periods downloaded since the last update are parsed. The
+    latest scoring period can still change during the day, so it is never
+    saved to the state and is always added on top of it. Scoring periods
+    after one that isn't downloaded are also only added on top of the state,
+    so the missing scoring period is still counted once it is downloaded.
+"""
+import argparse
+import copy
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser, get_last_contiguous_scoring_period
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_scoring_engine import EspnFantasyApiScoringEngine
+from espn_fantasy_api_scripts.espn_fantasy_api_transactions import EspnFantasyApiTransactions, get_moves_df
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
+import json
+import numpy as np
+import os
+import pandas as pd
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STATE_VERSION = 2
+
+# Standings are shown to 2 decimal places, same as ESPN
+NUM_DECIMALS = 2
+
+class EspnFantasyApiStandings():
+    def __init__(self, espn_fantasy_api_downloads_root_folder=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")):
+        """ Constructor. Takes in the root folder of ESPN fantasy API downloads. """
+        self._root_folder = espn_fantasy_api_downloads_root_folder
+        self._loader = EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder)
+        self._downloads_parser = EspnFantasyApiDownloadsParser(espn_fantasy_api_downloads_root_folder)
+        self._transactions = EspnFantasyApiTransactions(espn_fantasy_api_downloads_root_folder)
+
+    def get_season_standings_points_df(self, season_string):
+        """ Returns dataframe of season standings in points. """
+        standings_dict = self.get_standings_dict(season_string)
+        return standings_dict['season_points'] if standings_dict is not None else pd.DataFrame()
+
+    def get_season_standings_stats_df(self, season_string):
+        """ Returns dataframe of season standings in raw points/stats. """
+        standings_dict = self.get_standings_dict(season_string)
+        return standings_dict['season_stats'] if standings_dict is not None else pd.DataFrame()
+
+    @instrumentation.Timer("standings.get_standings_dict")
+    def get_standings_dict(self, season_string):
+        """ Returns dictionary of standings information of a season, in the form:
+            {'season_points': <dataframe>, 'season_stats': <dataframe>}
+            Updates the season's state with any new complete scoring periods.
+            Returns None if the season has no league info. """
+        league_info_dict = self._loader.get_league_info_dict(season_string)
+        if league_info_dict is None:
+            return None
+
+        applied_stats_map = self._loader.get_applied_stats_map(season_string)
+        stat_ids = list(applied_stats_map)
+        latest_scoring_period = min(league_info_dict['status']['latestScoringPeriod'], league_info_dict['status']['finalScoringPeriod'])
+
+        # Parse scoring periods after the saved state once, then split into complete and latest scoring periods
+        state = self._load_state(season_string, stat_ids)
+        df = self._downloads_parser.get_daily_rosters_df_by_season(season_string, None, first_scoring_period=state['scoringPeriodId'] + 1, raw_stats=True)
+        scoring_periods = df['scoringPeriodId'].to_numpy() if not df.empty else np.array([], dtype=np.int64)
+
+        # Add complete scoring periods to the saved state, up to the first one that isn't downloaded
+        first_scoring_period = max(state['scoringPeriodId'] + 1, league_info_dict['status']['firstScoringPeriod'])
+        saved_scoring_period = get_last_contiguous_scoring_period(scoring_periods, first_scoring_period, latest_scoring_period - 1)
+        if saved_scoring_period > state['scoringPeriodId']:
+            state = self._update_state(state, df[scoring_periods <= saved_scoring_period], season_string, applied_stats_map, saved_scoring_period)
+            self._save_state(season_string, state)
+
+        # Add other complete scoring periods, then the latest scoring period on top of the saved state
+        unsaved = scoring_periods > state['scoringPeriodId']
+        previous_state = self._update_state(copy.deepcopy(state), df[unsaved & (scoring_periods < latest_scoring_period)],
+                                            season_string, applied_stats_map, latest_scoring_period - 1)
+        current_state = self._update_state(copy.deepcopy(previous_state), df[scoring_periods == latest_scoring_period],
+                                           season_string, applied_stats_map, latest_scoring_period)
+
+        return self._get_standings_dict(current_state, previous_state, season_string, stat_ids)
+
+    def _update_state(self, state, df, season_string, applied_stats_map, last_scoring_period):
+        """ Adds daily rosters up to and including the last scoring period to the state. Returns the state. """
+        stat_ids = state['statIds']
+        if df.empty:
+            state['scoringPeriodId'] = max(state['scoringPeriodId'], last_scoring_period)
+            return state
+
+        # Matrices of [row, stat] of points and raw stats
+        points = np.zeros((len(df), len(stat_ids)))
+        for i, stat_id in enumerate(stat_ids):
+            if STATS_MAP[stat_id] in df:
+                points[:, i] = pd.to_numeric(df[STATS_MAP[stat_id]], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+        engine = EspnFantasyApiScoringEngine(df, {season_string: applied_stats_map})
+        engine_stat_ids = engine.get_stat_ids()
+        stats = engine.get_raw_stats()[:, [engine_stat_ids.index(stat_id) for stat_id in stat_ids]]
+        totals = pd.to_numeric(df['appliedTotal'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+        # Sum active rows of each owner
+        owner_codes, owners = pd.factorize(df['owner'])
+        active = df['active'].to_numpy(dtype=bool)
+        owner_points = np.zeros((len(owners), len(stat_ids)))
+        owner_stats = np.zeros((len(owners), len(stat_ids)))
+        np.add.at(owner_points, owner_codes[active], points[active])
+        np.add.at(owner_stats, owner_codes[active], stats[active])
+        owner_totals = np.bincount(owner_codes[active], weights=totals[active], minlength=len(owners))
+
+        for i, owner in enumerate(owners):
+            owner_state = state['owners'].setdefault(owner, {'points': [0.0] * len(stat_ids), 'total': 0.0, 'stats': [0.0] * len(stat_ids)})
+            owner_state['points'] = (np.array(owner_state['points']) + owner_points[i]).tolist()
+            owner_state['stats'] = (np.array(owner_state['stats']) + owner_stats[i]).tolist()
+            owner_state['total'] += float(owner_totals[i])
+
+        state['scoringPeriodId'] = last_scoring_period
+        return state
+
+    def _get_standings_dict(self, state, previous_state, season_string, stat_ids):
+        """ Returns dictionary of standings dataframes from the state. """
+        team_names_map = self._loader.get_team_names_map(season_string) or {}
+        members_id_map = self._loader.get_members_id_map(season_string) or {}
+        owner_team_map = {members_id_map[owner_id]: team_name for owner_id, team_name in team_names_map.items() if owner_id in members_id_map}
+        stat_names = [STATS_MAP[stat_id] for stat_id in stat_ids]
+        moves_df = get_moves_df(self._transactions.get_transactions_df(season_string))
+        moves_map = dict(zip(moves_df['owner'], moves_df['moves']))
+
+        # Rank by total points
+        totals_series = pd.Series({owner: owner_state['total'] for owner, owner_state in state['owners'].items()}, dtype=np.float64)
+        ranks = totals_series.round(NUM_DECIMALS).rank(method='min', ascending=False)
+
+        points_dicts = []
+        stats_dicts = []
+        for owner, owner_state in state['owners'].items():
+            previous_total = previous_state['owners'].get(owner, {}).get('total', 0.0)
+            info_dict = {'RK': int(ranks[owner]), 'Team': owner_team_map.get(owner, ""), 'Owner': owner}
+            points_dicts.append({**info_dict, **dict(zip(stat_names, owner_state['points'])), 'TOT': owner_state['total'],
+                                 'CHG': owner_state['total'] - previous_total})
+            stats_dicts.append({**info_dict, **dict(zip(stat_names, owner_state['stats'])), 'Moves': int(moves_map.get(owner, 0))})
+
+        points_df = pd.DataFrame(points_dicts, columns=['RK', 'Team', 'Owner'] + stat_names + ['TOT', 'CHG'])
+        stats_df = pd.DataFrame(stats_dicts, columns=['RK', 'Team', 'Owner'] + stat_names + ['Moves'])
+        return {'season_points': points_df.sort_values(by=['RK', 'Owner']).round(NUM_DECIMALS).reset_index(drop=True),
+                'season_stats': stats_df.sort_values(by=['RK', 'Owner']).round(NUM_DECIMALS).reset_index(drop=True)}
+
+    def _get_state_path(self, season_string):
+        """ Returns path of the standings state file of a season. """
+        return os.path.join(self._root_folder, season_string, f"{season_string}_standings_state.json")
+
+    def _load_state(self, season_string, stat_ids):
+        """ Returns saved standings state of a season. Returns an empty state if
+            not saved or saved with different scoring settings. """
+        empty_state = {'version': STATE_VERSION, 'statIds': stat_ids, 'scoringPeriodId': 0, 'owners': {}}
+        try:
+            with open(self._get_state_path(season_string), 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return empty_state
+
+        if state.get('version') != STATE_VERSION or state.get('statIds') != stat_ids:
+            return empty_state
+        return state
+
+    def _save_state(self, season_string, state):
+        """ Saves standings state of a season. """
+        temp_path = f"{self._get_state_path(season_string)}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self._get_state_path(season_string))
+
+if __name__ == "__main__":
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("season_string", type=str, help="Season to derive standings of (Example: 20242025).")
+    arg_parse.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads"),
+                           help="Root folder path containing ESPN Fantasy API downloaded files.")
+    args = arg_parse.parse_args()
+
+    standings_dict = EspnFantasyApiStandings(args.espn_fantasy_api_downloads_root_folder).get_standings_dict(args.season_string)
+    if standings_dict is None:
+        print(f"No league info for {args.season_string}.")
+    else:
+        print(standings_dict['season_points'].to_string(index=False))
+        print(standings_dict['season_stats'].to_string(index=False))
\ No newline at end of file
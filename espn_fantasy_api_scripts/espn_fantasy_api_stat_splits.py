@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+""" Extracts every stat split of players in scoring period and all players
+    info files, and scores projections against actual stats.
+
+    Each player's list of stats has an entry for each combination of:
+    - statSourceId: 0 = actual, 1 = projected
+    - statSplitTypeId: Example: 0 = season totals, scoring period splits, etc.
+    - seasonId and scoringPeriodId (0 for splits that aren't of a scoring period)
+    EspnFantasyApiScoringPeriodParser and EspnFantasyApiAllPlayersInfoParser only
+    keep a single entry. Here all entries are kept as rows of a dataframe with a
+    column of raw counts for each stat (see STATS_MAP). Entries found in more than
+    one file (Example: a player's season totals in every scoring period) are only
+    kept once.
+
+    Projection errors pair the projected and actual rows of the same player and
+    split, and subtract their stat matrices in a single array operation:
+    error = projected - actual, for each stat and the applied total.
+
+    Example usage:
+        stat_splits = EspnFantasyApiStatSplits(root_folder)
+        errors_df = stat_splits.get_projection_errors_df()
+        accuracy_df = get_accuracy_df(errors_df, by=['season', 'statSplitTypeId'])
+"""
+import argparse
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_utils import STATS_MAP
+import multiprocessing
+import numpy as np
+import os
+import pandas as pd
+import timeit
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ACTUAL_STAT_SOURCE_ID = 0
+PROJECTED_STAT_SOURCE_ID = 1
+
+# Stat IDs in order of the stat columns
+STAT_IDS = sorted(STATS_MAP)
+STAT_COLUMNS = [STATS_MAP[stat_id] for stat_id in STAT_IDS]
+_STAT_INDEX = {stat_id: i for i, stat_id in enumerate(STAT_IDS)}
+
+# Columns that identify a split of a player
+SPLIT_KEY_COLUMNS = ['season', 'id', 'seasonId', 'statSplitTypeId', 'scoringPeriodId']
+STAT_SPLITS_COLUMNS = SPLIT_KEY_COLUMNS + ['fullName', 'statSourceId', 'appliedTotal'] + STAT_COLUMNS
+
+def get_stat_splits_df(season_string, players):
+    """ Returns dataframe of all stat splits of a list of player dictionaries (each
+        with 'id', 'fullName' and 'stats') with the columns STAT_SPLITS_COLUMNS.
+        Stats missing from a split count as 0. """
+    columns = {column: [] for column in SPLIT_KEY_COLUMNS + ['fullName', 'statSourceId', 'appliedTotal']}
+    stat_rows, stat_indices, stat_values = [], [], []
+    for player in players:
+        for stat in player.get('stats') or []:
+            row = len(columns['id'])
+            columns['id'].append(player.get('id'))
+            columns['fullName'].append(player.get('fullName'))
+            columns['seasonId'].append(stat.get('seasonId', 0))
+            columns['statSourceId'].append(stat.get('statSourceId', ACTUAL_STAT_SOURCE_ID))
+            columns['statSplitTypeId'].append(stat.get('statSplitTypeId', 0))
+            columns['scoringPeriodId'].append(stat.get('scoringPeriodId', 0))
+            columns['appliedTotal'].append(stat.get('appliedTotal', 0.0))
+            for stat_id, value in (stat.get('stats') or {}).items():
+                stat_rows.append(row)
+                stat_indices.append(_STAT_INDEX[int(stat_id)])
+                stat_values.append(value)
+
+    num_rows = len(columns['id'])
+    stats = np.zeros((num_rows, len(STAT_IDS)))
+    stats[stat_rows, stat_indices] = stat_values
+    columns['season'] = [season_string] * num_rows
+
+    df = pd.DataFrame(columns)
+    df[STAT_COLUMNS] = stats
+    return df[STAT_SPLITS_COLUMNS]
+
+def get_projection_errors_df(stat_splits_df):
+    """ Returns dataframe of projection errors (projected - actual) of every split
+        with both a projected and an actual row. Has the columns:
+        <SPLIT_KEY_COLUMNS>, fullName, projectedTotal, actualTotal, appliedTotal, <stat columns>
+        where appliedTotal and stat columns are errors. """
+    sources = stat_splits_df['statSourceId'].to_numpy()
+    actual_df = stat_splits_df[sources == ACTUAL_STAT_SOURCE_ID]
+    projected_df = stat_splits_df[sources == PROJECTED_STAT_SOURCE_ID]
+
+    # Row positions of each matching pair of projected and actual rows
+    pairs_df = projected_df[SPLIT_KEY_COLUMNS].assign(projected_row=np.arange(len(projected_df))).merge(
+        actual_df[SPLIT_KEY_COLUMNS].assign(actual_row=np.arange(len(actual_df))), on=SPLIT_KEY_COLUMNS)
+    projected_rows = pairs_df['projected_row'].to_numpy()
+    actual_rows = pairs_df['actual_row'].to_numpy()
+
+    values_columns = ['appliedTotal'] + STAT_COLUMNS
+    errors = projected_df[values_columns].to_numpy()[projected_rows] - actual_df[values_columns].to_numpy()[actual_rows]
+    df = pairs_df[SPLIT_KEY_COLUMNS].copy()
+    df['fullName'] = projected_df['fullName'].to_numpy()[projected_rows]
+    df['projectedTotal'] = projected_df['appliedTotal'].to_numpy()[projected_rows]
+    df['actualTotal'] = actual_df['appliedTotal'].to_numpy()[actual_rows]
+    df[values_columns] = errors
+    instrumentation.increment("rows_produced.projection_errors", len(df))
+    return df
+
+def get_accuracy_df(projection_errors_df, by=('season',), stat_columns=None):
+    """ Returns dataframe of projection accuracy of each stat, grouped by the given
+        columns, with the columns: <by>, stat, count, bias, mae, rmse
+        Only stats projected or recorded in at least one split are included,
+        unless stat columns are given. """
+    by = list(by)
+    if stat_columns is None:
+        stat_columns = ['appliedTotal'] + [column for column in STAT_COLUMNS if projection_errors_df[column].any()]
+
+    errors = projection_errors_df[stat_columns].to_numpy()
+    group_codes, groups = pd.MultiIndex.from_frame(projection_errors_df[by]).factorize() if by else (np.zeros(len(errors), dtype=np.intp), None)
+    num_groups = len(groups) if by else 1
+
+    # Sums of each group as [group, stat]
+    counts = np.bincount(group_codes, minlength=num_groups)
+    sums = np.zeros((num_groups, len(stat_columns)))
+    abs_sums = np.zeros((num_groups, len(stat_columns)))
+    squared_sums = np.zeros((num_groups, len(stat_columns)))
+    np.add.at(sums, group_codes, errors)
+    np.add.at(abs_sums, group_codes, np.abs(errors))
+    np.add.at(squared_sums, group_codes, errors ** 2)
+
+    df = pd.DataFrame(list(groups) if by else [()], columns=by).loc[np.repeat(np.arange(num_groups), len(stat_columns))].reset_index(drop=True)
+    df['stat'] = stat_columns * num_groups
+    df['count'] = np.repeat(counts, len(stat_columns))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        df['bias'] = (sums / counts[:, None]).ravel()
+        df['mae'] = (abs_sums / counts[:, None]).ravel()
+        df['rmse'] = np.sqrt(squared_sums / counts[:, None]).ravel()
+    return df
+
+class EspnFantasyApiStatSplits():
+    def __init__(self, espn_fantasy_api_downloads_root_folder=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")):
+        """ Constructor. Takes in the root folder of ESPN fantasy API downloads. """
+        self._root_folder = espn_fantasy_api_downloads_root_folder
+        self._loader = EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder)
+
+    def get_seasons(self):
+        """ Returns list of seasons in the downloads root folder. """
+        return self._loader.get_seasons()
+
+    @instrumentation.Timer("stat_splits.get_stat_splits_df_by_season")
+    def get_stat_splits_df_by_season(self, season_string):
+        """ Returns dataframe of all stat splits of players in all scoring period
+            and all players info files of a season (see get_stat_splits_df). """
+        dfs = []
+        league_info_dict = self._loader.get_league_info_dict(season_string)
+        if league_info_dict is not None:
+            scoring_period_end = min(league_info_dict['status']['latestScoringPeriod'], league_info_dict['status']['finalScoringPeriod'])
+            for scoring_period in range(league_info_dict['status']['firstScoringPeriod'], scoring_period_end + 1):
+                scoring_period_dict = self._loader.get_scoring_period_dict(season_string, scoring_period)
+                if scoring_period_dict is None:
+                    continue
+                players = [entry['playerPoolEntry']['player'] for team in scoring_period_dict.get('teams', [])
+                           for entry in team.get('roster', {}).get('entries', [])]
+                dfs.append(get_stat_splits_df(season_string, players))
+
+        for page_dict in self._loader.iter_all_players_info_dicts(season_string):
+            dfs.append(get_stat_splits_df(season_string, [player['player'] for player in page_dict.get('players', []) if 'player' in player]))
+
+        if not dfs:
+            return pd.DataFrame(columns=STAT_SPLITS_COLUMNS)
+        df = pd.concat(dfs, ignore_index=True).drop_duplicates(SPLIT_KEY_COLUMNS + ['statSourceId'], keep='last', ignore_index=True)
+        instrumentation.increment("rows_produced.stat_splits", len(df))
+        return df
+
+    @instrumentation.Timer("stat_splits.get_stat_splits_df")
+    def get_stat_splits_df(self, seasons=None, multiprocess=True):
+        """ Returns dataframe of all stat splits of the given seasons (all seasons if
+            not given). Seasons are processed in a pool of processes if multiprocess. """
+        seasons = self.get_seasons() if seasons is None else seasons
+        if not seasons:
+            return pd.DataFrame(columns=STAT_SPLITS_COLUMNS)
+
+        if not multiprocess or len(seasons) == 1:
+            dfs = [self.get_stat_splits_df_by_season(season_string) for season_string in seasons]
+        else:
+            pool = multiprocessing.Pool(processes=min(len(seasons), os.cpu_count() or 1))
+            dfs = pool.map(self.get_stat_splits_df_by_season, seasons)
+            pool.close()
+            pool.join()
+
+        return pd.concat(dfs, ignore_index=True)
+
+    def get_projection_errors_df(self, seasons=None, multiprocess=True):
+        """ Returns dataframe of projection errors of all stat splits of the given
+            seasons (all seasons if not given). See get_projection_errors_df. """
+        return get_projection_errors_df(self.get_stat_splits_df(seasons, multiprocess))
+
+if __name__ == "__main__":
+    start_time = timeit.default_timer()
+
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads"),
+                           help="Root folder path containing ESPN Fantasy API downloaded files.")
+    arg_parse.add_argument("--seasons", type=str, nargs="*", default=None, help="Seasons to score projections of (Example: 20232024 20242025). Defaults to all.")
+    arg_parse.add_argument("--by", type=str, nargs="*", default=['season', 'statSplitTypeId'], help="Columns to group projection accuracy by.")
+    arg_parse.add_argument("--out_file_path", type=str, default=os.path.join(SCRIPT_DIR, "projection_errors_df.csv"),
+                           help="Output file path of projection errors of every player and split.")
+    args = arg_parse.parse_args()
+
+    errors_df = EspnFantasyApiStatSplits(args.espn_fantasy_api_downloads_root_folder).get_projection_errors_df(args.seasons)
+    errors_df.to_csv(args.out_file_path, index=False)
+    print(get_accuracy_df(errors_df, args.by).to_string(index=False))
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s.")
\ No newline at end of file
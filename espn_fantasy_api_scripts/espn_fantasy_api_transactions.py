@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+""" Infers roster transactions of each owner from the rosters of consecutive
+    scoring periods.
+
+    Each owner's roster is kept as arrays of player IDs (sorted) and lineup
+    slot IDs, so the difference between two scoring periods is a few set
+    operations on integer arrays instead of merging roster dataframes:
+    - add: Player on the roster that wasn't on any roster in the previous scoring period.
+    - drop: Player no longer on the roster that isn't on any other roster.
+    - trade: Player on the roster that was on another owner's roster in the previous
+      scoring period (fromOwner). A drop and pick-up by another owner on the
+      same day looks the same as a trade.
+    - lineup: Player on the roster in both scoring periods whose lineup slot changed.
+    No transactions are inferred for the first scoring period of a season.
+
+    Transactions of complete scoring periods are kept in a state file of the
+    season (XXXXYYYY_transactions_state.json) with the rosters of the last
+    scoring period, so only scoring periods downloaded since the last update
+    are loaded. The latest scoring period can still change during the day, so
+    it is never saved to the state, and neither are scoring periods after one
+    that isn't downloaded (same as EspnFantasyApiStandings).
+
+    Moves are the transactions counted in the 'Moves' column of league
+    standings (see MOVES_TRANSACTION_TYPES). They are used by
+    EspnFantasyApiStandings and can be reconciled with archived HTML league
+    standings (see reconcile_moves_df).
+"""
+import argparse
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_scoring_period_parser import EspnFantasyApiScoringPeriodParser
+import json
+import numpy as np
+import os
+import pandas as pd
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STATE_VERSION = 1
+
+TRANSACTION_TYPES = ['add', 'drop', 'trade', 'lineup']
+# ESPN counts players acquired from free agency or waivers as moves, trades are counted separately
+MOVES_TRANSACTION_TYPES = ['add']
+TRANSACTIONS_COLUMNS = ['season', 'scoringPeriodId', 'owner', 'type', 'id', 'fullName', 'fromOwner', 'fromLineupSlotId', 'lineupSlotId']
+
+def get_rosters(scoring_period_dict, owner_id_map):
+    """ Returns dictionary of each owner's roster of a scoring period, in the form:
+        {<owner>: {'ids': <array>, 'lineupSlotIds': <array>, 'fullNames': <array>}}
+        sorted by player ID. Owner IDs are mapped to owners with the given map.
+        Teams without an owner are skipped. """
+    scoring_period_parser = EspnFantasyApiScoringPeriodParser(scoring_period_dict)
+    rosters = {}
+    for owner_id in scoring_period_parser.get_owner_ids():
+        roster_dicts = scoring_period_parser.get_owner_roster_as_dicts(owner_id)
+        ids = np.array([roster_dict['id'] for roster_dict in roster_dicts], dtype=np.int64)
+        order = np.argsort(ids, kind='stable')
+        rosters[owner_id_map.get(owner_id, owner_id)] = {
+            'ids': ids[order],
+            'lineupSlotIds': np.array([roster_dict['lineupSlotId'] for roster_dict in roster_dicts], dtype=np.int64)[order],
+            'fullNames': np.array([roster_dict['fullName'] for roster_dict in roster_dicts], dtype=object)[order]}
+    return rosters
+
+def get_transactions(previous_rosters, rosters):
+    """ Returns list of transaction dictionaries of each owner between the rosters of
+        two consecutive scoring periods (see get_rosters). Each dictionary has the
+        keys of TRANSACTIONS_COLUMNS except season and scoringPeriodId. """
+    previous_all_ids, previous_all_owners = _get_all_ids(previous_rosters)
+    all_ids, _ = _get_all_ids(rosters)
+
+    transactions = []
+    for owner, roster in rosters.items():
+        previous_roster = previous_rosters.get(owner)
+        if previous_roster is None:
+            continue
+        ids = roster['ids']
+        previous_ids = previous_roster['ids']
+
+        # Added players were on another roster (trade) or no roster (add)
+        added = np.setdiff1d(ids, previous_ids, assume_unique=True)
+        added_index = np.searchsorted(ids, added)
+        previous_index = np.minimum(np.searchsorted(previous_all_ids, added), max(len(previous_all_ids) - 1, 0))
+        traded = (previous_all_ids[previous_index] == added) if len(previous_all_ids) else np.zeros(len(added), dtype=bool)
+        for i, id in enumerate(added):
+            transactions.append({'owner': owner, 'type': "trade" if traded[i] else "add", 'id': int(id),
+                                 'fullName': roster['fullNames'][added_index[i]],
+                                 'fromOwner': previous_all_owners[previous_index[i]] if traded[i] else None,
+                                 'fromLineupSlotId': None, 'lineupSlotId': int(roster['lineupSlotIds'][added_index[i]])})
+
+        # Dropped players that are on another roster are traded (added to the other owner)
+        dropped = np.setdiff1d(previous_ids, ids, assume_unique=True)
+        dropped = dropped[~np.isin(dropped, all_ids, assume_unique=True)]
+        dropped_index = np.searchsorted(previous_ids, dropped)
+        for i, id in enumerate(dropped):
+            transactions.append({'owner': owner, 'type': "drop", 'id': int(id), 'fullName': previous_roster['fullNames'][dropped_index[i]],
+                                 'fromOwner': None, 'fromLineupSlotId': int(previous_roster['lineupSlotIds'][dropped_index[i]]), 'lineupSlotId': None})
+
+        # Players on both rosters that changed lineup slots
+        kept, previous_kept_index, kept_index = np.intersect1d(previous_ids, ids, assume_unique=True, return_indices=True)
+        moved = previous_roster['lineupSlotIds'][previous_kept_index] != roster['lineupSlotIds'][kept_index]
+        for previous_i, i in zip(previous_kept_index[moved], kept_index[moved]):
+            transactions.append({'owner': owner, 'type': "lineup", 'id': int(ids[i]), 'fullName': roster['fullNames'][i],
+                                 'fromOwner': None, 'fromLineupSlotId': int(previous_roster['lineupSlotIds'][previous_i]),
+                                 'lineupSlotId': int(roster['lineupSlotIds'][i])})
+
+    return transactions
+
+def get_moves_df(transactions_df):
+    """ Returns dataframe of the number of transactions of each type of each owner and season,
+        and the number of 'moves' (see MOVES_TRANSACTION_TYPES). """
+    if transactions_df.empty:
+        return pd.DataFrame(columns=['season', 'owner'] + TRANSACTION_TYPES + ['moves'])
+    df = transactions_df.groupby(['season', 'owner'])['type'].value_counts().unstack(fill_value=0)
+    df = df.reindex(columns=TRANSACTION_TYPES, fill_value=0).rename_axis(columns=None).reset_index()
+    df['moves'] = df[MOVES_TRANSACTION_TYPES].sum(axis=1)
+    return df
+
+def reconcile_moves_df(transactions_df, standings_stats_df):
+    """ Returns dataframe comparing the 'Moves' of each owner in league standings stats
+        (with 'Season', 'Owner' and 'Moves' columns) to the number of moves in
+        transactions. 'Difference' is the number of moves not found in transactions. """
+    moves_df = get_moves_df(transactions_df).rename(columns={'season': 'Season', 'owner': 'Owner'})
+    moves_df['Season'] = moves_df['Season'].astype(int)
+    df = standings_stats_df[['Season', 'Owner', 'Moves']].astype({'Season': int}).merge(moves_df, on=['Season', 'Owner'], how='left')
+    df[TRANSACTION_TYPES + ['moves']] = df[TRANSACTION_TYPES + ['moves']].fillna(0).astype(int)
+    df['Difference'] = pd.to_numeric(df['Moves'], errors='coerce') - df['moves']
+    return df
+
+def _get_all_ids(rosters):
+    """ Returns tuple of (<sorted array of player IDs of all rosters>, <array of owner of each player ID>). """
+    if not rosters:
+        return np.array([], dtype=np.int64), np.array([], dtype=object)
+    ids = np.concatenate([roster['ids'] for roster in rosters.values()])
+    owners = np.concatenate([np.full(len(roster['ids']), owner, dtype=object) for owner, roster in rosters.items()])
+    order = np.argsort(ids, kind='stable')
+    return ids[order], owners[order]
+
+class EspnFantasyApiTransactions():
+    def __init__(self, espn_fantasy_api_downloads_root_folder=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads")):
+        """ Constructor. Takes in the root folder of ESPN fantasy API downloads. """
+        self._root_folder = espn_fantasy_api_downloads_root_folder
+        self._loader = EspnFantasyApiLoader(espn_fantasy_api_downloads_root_folder)
+
+    @instrumentation.Timer("transactions.get_transactions_df")
+    def get_transactions_df(self, season_string):
+        """ Returns dataframe of transactions of a season (see TRANSACTIONS_COLUMNS).
+            Lineup slot IDs not part of a transaction type are missing (<NA>).
+            Updates the season's state with any new complete scoring periods.
+            Returns an empty dataframe if the season has no league info. """
+        league_info_dict = self._loader.get_league_info_dict(season_string)
+        if league_info_dict is None:
+            return pd.DataFrame(columns=TRANSACTIONS_COLUMNS)
+
+        owner_id_map = self._loader.get_members_id_map(season_string)
+        first_scoring_period = league_info_dict['status']['firstScoringPeriod']
+        latest_scoring_period = min(league_info_dict['status']['latestScoringPeriod'], league_info_dict['status']['finalScoringPeriod'])
+
+        # Add complete scoring periods to the saved state, up to the first one that isn't downloaded
+        state = self._load_state(season_string)
+        if state['scoringPeriodId'] < latest_scoring_period - 1:
+            state = self._update_state(state, season_string, owner_id_map, max(state['scoringPeriodId'] + 1, first_scoring_period), latest_scoring_period - 1,
+                                       stop_at_missing=True)
+            self._save_state(season_string, state)
+
+        # Add other scoring periods on top of the saved state
+        current_state = self._update_state(dict(state, transactions=list(state['transactions'])), season_string, owner_id_map,
+                                           max(state['scoringPeriodId'] + 1, first_scoring_period), latest_scoring_period)
+        df = pd.DataFrame(current_state['transactions'], columns=TRANSACTIONS_COLUMNS)
+        return df.astype({'id': int, 'fromLineupSlotId': 'Int64', 'lineupSlotId': 'Int64'})
+
+    def _update_state(self, state, season_string, owner_id_map, start_scoring_period, end_scoring_period, stop_at_missing=False):
+        """ Adds transactions of scoring periods from start to end (inclusive) to the state.
+            If stop_at_missing is True, stops at the first scoring period that isn't
+            downloaded, so it is still added once downloaded. Returns the state. """
+        rosters = self._from_state_rosters(state['rosters']) if state['rosters'] is not None else None
+        last_scoring_period = end_scoring_period
+        for scoring_period in range(start_scoring_period, end_scoring_period + 1):
+            scoring_period_dict = self._loader.get_scoring_period_dict(season_string, scoring_period)
+            if scoring_period_dict is None:
+                if stop_at_missing:
+                    last_scoring_period = scoring_period - 1
+                    break
+                continue
+
+            next_rosters = get_rosters(scoring_period_dict, owner_id_map)
+            if rosters is not None:
+                transactions = get_transactions(rosters, next_rosters)
+                state['transactions'].extend({'season': season_string, 'scoringPeriodId': scoring_period, **t} for t in transactions)
+                instrumentation.increment("rows_produced.transactions", len(transactions))
+            rosters = next_rosters
+
+        state['scoringPeriodId'] = max(state['scoringPeriodId'], last_scoring_period)
+        state['rosters'] = self._to_state_rosters(rosters) if rosters is not None else None
+        return state
+
+    def _to_state_rosters(self, rosters):
+        """ Returns rosters with lists instead of arrays, to be saved as JSON. """
+        return {owner: {key: values.tolist() for key, values in roster.items()} for owner, roster in rosters.items()}
+
+    def _from_state_rosters(self, state_rosters):
+        """ Returns rosters saved in a state with arrays instead of lists. """
+        return {owner: {'ids': np.array(roster['ids'], dtype=np.int64), 'lineupSlotIds': np.array(roster['lineupSlotIds'], dtype=np.int64),
+                        'fullNames': np.array(roster['fullNames'], dtype=object)} for owner, roster in state_rosters.items()}
+
+    def _get_state_path(self, season_string):
+        """ Returns path of the transactions state file of a season. """
+        return os.path.join(self._root_folder, season_string, f"{season_string}_transactions_state.json")
+
+    def _load_state(self, season_string):
+        """ Returns saved transactions state of a season. Returns an empty state if not saved. """
+        empty_state = {'version': STATE_VERSION, 'scoringPeriodId': 0, 'rosters': None, 'transactions': []}
+        try:
+            with open(self._get_state_path(season_string), 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return empty_state
+
+        if state.get('version') != STATE_VERSION:
+            return empty_state
+        return state
+
+    def _save_state(self, season_string, state):
+        """ Saves transactions state of a season. """
+        temp_path = f"{self._get_state_path(season_string)}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self._get_state_path(season_string))
+
+if __name__ == "__main__":
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("season_string", type=str, help="Season to infer transactions of (Example: 20242025).")
+    arg_parse.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=os.path.join(SCRIPT_DIR, "espn_fantasy_api_downloads"),
+                           help="Root folder path containing ESPN Fantasy API downloaded files.")
+    arg_parse.add_argument("--espn_html_root_folder", type=str, default=None,
+                           help="Root folder path containing ESPN HTML files, to reconcile moves with league standings.")
+    args = arg_parse.parse_args()
+
+    transactions_df = EspnFantasyApiTransactions(args.espn_fantasy_api_downloads_root_folder).get_transactions_df(args.season_string)
+    print(get_moves_df(transactions_df).to_string(index=False))
+    if args.espn_html_root_folder is not None:
+        from espn_html_parser_scripts.espn_html_parser import EspnHtmlParser
+        standings_stats_df = EspnHtmlParser(args.espn_html_root_folder).get_league_standings_stats_df()
+        standings_stats_df = standings_stats_df[standings_stats_df['Season'] == int(args.season_string)]
+        print(reconcile_moves_df(transactions_df, standings_stats_df).to_string(index=False))
\ No newline at end of file
@@ -49,4 +49,23 @@ STATS_MAP = {
     44: '44',
     45: '45',
     99: '99'
-    }
\ No newline at end of file
+    }
+
+# Prefix of columns of raw stat counts (Example: "raw_G" is the number of goals, "G" is the points earned from goals)
+RAW_STATS_PREFIX = "raw_"
+
+# Lineup slots map (Reference: https://github.com/cwendt94/espn-api)
+LINEUP_SLOTS_MAP = {
+    0: 'C',
+    1: 'LW',
+    2: 'RW',
+    3: 'F',
+    4: 'D',
+    5: 'G',
+    6: 'UTIL',
+    7: 'BE',
+    8: 'IR'
+    }
+
+# Lineup slots that don't count towards standings (bench and injured reserve)
+INACTIVE_LINEUP_SLOT_IDS = [7, 8]
\ No newline at end of file
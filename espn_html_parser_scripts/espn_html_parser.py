@@ -25,19 +25,20 @@ from espn_html_parser_scripts.espn_html_parser_league_standings import EspnHtmlP
 from espn_html_parser_scripts.espn_html_parser_draft_recap import EspnHtmlParserDraftRecap
 import os
 import pandas as pd
-import re
+from utils.file_catalog import get_catalog
 
 class EspnHtmlParser():
     def __init__(self, espn_html_files_root_path):
         """ Default constructor. """
         self._espn_html_files_root_path = espn_html_files_root_path
-        self._seasons_list = self._get_seasons()
+        self._catalog = get_catalog(espn_html_files_root_path)
+        self._seasons_list = self._catalog.get_seasons()
 
     def get_league_standings_points_df(self):
         """ Returns dataframe of league standings points data. """
         combined_df = pd.DataFrame()
         for season in self._seasons_list:
-            file_path = self._find_file_in_folder(os.path.join(self._espn_html_files_root_path, season), "League Standings")
+            file_path = self._find_file_in_season(season, "League Standings")
             df = EspnHtmlParserLeagueStandings(file_path).get_season_standings_points_df()
             df['Season'] = int(season)
             combined_df = pd.concat([combined_df, df])
@@ -48,7 +49,7 @@ class EspnHtmlParser():
         """ Returns dataframe of league standings stats data. """
         combined_df = pd.DataFrame()
         for season in self._seasons_list:
-            file_path = self._find_file_in_folder(os.path.join(self._espn_html_files_root_path, season), "League Standings")
+            file_path = self._find_file_in_season(season, "League Standings")
             df = EspnHtmlParserLeagueStandings(file_path).get_season_standings_stats_df()
             df['Season'] = int(season)
             combined_df = pd.concat([combined_df, df])
@@ -59,11 +60,11 @@ class EspnHtmlParser():
         """ Returns dataframe of draft data. """
         combined_df = pd.DataFrame()
         for season in self._seasons_list:
-            draft_recap_file_path = self._find_file_in_folder(os.path.join(self._espn_html_files_root_path, season), "Draft Recap")
+            draft_recap_file_path = self._find_file_in_season(season, "Draft Recap")
             df = EspnHtmlParserDraftRecap(draft_recap_file_path).get_df()
 
             # Reach into league standings data because it contains some info about team and owner names
-            league_standings_file_path = self._find_file_in_folder(os.path.join(self._espn_html_files_root_path, season), "League Standings")
+            league_standings_file_path = self._find_file_in_season(season, "League Standings")
             if league_standings_file_path is not None:
                 team_owner_map_df = EspnHtmlParserLeagueStandings(league_standings_file_path).get_team_owners_df()
                 team_owner_map_df = team_owner_map_df.rename(columns={'Team': "Team Name", 'Owner': "Owner Name"})
@@ -76,44 +77,29 @@ class EspnHtmlParser():
 
         return combined_df
 
-    def _get_seasons(self):
-        """ Returns a list of season folders from the root.
-            Folder must be in the form XXXXYYYY. """
-        # Regex pattern to find a season string
-        #   - ^ used to denote start of string searching
-        #   - $ used to denote end of string searching
-        #   - + used to denote any repeating numbers between [0-9]
-        # Examples:
-        #  - "20192020" (ok)
-        #  - "aaa20192020" (no)
-        #  - "20192020aaa" (no)
-        ret_list = []
-        season_string_re_pattern = "^[0-9]+$"
-
-        for item in os.listdir(self._espn_html_files_root_path):
-            item_path = os.path.join(self._espn_html_files_root_path, item)
-            if os.path.isdir(item_path) and re.match(season_string_re_pattern, item):
-                ret_list.append(item)
-
-        return ret_list
-
-    def _find_file_in_folder(self, folder_path, str_pattern):
-        """ Simple helper function that returns the path of the first file found
-            that contains the given string pattern. """
-        for item in os.listdir(folder_path):
+    def _find_file_in_season(self, season, str_pattern):
+        """ Simple helper function that returns the path of the first file of a season
+            folder (in name order) that contains the given string pattern. """
+        for item in self._catalog.list_files(season):
             if str_pattern in item:
-                return os.path.join(folder_path, item)
+                return os.path.join(self._espn_html_files_root_path, season, item)
         return None
 
-if __name__ == "__main__":
-    argparser = argparse.ArgumentParser()
+def add_arguments(argparser):
+    """ Adds command line arguments to an argument parser. """
     argparser.add_argument("--input_dir", "-i", required=True, help="Input root path to ESPN HTML files for parsing.""")
-    args = argparser.parse_args()
 
+def main(args):
+    """ Parses all HTML files in the input folder and outputs the parsed data. """
     espn_html_parser = EspnHtmlParser(args.input_dir)
     espn_html_parser.get_league_standings_points_df().to_csv("espn_html_parsed_league_standings_points.csv", index=False)
     espn_html_parser.get_league_standings_stats_df().to_csv("espn_html_parsed_league_standings_stats.csv", index=False)
     print("Generated league standings data.")
 
     espn_html_parser.get_draft_df().to_csv("espn_html_parsed_draft_df.csv", index=False)
-    print("Generated draft recap data.")
\ No newline at end of file
+    print("Generated draft recap data.")
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    add_arguments(argparser)
+    main(argparser.parse_args())
\ No newline at end of file
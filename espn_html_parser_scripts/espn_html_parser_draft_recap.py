@@ -2,8 +2,10 @@
 """ Parser for ESPN draft recap files. """
 import argparse
 import espn_html_parser_scripts.espn_html_parser_utils as espn_html_parser_utils
+from espn_html_parser_scripts.espn_html_table_extractor import get_columns, get_df, read_html_tables
 import os
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 class EspnHtmlParserDraftRecap():
     """ Class for ESPN draft recap file parsing. """
@@ -36,24 +38,31 @@ class EspnHtmlParserDraftRecap():
 
         # Read HTML file for all tables/data
         try:
-            html_dfs = pd.read_html(self._html_path)
+            with instrumentation.Timer("html_parser.read_tables"):
+                html_tables = read_html_tables(self._html_path)
         # Intentional except-all
         except:
             print("Cannot parse input HTML.")
             self.valid = False
             return combined_df
 
-        # Combine dataframes
-        combined_df = self._get_combined_df(html_dfs)
+        if not html_tables:
+            print("No tables found in input HTML.")
+            self.valid = False
+            return combined_df
+
+        # Combine tables
+        combined_df = self._get_combined_df(html_tables)
+        instrumentation.increment("rows_produced.draft_recap", len(combined_df))
         return combined_df
 
-    def _get_combined_df(self, df_list):
-        """ Combines list of dataframes into one big list. """
-        combined_df = pd.DataFrame()
-        for index, df in enumerate(df_list):
-            # Add round number column to beginning of dataframe
-            df.insert(0, 'Round Number', index + 1)
-            combined_df = pd.concat([combined_df, df], axis=0, ignore_index=True)
+    def _get_combined_df(self, html_tables):
+        """ Combines list of tables of each draft round into one dataframe. """
+        # Rows of all rounds are built at once with the round number at the beginning of each row
+        # Assumes all rounds have the same columns
+        columns = get_columns(html_tables[0])
+        rows = [[str(index + 1)] + row for index, table in enumerate(html_tables) for row in table['body']]
+        combined_df = get_df(rows, pd.Index(['Round Number']).append(columns))
 
         # Rename "Team" column to differentiate between player's actual NHL team,
         # and name of a team in the fantasy league.
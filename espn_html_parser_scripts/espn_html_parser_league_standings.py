@@ -2,8 +2,10 @@
 """ Parser for ESPN league standings files. """
 import argparse
 import espn_html_parser_scripts.espn_html_parser_utils as espn_html_parser_utils
+from espn_html_parser_scripts.espn_html_table_extractor import get_table_df, read_html_tables
 import os
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 NUM_EXPECTED_HTML_TABLES = 6
 class EspnHtmlParserLeagueStandings():
@@ -112,11 +114,9 @@ class EspnHtmlParserLeagueStandings():
         combined_df = pd.concat([combined_df, self._html_dfs[4].droplevel(0, axis=1)], axis=1)
 
         # 6th dataframe is a single column of number of moves made
-        # For some reason, this gets incorrectly parsed
-        # First, the column name of this is actually a valid row entry
-        # Then, change the column name to something more descriptive
-        df = self._html_dfs[5]
-        df = pd.concat([pd.DataFrame([{df.columns[0]: df.columns[0]}]), df], ignore_index=True)
+        # Change the column name to something more descriptive
+        # Kept as object type, the same as when parsed with pd.read_html
+        df = self._html_dfs[5].astype(object)
         df.columns = ['Moves']
         combined_df = pd.concat([combined_df, df], axis=1)
         return combined_df
@@ -130,7 +130,8 @@ class EspnHtmlParserLeagueStandings():
             return dfs
 
         try:
-            dfs = pd.read_html(self._html_path)
+            with instrumentation.Timer("html_parser.read_tables"):
+                dfs = [get_table_df(table) for table in read_html_tables(self._html_path)]
         # Intentional catch all
         except:
             print("Unable to read HTML.")
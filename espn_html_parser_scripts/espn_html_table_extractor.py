@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+""" Extracts tables from saved ESPN HTML pages with a single lxml parse per file.
+
+    pd.read_html parses every table of a page (trying other parsers if one
+    fails) and builds a dataframe for each. ESPN pages only have a few tables
+    of interest, so this selects them with an XPath expression and builds rows
+    of text directly. Cell text, colspans and type conversion are handled the
+    same way as pd.read_html, so values are identical. Header rows without any
+    text are ignored, so the columns are a MultiIndex only if a table has more
+    than one header row with text.
+"""
+import lxml.html
+import pandas as pd
+from pandas.io.parsers import TextParser
+import re
+import utils.instrumentation as instrumentation
+
+# Tables of ESPN pages all have the "Table" class
+ESPN_TABLES_XPATH = "//table[contains(concat(' ', normalize-space(@class), ' '), ' Table ')]"
+
+def read_html_tables(html_path, tables_xpath=ESPN_TABLES_XPATH):
+    """ Returns list of tables in an HTML file selected by an XPath expression.
+        Each table is a dictionary in the form: {'header': [<row>, ...], 'body': [<row>, ...]}
+        where each row is a list of cell text. Raises an exception if the file
+        can't be parsed. """
+    with instrumentation.Timer("html_table_extractor.parse"):
+        document = lxml.html.parse(html_path)
+    instrumentation.increment("files_decoded")
+
+    tables = []
+    for table in document.xpath(tables_xpath):
+        header_rows = table.xpath("./thead/tr")
+        body_rows = table.xpath("./tbody/tr") or table.xpath("./tr")
+
+        # Same as pd.read_html: without a <thead>, top rows of only <th> cells are the header
+        if not header_rows:
+            while body_rows and all(cell.tag == "th" for cell in body_rows[0].xpath("./th|./td")):
+                header_rows.append(body_rows.pop(0))
+
+        tables.append({'header': [_get_row_texts(row) for row in header_rows],
+                       'body': [_get_row_texts(row) for row in body_rows]})
+    return tables
+
+def get_columns(table):
+    """ Returns columns of a table from its header rows with text. Returns a
+        MultiIndex if more than one header row has text. Returns None if no
+        header row has text. """
+    header_rows = [row for row in table['header'] if any(row)]
+    if not header_rows:
+        return None
+    if len(header_rows) == 1:
+        return pd.Index(header_rows[0])
+    return pd.MultiIndex.from_arrays(header_rows)
+
+def get_df(rows, columns):
+    """ Returns dataframe from rows of cell text, converting types of each column
+        the same way as pd.read_html (Example: "1,077" -> 1077, "+10.0" -> 10.0). """
+    num_columns = len(columns)
+    rows = [row + [""] * (num_columns - len(row)) for row in rows]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    with TextParser(rows, header=None, thousands=",") as text_parser:
+        df = text_parser.read()
+    df.columns = columns
+    return df
+
+def get_table_df(table):
+    """ Returns dataframe of a table. Columns are numbered if the table has no header. """
+    columns = get_columns(table)
+    if columns is None:
+        columns = pd.RangeIndex(max((len(row) for row in table['body']), default=0))
+    return get_df(table['body'], columns)
+
+def _get_row_texts(row):
+    """ Returns list of text of each cell in a row. Cells are repeated for their
+        colspan and whitespace is collapsed, the same as pd.read_html. """
+    texts = []
+    for cell in row.xpath("./th|./td"):
+        text = re.sub(r"[\r\n]+|\s{2,}", " ", cell.text_content().strip())
+        texts.extend([text] * int(cell.get("colspan") or 1))
+    return texts
\ No newline at end of file
@@ -1,47 +1,264 @@
-""" Generates data from nhlapi downloaded files. """
+""" Generates data from nhlapi downloaded files.
+
+    Team schedules and player game logs are aligned to ESPN fantasy scoring
+    periods through a calendar of each season: a dataframe of every date from
+    the first scoring period date (defaults to the first regular season game)
+    to the last regular season game, with one scoring period per date. Games and
+    game logs are then mapped to scoring periods with a single index lookup of
+    their dates, and games per scoring period or stats reconciled against ESPN
+    are array operations instead of per-game loops.
+"""
 import json
+import multiprocessing
+import numpy as np
 import os
 import pandas as pd
+import utils.instrumentation as instrumentation
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 
+REGULAR_SEASON_GAME_TYPE = 2
+
+# Stats of game log entries and the ESPN name of each stat (see STATS_MAP of espn_fantasy_api_utils)
+GAME_LOG_STATS_MAP = {'goals': 'G',
+                      'assists': 'A',
+                      'points': 'PTS',
+                      'plusMinus': '+/-',
+                      'pim': 'PIM',
+                      'powerPlayGoals': 'PPG',
+                      'powerPlayPoints': 'PPP',
+                      'shorthandedGoals': 'SHG',
+                      'shorthandedPoints': 'SHP',
+                      'gameWinningGoals': 'GWG',
+                      'shots': 'SOG',
+                      'gamesStarted': 'GS',
+                      'goalsAgainst': 'GA',
+                      'shotsAgainst': 'SA',
+                      'shutouts': 'SO'}
+
+# Goalie decisions of game log entries and the ESPN name of each stat
+GAME_LOG_DECISIONS_MAP = {'W': 'W', 'L': 'L', 'O': 'OTL'}
+
+GAME_LOG_STAT_COLUMNS = list(GAME_LOG_STATS_MAP.values()) + list(GAME_LOG_DECISIONS_MAP.values()) + ['GP']
+GAME_LOGS_COLUMNS = ['id', 'Season', 'gameId', 'gameDate', 'scoringPeriodId', 'Team', 'Opponent'] + GAME_LOG_STAT_COLUMNS
+SCHEDULE_COLUMNS = ['gameId', 'Season', 'gameDate', 'homeTeam', 'awayTeam']
+
+def get_calendar_df(schedule_df, first_scoring_period_date=None):
+    """ Returns dataframe of every date of a season with the columns: date, scoringPeriodId, numGames
+        Scoring period 1 is the first scoring period date (Example: "2024-10-04"), or the date of
+        the first game of the schedule if not given, with one scoring period per date until the
+        date of the last game. """
+    if schedule_df.empty:
+        return pd.DataFrame({'date': pd.Series(dtype=str), 'scoringPeriodId': pd.Series(dtype=np.int64), 'numGames': pd.Series(dtype=np.int64)})
+
+    game_dates = pd.to_datetime(schedule_df['gameDate'])
+    first_date = game_dates.min() if first_scoring_period_date is None else pd.Timestamp(first_scoring_period_date)
+    dates = pd.date_range(first_date, game_dates.max(), freq='D').strftime("%Y-%m-%d")
+    num_games = schedule_df['gameDate'].value_counts().reindex(dates, fill_value=0).to_numpy()
+    return pd.DataFrame({'date': dates, 'scoringPeriodId': np.arange(1, len(dates) + 1), 'numGames': num_games})
+
+def get_scoring_period_ids(calendar_df, dates):
+    """ Returns array of the scoring period ID of each date (Example: "2024-10-04").
+        Dates that are not in the calendar have a scoring period ID of 0. """
+    positions = pd.Index(calendar_df['date']).get_indexer(pd.Index(dates, dtype=object))
+    return np.where(positions >= 0, calendar_df['scoringPeriodId'].to_numpy()[positions], 0)
+
+def get_games_per_period_df(schedule_df, calendar_df):
+    """ Returns dataframe of the number of games of each team (rows) in each scoring period
+        of the calendar (columns). """
+    scoring_period_ids = get_scoring_period_ids(calendar_df, schedule_df['gameDate'])
+    teams = np.concatenate([schedule_df['homeTeam'].to_numpy(), schedule_df['awayTeam'].to_numpy()])
+    team_codes, team_names = pd.factorize(teams, sort=True)
+
+    # Games outside of the calendar are not counted
+    num_games = np.zeros((len(team_names), len(calendar_df) + 1), dtype=np.int64)
+    np.add.at(num_games, (team_codes, np.tile(scoring_period_ids, 2)), 1)
+    return pd.DataFrame(num_games[:, 1:], index=pd.Index(team_names, name='Team'), columns=calendar_df['scoringPeriodId'].to_numpy())
+
+def get_reconciliation_df(game_logs_df, espn_stats_df, player_id_map, stat_columns=None):
+    """ Returns dataframe of differences (NHL - ESPN) of stats of each player and scoring
+        period of a season, with the columns: id, espnId, scoringPeriodId, <stat columns>, Matches
+        - game_logs_df: game logs of the season (see NhlapiDataGenerator.get_game_logs_df)
+        - espn_stats_df: ESPN stats of the same season with an 'id' (ESPN player ID),
+          'scoringPeriodId' and a column of raw counts for each stat (Example: actual
+          scoring period splits of EspnFantasyApiStatSplits)
+        - player_id_map: dictionary or series of ESPN player ID to NHL player ID
+        Only players with ESPN stats and an NHL player ID are compared. Stats default to
+        all stats of game logs that ESPN stats have. Stats missing from either side count as 0. """
+    if stat_columns is None:
+        stat_columns = [column for column in GAME_LOG_STAT_COLUMNS if column in espn_stats_df.columns]
+    key_columns = ['id', 'scoringPeriodId']
+
+    # Sum stats of each player and scoring period on both sides
+    espn_df = espn_stats_df[['id', 'scoringPeriodId'] + stat_columns].rename(columns={'id': 'espnId'})
+    espn_df.insert(0, 'id', espn_df['espnId'].map(player_id_map))
+    espn_df = espn_df[espn_df['id'].notna()].astype({'id': np.int64})
+    espn_ids = espn_df.groupby('id')['espnId'].first()
+    espn_df = espn_df.groupby(key_columns)[stat_columns].sum()
+    nhl_df = game_logs_df[(game_logs_df['scoringPeriodId'] > 0) & game_logs_df['id'].isin(espn_ids.index)]
+    nhl_df = nhl_df.groupby(key_columns)[stat_columns].sum()
+
+    index = nhl_df.index.union(espn_df.index)
+    differences = nhl_df.reindex(index, fill_value=0).to_numpy(dtype=np.float64) - espn_df.reindex(index, fill_value=0).to_numpy(dtype=np.float64)
+    df = index.to_frame(index=False)
+    df.insert(1, 'espnId', df['id'].map(espn_ids).to_numpy())
+    df[stat_columns] = differences
+    df['Matches'] = ~differences.any(axis=1)
+    return df
+
 class NhlapiDataGenerator():
     def __init__(self, nhlapi_downloads_root_folder=os.path.join(SCRIPT_DIR, "nhlapi_downloads"), out_dir_path=SCRIPT_DIR):
         """ Default constructor. """
         self._nhlapi_downloads_root_folder = nhlapi_downloads_root_folder
         self._out_dir_path = out_dir_path
 
+        self._calendar_dfs = {}
+
     def generate(self):
-        """ Generates data to file. """
+        """ Generates data to file. Calendars and game logs are only generated for
+            seasons with downloaded team schedules. """
         self.get_df().to_csv(os.path.join(self._out_dir_path, "nhlapi_players_data_df.csv"), index=False)
 
-    def get_df(self):
-        """ Returns a dataframe of parsed data. """
+        season_string_list = self._get_season_strings("team_schedules")
+        if season_string_list:
+            calendar_df = pd.concat([self.get_calendar_df(season_string).assign(Season=int(season_string))
+                                     for season_string in season_string_list], ignore_index=True)
+            calendar_df.to_csv(os.path.join(self._out_dir_path, "nhlapi_calendar_df.csv"), index=False)
+            game_logs_df = pd.concat([self.get_game_logs_df(season_string) for season_string in season_string_list], ignore_index=True)
+            game_logs_df.to_csv(os.path.join(self._out_dir_path, "nhlapi_game_logs_df.csv"), index=False)
+
+    @instrumentation.Timer("nhlapi_data_generator.get_df")
+    def get_df(self, multiprocess=True):
+        """ Returns a dataframe of parsed data. Seasons are parsed in parallel
+            processes if multiprocess is True and there is more than one season. """
+        season_string_list = self._get_season_strings("team_rosters")
+
+        if not multiprocess or len(season_string_list) <= 1:
+            players_lists = [self.get_players_list_by_season(season_string) for season_string in season_string_list]
+        else:
+            # Use multiprocessing to parse each season's roster files
+            pool = multiprocessing.Pool(processes=min(len(season_string_list), os.cpu_count() or 1))
+            results = []
+            for season_string in season_string_list:
+                async_result = pool.apply_async(func=self.get_players_list_by_season, args=(season_string,))
+                results.append(async_result)
+
+            pool.close()
+            pool.join()
+
+            players_lists = [res.get() for res in results]
+
+        return pd.DataFrame([player for players_list in players_lists for player in players_list])
+
+    def get_players_list_by_season(self, season_string):
+        """ Returns a list of dictionaries of all players in a season's team rosters. """
         players_list = []
-        for folder in os.listdir(self._nhlapi_downloads_root_folder):
-            folder_path = os.path.join(self._nhlapi_downloads_root_folder, folder)
-            if os.path.isdir(folder_path):
-                season_string = folder
-
-                for file in os.listdir(os.path.join(folder_path, "team_rosters")):
-                    file_path = os.path.join(folder_path, "team_rosters", file)
-                    team_abbrev = os.path.splitext(os.path.basename(file_path))[0][-3:]
-                    json_data = json.load(open(file_path, 'r'))
-
-                    for position, entries in json_data.items():
-                        for player in entries:
-                            players_list.append({'id': player['id'],
-                                                 'Season': int(season_string),
-                                                 'Player': f"{player['firstName']['default']} {player['lastName']['default']}",
-                                                 'Team': team_abbrev,
-                                                 'Position': player['positionCode'],
-                                                 'Player Shoots-Catches': player['shootsCatches'],
-                                                 'Player Birth Country': player['birthCountry'],
-                                                 'Player Birth Date': player['birthDate'],
-                                                 'Player Height (in)': player['heightInInches'],
-                                                 'Player Weight (lb)': player['weightInPounds']})
-
-        return pd.DataFrame(players_list)
+        folder_path = os.path.join(self._nhlapi_downloads_root_folder, season_string, "team_rosters")
+        for file in sorted(os.listdir(folder_path)):
+            file_path = os.path.join(folder_path, file)
+            team_abbrev = os.path.splitext(os.path.basename(file_path))[0][-3:]
+            with open(file_path, 'r') as f:
+                json_data = json.load(f)
+
+            for position, entries in json_data.items():
+                for player in entries:
+                    players_list.append({'id': player['id'],
+                                         'Season': int(season_string),
+                                         'Player': f"{player['firstName']['default']} {player['lastName']['default']}",
+                                         'Team': team_abbrev,
+                                         'Position': player['positionCode'],
+                                         'Player Shoots-Catches': player['shootsCatches'],
+                                         'Player Birth Country': player['birthCountry'],
+                                         'Player Birth Date': player['birthDate'],
+                                         'Player Height (in)': player['heightInInches'],
+                                         'Player Weight (lb)': player['weightInPounds']})
+
+        return players_list
+
+    def get_schedule_df(self, season_string):
+        """ Returns dataframe of all regular season games of a season's team schedules with
+            the columns SCHEDULE_COLUMNS. Games in more than one schedule are only kept once. """
+        games = []
+        folder_path = os.path.join(self._nhlapi_downloads_root_folder, season_string, "team_schedules")
+        if os.path.isdir(folder_path):
+            for file in sorted(os.listdir(folder_path)):
+                with open(os.path.join(folder_path, file), 'r') as f:
+                    json_data = json.load(f)
+
+                for game in json_data.get('games', []):
+                    if game.get('gameType') != REGULAR_SEASON_GAME_TYPE:
+                        continue
+                    games.append({'gameId': game['id'],
+                                  'Season': int(season_string),
+                                  'gameDate': game['gameDate'],
+                                  'homeTeam': game['homeTeam']['abbrev'],
+                                  'awayTeam': game['awayTeam']['abbrev']})
+
+        df = pd.DataFrame(games, columns=SCHEDULE_COLUMNS)
+        return df.drop_duplicates('gameId').sort_values(['gameDate', 'gameId'], ignore_index=True)
+
+    def get_calendar_df(self, season_string, first_scoring_period_date=None):
+        """ Returns dataframe of the calendar of a season (see get_calendar_df). Calendars are
+            computed once per season and first scoring period date. """
+        key = (season_string, first_scoring_period_date)
+        if key not in self._calendar_dfs:
+            self._calendar_dfs[key] = get_calendar_df(self.get_schedule_df(season_string), first_scoring_period_date)
+        return self._calendar_dfs[key]
+
+    def get_games_per_period_df(self, season_string, first_scoring_period_date=None):
+        """ Returns dataframe of the number of games of each team in each scoring period of a season. """
+        return get_games_per_period_df(self.get_schedule_df(season_string), self.get_calendar_df(season_string, first_scoring_period_date))
+
+    @instrumentation.Timer("nhlapi_data_generator.get_game_logs_df")
+    def get_game_logs_df(self, season_string, first_scoring_period_date=None):
+        """ Returns dataframe of all entries of a season's player game logs with the columns
+            GAME_LOGS_COLUMNS. Each entry has the scoring period of its date (0 if not in
+            the season's calendar). Stats missing from an entry count as 0. """
+        columns = {column: [] for column in ['id', 'gameId', 'gameDate', 'Team', 'Opponent']}
+        stat_rows, stat_indices, stat_values = [], [], []
+        stat_index = {column: i for i, column in enumerate(GAME_LOG_STAT_COLUMNS)}
+        folder_path = os.path.join(self._nhlapi_downloads_root_folder, season_string, "player_game_logs")
+        if os.path.isdir(folder_path):
+            for file in sorted(os.listdir(folder_path)):
+                player_id = int(os.path.splitext(file)[0].split("_")[-1])
+                with open(os.path.join(folder_path, file), 'r') as f:
+                    json_data = json.load(f)
+
+                for entry in json_data.get('gameLog', []):
+                    row = len(columns['id'])
+                    columns['id'].append(player_id)
+                    columns['gameId'].append(entry['gameId'])
+                    columns['gameDate'].append(entry['gameDate'])
+                    columns['Team'].append(entry.get('teamAbbrev'))
+                    columns['Opponent'].append(entry.get('opponentAbbrev'))
+                    stats = [(GAME_LOG_STATS_MAP[key], value) for key, value in entry.items() if key in GAME_LOG_STATS_MAP]
+                    stats.append(('GP', 1))
+                    if entry.get('decision') in GAME_LOG_DECISIONS_MAP:
+                        stats.append((GAME_LOG_DECISIONS_MAP[entry['decision']], 1))
+                    for column, value in stats:
+                        stat_rows.append(row)
+                        stat_indices.append(stat_index[column])
+                        stat_values.append(value or 0)
+
+        num_rows = len(columns['id'])
+        stats = np.zeros((num_rows, len(GAME_LOG_STAT_COLUMNS)))
+        stats[stat_rows, stat_indices] = stat_values
+
+        df = pd.DataFrame(columns)
+        df['Season'] = int(season_string)
+        df['scoringPeriodId'] = get_scoring_period_ids(self.get_calendar_df(season_string, first_scoring_period_date), df['gameDate'])
+        df[GAME_LOG_STAT_COLUMNS] = stats
+        instrumentation.increment("rows_produced.nhlapi_game_logs", num_rows)
+        return df[GAME_LOGS_COLUMNS]
+
+    def get_reconciliation_df(self, season_string, espn_stats_df, player_id_map, stat_columns=None, first_scoring_period_date=None):
+        """ Returns dataframe of differences of a season's game logs against ESPN stats (see get_reconciliation_df). """
+        return get_reconciliation_df(self.get_game_logs_df(season_string, first_scoring_period_date), espn_stats_df, player_id_map, stat_columns)
+
+    def _get_season_strings(self, folder_name):
+        """ Returns sorted list of seasons with the given folder of downloaded files. """
+        return [folder for folder in sorted(os.listdir(self._nhlapi_downloads_root_folder))
+                if os.path.isdir(os.path.join(self._nhlapi_downloads_root_folder, folder, folder_name))]
 
 if __name__ == "__main__":
     print("Processing...")
@@ -4,10 +4,15 @@
 
     nhlapi_data_root_folder
     - teams.json
+    - team_seasons.json
     - 20192020
       - team_rosters
         -> 20192020_team_roster_<team1>.json
         -> 20192020_team_roster_<team2>.json
+      - team_schedules
+        -> 20192020_team_schedule_<team1>.json
+      - player_game_logs
+        -> 20192020_player_game_log_<player_id>.json
       - etc.
 
     - 20202021
@@ -15,20 +20,44 @@
         -> 20202021_team_roster_<team1>.json
         -> 20202021_team_roster_<team2>.json
       - etc.
+
+    team_seasons.json has the seasons each team has rosters for, in the form:
+    {<team_abbrev>: [20192020, 20202021, ...], ...}
+    It is used to only request rosters of teams that existed in a season.
+    Teams that are not in team_seasons.json are requested for every season.
+
+    Team schedules and player game logs (regular season) are optional. Game
+    logs are requested for every player of a season's downloaded team rosters.
+    Requests are made asynchronously with at most max_connections at a time.
 """
 import argparse
 import json
 import os
 import timeit
+import utils.instrumentation as instrumentation
 from utils.requests_util import RequestsUtil
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+DEFAULT_DOWNLOADS_DIR = os.path.join(SCRIPT_DIR, "nhlapi_downloads")
+NHLE_API_BASE_URL = "https://api.nhle.com/"
+NHLE_WEB_API_BASE_URL = "https://api-web.nhle.com/"
+
+# Maximum number of simultaneous requests to the NHL APIs
+DEFAULT_MAX_CONNECTIONS = 10
+
+# Game type of regular season games
+REGULAR_SEASON_GAME_TYPE = 2
 
 class NhlapiDownloader():
-    def __init__(self, root_output_folder=os.path.join(SCRIPT_DIR, "nhlapi_downloads"), overwrite=True):
-        """ Constructor. """
+    def __init__(self, root_output_folder=DEFAULT_DOWNLOADS_DIR, overwrite=True,
+                       nhle_api_base_url=NHLE_API_BASE_URL, nhle_web_api_base_url=NHLE_WEB_API_BASE_URL, max_connections=DEFAULT_MAX_CONNECTIONS):
+        """ Constructor. Base URLs can be overridden to point requests to a
+            different server (e.g.: a local mock server for testing). """
         self._root_output_folder = root_output_folder
         self._overwrite = overwrite
+        self._max_connections = max_connections
+        self._nhle_api_base_url = nhle_api_base_url
+        self._nhle_web_api_base_url = nhle_web_api_base_url
 
         # Create root output folder where downloaded data be output
         os.makedirs(self._root_output_folder, exist_ok=True)
@@ -46,10 +75,36 @@ class NhlapiDownloader():
     def download_teams_data(self):
         """ Download all teams data. This provides us with each team's ID,
             letter codes, etc. """
-        req = RequestsUtil("https://api.nhle.com/")
+        req = RequestsUtil(self._nhle_api_base_url)
         output_file_path = os.path.join(self._root_output_folder, "teams.json")
         req.save_json_from_endpoint("stats/rest/en/team", output_file_path)
 
+    def download_team_seasons_data(self):
+        """ Download the seasons each team has rosters for and save them to
+            team_seasons.json. Teams without a franchise (Example: all-star
+            teams) are skipped. Teams whose request failed keep their previously
+            downloaded seasons, if any. Returns list of teams whose request failed.
+
+            Note: Depends on the teams information to be present. Ensure
+            download_teams_data() is called first. """
+        team_abbrev_list = self._get_team_abbrevs()
+        req = RequestsUtil(self._nhle_web_api_base_url)
+        json_data_list = req.load_jsons_from_endpoints_async([f"v1/roster-season/{abbrev}" for abbrev in team_abbrev_list])
+
+        team_seasons = self._get_team_seasons() or {}
+        failed_team_abbrevs = []
+        for abbrev, json_data in zip(team_abbrev_list, json_data_list):
+            if isinstance(json_data, list):
+                team_seasons[abbrev] = json_data
+            else:
+                failed_team_abbrevs.append(abbrev)
+
+        if failed_team_abbrevs:
+            print(f"Failed to download seasons of teams: {failed_team_abbrevs}")
+        with open(os.path.join(self._root_output_folder, "team_seasons.json"), 'w') as out_file:
+            json.dump(team_seasons, out_file)
+        return failed_team_abbrevs
+
     def download_team_rosters_data(self, season_string):
         """ Download all team rosters data for the given season. Downloaded
             files have the form: "XXXXYYYY_team_roster_<team_abbrev>.json",
@@ -57,49 +112,192 @@ class NhlapiDownloader():
 
             Note: Depends on the teams information to be present. Ensure
             download_teams_data() is called first. """
-        # Output folder
-        req = RequestsUtil("https://api-web.nhle.com/")
-        output_folder_path = os.path.join(self._root_output_folder, season_string, "team_rosters")
-        os.makedirs(output_folder_path, exist_ok=True)
+        return self.download_team_rosters_data_for_seasons([season_string])
 
-        # Read teams data to get abbreviations
-        teams_data = json.load(open(os.path.join(self._root_output_folder, "teams.json"), 'r'))
-        team_abbrev_list = [d['triCode'] for d in teams_data['data']]
+    def download_team_rosters_data_for_seasons(self, season_string_list):
+        """ Download all team rosters data for the given list of seasons in a
+            single asynchronous run. Only teams that existed in each season are
+            requested (see team_seasons.json). Rosters that are already downloaded
+            are skipped if overwrite is disabled. Returns the number of rosters saved.
+
+            Note: Depends on the teams information to be present. Ensure
+            download_teams_data() is called first. """
+        # Read teams data once for all seasons
+        team_abbrev_list = self._get_team_abbrevs()
+        team_seasons = self._get_team_seasons()
 
         # Prepare links and output paths for download
         # Example link: https://api-web.nhle.com/v1/roster/DAL/20222023
-        download_dict_list = [{'endpoint': f"v1/roster/{abbrev}/{season_string}",
-                               'out_file_path': os.path.join(output_folder_path, f"{season_string}_team_roster_{abbrev}.json")}
-                               for abbrev in team_abbrev_list]
+        download_dict_list = []
+        for season_string in season_string_list:
+            output_folder_path = os.path.join(self._root_output_folder, season_string, "team_rosters")
+            os.makedirs(output_folder_path, exist_ok=True)
 
-        # Download
-        req.save_jsons_from_endpoints_async(download_dict_list)
+            for abbrev in team_abbrev_list:
+                if not self._team_existed(team_seasons, abbrev, season_string):
+                    instrumentation.increment("nhlapi.team_rosters_skipped_missing")
+                    continue
 
-if __name__ == "__main__":
-    """ Main function. """
-    total_start_timer = timeit.default_timer()
+                out_file_path = os.path.join(output_folder_path, f"{season_string}_team_roster_{abbrev}.json")
+                if not self._overwrite and os.path.exists(out_file_path):
+                    instrumentation.increment("nhlapi.team_rosters_skipped_existing")
+                    continue
 
-    # Read arguments
-    arg_parse = argparse.ArgumentParser()
+                download_dict_list.append({'endpoint': f"v1/roster/{abbrev}/{season_string}", 'out_file_path': out_file_path})
+
+        return self._download_jsons(download_dict_list)
+
+    def download_team_schedules_data_for_seasons(self, season_string_list):
+        """ Download schedules of all teams for the given list of seasons in a single
+            asynchronous run. Downloaded files have the form: "XXXXYYYY_team_schedule_<team_abbrev>.json".
+            Only teams that existed in each season are requested (see team_seasons.json).
+            Schedules that are already downloaded are skipped if overwrite is disabled.
+            Returns the number of schedules saved.
+
+            Note: Depends on the teams information to be present. Ensure
+            download_teams_data() is called first. """
+        team_abbrev_list = self._get_team_abbrevs()
+        team_seasons = self._get_team_seasons()
+
+        # Example link: https://api-web.nhle.com/v1/club-schedule-season/DAL/20222023
+        download_dict_list = []
+        for season_string in season_string_list:
+            for abbrev in team_abbrev_list:
+                if not self._team_existed(team_seasons, abbrev, season_string):
+                    continue
+
+                out_file_path = os.path.join(self._root_output_folder, season_string, "team_schedules", f"{season_string}_team_schedule_{abbrev}.json")
+                if not self._overwrite and os.path.exists(out_file_path):
+                    instrumentation.increment("nhlapi.team_schedules_skipped_existing")
+                    continue
+
+                download_dict_list.append({'endpoint': f"v1/club-schedule-season/{abbrev}/{season_string}", 'out_file_path': out_file_path})
+
+        return self._download_jsons(download_dict_list)
+
+    def download_player_game_logs_data_for_seasons(self, season_string_list, game_type=REGULAR_SEASON_GAME_TYPE):
+        """ Download game logs of all players in the downloaded team rosters of the given
+            list of seasons in a single asynchronous run. Downloaded files have the form:
+            "XXXXYYYY_player_game_log_<player_id>.json". Game logs that are already
+            downloaded are skipped if overwrite is disabled. Returns the number of game logs saved.
+
+            Note: Depends on team rosters of each season to be present. Ensure
+            download_team_rosters_data_for_seasons() is called first. """
+        # Example link: https://api-web.nhle.com/v1/player/8478402/game-log/20222023/2
+        download_dict_list = []
+        for season_string in season_string_list:
+            for player_id in self._get_season_player_ids(season_string):
+                out_file_path = os.path.join(self._root_output_folder, season_string, "player_game_logs", f"{season_string}_player_game_log_{player_id}.json")
+                if not self._overwrite and os.path.exists(out_file_path):
+                    instrumentation.increment("nhlapi.player_game_logs_skipped_existing")
+                    continue
+
+                download_dict_list.append({'endpoint': f"v1/player/{player_id}/game-log/{season_string}/{game_type}", 'out_file_path': out_file_path})
+
+        return self._download_jsons(download_dict_list)
+
+    def _download_jsons(self, download_dict_list):
+        """ Downloads JSON data from the NHL web API for a list of dictionaries in the form:
+            {'endpoint': <endpoint>, 'out_file_path': <output file path>}
+            Returns the number of files saved. """
+        if not download_dict_list:
+            return 0
+
+        # Download. Failed requests have no data and are not saved so they are retried next time.
+        req = RequestsUtil(self._nhle_web_api_base_url, max_connections=self._max_connections)
+        json_data_list = req.load_jsons_from_endpoints_async([d['endpoint'] for d in download_dict_list])
+
+        num_saved = 0
+        for json_data, d in zip(json_data_list, download_dict_list):
+            if not json_data:
+                continue
+
+            os.makedirs(os.path.dirname(d['out_file_path']), exist_ok=True)
+            with open(d['out_file_path'], 'w') as out_file:
+                json.dump(json_data, out_file)
+            num_saved += 1
+
+        return num_saved
+
+    def _get_team_abbrevs(self):
+        """ Returns list of abbreviations of teams with a franchise from teams.json. """
+        with open(os.path.join(self._root_output_folder, "teams.json"), 'r') as f:
+            teams_data = json.load(f)
+        return [d['triCode'] for d in teams_data['data'] if d.get('franchiseId') is not None]
+
+    def _get_season_player_ids(self, season_string):
+        """ Returns sorted list of IDs of all players in a season's downloaded team rosters. """
+        folder_path = os.path.join(self._root_output_folder, season_string, "team_rosters")
+        if not os.path.isdir(folder_path):
+            return []
+
+        player_ids = set()
+        for file_name in os.listdir(folder_path):
+            with open(os.path.join(folder_path, file_name), 'r') as f:
+                roster_data = json.load(f)
+            player_ids.update(player['id'] for players in roster_data.values() for player in players)
+        return sorted(player_ids)
+
+    def _team_existed(self, team_seasons, abbrev, season_string):
+        """ Returns True if a team existed in a season according to team seasons data.
+            Teams without team seasons data are assumed to exist in every season. """
+        if team_seasons is None or abbrev not in team_seasons:
+            return True
+        return int(season_string) in team_seasons[abbrev]
+
+    def _get_team_seasons(self):
+        """ Returns dictionary of team abbreviations to list of seasons from
+            team_seasons.json. Returns None if not downloaded. """
+        try:
+            with open(os.path.join(self._root_output_folder, "team_seasons.json"), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+def add_arguments(arg_parse):
+    """ Adds command line arguments to an argument parser. """
     arg_parse.add_argument("--start_year", "-s", required=True, type=int, help="Starting season of data to download (Example: 2015 will download 20152016).")
     arg_parse.add_argument("--end_year", "-e", required=True, type=int, help="End season of data to download (Example: 2025 will download 20252026).")
-    args = arg_parse.parse_args()
+    arg_parse.add_argument("--output_path", "-o", required=False, default=DEFAULT_DOWNLOADS_DIR,
+                           type=str, help="Output path of where downloaded data will go. Defaults to a folder within script directory.")
+    arg_parse.add_argument("--skip_existing", action='store_true', help="Skip team rosters, schedules and game logs that are already downloaded.")
+    arg_parse.add_argument("--team_schedules", action='store_true', help="Also download team schedules.")
+    arg_parse.add_argument("--player_game_logs", action='store_true', help="Also download regular season game logs of all players in team rosters.")
+    arg_parse.add_argument("--max_connections", type=int, default=DEFAULT_MAX_CONNECTIONS, help="Maximum number of simultaneous requests.")
+
+def main(args):
+    """ Downloads teams and team rosters data of all seasons given by the parsed command line arguments. """
+    total_start_timer = timeit.default_timer()
 
     # Instantiate
-    start_timer = timeit.default_timer()
-    nhlapi_downloader = NhlapiDownloader()
-    print(f"Downloaded teams data in {round(timeit.default_timer() - start_timer, 1)}s.")
+    nhlapi_downloader = NhlapiDownloader(root_output_folder=args.output_path, overwrite=not args.skip_existing, max_connections=args.max_connections)
 
     # Download most up-to-date teams data
+    start_timer = timeit.default_timer()
     nhlapi_downloader.download_teams_data()
+    nhlapi_downloader.download_team_seasons_data()
+    print(f"Downloaded teams data in {round(timeit.default_timer() - start_timer, 1)}s.")
 
-    # Download relevant data for each season
-    for season in range(args.start_year, args.end_year + 1):
-        # Example: The 2020 season will be "20202021"
-        season_string = f"{season}{season + 1}"
+    # Download relevant data for all seasons at once
+    # Example: The 2020 season will be "20202021"
+    start_timer = timeit.default_timer()
+    season_string_list = [f"{season}{season + 1}" for season in range(args.start_year, args.end_year + 1)]
+    num_saved = nhlapi_downloader.download_team_rosters_data_for_seasons(season_string_list)
+    print(f"Downloaded {num_saved} team rosters for {len(season_string_list)} seasons in {round(timeit.default_timer() - start_timer, 1)}s.")
+
+    if args.team_schedules:
+        start_timer = timeit.default_timer()
+        num_saved = nhlapi_downloader.download_team_schedules_data_for_seasons(season_string_list)
+        print(f"Downloaded {num_saved} team schedules in {round(timeit.default_timer() - start_timer, 1)}s.")
 
+    if args.player_game_logs:
         start_timer = timeit.default_timer()
-        nhlapi_downloader.download_team_rosters_data(season_string)
-        print(f"Downloaded team rosters data for {season_string} in {round(timeit.default_timer() - start_timer, 1)}s.")
+        num_saved = nhlapi_downloader.download_player_game_logs_data_for_seasons(season_string_list)
+        print(f"Downloaded {num_saved} player game logs in {round(timeit.default_timer() - start_timer, 1)}s.")
 
-    print(f"Finished in {round(timeit.default_timer() - total_start_timer, 1)}s.")
\ No newline at end of file
+    print(f"Finished in {round(timeit.default_timer() - total_start_timer, 1)}s.")
+
+if __name__ == "__main__":
+    arg_parse = argparse.ArgumentParser()
+    add_arguments(arg_parse)
+    main(arg_parse.parse_args())
\ No newline at end of file
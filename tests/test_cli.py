@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+import importlib
+import os
+import pandas as pd
+import shutil
+import subprocess
+import sys
+import unittest
+from utils.cli import COMMANDS, main, split_commands
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_cli")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_split_commands(self):
+        """ Test command line is split into each chained command. """
+        self.assertEqual(split_commands(["generate", "draft"]), [["generate", "draft"]])
+        self.assertEqual(split_commands(["download", "espn", "-s", "2026", "+", "generate", "draft"]),
+                         [["download", "espn", "-s", "2026"], ["generate", "draft"]])
+
+    def test_help_without_heavy_imports(self):
+        """ Test showing help of all command groups doesn't import any script or heavy library. """
+        code = ("import sys\n"
+                "from utils.cli import COMMANDS, main\n"
+                "for argv in [['--help']] + [[group, '--help'] for group in COMMANDS]:\n"
+                "    try:\n"
+                "        main(argv)\n"
+                "    except SystemExit:\n"
+                "        pass\n"
+                "print(sorted(m for m in ['pandas', 'aiohttp', 'requests', 'numpy'] if m in sys.modules))\n")
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.join(SCRIPT_DIR, ".."), capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+
+    def test_commands(self):
+        """ Test all commands have a script with arguments and a main function. """
+        for group, commands in COMMANDS.items():
+            for command, (module_name, _) in commands.items():
+                module = importlib.import_module(module_name)
+                self.assertTrue(callable(module.add_arguments), f"{group} {command}")
+                self.assertTrue(callable(module.main), f"{group} {command}")
+
+    def test_main_chained_commands(self):
+        """ Test chained commands all run in order in a single call. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+            downloader.download_all_players_info()
+
+        common_argv = ["--espn_fantasy_api_downloads_root_folder", self._test_folder, "--out_dir_path", self._test_folder]
+        main(["generate", "all_players_info"] + common_argv + ["+", "generate", "daily_rosters", "--stream"] + common_argv)
+
+        self.assertFalse(pd.read_csv(os.path.join(self._test_folder, "espn_fantasy_api_all_players_info_df.csv")).empty)
+        self.assertFalse(pd.read_csv(os.path.join(self._test_folder, "espn_fantasy_api_daily_rosters_df.csv")).empty)
+
+        # Test invalid command fails before running any command
+        os.remove(os.path.join(self._test_folder, "espn_fantasy_api_all_players_info_df.csv"))
+        with self.assertRaises(SystemExit):
+            main(["generate", "all_players_info"] + common_argv + ["+", "generate", "does_not_exist"])
+        self.assertFalse(os.path.exists(os.path.join(self._test_folder, "espn_fantasy_api_all_players_info_df.csv")))
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.csv_writer import CsvWriter
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestCsvWriter(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_csv_writer")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_write(self):
+        """ Test batches with different columns are written with the writer's columns. """
+        file_path = os.path.join(self._test_folder, "out.csv")
+        with CsvWriter(file_path, ['id', 'G', 'SV%', 'owner']) as writer:
+            writer.write(pd.DataFrame([{'id': 1, 'G': 2.0, 'owner': "Owner 1"}]))
+            self.assertFalse(os.path.exists(file_path))
+            writer.write(pd.DataFrame([{'id': 2, 'SV%': 0.9, 'owner': "Owner, 2", 'HIT': 1.0}]))
+        self.assertEqual(writer.get_num_rows(), 2)
+
+        df = pd.read_csv(file_path)
+        self.assertEqual(df.columns.tolist(), ['id', 'G', 'SV%', 'owner'])
+        self.assertEqual(df['owner'].tolist(), ["Owner 1", "Owner, 2"])
+        self.assertEqual(df['G'].fillna(0).tolist(), [2.0, 0])
+
+        # Test empty output still has a header
+        with CsvWriter(file_path, ['id', 'G']):
+            pass
+        self.assertEqual(pd.read_csv(file_path).columns.tolist(), ['id', 'G'])
+
+    def test_write_failed(self):
+        """ Test output file is not replaced if writing fails. """
+        file_path = os.path.join(self._test_folder, "out.csv")
+        pd.DataFrame([{'id': 1}]).to_csv(file_path, index=False)
+        with self.assertRaises(ValueError):
+            with CsvWriter(file_path, ['id']) as writer:
+                writer.write(pd.DataFrame([{'id': 2}]))
+                raise ValueError()
+
+        self.assertEqual(pd.read_csv(file_path)['id'].tolist(), [1])
+        self.assertEqual(os.listdir(self._test_folder), ["out.csv"])
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
\ No newline at end of file
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+from data_generator_scripts.data_generator_player_index import DataGeneratorPlayerIndex, normalize_name, parse_espn_dob, parse_nhl_dob
+from datetime import date
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnApiDownloader, EspnFantasyApiDownloader
+from nhlapi_scripts.nhlapi_downloader import NhlapiDownloader
+import os
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Mock server player IDs start from these
+MOCK_ESPN_PLAYER_ID = 4000000
+MOCK_NHL_PLAYER_ID = 8470000
+
+class TestDataGeneratorPlayerIndex(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_data_generator_player_index")
+        self._espn_folder = os.path.join(self._test_folder, "espn_fantasy_api_downloads")
+        self._nhlapi_folder = os.path.join(self._test_folder, "nhlapi_downloads")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+        # Download data of a season from the mock server
+        with MockApiServer() as server:
+            fapi_downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._espn_folder, base_url=server.base_url)
+            fapi_downloader.download_all_players_info()
+            EspnApiDownloader(root_output_folder=self._espn_folder, base_url=server.base_url).download_athletes_data(range(MOCK_ESPN_PLAYER_ID, MOCK_ESPN_PLAYER_ID + 3))
+
+            nhlapi_downloader = NhlapiDownloader(root_output_folder=self._nhlapi_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            nhlapi_downloader.download_teams_data()
+            nhlapi_downloader.download_team_rosters_data("20242025")
+
+    def test_get_df(self):
+        """ Test IDs of all data sources are mapped to player keys. """
+        data_generator = DataGeneratorPlayerIndex(self._espn_folder, self._nhlapi_folder, self._test_folder)
+        df = data_generator.get_df()
+        self.assertEqual(str(df['Player Key'].dtype), "Int64")
+        self.assertEqual(str(df['ESPN Player ID'].dtype), "Int64")
+        self.assertEqual(str(df['NHL Player ID'].dtype), "Int64")
+        self.assertTrue(df['Player Key'].is_unique)
+
+        # Players with athletes data are linked to NHL players by name and date of birth
+        row = df[df['ESPN Player ID'] == MOCK_ESPN_PLAYER_ID].iloc[0]
+        self.assertEqual(row['NHL Player ID'], MOCK_NHL_PLAYER_ID)
+        self.assertEqual(row['Player DOB'], "1/1/1990")
+
+        # Players without a date of birth are linked by name only
+        self.assertEqual(df[df['ESPN Player ID'] == MOCK_ESPN_PLAYER_ID + 3]['NHL Player ID'].iloc[0], MOCK_NHL_PLAYER_ID + 3)
+        self.assertTrue(df['NHL Player ID'].is_unique)
+
+        # Test lookups
+        player_key = row['Player Key']
+        self.assertEqual(data_generator.get_espn_player_key_map(df)[MOCK_ESPN_PLAYER_ID], player_key)
+        self.assertTrue(player_key in data_generator.get_name_player_keys_map(df)[normalize_name(row['Player Name'])])
+
+    def test_get_df_saved(self):
+        """ Test saved index is used until inputs change, and player keys are stable. """
+        data_generator = DataGeneratorPlayerIndex(self._espn_folder, self._nhlapi_folder, self._test_folder)
+        df = data_generator.get_df()
+
+        # Test index is not rebuilt
+        instrumentation.reset()
+        self.assertTrue(df.equals(data_generator.get_df()))
+        self.assertFalse('rows_produced.player_index' in instrumentation.get_counters())
+
+        # Test new athletes data updates index and existing players keep their keys
+        with MockApiServer() as server:
+            EspnApiDownloader(root_output_folder=self._espn_folder, base_url=server.base_url).download_athletes_data([MOCK_ESPN_PLAYER_ID + 3])
+        updated_df = data_generator.get_df()
+        self.assertTrue(instrumentation.get_counters()['rows_produced.player_index'] > 0)
+        self.assertEqual(len(updated_df), len(df))
+        self.assertEqual(updated_df[updated_df['ESPN Player ID'] == MOCK_ESPN_PLAYER_ID + 3]['NHL Player ID'].iloc[0], MOCK_NHL_PLAYER_ID + 3)
+        for espn_id in range(MOCK_ESPN_PLAYER_ID, MOCK_ESPN_PLAYER_ID + 4):
+            self.assertEqual(data_generator.get_espn_player_key_map(df)[espn_id], data_generator.get_espn_player_key_map(updated_df)[espn_id])
+
+        # Test all players info downloaded in pages updates index
+        instrumentation.reset()
+        with MockApiServer() as server:
+            EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._espn_folder, base_url=server.base_url).download_all_players_info_pages(page_size=20)
+        data_generator.get_df()
+        self.assertTrue(instrumentation.get_counters()['rows_produced.player_index'] > 0)
+
+    def test_helpers(self):
+        """ Test name normalization and date of birth parsing. """
+        self.assertEqual(normalize_name("Alexis Lafrenière"), "alexislafreniere")
+        self.assertEqual(normalize_name("T.J. Brodie"), "tjbrodie")
+        self.assertEqual(normalize_name(float('nan')), "")
+        self.assertEqual(parse_espn_dob("28/3/1991"), date(1991, 3, 28))
+        self.assertIsNone(parse_espn_dob(None))
+        self.assertEqual(parse_nhl_dob("1991-03-28"), date(1991, 3, 28))
+        self.assertIsNone(parse_nhl_dob(""))
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
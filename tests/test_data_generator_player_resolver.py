@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+from data_generator_scripts.data_generator_player_resolver import DataGeneratorPlayerResolver, get_last_name_key, normalize_team_abbrev
+from datetime import date
+import os
+import pandas as pd
+import shutil
+import unittest
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Players in the form of NhlapiDataGenerator dataframe
+NHL_PLAYERS_DF = pd.DataFrame([
+    {'id': 1, 'Season': 20212022, 'Player': "Alexis Lafrenière", 'Team': "NYR", 'Player Birth Date': "2001-10-11"},
+    {'id': 2, 'Season': 20212022, 'Player': "Mitchell Marner", 'Team': "TOR", 'Player Birth Date': "1997-05-05"},
+    {'id': 3, 'Season': 20212022, 'Player': "Sebastian Aho", 'Team': "CAR", 'Player Birth Date': "1997-07-26"},
+    {'id': 4, 'Season': 20212022, 'Player': "Sebastian Aho", 'Team': "NYI", 'Player Birth Date': "1996-02-17"},
+    {'id': 5, 'Season': 20212022, 'Player': "Marc-Andre Fleury", 'Team': "CHI", 'Player Birth Date': "1984-11-28"},
+    {'id': 5, 'Season': 20222023, 'Player': "Marc-Andre Fleury", 'Team': "MIN", 'Player Birth Date': "1984-11-28"},
+    {'id': 6, 'Season': 20212022, 'Player': "Drew Doughty", 'Team': "LAK", 'Player Birth Date': "1989-12-08"}])
+
+class TestDataGeneratorPlayerResolver(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_data_generator_player_resolver")
+        self._cache_path = os.path.join(self._test_folder, "player_resolver_cache.json")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_resolve(self):
+        """ Test names are resolved with name, team, season and birth date. """
+        resolver = DataGeneratorPlayerResolver(self._test_folder, self._cache_path, nhl_players_df=NHL_PLAYERS_DF)
+
+        # Accents and case are ignored
+        self.assertEqual(resolver.resolve("Alexis Lafreniere"), 1)
+        self.assertEqual(resolver.resolve("ALEXIS LAFRENIÈRE"), 1)
+
+        # Nicknames need team and season or birth date to resolve
+        self.assertIsNone(resolver.resolve("Mitch Marner"))
+        self.assertEqual(resolver.resolve("Mitch Marner", team="Tor", season=20212022), 2)
+        self.assertEqual(resolver.resolve("Mitch Marner", dob=date(1997, 5, 5)), 2)
+
+        # Players with the same name
+        self.assertIsNone(resolver.resolve("Sebastian Aho"))
+        self.assertEqual(resolver.resolve("Sebastian Aho", team="NYI", season=20212022), 4)
+        self.assertEqual(resolver.resolve("Sebastian Aho", dob=date(1997, 7, 26)), 3)
+
+        # Different birth dates never match
+        self.assertIsNone(resolver.resolve("Drew Doughty", dob=date(1990, 1, 1)))
+
+        # ESPN team abbreviations
+        self.assertEqual(resolver.resolve("Drew Doughty", team="LA", season=20212022), 6)
+        self.assertIsNone(resolver.resolve("Unknown Player"))
+        self.assertIsNone(resolver.resolve(float('nan')))
+
+    def test_resolve_df(self):
+        """ Test dataframe is resolved once per unique row and results are cached. """
+        df = pd.DataFrame([{'Player': "Marc-Andre Fleury", 'Team': "Chi", 'Season': 20212022},
+                           {'Player': "Marc-Andre Fleury", 'Team': "Chi", 'Season': 20212022},
+                           {'Player': "Marc Andre Fleury", 'Team': "Min", 'Season': 20222023},
+                           {'Player': "Sebastian Aho", 'Team': "", 'Season': 20212022}])
+        resolver = DataGeneratorPlayerResolver(self._test_folder, self._cache_path, nhl_players_df=NHL_PLAYERS_DF)
+        series = resolver.resolve_df(df, 'Player', team_column='Team', season_column='Season')
+        self.assertEqual(str(series.dtype), "Int64")
+        self.assertEqual(series.tolist(), [5, 5, 5, pd.NA])
+        self.assertEqual(instrumentation.get_counters()['player_resolver.cache_misses'], 3)
+
+        # Test only candidates of matching blocks are scored
+        self.assertTrue(instrumentation.get_counters()['player_resolver.candidates'] < 3 * len(NHL_PLAYERS_DF))
+
+        # Test cached results are used without loading NHL players
+        instrumentation.reset()
+        resolver = DataGeneratorPlayerResolver(self._test_folder, self._cache_path, nhl_players_df=pd.DataFrame())
+        self.assertEqual(resolver.resolve_df(df, 'Player', team_column='Team', season_column='Season').tolist(), [5, 5, 5, pd.NA])
+        self.assertEqual(instrumentation.get_counters()['player_resolver.cache_hits'], 3)
+        self.assertFalse('player_resolver.cache_misses' in instrumentation.get_counters())
+
+    def test_cache_invalidated(self):
+        """ Test cached misses are retried when NHL rosters change, but cached matches are kept. """
+        resolver = DataGeneratorPlayerResolver(self._test_folder, self._cache_path, nhl_players_df=NHL_PLAYERS_DF)
+        self.assertEqual(resolver.resolve("Drew Doughty"), 6)
+        self.assertIsNone(resolver.resolve("Connor McDavid"))
+        resolver.save_cache()
+
+        roster_folder_path = os.path.join(self._test_folder, "20212022", "team_rosters")
+        os.makedirs(roster_folder_path, exist_ok=True)
+        with open(os.path.join(roster_folder_path, "20212022_team_roster_EDM.json"), 'w') as f:
+            f.write("{}")
+
+        df = pd.concat([NHL_PLAYERS_DF, pd.DataFrame([{'id': 7, 'Season': 20212022, 'Player': "Connor McDavid", 'Team': "EDM", 'Player Birth Date': "1997-01-13"}])])
+        resolver = DataGeneratorPlayerResolver(self._test_folder, self._cache_path, nhl_players_df=df)
+        self.assertEqual(resolver.resolve("Drew Doughty"), 6)
+        self.assertEqual(instrumentation.get_counters()['player_resolver.cache_hits'], 1)
+        self.assertEqual(resolver.resolve("Connor McDavid"), 7)
+
+    def test_helpers(self):
+        """ Test last name keys and team abbreviations. """
+        self.assertEqual(get_last_name_key("Alexis Lafrenière"), "lafreniere")
+        self.assertEqual(get_last_name_key("Martin St. Louis"), "louis")
+        self.assertEqual(get_last_name_key("Tim Stützle Jr."), "stutzle")
+        self.assertEqual(get_last_name_key(None), "")
+        self.assertEqual(normalize_team_abbrev("Pit"), "PIT")
+        self.assertEqual(normalize_team_abbrev("Mon"), "MTL")
+        self.assertEqual(normalize_team_abbrev("Vgs"), "VGK")
+        self.assertIsNone(normalize_team_abbrev(""))
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
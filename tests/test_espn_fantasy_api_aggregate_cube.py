@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_aggregate_cube import EspnFantasyApiAggregateCube, get_cube_df
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+import json
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiAggregateCube(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_aggregate_cube")
+        os.makedirs(self._test_folder, exist_ok=True)
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+    def test_get_rollup_df(self):
+        """ Test rollups of the cube match grouping daily rosters. """
+        cube = EspnFantasyApiAggregateCube(self._test_folder)
+        cube.update()
+        daily_rosters_df = EspnFantasyApiDownloadsParser(self._test_folder).get_daily_rosters_df_by_season("20242025", None)
+
+        rollup_df = cube.get_rollup_df(['owner', 'active'])
+        expected_df = daily_rosters_df.groupby(['owner', 'active'])[['appliedTotal', 'G', 'A']].sum().reset_index()
+        pd.testing.assert_frame_equal(rollup_df[['owner', 'active', 'appliedTotal', 'G', 'A']], expected_df, check_dtype=False)
+        self.assertEqual(rollup_df['numScoringPeriods'].sum(), len(daily_rosters_df))
+
+        # Player season totals have the player's name
+        rollup_df = cube.get_rollup_df(['id', 'season'], owner="Owner1 Synthetic")
+        self.assertEqual(rollup_df.columns.tolist()[:3], ['id', 'fullName', 'season'])
+        self.assertEqual(len(rollup_df), daily_rosters_df.loc[daily_rosters_df['owner'] == "Owner1 Synthetic", 'id'].nunique())
+        self.assertTrue(rollup_df['fullName'].notna().all())
+
+    def test_get_slice_df(self):
+        """ Test slices match single values and lists of values of each level. """
+        cube = EspnFantasyApiAggregateCube(self._test_folder)
+        cube.update()
+        df = cube.get_df()
+
+        self.assertEqual(len(cube.get_slice_df(active=False)), (~df['active']).sum())
+        self.assertEqual(len(cube.get_slice_df(active=[True, False])), len(df))
+        slice_df = cube.get_slice_df(owner=["Owner1 Synthetic", "Owner2 Synthetic"], active=True)
+        self.assertEqual(sorted(slice_df['owner'].unique()), ["Owner1 Synthetic", "Owner2 Synthetic"])
+        self.assertTrue(slice_df['active'].all())
+        self.assertTrue(cube.get_slice_df(season="20202021").empty)
+
+    def test_update_incremental(self):
+        """ Test only new complete scoring periods are added and the cube matches a full rebuild. """
+        self._set_latest_scoring_period(5)
+        EspnFantasyApiAggregateCube(self._test_folder).update()
+        with open(os.path.join(self._test_folder, "aggregate_cube_state.json"), 'r') as f:
+            self.assertEqual(json.load(f)['scoringPeriods'], {'20242025': 4})
+
+        # Test only scoring periods after the saved ones are added
+        self._set_latest_scoring_period(10)
+        instrumentation.reset()
+        cube = EspnFantasyApiAggregateCube(self._test_folder)
+        cube.update()
+        self.assertEqual(instrumentation.get_counters()['aggregate_cube.rows_added'], 24 * 5)
+
+        # Test same result without saved cube
+        os.remove(os.path.join(self._test_folder, "aggregate_cube_state.json"))
+        rebuilt_cube = EspnFantasyApiAggregateCube(self._test_folder)
+        rebuilt_cube.update()
+        pd.testing.assert_frame_equal(cube.get_df(), rebuilt_cube.get_df())
+
+    def test_update_missing_scoring_period(self):
+        """ Test scoring periods after a missing one are not saved, so it is added once downloaded. """
+        file_path = os.path.join(self._test_folder, "20242025", "scoring_periods", "20242025_scoring_period3.json")
+        os.rename(file_path, f"{file_path}.bak")
+        cube = EspnFantasyApiAggregateCube(self._test_folder)
+        cube.update()
+        with open(os.path.join(self._test_folder, "aggregate_cube_state.json"), 'r') as f:
+            self.assertEqual(json.load(f)['scoringPeriods'], {'20242025': 2})
+        self.assertEqual(cube.get_df()['numScoringPeriods'].sum(), 24 * 9)
+
+        os.rename(f"{file_path}.bak", file_path)
+        cube = EspnFantasyApiAggregateCube(self._test_folder)
+        cube.update()
+        daily_rosters_df = EspnFantasyApiDownloadsParser(self._test_folder).get_daily_rosters_df_by_season("20242025", None)
+        expected_df = get_cube_df(daily_rosters_df).reset_index()
+        pd.testing.assert_frame_equal(cube.get_df()[expected_df.columns], expected_df, check_dtype=False)
+
+    def _set_latest_scoring_period(self, latest_scoring_period):
+        """ Helper function to change the latest scoring period of downloaded league info. """
+        file_path = os.path.join(self._test_folder, "20242025", "20242025_league_info.json")
+        with open(file_path, 'r') as f:
+            league_info = json.load(f)
+        league_info['status']['latestScoringPeriod'] = latest_scoring_period
+        with open(file_path, 'w') as f:
+            json.dump(league_info, f)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_archive import EspnFantasyApiArchive, archive_season_folder, get_archive_path
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+import json
+import os
+import pickle
+import shutil
+import unittest
+import zipfile
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiArchive(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_archive")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_add_and_load_json(self):
+        """ Test documents are read back identically. """
+        archive_path = os.path.join(self._test_folder, "test_archive.zip")
+        archive = EspnFantasyApiArchive(archive_path)
+        self.assertFalse(archive.exists())
+
+        docs = [self._create_scoring_period_dict(id) for id in range(1, 4)]
+        for id, doc in enumerate(docs, start=1):
+            self.assertTrue(archive.add_json(f"scoring_periods/{id}.json", doc))
+
+        # Test adding same path again is ignored
+        self.assertFalse(archive.add_json("scoring_periods/1.json", {}))
+        archive.close()
+
+        # Test reading back from a new instance
+        archive = EspnFantasyApiArchive(archive_path)
+        self.assertTrue(archive.exists())
+        for id, doc in enumerate(docs, start=1):
+            self.assertEqual(doc, archive.load_json(f"scoring_periods/{id}.json"))
+        self.assertIsNone(archive.load_json("scoring_periods/4.json"))
+        self.assertEqual(["1.json", "2.json", "3.json"], archive.list_files("scoring_periods"))
+        self.assertEqual([], archive.list_files())
+
+        # Test loaded documents don't share data between calls
+        archive.load_json("scoring_periods/1.json")['settings']['name'] = "Modified"
+        self.assertEqual(docs[0], archive.load_json("scoring_periods/1.json"))
+        archive.close()
+
+    def test_deduplication(self):
+        """ Test repeated sub-documents are only stored once. """
+        archive_path = os.path.join(self._test_folder, "test_deduplication.zip")
+        archive = EspnFantasyApiArchive(archive_path)
+        raw_size = 0
+        for id in range(1, 11):
+            doc = self._create_scoring_period_dict(id)
+            archive.add_json(f"{id}.json", doc)
+            raw_size += len(json.dumps(doc))
+        archive.close()
+
+        # Settings are stored once for all documents and identical rosters are stored
+        # once for all teams, so expect one chunk for settings and one roster per document
+        with zipfile.ZipFile(archive_path, 'r') as zip_file:
+            num_chunks = len([name for name in zip_file.namelist() if name.startswith("chunks/")])
+        self.assertEqual(num_chunks, 11)
+        self.assertTrue(os.path.getsize(archive_path) < raw_size / 10)
+
+    def test_add_file(self):
+        """ Test non-JSON files are read back identically. """
+        archive = EspnFantasyApiArchive(os.path.join(self._test_folder, "test_add_file.zip"))
+        self.assertTrue(archive.add_file("realtime_stats/deltas.jsonl", b"line1\nline2\n"))
+        self.assertEqual(b"line1\nline2\n", archive.read_file("realtime_stats/deltas.jsonl"))
+        self.assertIsNone(archive.read_file("realtime_stats/missing.jsonl"))
+        self.assertTrue(archive.contains("realtime_stats/deltas.jsonl"))
+        archive.close()
+
+    def test_pickle(self):
+        """ Test archive can be pickled (Example: passed to other processes). """
+        archive_path = os.path.join(self._test_folder, "test_pickle.zip")
+        archive = EspnFantasyApiArchive(archive_path)
+        archive.add_json("1.json", self._create_scoring_period_dict(1))
+        archive.close()
+
+        archive = pickle.loads(pickle.dumps(EspnFantasyApiArchive(archive_path)))
+        self.assertEqual(self._create_scoring_period_dict(1), archive.load_json("1.json"))
+        archive.close()
+
+    def test_archive_season_folder(self):
+        """ Test archiving a season folder and reading through the loader. """
+        root_folder_path = os.path.join(self._test_folder, "test_archive_season_folder")
+        season_folder_path = os.path.join(root_folder_path, "20192020")
+        os.makedirs(os.path.join(season_folder_path, "scoring_periods"), exist_ok=True)
+        os.makedirs(os.path.join(season_folder_path, "realtime_stats"), exist_ok=True)
+        for id in range(1, 4):
+            with open(os.path.join(season_folder_path, "scoring_periods", f"20192020_scoring_period{id}.json"), 'w') as f:
+                json.dump(self._create_scoring_period_dict(id), f)
+        with open(os.path.join(season_folder_path, "realtime_stats", "20192020_realtime_stats_2020-01-01_00-00-00.json"), 'w') as f:
+            json.dump({'points': 0}, f)
+        with open(os.path.join(season_folder_path, "realtime_stats", "20192020_realtime_stats_2020-01-01_00-00-00_deltas.jsonl"), 'w') as f:
+            f.write(json.dumps({'timestamp': "2020-01-01_00-01-00", 'delta': [[['points'], 1]]}) + "\n")
+
+        # Archive and remove original files
+        summary = archive_season_folder(season_folder_path, remove_originals=True)
+        self.assertEqual(summary['num_files'], 5)
+        self.assertTrue(os.path.exists(get_archive_path(season_folder_path)))
+        self.assertEqual([], os.listdir(os.path.join(season_folder_path, "scoring_periods")))
+        self.assertEqual([], os.listdir(os.path.join(season_folder_path, "realtime_stats")))
+
+        # Test reading back transparently through the loader
+        loader = EspnFantasyApiLoader(root_folder_path)
+        self.assertEqual(self._create_scoring_period_dict(2), loader.get_scoring_period_dict("20192020", 2))
+        self.assertIsNone(loader.get_scoring_period_dict("20192020", 4))
+        self.assertEqual([{'timestamp': "2020-01-01_00-00-00", 'data': {'points': 0}},
+                          {'timestamp': "2020-01-01_00-01-00", 'data': {'points': 1}}],
+                         loader.get_realtime_stats_dicts("20192020"))
+
+    def _create_scoring_period_dict(self, id):
+        """ Helper function to create a scoring period-like dictionary where settings
+            are identical and rosters differ between scoring periods. """
+        return {'scoringPeriodId': id,
+                'settings': {'name': "League", 'scoringItems': [{'statId': s, 'points': 1.0} for s in range(40)]},
+                'teams': [{'id': t, 'name': f"Team {t}", 'logo': "https://example.com/" + "x" * 200,
+                           'roster': {'entries': [{'playerId': p, 'stats': {'scoringPeriodId': id, 'appliedTotal': (p * id) % 7}}
+                                                  for p in range(20)]}}
+                          for t in range(10)]}
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_store import EspnFantasyApiAthletesStore, STORE_FILE_NAME
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+import json
+import os
+import shutil
+import unittest
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiAthletesStore(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_athletes_store")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_append_and_get(self):
+        """ Test only projected fields are stored and latest records win. """
+        store = EspnFantasyApiAthletesStore(self._test_folder)
+        self.assertEqual(store.get_records(), [])
+        self.assertIsNone(store.get(1234))
+
+        self.assertEqual(store.append([self._create_athlete_dict(1234, "Player 1"), self._create_athlete_dict(2345, "Player 2"), {}], updated=1), 2)
+        self.assertEqual(store.get(1234), {'id': 1234, 'fullName': "Player 1", 'displayBirthPlace': "Place", 'displayHeight': "6' 0\"",
+                                           'displayWeight': "200 lbs", 'displayDOB': "1/1/2000", 'updated': 1})
+
+        # Test appending an update after the index is built
+        store.append([self._create_athlete_dict(1234, "Player 1 Updated")], updated=2)
+        self.assertEqual(store.get(1234)['fullName'], "Player 1 Updated")
+        self.assertEqual([r['fullName'] for r in store.get_records()], ["Player 1 Updated", "Player 2"])
+        self.assertEqual(store.get_updated_times(), {1234: 2, 2345: 1})
+
+        # Test compacting only keeps latest records
+        store.compact()
+        with open(os.path.join(self._test_folder, STORE_FILE_NAME), 'r') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(store.get(1234)['fullName'], "Player 1 Updated")
+
+    def test_partial_line(self):
+        """ Test a partially written line from an interrupted append is ignored and overwritten. """
+        store = EspnFantasyApiAthletesStore(self._test_folder)
+        store.append([self._create_athlete_dict(1234, "Player 1")])
+        with open(os.path.join(self._test_folder, STORE_FILE_NAME), 'a') as f:
+            f.write('{"id": 2345, "fullN')
+
+        self.assertEqual(len(store.get_records()), 1)
+        self.assertIsNone(store.get(2345))
+
+        store.append([self._create_athlete_dict(2345, "Player 2")])
+        self.assertEqual([r['fullName'] for r in store.get_records()], ["Player 1", "Player 2"])
+        self.assertEqual(store.get(2345)['fullName'], "Player 2")
+
+    def test_get_athletes_df(self):
+        """ Test downloaded athletes files are only ingested when asked, once, and loaded from the store. """
+        folder_path = os.path.join(self._test_folder, "athletes")
+        os.makedirs(folder_path, exist_ok=True)
+        for id in [1234, 2345]:
+            with open(os.path.join(folder_path, f"{id}.json"), 'w') as f:
+                json.dump(self._create_athlete_dict(id, f"Player {id}"), f)
+
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        self.assertTrue(parser.get_athletes_df().empty)
+        df = parser.get_athletes_df(ingest_folder=True)
+        self.assertEqual(list(df['Player ID']), [1234.0, 2345.0])
+        self.assertEqual(list(df['Player Name']), ["Player 1234", "Player 2345"])
+        self.assertEqual(list(df.columns), ['Player ID', 'Player Name', 'Player Birth Place', 'Player Height', 'Player Weight', 'Player DOB'])
+
+        # Test files already in the store are not ingested again
+        store = EspnFantasyApiAthletesStore(self._test_folder)
+        self.assertEqual(store.ingest_folder(folder_path), 0)
+
+        # Test modified files are ingested again
+        file_path = os.path.join(folder_path, "1234.json")
+        with open(file_path, 'w') as f:
+            json.dump(self._create_athlete_dict(1234, "Player Updated"), f)
+        os.utime(file_path, (store.get(1234)['updated'] + 10, store.get(1234)['updated'] + 10))
+        self.assertEqual(list(parser.get_athletes_df()['Player Name']), ["Player 1234", "Player 2345"])
+        self.assertEqual(list(parser.get_athletes_df(ingest_folder=True)['Player Name']), ["Player Updated", "Player 2345"])
+
+    def _create_athlete_dict(self, id, name):
+        """ Helper function to create data in the form of the ESPN athletes API. """
+        return {'athlete': {'id': str(id), 'fullName': name, 'displayBirthPlace': "Place", 'displayHeight': "6' 0\"",
+                            'displayWeight': "200 lbs", 'displayDOB': "1/1/2000", 'links': [{'href': "https://example.com"}]}}
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_store import EspnFantasyApiAthletesStore
+from espn_fantasy_api_scripts.espn_fantasy_api_athletes_sync import CHECKPOINT_FILE_NAME, EspnFantasyApiAthletesSync, get_needed_player_ids
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+import json
+import os
+import shutil
+import time
+import unittest
+from utils.mock_api_server import MockApiServer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Player IDs known by the mock server
+MOCK_PLAYER_IDS = [4000000, 4000001, 4000002, 4000003, 4000004]
+
+class TestEspnFantasyApiAthletesSync(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_athletes_sync")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_get_needed_player_ids(self):
+        """ Test drafted players and players with games played are needed. """
+        season_folder_path = os.path.join(self._test_folder, "20192020")
+        os.makedirs(season_folder_path, exist_ok=True)
+        with open(os.path.join(season_folder_path, "20192020_draft_details.json"), 'w') as f:
+            json.dump({'draftDetail': {'picks': [{'playerId': 1}, {'playerId': 2}]}}, f)
+        with open(os.path.join(season_folder_path, "20192020_all_players_info.json"), 'w') as f:
+            json.dump({'players': [{'player': {'id': 2, 'stats': [{'id': "002020", 'stats': {'34': 10}}]}},
+                                   {'player': {'id': 3, 'stats': [{'id': "002020", 'stats': {'34': 1}}]}},
+                                   {'player': {'id': 4, 'stats': [{'id': "002020", 'stats': {'13': 1}}]}},
+                                   {'player': {'id': 5, 'stats': [{'id': "002019", 'stats': {'34': 1}}]}},
+                                   {'player': {'id': 6}}]}, f)
+
+        loader = EspnFantasyApiLoader(self._test_folder)
+        self.assertEqual(get_needed_player_ids(loader, 2020, 2020), {1, 2, 3})
+        self.assertEqual(get_needed_player_ids(loader, 2021, 2022), set())
+
+    def test_sync(self):
+        """ Test only missing athletes are downloaded and failed responses are not saved. """
+        with MockApiServer() as server:
+            downloader = EspnApiDownloader(root_output_folder=self._test_folder, base_url=server.base_url)
+            athletes_sync = EspnFantasyApiAthletesSync(downloader, batch_size=2)
+
+            # Unknown player ID fails on the mock server
+            summary = athletes_sync.sync(lambda: set(MOCK_PLAYER_IDS[:3] + [1]))
+            self.assertEqual(summary, {'num_downloaded': 3, 'failed': [1]})
+            self.assertEqual(sorted(os.listdir(downloader.get_athletes_folder_path())), [f"{id}.json" for id in MOCK_PLAYER_IDS[:3]])
+            self.assertFalse(os.path.exists(os.path.join(self._test_folder, CHECKPOINT_FILE_NAME)))
+            self.assertEqual([r['id'] for r in EspnFantasyApiAthletesStore(self._test_folder).get_records()], MOCK_PLAYER_IDS[:3])
+
+            # Test only new athletes are downloaded
+            num_requests = sum(server.request_counts.values())
+            summary = athletes_sync.sync(lambda: set(MOCK_PLAYER_IDS))
+            self.assertEqual(summary['num_downloaded'], 2)
+            self.assertEqual(sum(server.request_counts.values()) - num_requests, 2)
+
+    def test_sync_stale(self):
+        """ Test athletes older than the maximum age are downloaded again. """
+        with MockApiServer() as server:
+            downloader = EspnApiDownloader(root_output_folder=self._test_folder, base_url=server.base_url)
+            EspnFantasyApiAthletesSync(downloader).sync(lambda: set(MOCK_PLAYER_IDS[:2]))
+
+            # Make one file appear to be 2 days old
+            file_path = os.path.join(downloader.get_athletes_folder_path(), f"{MOCK_PLAYER_IDS[0]}.json")
+            two_days_ago = time.time() - 2 * 24 * 60 * 60
+            os.utime(file_path, (two_days_ago, two_days_ago))
+
+            self.assertEqual(EspnFantasyApiAthletesSync(downloader).get_player_ids_to_download(set(MOCK_PLAYER_IDS[:2])), [])
+            self.assertEqual(EspnFantasyApiAthletesSync(downloader, max_age_days=1).get_player_ids_to_download(set(MOCK_PLAYER_IDS[:2])), [MOCK_PLAYER_IDS[0]])
+
+    def test_sync_resume(self):
+        """ Test an interrupted sync resumes from its checkpoint. """
+        with open(os.path.join(self._test_folder, CHECKPOINT_FILE_NAME), 'w') as f:
+            json.dump({'pending': MOCK_PLAYER_IDS[3:], 'failed': [1]}, f)
+
+        with MockApiServer() as server:
+            downloader = EspnApiDownloader(root_output_folder=self._test_folder, base_url=server.base_url)
+            summary = EspnFantasyApiAthletesSync(downloader).sync(lambda: self.fail("Player IDs should not be recomputed when resuming."))
+
+        self.assertEqual(summary, {'num_downloaded': 2, 'failed': [1]})
+        self.assertEqual(sorted(os.listdir(downloader.get_athletes_folder_path())), [f"{id}.json" for id in MOCK_PLAYER_IDS[3:]])
+        self.assertFalse(os.path.exists(os.path.join(self._test_folder, CHECKPOINT_FILE_NAME)))
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
\ No newline at end of file
@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
 from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
 import json
 import os
+import pandas as pd
 import shutil
 import unittest
+from utils.mock_api_server import MockApiServer, SYNTHETIC_NUM_PLAYERS
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_LEAGUE_ID = 54078
@@ -81,6 +85,57 @@ class TestEspnFantasyApiDDownloader(unittest.TestCase):
         self.assertTrue(len(expected_data['players']) > 0)
         self.assertTrue("id" in expected_data['players'][0])
 
+    def test_download_all_players_info_pages(self):
+        """ Tests downloading all players info in pages gives the same players as a single request. """
+        paged_folder = os.path.join(self._test_folder, "paged")
+        single_folder = os.path.join(self._test_folder, "single")
+        with MockApiServer() as server:
+            EspnFantasyApiDownloader(TEST_SEASON, TEST_LEAGUE_ID, root_output_folder=single_folder, base_url=server.base_url).download_all_players_info()
+
+            # Test pages past the last page of an earlier download are removed
+            fapi_downloader = EspnFantasyApiDownloader(TEST_SEASON, TEST_LEAGUE_ID, root_output_folder=paged_folder, base_url=server.base_url)
+            folder_path = os.path.join(paged_folder, "20242025", "all_players_info")
+            os.makedirs(folder_path)
+            self._create_empty_json(os.path.join(folder_path, "20242025_all_players_info_page9.json"))
+
+            # 60 players in pages of 25 are 2 full pages and a last page of 10
+            server.request_counts = {}
+            self.assertEqual(fapi_downloader.download_all_players_info_pages(page_size=25, num_concurrent_pages=2), 3)
+            self.assertEqual(server.request_counts, {200: 4})
+            self.assertEqual(sorted(os.listdir(folder_path)), [f"20242025_all_players_info_page{page}.json" for page in range(3)])
+
+        # Test an earlier download is kept if any page fails
+        with MockApiServer(error_rate=1.0) as server:
+            fapi_downloader = EspnFantasyApiDownloader(TEST_SEASON, TEST_LEAGUE_ID, root_output_folder=paged_folder, base_url=server.base_url)
+            self.assertEqual(fapi_downloader.download_all_players_info_pages(page_size=25, num_concurrent_pages=2, retry_delay=0), 0)
+            self.assertEqual(sorted(os.listdir(os.path.join(paged_folder, "20242025"))), ["all_players_info"])
+            self.assertEqual(sorted(os.listdir(folder_path)), [f"20242025_all_players_info_page{page}.json" for page in range(3)])
+
+        loader = EspnFantasyApiLoader(paged_folder)
+        self.assertEqual([len(d['players']) for d in loader.iter_all_players_info_dicts("20242025")], [25, 25, 10])
+        self.assertEqual(len(loader.get_all_players_info_dict("20242025")['players']), SYNTHETIC_NUM_PLAYERS)
+        self.assertEqual(loader.get_all_players_info_dict("20242025"), EspnFantasyApiLoader(single_folder).get_all_players_info_dict("20242025"))
+
+        expected_df = EspnFantasyApiDownloadsParser(single_folder).get_all_players_info_df()
+        pd.testing.assert_frame_equal(expected_df, EspnFantasyApiDownloadsParser(paged_folder).get_all_players_info_df())
+
+    def test_download_all_players_info_pages_retries(self):
+        """ Tests failed pages are retried on their own and the number of pages is capped. """
+        folder_path = os.path.join(self._test_folder, "20242025", "all_players_info")
+        with MockApiServer(error_rate=0.2, seed=0) as server:
+            fapi_downloader = EspnFantasyApiDownloader(TEST_SEASON, TEST_LEAGUE_ID, root_output_folder=self._test_folder, base_url=server.base_url)
+            self.assertEqual(fapi_downloader.download_all_players_info_pages(page_size=5, num_concurrent_pages=4, retry_delay=0), 13)
+            self.assertTrue(server.request_counts[500] > 0)
+        loader = EspnFantasyApiLoader(self._test_folder)
+        self.assertEqual(len(loader.get_all_players_info_dict("20242025")['players']), SYNTHETIC_NUM_PLAYERS)
+
+        # Test pages are not requested past the maximum number of players when every page is full
+        with MockApiServer() as server:
+            fapi_downloader = EspnFantasyApiDownloader(TEST_SEASON, TEST_LEAGUE_ID, root_output_folder=self._test_folder, base_url=server.base_url)
+            self.assertEqual(fapi_downloader.download_all_players_info_pages(page_size=5, num_concurrent_pages=4, max_players=22), 5)
+            self.assertEqual(server.request_counts, {200: 5})
+        self.assertEqual(sorted(os.listdir(folder_path)), sorted(f"20242025_all_players_info_page{page}.json" for page in range(5)))
+
     def test_download_athletes_data(self):
         """ Tests downloading athletes data. """
         # Download
@@ -96,6 +151,56 @@ class TestEspnFantasyApiDDownloader(unittest.TestCase):
         self.assertTrue("fullName" in expected_data['athlete'])
         self.assertTrue(expected_data['athlete']['id'], 3895074)
 
+    def test_download_realtime_stats(self):
+        """ Tests downloading realtime stats to a timestamped file. """
+        with MockApiServer() as server:
+            fapi_downloader = EspnFantasyApiDownloader(league_id=TEST_LEAGUE_ID, season=TEST_SEASON,
+                                                       root_output_folder=self._test_folder, base_url=server.base_url)
+            fapi_downloader.download_realtime_stats()
+
+        # Test file exists
+        folder_path = os.path.join(self._test_folder, "20242025", "realtime_stats")
+        file_names = os.listdir(folder_path)
+        self.assertEqual(len(file_names), 1)
+        self.assertTrue(file_names[0].startswith("20242025_realtime_stats_"))
+
+        # Test contents in file
+        expected_data = self._load_json(os.path.join(folder_path, file_names[0]))
+        self.assertTrue("schedule" in expected_data)
+
+    def test_poll_realtime_stats(self):
+        """ Tests polling realtime stats saves a snapshot followed by deltas. """
+        with MockApiServer() as server:
+            fapi_downloader = EspnFantasyApiDownloader(league_id=TEST_LEAGUE_ID, season=TEST_SEASON,
+                                                       root_output_folder=self._test_folder, base_url=server.base_url)
+            num_saved = fapi_downloader.poll_realtime_stats(interval=0, max_polls=3)
+
+        # Mock server live scores change every poll
+        self.assertEqual(num_saved, 3)
+
+        folder_path = os.path.join(self._test_folder, "20242025", "realtime_stats")
+        file_names = sorted(os.listdir(folder_path))
+        self.assertEqual(len(file_names), 2)
+        self.assertTrue(file_names[0].endswith(".json"))
+        self.assertTrue(file_names[1].endswith("_deltas.jsonl"))
+        with open(os.path.join(folder_path, file_names[1]), 'r') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_poll_realtime_stats_connection_error(self):
+        """ Tests polling realtime stats keeps polling after connection errors. """
+        with MockApiServer() as server:
+            base_url = server.base_url
+
+        # Server is stopped, so every poll fails to connect
+        fapi_downloader = EspnFantasyApiDownloader(league_id=TEST_LEAGUE_ID, season=TEST_SEASON,
+                                                   root_output_folder=self._test_folder, base_url=base_url)
+        self.assertEqual(fapi_downloader.poll_realtime_stats(interval=0, max_polls=2), 0)
+
+    def _create_empty_json(self, file_path):
+        """ Helper function to create an empty JSON file. """
+        with open(file_path, 'w') as f:
+            json.dump({}, f)
+
     def _load_json(self, file_path):
         """ Helper function to load a JSON file. """
         with open(file_path, 'r') as f:
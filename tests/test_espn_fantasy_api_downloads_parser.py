@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiDownloadsParser(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_downloads_parser")
+        os.makedirs(self._test_folder, exist_ok=True)
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+    def test_get_lineup_slots_df(self):
+        """ Test lineup slots are read from league settings and bench players are not active. """
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        lineup_slots_df = parser.get_lineup_slots_df("20242025").set_index('lineupSlot')
+        self.assertEqual(lineup_slots_df['count'].to_dict(), {'C': 1, 'LW': 1, 'RW': 1, 'F': 0, 'D': 1, 'G': 1, 'UTIL': 0, 'BE': 1, 'IR': 0})
+        self.assertEqual(lineup_slots_df[~lineup_slots_df['active']].index.tolist(), ['BE', 'IR'])
+        self.assertTrue(parser.get_lineup_slots_df("20192020").empty)
+
+        df = parser.get_daily_rosters_df_by_season("20242025", None)
+        self.assertEqual(df.columns.tolist()[:4], ['fullName', 'id', 'lineupSlotId', 'active'])
+        self.assertEqual(df['active'].tolist(), (df['lineupSlotId'] != 7).tolist())
+
+    def test_get_daily_rosters_totals_df(self):
+        """ Test totals are saved alongside the store and match the daily rosters. """
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        df = parser.get_daily_rosters_df_by_season("20242025", None)
+        totals_df = parser.get_daily_rosters_totals_df_by_season("20242025")
+        self.assertEqual(totals_df.columns.tolist()[:5], ['season', 'owner', 'scoringPeriodId', 'active', 'numPlayers'])
+        self.assertEqual(len(totals_df), 4 * 10 * 2)
+        self.assertEqual(totals_df['numPlayers'].sum(), len(df))
+
+        active_df = totals_df[totals_df['active']]
+        expected = df[df['active']].groupby('owner')['appliedTotal'].sum()
+        pd.testing.assert_series_equal(expected, active_df.groupby('owner')['appliedTotal'].sum())
+
+        # Test totals are loaded from file without parsing scoring periods
+        self.assertIsNone(parser.load_daily_rosters_totals_df("20242025"))
+        parser.get_daily_rosters_df_by_season("20242025", None, use_store=True)
+        instrumentation.reset()
+        loaded_df = parser.get_daily_rosters_totals_df(use_store=True)
+        self.assertNotIn('rows_produced.scoring_period', instrumentation.get_counters())
+        pd.testing.assert_frame_equal(totals_df, loaded_df, check_dtype=False)
+
+    def test_iter_daily_rosters_dfs(self):
+        """ Test batches are one scoring period each, in order, and match the full dataframe. """
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        expected_df = parser.get_daily_rosters_df_by_season("20242025", None).reset_index(drop=True)
+        columns = parser.get_daily_rosters_columns()
+        self.assertEqual(set(columns), set(expected_df.columns))
+
+        # Test raw stat counts are only added when asked
+        raw_stats_df = parser.get_daily_rosters_df_by_season("20242025", None, raw_stats=True).reset_index(drop=True)
+        raw_columns = [c for c in raw_stats_df.columns if c not in expected_df.columns]
+        self.assertTrue(raw_columns and all(c.startswith("raw_") for c in raw_columns))
+        pd.testing.assert_frame_equal(expected_df, raw_stats_df[expected_df.columns])
+
+        for use_store in [False, True]:
+            dfs = list(parser.iter_daily_rosters_dfs(use_store=use_store))
+            self.assertEqual([df['scoringPeriodId'].unique().tolist() for df in dfs], [[i] for i in range(1, 11)])
+            actual_df = pd.concat(dfs, ignore_index=True)[expected_df.columns]
+            pd.testing.assert_frame_equal(expected_df, actual_df, check_dtype=False)
+
+            # Test only the given columns are kept, even without scoringPeriodId
+            dfs = list(parser.iter_daily_rosters_dfs(use_store=use_store, columns=['id', 'appliedTotal']))
+            self.assertEqual(len(dfs), 10)
+            self.assertTrue(all(df.columns.tolist() == ['id', 'appliedTotal'] for df in dfs))
+            actual_df = pd.concat(dfs, ignore_index=True)
+            pd.testing.assert_frame_equal(expected_df[['id', 'appliedTotal']], actual_df, check_dtype=False)
+            parser.save_daily_rosters_store("20242025")
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_lazy_seasons_df import EspnFantasyApiLazySeasonsDf
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiLazySeasonsDf(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_lazy_seasons_df")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_lazy_seasons_df(self):
+        """ Test seasons are only loaded when needed and only once. """
+        loaded_seasons = []
+        def load_season_df(season_string):
+            loaded_seasons.append(season_string)
+            return pd.DataFrame({'Player ID': [1, 2], 'Player Name': ["Player 1", "Player 2"], 'Season': int(season_string)})
+
+        lazy_df = EspnFantasyApiLazySeasonsDf(["20182019", "20192020", "20202021", "20212022"], load_season_df)
+        filtered_df = lazy_df.filter(start_season="20192020", end_season=20202021)
+        self.assertEqual(filtered_df.get_seasons(), ["20192020", "20202021"])
+        self.assertEqual(loaded_seasons, [])
+
+        df = filtered_df.get_df(columns=['Season', 'Player ID', 'Other'])
+        self.assertEqual(df.columns.tolist(), ['Season', 'Player ID'])
+        self.assertEqual(df['Season'].tolist(), [20192020, 20192020, 20202021, 20202021])
+        self.assertEqual(loaded_seasons, ["20192020", "20202021"])
+
+        # Test loaded seasons are shared with the unfiltered collection
+        self.assertTrue(lazy_df.is_loaded("20192020"))
+        self.assertEqual(len(lazy_df.filter(end_season="20192020").get_df()), 4)
+        self.assertEqual(loaded_seasons, ["20192020", "20202021", "20182019"])
+        self.assertIsNone(filtered_df.get_season_df("20212022"))
+
+    def test_downloads_parser_season_range(self):
+        """ Test only seasons in range are parsed by the downloads parser. """
+        with MockApiServer() as server:
+            for year in [2024, 2025]:
+                downloader = EspnFantasyApiDownloader(year, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+                downloader.download_league_info()
+                downloader.download_scoring_periods()
+
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        self.assertEqual(sorted(parser.get_seasons()), ["20232024", "20242025"])
+        self.assertEqual(parser.get_seasons(start_season="20242025"), ["20242025"])
+
+        instrumentation.reset()
+        df = parser.get_daily_rosters_df(multiprocess=False, start_season="20242025", columns=['id', 'season', 'appliedTotal'])
+        self.assertEqual(df.columns.tolist(), ['id', 'season', 'appliedTotal'])
+        self.assertEqual(df['season'].unique().tolist(), ["20242025"])
+        self.assertEqual(instrumentation.get_counters()['rows_produced.scoring_period'], len(df))
+
+        # Test columns are read from the store
+        expected_df = parser.get_daily_rosters_df_by_season("20242025", None, use_store=True)
+        actual_df = parser.get_daily_rosters_df_by_season("20242025", None, use_store=True, columns=['season', 'id', 'G'])
+        self.assertEqual(actual_df.columns.tolist(), ['season', 'id', 'G'])
+        pd.testing.assert_frame_equal(expected_df[['season', 'id', 'G']].reset_index(drop=True), actual_df)
+
+    def test_downloads_parser_columns(self):
+        """ Test only the given columns of draft details and all players info are parsed, in the given order. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_draft_details()
+            downloader.download_all_players_info()
+
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        expected_df = parser.get_all_players_info_df()
+        actual_df = parser.get_all_players_info_df(columns=['Season', 'Player ID', 'G', 'Other'])
+        self.assertEqual(actual_df.columns.tolist(), ['Season', 'Player ID', 'G'])
+        pd.testing.assert_frame_equal(expected_df[['Season', 'Player ID', 'G']], actual_df)
+
+        expected_df = parser.get_draft_details_df()
+        actual_df = parser.get_draft_details_df(columns=['Player ID', 'Draft Number'])
+        self.assertEqual(actual_df.columns.tolist(), ['Player ID', 'Draft Number'])
+        pd.testing.assert_frame_equal(expected_df[['Player ID', 'Draft Number']], actual_df)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+import json
 import os
 import shutil
 import unittest
+import utils.json_delta as json_delta
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -36,6 +38,44 @@ class TestEspnFantasyApiLoader(unittest.TestCase):
         self.assertIsNone(espn_api._load_json("2019", "2020_league_info.json"))
         self.assertIsNone(espn_api._load_json("2019", "2020_all_players_info.json"))
 
+    def test_get_realtime_stats_dicts(self):
+        """ Test realtime stats snapshots are reconstructed from deltas. """
+        # Generate test structure
+        root_folder_path = os.path.join(self._test_folder, "test_get_realtime_stats_dicts")
+        folder_path = os.path.join(root_folder_path, "20192020", "realtime_stats")
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, "20192020_realtime_stats_2020-01-01_00-00-00.json"), 'w') as f:
+            json.dump({'points': 0, 'teams': [1, 2]}, f)
+        with open(os.path.join(folder_path, "20192020_realtime_stats_2020-01-01_00-00-00_deltas.jsonl"), 'w') as f:
+            f.write(json.dumps({'timestamp': "2020-01-01_00-01-00", 'delta': json_delta.diff({'points': 0, 'teams': [1, 2]}, {'points': 1, 'teams': [1, 2]})}) + "\n")
+            f.write(json.dumps({'timestamp': "2020-01-01_00-02-00", 'delta': json_delta.diff({'points': 1, 'teams': [1, 2]}, {'points': 1, 'teams': [1]})}) + "\n")
+        with open(os.path.join(folder_path, "20192020_realtime_stats_2020-01-01_00-01-30.json"), 'w') as f:
+            json.dump({'points': 5}, f)
+
+        # Test snapshots are in time order
+        espn_api = EspnFantasyApiLoader(root_folder_path)
+        expected_result = [{'timestamp': "2020-01-01_00-00-00", 'data': {'points': 0, 'teams': [1, 2]}},
+                           {'timestamp': "2020-01-01_00-01-00", 'data': {'points': 1, 'teams': [1, 2]}},
+                           {'timestamp': "2020-01-01_00-01-30", 'data': {'points': 5}},
+                           {'timestamp': "2020-01-01_00-02-00", 'data': {'points': 1, 'teams': [1]}}]
+        self.assertEqual(expected_result, espn_api.get_realtime_stats_dicts("20192020"))
+
+        # Test season without realtime stats
+        self.assertEqual([], espn_api.get_realtime_stats_dicts("20202021"))
+
+    def test_iter_all_players_info_dicts(self):
+        """ Test pages are in page order and players already in an earlier page are removed. """
+        folder_path = os.path.join(self._test_folder, "20192020", "all_players_info")
+        os.makedirs(folder_path, exist_ok=True)
+        for page, player_ids in {0: [1, 2], 1: [2, 3], 10: [4]}.items():
+            with open(os.path.join(folder_path, f"20192020_all_players_info_page{page}.json"), 'w') as f:
+                json.dump({'players': [{'id': player_id} for player_id in player_ids]}, f)
+
+        espn_api = EspnFantasyApiLoader(self._test_folder)
+        page_dicts = list(espn_api.iter_all_players_info_dicts("20192020"))
+        self.assertEqual([[player['id'] for player in page_dict['players']] for page_dict in page_dicts], [[1, 2], [3], [4]])
+        self.assertEqual([player['id'] for player in espn_api.get_all_players_info_dict("20192020")['players']], [1, 2, 3, 4])
+
     def _create_empty_json(self, file_path):
         """ Helper function to create an empty JSON file. """
         with open(file_path, 'w') as f:
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_roster_store import EspnFantasyApiRosterStore
+import json
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import unittest
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiRosterStore(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_roster_store")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_save_and_load(self):
+        """ Test data is read back identically as memory-mapped arrays. """
+        df = pd.DataFrame([{'fullName': "Player 1", 'id': 1234, 'lineupSlotId': 3, 'G': 2, 'A': 1, 'appliedTotal': 5, 'GP': 1, 'scoringPeriodId': 1, 'owner': "Owner 1", 'season': "20192020"},
+                           {'fullName': "Player 2", 'id': 2345, 'lineupSlotId': 4, 'appliedTotal': 0, 'scoringPeriodId': 1, 'owner': "Owner 2", 'season': "20192020"},
+                           {'fullName': "Player 1", 'id': 1234, 'lineupSlotId': 7, 'scoringPeriodId': 2, 'owner': "Owner 1", 'season': "20192020"}])
+
+        store = EspnFantasyApiRosterStore(os.path.join(self._test_folder, "store"))
+        self.assertFalse(store.exists())
+        self.assertIsNone(store.get_df())
+        self.assertTrue(store.save(df, {'latestScoringPeriod': 2}))
+        self.assertTrue(store.exists())
+
+        metadata = store.get_metadata()
+        self.assertEqual(metadata['latestScoringPeriod'], 2)
+        self.assertEqual(metadata['fullName'], ["Player 1", "Player 2"])
+        self.assertEqual(metadata['owner'], ["Owner 1", "Owner 2"])
+
+        arrays = store.load()
+        self.assertIsInstance(arrays['id'], np.memmap)
+        self.assertEqual(arrays['stats'].shape, (2, 3))
+        self.assertEqual(arrays['fullName_codes'].tolist(), [0, 1, 0])
+
+        # Test dataframe is identical other than fixed-width types, and is a view of the store
+        actual_df = store.get_df()
+        pd.testing.assert_frame_equal(df, actual_df, check_dtype=False)
+        for column in ['id', 'G', 'appliedTotal']:
+            self.assertTrue(self._is_memory_mapped(actual_df[column].to_numpy()))
+
+        # Test modifying loaded data does not modify the store
+        actual_df.loc[0, 'appliedTotal'] = 100
+        self.assertEqual(store.get_df().loc[0, 'appliedTotal'], 5)
+
+    def test_save_multiple_seasons(self):
+        """ Test a store only holds a single season. """
+        df = pd.DataFrame([{'fullName': "Player 1", 'id': 1234, 'lineupSlotId': 3, 'scoringPeriodId': 1, 'owner': "Owner 1", 'season': "20192020"},
+                           {'fullName': "Player 1", 'id': 1234, 'lineupSlotId': 3, 'scoringPeriodId': 1, 'owner': "Owner 1", 'season': "20202021"}])
+        store = EspnFantasyApiRosterStore(os.path.join(self._test_folder, "store"))
+        self.assertFalse(store.save(df))
+        self.assertFalse(store.exists())
+
+    def test_downloads_parser_use_store(self):
+        """ Test daily rosters are saved to the store and reloaded until out-of-date. """
+        root_folder_path = os.path.join(self._test_folder, "test_downloads_parser_use_store")
+        self._create_season_folder(root_folder_path, latest_scoring_period=2)
+        parser = EspnFantasyApiDownloadsParser(root_folder_path)
+
+        expected_df = parser.get_daily_rosters_df_by_season("20192020", None).reset_index(drop=True)
+        actual_df = parser.get_daily_rosters_df_by_season("20192020", None, use_store=True)
+        pd.testing.assert_frame_equal(expected_df, actual_df.reset_index(drop=True), check_dtype=False)
+        self.assertTrue(parser.get_daily_rosters_store("20192020").exists())
+
+        # Test store is loaded without parsing scoring period files
+        shutil.rmtree(os.path.join(root_folder_path, "20192020", "scoring_periods"))
+        pd.testing.assert_frame_equal(expected_df, parser.load_daily_rosters_store_df("20192020"), check_dtype=False)
+
+        # Test store is out-of-date when more scoring periods are available
+        self._create_season_folder(root_folder_path, latest_scoring_period=3)
+        self.assertIsNone(parser.load_daily_rosters_store_df("20192020"))
+        self.assertEqual(parser.get_daily_rosters_df_by_season("20192020", None, use_store=True)['scoringPeriodId'].max(), 3)
+
+    def _is_memory_mapped(self, array):
+        """ Helper function to check if an array is a view of a memory-mapped array. """
+        while array is not None:
+            if isinstance(array, np.memmap):
+                return True
+            array = getattr(array, 'base', None)
+        return False
+
+    def _create_season_folder(self, root_folder_path, latest_scoring_period):
+        """ Helper function to create a season folder with league info and scoring periods. """
+        season_folder_path = os.path.join(root_folder_path, "20192020")
+        os.makedirs(os.path.join(season_folder_path, "scoring_periods"), exist_ok=True)
+        with open(os.path.join(season_folder_path, "20192020_league_info.json"), 'w') as f:
+            json.dump({'members': [{'id': "1a2b", 'firstName': "Owner", 'lastName': "1"}],
+                       'status': {'firstScoringPeriod': 1, 'latestScoringPeriod': latest_scoring_period, 'finalScoringPeriod': 10}}, f)
+
+        for id in range(1, latest_scoring_period + 1):
+            entries = [{'lineupSlotId': 3, 'playerPoolEntry': {'player': {'fullName': "Player 1", 'id': 1234, 'stats': [{'scoringPeriodId': id, 'appliedTotal': 5, 'appliedStats': {'13': 2, '14': 1}, 'stats': {'13': 2, '14': 1}}]}}},
+                       {'lineupSlotId': 5, 'playerPoolEntry': {'player': {'fullName': "Player 2", 'id': 9999, 'stats': [{'scoringPeriodId': id, 'appliedTotal': 2, 'appliedStats': {'1': 1}, 'stats': {'1': 1}}]}}}]
+            with open(os.path.join(season_folder_path, "scoring_periods", f"20192020_scoring_period{id}.json"), 'w') as f:
+                json.dump({'scoringPeriodId': id, 'teams': [{'owners': ["1a2b"], 'roster': {'entries': entries}}]}, f)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
\ No newline at end of file
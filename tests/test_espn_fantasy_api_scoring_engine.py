@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_loader import EspnFantasyApiLoader
+from espn_fantasy_api_scripts.espn_fantasy_api_scoring_engine import EspnFantasyApiScoringEngine, get_scoring_settings
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Applied stats maps of two seasons where goals are worth different points and hits are only scored in one
+APPLIED_STATS_MAPS = {'20192020': {13: {'stat': "G", 'points': 2.0}, 14: {'stat': "A", 'points': 1.0}},
+                      '20202021': {13: {'stat': "G", 'points': 3.0}, 14: {'stat': "A", 'points': 1.0}, 31: {'stat': "HIT", 'points': 0.5}}}
+
+class TestEspnFantasyApiScoringEngine(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_scoring_engine")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_get_points(self):
+        """ Test points are recomputed for multiple scoring settings at once. """
+        # Raw stats are 2 goals, 1 assist for player 1 and 1 goal, 4 hits for player 2 in 20202021
+        df = pd.DataFrame([{'id': 1, 'G': 4.0, 'A': 1.0, 'appliedTotal': 5.0, 'owner': "Owner 1", 'season': "20192020"},
+                           {'id': 2, 'appliedTotal': float('nan'), 'owner': "Owner 2", 'season': "20192020"},
+                           {'id': 1, 'G': 6.0, 'A': 1.0, 'appliedTotal': 7.0, 'owner': "Owner 1", 'season': "20202021"},
+                           {'id': 2, 'G': 3.0, 'HIT': 2.0, 'appliedTotal': 5.0, 'owner': "Owner 2", 'season': "20202021"}])
+        engine = EspnFantasyApiScoringEngine(df, APPLIED_STATS_MAPS)
+
+        raw_stats = engine.get_raw_stats()
+        self.assertEqual(raw_stats.shape, (4, len(engine.get_stat_ids())))
+        self.assertEqual(raw_stats[3, engine.get_stat_ids().index(31)], 4)
+        np.testing.assert_allclose(engine.get_season_points(), df['appliedTotal'].fillna(0))
+
+        scoring_settings_list = [{13: 1.0}, {'14': 2.0, '31': 1.0}]
+        np.testing.assert_allclose(engine.get_points(scoring_settings_list), [[2, 2], [0, 0], [2, 2], [1, 4]])
+
+        # Hits are not available in the first season
+        self.assertEqual(engine.get_unscored_stat_ids(scoring_settings_list), {'20192020': [31]})
+
+        totals_df = engine.get_totals_df({'goals': {13: 1.0}, 'actual': get_scoring_settings(APPLIED_STATS_MAPS['20202021'])})
+        self.assertEqual(totals_df.columns.tolist(), ['season', 'owner', 'goals', 'actual'])
+        self.assertEqual(totals_df['goals'].tolist(), [2, 0, 2, 1])
+        self.assertEqual(totals_df['actual'].tolist(), [7, 0, 7, 5])
+
+    def test_get_points_downloaded(self):
+        """ Test points under the league's own settings match the applied totals of downloaded data. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+        parser = EspnFantasyApiDownloadsParser(self._test_folder)
+        df = parser.get_daily_rosters_df_by_season("20242025", None, raw_stats=True)
+        applied_stats_map = EspnFantasyApiLoader(self._test_folder).get_applied_stats_map("20242025")
+        engine = EspnFantasyApiScoringEngine(df, {'20242025': applied_stats_map})
+
+        np.testing.assert_allclose(engine.get_season_points(), df['appliedTotal'].fillna(0))
+        points_df = engine.get_points_df({'actual': get_scoring_settings(applied_stats_map), 'none': {}})
+        np.testing.assert_allclose(points_df['actual'], df['appliedTotal'].fillna(0))
+        self.assertTrue((points_df['none'] == 0).all())
+
+        # Test stats the league doesn't score are given points from raw counts
+        gp_points = engine.get_points([{34: 1.0}])[:, 0]
+        np.testing.assert_allclose(gp_points, df['raw_GP'].fillna(0))
+        self.assertEqual(gp_points.sum(), df['GP'].sum())
+        self.assertEqual(engine.get_unscored_stat_ids([{34: 1.0}]), {})
+
+    def test_get_raw_stats(self):
+        """ Test raw stat columns are used when available, with applied stats as a fallback. """
+        # Hits are not scored in 20192020 but player 2's are recorded as raw counts
+        df = pd.DataFrame([{'id': 1, 'G': 4.0, 'raw_G': 2.0, 'appliedTotal': 4.0, 'owner': "Owner 1", 'season': "20192020"},
+                           {'id': 2, 'raw_HIT': 3.0, 'appliedTotal': 0.0, 'owner': "Owner 2", 'season': "20192020"},
+                           {'id': 1, 'G': 6.0, 'HIT': 1.0, 'appliedTotal': 7.0, 'owner': "Owner 1", 'season': "20202021"}])
+        engine = EspnFantasyApiScoringEngine(df, APPLIED_STATS_MAPS)
+        hits_settings = {**get_scoring_settings(APPLIED_STATS_MAPS['20192020']), 31: 0.5}
+        np.testing.assert_allclose(engine.get_points([hits_settings])[:, 0], [4.0, 1.5, 5.0])
+        self.assertEqual(engine.get_unscored_stat_ids([hits_settings]), {})
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
\ No newline at end of file
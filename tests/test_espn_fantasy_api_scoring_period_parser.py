@@ -28,6 +28,12 @@ class TestEspnFantasyApiScoringPeriodParser(unittest.TestCase):
 
         self.assertEqual(expected_result, actual_result)
 
+        # Test raw stats are kept, including stats that are not scored
+        input_dict['teams'][0]['roster']['entries'][2]['playerPoolEntry']['player']['stats'][0]['stats']['31'] = 4
+        actual_result = parser.get_owner_roster_applied_stats_as_dicts("1a2b", raw_stats=True)
+        self.assertEqual(actual_result[2], {'fullName': "Player 3", 'id': 9999, 'lineupSlotId': 5, 'W': 1, 'SO': 1, 'appliedTotal': 2, 'GP': 1,
+                                            'raw_W': 1, 'raw_SO': 1, 'raw_HIT': 4})
+
     def test_get_owner_roster_applied_stats_as_dicts_no_game(self):
         """ Test when player(s) did not play a game for given scoring period.
             Pattern appears to be when scoringPeriodId of the dictionary does
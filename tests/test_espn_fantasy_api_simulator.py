@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_simulator import EspnFantasyApiSimulator, simulate
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiSimulator(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_simulator")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_get_playoff_odds_df(self):
+        """ Test playoff odds are probabilities of each team's seed and are the same
+            for the same seed regardless of the number of processes. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+            downloader.download_realtime_stats()
+
+        simulator = EspnFantasyApiSimulator(self._test_folder)
+        inputs = simulator.get_simulation_inputs("20242025")
+        self.assertEqual(inputs['history'].shape, (20, 10))
+        self.assertEqual(inputs['period_matchups'].shape, (5, 3))
+        self.assertEqual(len(inputs['home_teams']), 6)
+
+        odds_df = simulator.get_playoff_odds_df("20242025", num_simulations=1000, seed=1, num_processes=1, chunk_size=300)
+        self.assertEqual(odds_df.columns.tolist(), ['Team', 'Owner', 'W', 'L', 'T', 'PF', 'Proj W', 'Proj PF', 'Playoffs', 'Seed 1', 'Seed 2', 'Seed 3', 'Seed 4'])
+        self.assertAlmostEqual(odds_df['Playoffs'].sum(), 2.0)
+        for column in ['Seed 1', 'Seed 2', 'Seed 3', 'Seed 4']:
+            self.assertAlmostEqual(odds_df[column].sum(), 1.0)
+
+        # Each team plays 3 more matchups
+        self.assertTrue(((odds_df['Proj W'] - odds_df['W']).round(6) <= 3).all())
+        self.assertAlmostEqual(odds_df['Proj W'].sum(), 10.0)
+        self.assertTrue((odds_df['Proj PF'] >= odds_df['PF']).all())
+
+        parallel_odds_df = simulator.get_playoff_odds_df("20242025", num_simulations=1000, seed=1, num_processes=2, chunk_size=300)
+        pd.testing.assert_frame_equal(odds_df, parallel_odds_df)
+        self.assertIsNone(simulator.get_playoff_odds_df("20202021"))
+
+    def test_simulate(self):
+        """ Test players only score points from their own history. """
+        # Both teams always score 1 point per scoring period, so the away team keeps its lead
+        inputs = {'wins': np.array([0.0, 1.0]), 'points_for': np.array([0.0, 10.0]),
+                  'history': np.array([[1, 1], [1, 0], [0, 0]], dtype=np.float32), 'history_counts': np.array([2, 1, 2], dtype=np.int32),
+                  'player_teams': np.array([[1, 0], [0, 1], [1, 0]], dtype=np.float32),
+                  'period_matchups': np.array([[1], [1]], dtype=np.float32), 'matchup_periods': np.array([0]),
+                  'home_teams': np.array([0]), 'away_teams': np.array([1]), 'home_points': np.array([1.0]), 'away_points': np.array([1.5])}
+        results = simulate(inputs, 10, seed=0, num_processes=1, chunk_size=3)
+        self.assertEqual(results['seed_counts'].tolist(), [[0, 10], [10, 0]])
+        self.assertEqual(results['wins'].tolist(), [0.0, 20.0])
+        self.assertEqual(results['points_for'].tolist(), [30.0, 135.0])
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
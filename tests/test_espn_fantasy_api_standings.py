@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloads_parser import EspnFantasyApiDownloadsParser
+from espn_fantasy_api_scripts.espn_fantasy_api_standings import EspnFantasyApiStandings
+import json
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiStandings(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_standings")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_get_standings_dict(self):
+        """ Test standings tables have the same columns as the HTML standings and
+            only count active lineup slots. """
+        season_folder_path = os.path.join(self._test_folder, "20192020")
+        os.makedirs(os.path.join(season_folder_path, "scoring_periods"), exist_ok=True)
+        with open(os.path.join(season_folder_path, "20192020_league_info.json"), 'w') as f:
+            json.dump({'members': [{'id': "1a2b", 'firstName': "Owner", 'lastName': "1"}, {'id': "3c4d", 'firstName': "Owner", 'lastName': "2"}],
+                       'teams': [{'name': "Team 1", 'owners': ["1a2b"]}, {'location': "Team", 'nickname': "2", 'owners': ["3c4d"]}],
+                       'settings': {'scoringSettings': {'scoringItems': [{'statId': 13, 'points': 2.0}, {'statId': 14, 'points': 1.0}]}},
+                       'status': {'firstScoringPeriod': 1, 'latestScoringPeriod': 2, 'finalScoringPeriod': 10}}, f)
+
+        # Owner 1 benches player 2 in the first scoring period, then replaces player 2 with player 3
+        rosters = {1: {"1a2b": [(1, 0, 1, 1), (2, 7, 2, 0)], "3c4d": [(4, 0, 0, 1)]},
+                   2: {"1a2b": [(1, 0, 1, 0), (3, 1, 0, 2)], "3c4d": [(4, 0, 3, 0)]}}
+        for id, owner_rosters in rosters.items():
+            teams = []
+            for owner_id, roster in owner_rosters.items():
+                entries = [{'lineupSlotId': lineup_slot_id,
+                            'playerPoolEntry': {'player': {'fullName': f"Player {player_id}", 'id': player_id,
+                                                           'stats': [{'scoringPeriodId': id, 'appliedTotal': 2.0 * goals + assists,
+                                                                      'appliedStats': {'13': 2.0 * goals, '14': assists}, 'stats': {'13': goals, '14': assists}}]}}}
+                           for player_id, lineup_slot_id, goals, assists in roster]
+                teams.append({'owners': [owner_id], 'roster': {'entries': entries}})
+            with open(os.path.join(season_folder_path, "scoring_periods", f"20192020_scoring_period{id}.json"), 'w') as f:
+                json.dump({'scoringPeriodId': id, 'teams': teams}, f)
+
+        standings_dict = EspnFantasyApiStandings(self._test_folder).get_standings_dict("20192020")
+        points_df = standings_dict['season_points']
+        stats_df = standings_dict['season_stats']
+        self.assertEqual(points_df.columns.tolist(), ['RK', 'Team', 'Owner', 'G', 'A', 'TOT', 'CHG'])
+        self.assertEqual(stats_df.columns.tolist(), ['RK', 'Team', 'Owner', 'G', 'A', 'Moves'])
+
+        # Owner 2 ties owner 1 in the latest scoring period
+        self.assertEqual(points_df.to_dict('records'), [{'RK': 1, 'Team': "Team 1", 'Owner': "Owner 1", 'G': 4.0, 'A': 3.0, 'TOT': 7.0, 'CHG': 4.0},
+                                                        {'RK': 1, 'Team': "Team 2", 'Owner': "Owner 2", 'G': 6.0, 'A': 1.0, 'TOT': 7.0, 'CHG': 6.0}])
+        self.assertEqual(stats_df['G'].tolist(), [2.0, 3.0])
+        self.assertEqual(stats_df['A'].tolist(), [3.0, 1.0])
+        self.assertEqual(stats_df['Moves'].tolist(), [1, 0])
+        self.assertIsNone(EspnFantasyApiStandings(self._test_folder).get_standings_dict("20202021"))
+
+    def test_get_standings_dict_incremental(self):
+        """ Test only new complete scoring periods are parsed and results match a full rebuild. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+        self._set_latest_scoring_period(5)
+        standings = EspnFantasyApiStandings(self._test_folder)
+        standings.get_standings_dict("20242025")
+
+        # Test totals match daily rosters
+        self._set_latest_scoring_period(10)
+        instrumentation.reset()
+        standings_dict = standings.get_standings_dict("20242025")
+        num_rows = instrumentation.get_counters()['rows_produced.scoring_period']
+        df = EspnFantasyApiDownloadsParser(self._test_folder).get_daily_rosters_df_by_season("20242025", None)
+        self.assertEqual(num_rows, len(df[df['scoringPeriodId'] >= 5]))
+
+        df = df[df['lineupSlotId'] != 7]
+        expected = df.groupby('owner')['appliedTotal'].sum().round(2)
+        actual = standings_dict['season_points'].set_index('Owner')['TOT']
+        pd.testing.assert_series_equal(expected.sort_index(), actual.sort_index(), check_names=False)
+
+        # Test same result without saved state
+        os.remove(os.path.join(self._test_folder, "20242025", "20242025_standings_state.json"))
+        rebuilt_dict = EspnFantasyApiStandings(self._test_folder).get_standings_dict("20242025")
+        pd.testing.assert_frame_equal(standings_dict['season_stats'], rebuilt_dict['season_stats'])
+        pd.testing.assert_frame_equal(standings_dict['season_points'], rebuilt_dict['season_points'])
+
+    def test_get_standings_dict_missing_scoring_period(self):
+        """ Test scoring periods after a missing one are not saved, so it is counted once downloaded. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+        file_path = os.path.join(self._test_folder, "20242025", "scoring_periods", "20242025_scoring_period3.json")
+        os.rename(file_path, f"{file_path}.bak")
+        EspnFantasyApiStandings(self._test_folder).get_standings_dict("20242025")
+        with open(os.path.join(self._test_folder, "20242025", "20242025_standings_state.json"), 'r') as f:
+            self.assertEqual(json.load(f)['scoringPeriodId'], 2)
+
+        os.rename(f"{file_path}.bak", file_path)
+        standings_dict = EspnFantasyApiStandings(self._test_folder).get_standings_dict("20242025")
+        os.remove(os.path.join(self._test_folder, "20242025", "20242025_standings_state.json"))
+        rebuilt_dict = EspnFantasyApiStandings(self._test_folder).get_standings_dict("20242025")
+        pd.testing.assert_frame_equal(standings_dict['season_points'], rebuilt_dict['season_points'])
+        pd.testing.assert_frame_equal(standings_dict['season_stats'], rebuilt_dict['season_stats'])
+
+    def _set_latest_scoring_period(self, latest_scoring_period):
+        """ Helper function to change the latest scoring period of downloaded league info. """
+        file_path = os.path.join(self._test_folder, "20242025", "20242025_league_info.json")
+        with open(file_path, 'r') as f:
+            league_info = json.load(f)
+        league_info['status']['latestScoringPeriod'] = latest_scoring_period
+        with open(file_path, 'w') as f:
+            json.dump(league_info, f)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
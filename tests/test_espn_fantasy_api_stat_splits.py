@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_stat_splits import EspnFantasyApiStatSplits, get_accuracy_df, get_projection_errors_df, get_stat_splits_df
+import os
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiStatSplits(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_stat_splits")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_get_projection_errors_df(self):
+        """ Test projected and actual splits of the same player and scoring period are paired. """
+        players = [{'id': 1, 'fullName': "Player 1",
+                    'stats': [{'seasonId': 2020, 'statSourceId': 0, 'statSplitTypeId': 1, 'scoringPeriodId': 1, 'appliedTotal': 5.0, 'stats': {'13': 2, '14': 1}},
+                              {'seasonId': 2020, 'statSourceId': 1, 'statSplitTypeId': 1, 'scoringPeriodId': 1, 'appliedTotal': 2.0, 'stats': {'13': 0.5, '14': 1}},
+                              {'seasonId': 2020, 'statSourceId': 1, 'statSplitTypeId': 1, 'scoringPeriodId': 2, 'appliedTotal': 2.0, 'stats': {'13': 0.5}}]},
+                   {'id': 2, 'fullName': "Player 2",
+                    'stats': [{'seasonId': 2020, 'statSourceId': 0, 'statSplitTypeId': 1, 'scoringPeriodId': 1, 'appliedTotal': 0.0, 'stats': {}},
+                              {'seasonId': 2020, 'statSourceId': 1, 'statSplitTypeId': 1, 'scoringPeriodId': 1, 'appliedTotal': 1.0, 'stats': {'14': 1}}]}]
+        stat_splits_df = get_stat_splits_df("20192020", players)
+        self.assertEqual(len(stat_splits_df), 5)
+        self.assertEqual(stat_splits_df['G'].tolist(), [2.0, 0.5, 0.5, 0.0, 0.0])
+
+        # Player 1's projection of scoring period 2 has no actual stats
+        errors_df = get_projection_errors_df(stat_splits_df)
+        self.assertEqual(errors_df[['id', 'scoringPeriodId', 'projectedTotal', 'actualTotal', 'appliedTotal', 'G', 'A']].to_dict('records'),
+                         [{'id': 1, 'scoringPeriodId': 1, 'projectedTotal': 2.0, 'actualTotal': 5.0, 'appliedTotal': -3.0, 'G': -1.5, 'A': 0.0},
+                          {'id': 2, 'scoringPeriodId': 1, 'projectedTotal': 1.0, 'actualTotal': 0.0, 'appliedTotal': 1.0, 'G': 0.0, 'A': 1.0}])
+
+        accuracy_df = get_accuracy_df(errors_df)
+        self.assertEqual(accuracy_df['stat'].tolist(), ['appliedTotal', 'G', 'A'])
+        self.assertEqual(accuracy_df['count'].tolist(), [2, 2, 2])
+        self.assertEqual(accuracy_df['bias'].tolist(), [-1.0, -0.75, 0.5])
+        self.assertEqual(accuracy_df['mae'].tolist(), [2.0, 0.75, 0.5])
+        self.assertAlmostEqual(accuracy_df['rmse'].iloc[0], 5 ** 0.5)
+
+    def test_get_stat_splits_df(self):
+        """ Test splits of all scoring period and all players info files are kept once. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+            downloader.download_all_players_info()
+
+        stat_splits = EspnFantasyApiStatSplits(self._test_folder)
+        df = stat_splits.get_stat_splits_df()
+        self.assertFalse(df.duplicated(['season', 'id', 'seasonId', 'statSplitTypeId', 'scoringPeriodId', 'statSourceId']).any())
+
+        # Season totals of all players, then actual and projected stats of 24 rostered players in 10 scoring periods
+        self.assertEqual(len(df[df['statSplitTypeId'] == 0]), 60)
+        self.assertEqual(len(df[df['statSplitTypeId'] == 1]), 2 * 24 * 10)
+        self.assertEqual(len(stat_splits.get_projection_errors_df()), 24 * 10)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
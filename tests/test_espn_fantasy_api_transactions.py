@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_transactions import EspnFantasyApiTransactions, get_moves_df, get_rosters, reconcile_moves_df
+import json
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestEspnFantasyApiTransactions(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_fantasy_api_transactions")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_get_transactions_df(self):
+        """ Test adds, drops, trades and lineup moves are inferred between consecutive scoring periods. """
+        season_folder_path = os.path.join(self._test_folder, "20192020")
+        os.makedirs(os.path.join(season_folder_path, "scoring_periods"), exist_ok=True)
+        with open(os.path.join(season_folder_path, "20192020_league_info.json"), 'w') as f:
+            json.dump({'members': [{'id': "1a2b", 'firstName': "Owner", 'lastName': "1"}, {'id': "3c4d", 'firstName': "Owner", 'lastName': "2"}],
+                       'teams': [{'name': "Team 1", 'owners': ["1a2b"]}, {'name': "Team 2", 'owners': ["3c4d"]}],
+                       'status': {'firstScoringPeriod': 1, 'latestScoringPeriod': 3, 'finalScoringPeriod': 10}}, f)
+
+        # Owner 1 benches player 2, then drops player 2 for player 5 and trades player 1 for player 4
+        rosters = {1: {"1a2b": [(1, 0), (2, 1)], "3c4d": [(4, 0)]},
+                   2: {"1a2b": [(1, 0), (2, 7)], "3c4d": [(4, 0)]},
+                   3: {"1a2b": [(4, 0), (5, 1)], "3c4d": [(1, 0)]}}
+        for id, owner_rosters in rosters.items():
+            teams = [{'owners': [owner_id], 'roster': {'entries': [{'lineupSlotId': lineup_slot_id,
+                                                                    'playerPoolEntry': {'player': {'fullName': f"Player {player_id}", 'id': player_id}}}
+                                                                   for player_id, lineup_slot_id in roster]}}
+                     for owner_id, roster in owner_rosters.items()]
+            with open(os.path.join(season_folder_path, "scoring_periods", f"20192020_scoring_period{id}.json"), 'w') as f:
+                json.dump({'scoringPeriodId': id, 'teams': teams}, f)
+
+        df = EspnFantasyApiTransactions(self._test_folder).get_transactions_df("20192020")
+        records_df = df[['scoringPeriodId', 'owner', 'type', 'id', 'fromOwner', 'fromLineupSlotId', 'lineupSlotId']].astype(object)
+        records = records_df.where(records_df.notna(), None).to_dict('records')
+        self.assertEqual(records, [{'scoringPeriodId': 2, 'owner': "Owner 1", 'type': "lineup", 'id': 2, 'fromOwner': None, 'fromLineupSlotId': 1, 'lineupSlotId': 7},
+                                   {'scoringPeriodId': 3, 'owner': "Owner 1", 'type': "trade", 'id': 4, 'fromOwner': "Owner 2", 'fromLineupSlotId': None, 'lineupSlotId': 0},
+                                   {'scoringPeriodId': 3, 'owner': "Owner 1", 'type': "add", 'id': 5, 'fromOwner': None, 'fromLineupSlotId': None, 'lineupSlotId': 1},
+                                   {'scoringPeriodId': 3, 'owner': "Owner 1", 'type': "drop", 'id': 2, 'fromOwner': None, 'fromLineupSlotId': 7, 'lineupSlotId': None},
+                                   {'scoringPeriodId': 3, 'owner': "Owner 2", 'type': "trade", 'id': 1, 'fromOwner': "Owner 1", 'fromLineupSlotId': None, 'lineupSlotId': 0}])
+
+        # Test moves are counted and reconciled with league standings
+        moves_df = get_moves_df(df)
+        self.assertEqual(moves_df.to_dict('records'), [{'season': "20192020", 'owner': "Owner 1", 'add': 1, 'drop': 1, 'trade': 1, 'lineup': 1, 'moves': 1},
+                                                       {'season': "20192020", 'owner': "Owner 2", 'add': 0, 'drop': 0, 'trade': 1, 'lineup': 0, 'moves': 0}])
+        standings_stats_df = pd.DataFrame({'Season': [20192020, 20192020], 'Owner': ["Owner 1", "Owner 2"], 'Moves': [2, 0]})
+        self.assertEqual(reconcile_moves_df(df, standings_stats_df)['Difference'].tolist(), [1, 0])
+
+        self.assertTrue(EspnFantasyApiTransactions(self._test_folder).get_transactions_df("20202021").empty)
+
+    def test_get_rosters(self):
+        """ Test rosters are sorted by player ID and teams without an owner are skipped. """
+        entries = [{'lineupSlotId': lineup_slot_id, 'playerPoolEntry': {'player': {'fullName': f"Player {player_id}", 'id': player_id}}}
+                   for player_id, lineup_slot_id in [(2, 7), (1, 0)]]
+        scoring_period_dict = {'scoringPeriodId': 1, 'teams': [{'owners': ["1a2b"], 'roster': {'entries': entries}},
+                                                               {'owners': [], 'roster': {'entries': []}}]}
+        rosters = get_rosters(scoring_period_dict, {"1a2b": "Owner 1"})
+        self.assertEqual(list(rosters), ["Owner 1"])
+        self.assertEqual(rosters["Owner 1"]['ids'].tolist(), [1, 2])
+        self.assertEqual(rosters["Owner 1"]['lineupSlotIds'].tolist(), [0, 7])
+        self.assertEqual(rosters["Owner 1"]['fullNames'].tolist(), ["Player 1", "Player 2"])
+
+    def test_get_transactions_df_incremental(self):
+        """ Test only new complete scoring periods are loaded and results match a full rebuild. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+        self._set_latest_scoring_period(5)
+        transactions = EspnFantasyApiTransactions(self._test_folder)
+        transactions.get_transactions_df("20242025")
+
+        self._set_latest_scoring_period(10)
+        df = transactions.get_transactions_df("20242025")
+        self.assertTrue((df['scoringPeriodId'] > 1).all())
+
+        # Test same result without saved state
+        os.remove(os.path.join(self._test_folder, "20242025", "20242025_transactions_state.json"))
+        rebuilt_df = EspnFantasyApiTransactions(self._test_folder).get_transactions_df("20242025")
+        pd.testing.assert_frame_equal(df, rebuilt_df)
+
+    def test_get_transactions_df_missing_scoring_period(self):
+        """ Test scoring periods after a missing one are not saved, so it is added once downloaded. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+
+        file_path = os.path.join(self._test_folder, "20242025", "scoring_periods", "20242025_scoring_period3.json")
+        os.rename(file_path, f"{file_path}.bak")
+        EspnFantasyApiTransactions(self._test_folder).get_transactions_df("20242025")
+        with open(os.path.join(self._test_folder, "20242025", "20242025_transactions_state.json"), 'r') as f:
+            self.assertEqual(json.load(f)['scoringPeriodId'], 2)
+
+        os.rename(f"{file_path}.bak", file_path)
+        df = EspnFantasyApiTransactions(self._test_folder).get_transactions_df("20242025")
+        os.remove(os.path.join(self._test_folder, "20242025", "20242025_transactions_state.json"))
+        pd.testing.assert_frame_equal(df, EspnFantasyApiTransactions(self._test_folder).get_transactions_df("20242025"))
+
+    def _set_latest_scoring_period(self, latest_scoring_period):
+        """ Helper function to change the latest scoring period of downloaded league info. """
+        file_path = os.path.join(self._test_folder, "20242025", "20242025_league_info.json")
+        with open(file_path, 'r') as f:
+            league_info = json.load(f)
+        league_info['status']['latestScoringPeriod'] = latest_scoring_period
+        with open(file_path, 'w') as f:
+            json.dump(league_info, f)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 from espn_html_parser_scripts.espn_html_parser_league_standings import EspnHtmlParserLeagueStandings
+import glob
 import os
 import pandas as pd
 import shutil
 import unittest
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+HTML_FILES_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_html_files")
 
 class TestEspnHtmlParserLeagueStandings(unittest.TestCase):
     def setUp(self):
@@ -73,7 +75,11 @@ class TestEspnHtmlParserLeagueStandings(unittest.TestCase):
         df = espn.get_season_standings_stats_df()
         self.assertTrue(df.empty)
 
-        # Note: No tests for parsing a representative HTML page yet
+        # Test moves of saved ESPN pages are parsed as object type
+        for html_path in sorted(glob.glob(os.path.join(HTML_FILES_FOLDER, "*", "League Standings*.html")))[:2]:
+            df = EspnHtmlParserLeagueStandings(html_path).get_season_standings_stats_df()
+            self.assertEqual(df['Moves'].dtype, object)
+            self.assertFalse(df['Moves'].isna().any())
 
     def test_get_standings_dict(self):
         """ Test getting dictionary of standings information. """
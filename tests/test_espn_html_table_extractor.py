@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+from espn_html_parser_scripts.espn_html_table_extractor import get_columns, get_df, get_table_df, read_html_tables
+import glob
+import os
+import pandas as pd
+import shutil
+import unittest
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+HTML_FILES_FOLDER = os.path.join(SCRIPT_DIR, "..", "espn_html_files")
+
+class TestEspnHtmlTableExtractor(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_espn_html_table_extractor")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_read_html_tables(self):
+        """ Test tables are extracted with their header and body rows. """
+        test_file_path = os.path.join(self._test_folder, "test.html")
+        with open(test_file_path, 'w') as f:
+            f.write("<html><body>"
+                    "<table class='Table'><thead><tr><th colspan='2'>Skaters</th><th>Goalies</th></tr><tr><th>G</th><th>A</th><th>W</th></tr></thead>"
+                    "<tbody><tr><td>1,077</td><td>  12\n</td><td>3</td></tr><tr><td>5</td><td>6</td><td>7</td></tr></tbody></table>"
+                    "<table class='Other'><tr><td>Not selected</td></tr></table>"
+                    "<table class='Table Table--fixed'><tr><th>MOVES</th></tr><tr><td>+10.0</td></tr></table>"
+                    "</body></html>")
+
+        tables = read_html_tables(test_file_path)
+        self.assertEqual(len(tables), 2)
+        self.assertEqual(tables[0], {'header': [['Skaters', 'Skaters', 'Goalies'], ['G', 'A', 'W']], 'body': [['1,077', '12', '3'], ['5', '6', '7']]})
+        self.assertEqual(tables[1], {'header': [['MOVES']], 'body': [['+10.0']]})
+
+        # Test types are converted
+        df = get_table_df(tables[0])
+        self.assertEqual(df.columns.tolist(), [('Skaters', 'G'), ('Skaters', 'A'), ('Goalies', 'W')])
+        self.assertEqual(df.values.tolist(), [[1077, 12, 3], [5, 6, 7]])
+        self.assertEqual(get_table_df(tables[1])['MOVES'].tolist(), [10.0])
+
+        # Test empty and missing header rows
+        self.assertIsNone(get_columns({'header': [['', '']], 'body': []}))
+        self.assertEqual(get_table_df({'header': [], 'body': [['a', '1']]}).columns.tolist(), [0, 1])
+        self.assertTrue(get_df([], pd.Index(['A'])).empty)
+
+    def test_read_html_tables_same_as_read_html(self):
+        """ Test tables of saved ESPN pages are the same as pd.read_html. """
+        for html_path in sorted(glob.glob(os.path.join(HTML_FILES_FOLDER, "*", "*.html")))[:4]:
+            expected_dfs = pd.read_html(html_path)
+            dfs = [get_table_df(table) for table in read_html_tables(html_path)]
+            self.assertEqual(len(dfs), len(expected_dfs))
+
+            # pd.read_html skips header rows without any text, except in single column tables
+            for df, expected_df in zip(dfs, expected_dfs):
+                if len(expected_df.columns) > 1:
+                    pd.testing.assert_frame_equal(df, expected_df)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
\ No newline at end of file
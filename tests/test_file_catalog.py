@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+import json
+import os
+import shutil
+import unittest
+from utils.file_catalog import FileCatalog, get_catalog, get_file_kind
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class TestFileCatalog(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_file_catalog")
+        self._root_folder = os.path.join(self._test_folder, "root")
+        for file_path in ["20192020/20192020_league_info.json",
+                          "20192020/scoring_periods/20192020_scoring_period2.json",
+                          "20192020/scoring_periods/20192020_scoring_period10.json",
+                          "20202021/League Standings - 2020_21.html",
+                          "athletes/1234.json",
+                          "not_a_season/notes.txt"]:
+            os.makedirs(os.path.dirname(os.path.join(self._root_folder, file_path)), exist_ok=True)
+            with open(os.path.join(self._root_folder, file_path), 'w') as f:
+                f.write("{}")
+
+    def test_get_file_kind(self):
+        """ Test files are classified by their path. """
+        self.assertEqual(get_file_kind("20192020/scoring_periods/20192020_scoring_period10.json"), ('scoring_period', "20192020", 10))
+        self.assertEqual(get_file_kind("20192020/all_players_info/20192020_all_players_info_page3.json"), ('all_players_info_page', "20192020", 3))
+        self.assertEqual(get_file_kind("20192020/realtime_stats/20192020_realtime_stats_2020-01-01_deltas.jsonl"), ('realtime_stats_deltas', "20192020", None))
+        self.assertEqual(get_file_kind("20202021/Draft Recap - 2020_21.html"), ('draft_recap', "20202021", None))
+        self.assertEqual(get_file_kind("20192020/scoring_periods/20202021_scoring_period1.json"), (None, None, None))
+
+    def test_catalog(self):
+        """ Test seasons and files are looked up from the catalog. """
+        catalog = FileCatalog(self._root_folder)
+        self.assertEqual(catalog.get_seasons(), ["20192020", "20202021"])
+        self.assertTrue(catalog.exists("20192020", "20192020_league_info.json"))
+        self.assertFalse(catalog.exists("20192020", "20192020_draft_details.json"))
+        self.assertFalse(catalog.exists("20212022", "20212022_league_info.json"))
+        self.assertEqual(catalog.list_files("20192020", "scoring_periods"), ["20192020_scoring_period10.json", "20192020_scoring_period2.json"])
+        self.assertEqual(catalog.list_files("20192020", "realtime_stats"), [])
+        self.assertEqual(catalog.get_ids('scoring_period', "20192020"), [2, 10])
+        self.assertEqual([file_info['path'] for file_info in catalog.get_files('league_standings')], ["20202021/League Standings - 2020_21.html"])
+
+        file_info = catalog.get_file_info("athletes", "1234.json")
+        self.assertEqual((file_info['kind'], file_info['season'], file_info['id'], file_info['size']), ('athlete', None, 1234, 2))
+        self.assertIsNone(catalog.get_file_info("athletes", "5678.json"))
+
+        # Test files added after the catalog is built are found
+        with open(os.path.join(self._root_folder, "20192020", "scoring_periods", "20192020_scoring_period3.json"), 'w') as f:
+            f.write("{}")
+        os.makedirs(os.path.join(self._root_folder, "20212022"))
+        self.assertTrue(catalog.exists("20192020", "scoring_periods", "20192020_scoring_period3.json"))
+        self.assertEqual(catalog.get_ids('scoring_period', "20192020"), [2, 3, 10])
+        self.assertEqual(catalog.get_seasons(), ["20192020", "20202021", "20212022"])
+
+    def test_catalog_unchanged_folders(self):
+        """ Test only changed folders are listed again, and the catalog is loaded from its cache file. """
+        cache_path = os.path.join(self._test_folder, "catalog.json")
+        FileCatalog(self._root_folder, cache_path)
+        self.assertTrue(os.path.exists(cache_path))
+
+        # Make all folders look like they were last modified long ago
+        for folder_path, _, _ in os.walk(self._root_folder):
+            os.utime(folder_path, (0, 0))
+        catalog = FileCatalog(self._root_folder, cache_path)
+
+        instrumentation.reset()
+        catalog = FileCatalog(self._root_folder, cache_path)
+        self.assertNotIn('file_catalog.folders_listed', instrumentation.get_counters())
+        self.assertEqual(catalog.get_ids('scoring_period'), [2, 10])
+
+        # Test folder changed since it was cached
+        os.remove(os.path.join(self._root_folder, "20192020", "scoring_periods", "20192020_scoring_period2.json"))
+        catalog = FileCatalog(self._root_folder, cache_path)
+        self.assertEqual(instrumentation.get_counters()['file_catalog.folders_listed'], 1)
+        self.assertEqual(catalog.get_ids('scoring_period'), [10])
+
+        # Test cache of a different root folder is not used
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+        cache['root'] = "other"
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f)
+        instrumentation.reset()
+        FileCatalog(self._root_folder, cache_path)
+        self.assertEqual(instrumentation.get_counters()['file_catalog.folders_listed'], 6)
+
+    def test_get_catalog(self):
+        """ Test a single catalog is shared for each root folder. """
+        self.assertIs(get_catalog(self._root_folder), get_catalog(os.path.join(self._root_folder, ".")))
+        self.assertEqual(get_catalog(os.path.join(self._test_folder, "does_not_exist")).get_seasons(), [])
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
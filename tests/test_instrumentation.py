@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import unittest
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_instrumentation")
+        os.makedirs(self._test_folder, exist_ok=True)
+        instrumentation.reset()
+
+    def test_timer(self):
+        """ Test timer as a context manager and decorator. """
+        @instrumentation.Timer("decorated")
+        def decorated():
+            return 1
+
+        with instrumentation.Timer("context"):
+            pass
+        self.assertEqual(decorated(), 1)
+        self.assertEqual(decorated(), 1)
+
+        stages = instrumentation.get_stages()
+        self.assertEqual(stages['context']['count'], 1)
+        self.assertEqual(stages['decorated']['count'], 2)
+        self.assertTrue(stages['decorated']['total_seconds'] >= stages['decorated']['max_seconds'])
+
+    def test_timer_exception(self):
+        """ Test time is recorded and exceptions are not swallowed. """
+        with self.assertRaises(ValueError):
+            with instrumentation.Timer("raises"):
+                raise ValueError()
+        self.assertEqual(instrumentation.get_stages()['raises']['count'], 1)
+
+    def test_increment(self):
+        """ Test counters. """
+        instrumentation.increment("files_decoded")
+        instrumentation.increment("files_decoded")
+        instrumentation.increment("bytes_downloaded", 100)
+        self.assertEqual(instrumentation.get_counters(), {'files_decoded': 2, 'bytes_downloaded': 100})
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.get_counters(), {})
+
+    def test_run_report(self):
+        """ Test run report is returned and written to file. """
+        report_path = os.path.join(self._test_folder, "report.json")
+        instrumentation.start_run("test", profile=[])
+        with instrumentation.Timer("stage"):
+            instrumentation.increment("rows_produced", 5)
+        report = instrumentation.finish_run(report_path)
+
+        self.assertEqual(report['name'], "test")
+        self.assertEqual(report['stages']['stage']['count'], 1)
+        self.assertEqual(report['counters'], {'rows_produced': 5})
+        self.assertFalse('cprofile' in report)
+        self.assertFalse('tracemalloc' in report)
+        with open(report_path, 'r') as f:
+            self.assertEqual(json.load(f), report)
+
+    def test_run_report_jsonl(self):
+        """ Test run reports are appended to JSON lines files. """
+        report_path = os.path.join(self._test_folder, "reports.jsonl")
+        for _ in range(2):
+            instrumentation.start_run("test", profile=[])
+            instrumentation.finish_run(report_path)
+
+        with open(report_path, 'r') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_run_report_profilers(self):
+        """ Test profilers enabled through the environment variable. """
+        report_path = os.path.join(self._test_folder, "report.json")
+        os.environ[instrumentation.PROFILE_ENV_VAR] = "cprofile,tracemalloc"
+        try:
+            instrumentation.start_run("test")
+            data = [list(range(100)) for _ in range(100)]
+            report = instrumentation.finish_run(report_path)
+        finally:
+            del os.environ[instrumentation.PROFILE_ENV_VAR]
+
+        self.assertTrue(len(data) > 0)
+        self.assertTrue(os.path.isfile(report['cprofile']['stats_path']))
+        self.assertTrue(report['tracemalloc']['peak_bytes'] > 0)
+
+    def test_add_arguments(self):
+        """ Test profile argument requires at least one profiler. """
+        arg_parser = argparse.ArgumentParser()
+        instrumentation.add_arguments(arg_parser)
+        self.assertIsNone(arg_parser.parse_args([]).profile)
+        self.assertEqual(arg_parser.parse_args(["--profile", "cprofile", "tracemalloc"]).profile, ["cprofile", "tracemalloc"])
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            arg_parser.parse_args(["--profile"])
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
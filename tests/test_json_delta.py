@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import unittest
+import utils.json_delta as json_delta
+
+class TestJsonDelta(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        pass
+
+    def test_diff(self):
+        """ Test typical use-case of computing a delta. """
+        old = {'a': 1, 'b': [1, 2], 'c': 3}
+        new = {'a': 2, 'b': [1, 3], 'd': {'e': 4}}
+        expected_result = [[['a'], 2], [['b', 1], 3], [['c']], [['d'], {'e': 4}]]
+        self.assertEqual(expected_result, json_delta.diff(old, new))
+
+    def test_diff_identical(self):
+        """ Test no delta between identical documents. """
+        doc = {'teams': [{'id': 1, 'points': 10.5}], 'status': {'latestScoringPeriod': 5}}
+        self.assertEqual([], json_delta.diff(doc, doc))
+
+    def test_diff_list_length_changed(self):
+        """ Test lists that change length are replaced as a whole. """
+        old = {'entries': [1, 2]}
+        new = {'entries': [1, 2, 3]}
+        self.assertEqual([[['entries'], [1, 2, 3]]], json_delta.diff(old, new))
+
+    def test_diff_type_changed(self):
+        """ Test values that change type are replaced, including the root. """
+        self.assertEqual([[['a'], "1"]], json_delta.diff({'a': 1}, {'a': "1"}))
+        self.assertEqual([[[], [1]]], json_delta.diff({'a': 1}, [1]))
+
+    def test_patch(self):
+        """ Test applying a delta reproduces the new document without modifying the old one. """
+        old = {'a': 1, 'b': [1, {'x': 2}], 'c': 3, 'teams': [{'id': 1, 'roster': [5, 6]}]}
+        new = {'a': 2, 'b': [1, {'x': 3, 'y': 4}], 'teams': [{'id': 1, 'roster': [5, 6, 7]}]}
+        delta = json_delta.diff(old, new)
+        self.assertEqual(new, json_delta.patch(old, delta))
+        self.assertEqual(3, old['c'])
+
+    def test_apply_deltas(self):
+        """ Test applying multiple deltas in order. """
+        docs = [{'points': 0}, {'points': 1}, {'points': 1, 'final': True}, [{'points': 1}]]
+        deltas = [json_delta.diff(docs[i], docs[i + 1]) for i in range(len(docs) - 1)]
+        self.assertEqual(docs[-1], json_delta.apply_deltas(docs[0], deltas))
+
+    def tearDown(self):
+        """ Remove any items. """
+        pass
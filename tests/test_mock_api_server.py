@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnApiDownloader
+from nhlapi_scripts.nhlapi_downloader import NhlapiDownloader
+import json
+import os
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+from utils.requests_util import RequestsUtil
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+TEST_LEAGUE_ID = 54078
+
+class TestMockApiServer(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_mock_api_server")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_espn_fantasy_api_downloader(self):
+        """ Test downloading all ESPN fantasy API data from the mock server. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, TEST_LEAGUE_ID, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_draft_details()
+            downloader.download_scoring_periods()
+            downloader.download_all_players_info()
+
+        season_folder = os.path.join(self._test_folder, "20242025")
+        league_info = self._load_json(os.path.join(season_folder, "20242025_league_info.json"))
+        self.assertTrue("members" in league_info)
+        self.assertTrue("scoringItems" in league_info['settings']['scoringSettings'])
+
+        draft_details = self._load_json(os.path.join(season_folder, "20242025_draft_details.json"))
+        self.assertTrue("playerId" in draft_details['draftDetail']['picks'][0])
+
+        num_scoring_periods = league_info['status']['finalScoringPeriod']
+        for id in range(1, num_scoring_periods + 1):
+            scoring_period = self._load_json(os.path.join(season_folder, "scoring_periods", f"20242025_scoring_period{id}.json"))
+            self.assertEqual(scoring_period['scoringPeriodId'], id)
+
+        all_players_info = self._load_json(os.path.join(season_folder, "20242025_all_players_info.json"))
+        self.assertTrue(len(all_players_info['players']) > 0)
+
+    def test_espn_fantasy_api_downloader_older_season(self):
+        """ Test older seasons are served as a list from the league history endpoint. """
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2016, TEST_LEAGUE_ID, root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_league_info()
+
+        league_info = self._load_json(os.path.join(self._test_folder, "20152016", "20152016_league_info.json"))
+        self.assertTrue(isinstance(league_info, list))
+        self.assertEqual(league_info[0]['seasonId'], 2016)
+
+    def test_espn_api_downloader(self):
+        """ Test downloading athletes data from the mock server. """
+        with MockApiServer() as server:
+            downloader = EspnApiDownloader(root_output_folder=self._test_folder, base_url=server.base_url)
+            downloader.download_athletes_data([4000000, 4000001])
+
+        athlete = self._load_json(os.path.join(self._test_folder, "athletes", "4000001.json"))
+        self.assertEqual(athlete['athlete']['id'], "4000001")
+
+    def test_nhlapi_downloader(self):
+        """ Test downloading NHL teams and rosters data from the mock server. """
+        nhlapi_folder = os.path.join(self._test_folder, "nhlapi")
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=nhlapi_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            downloader.download_teams_data()
+            downloader.download_team_rosters_data("20242025")
+
+        teams = self._load_json(os.path.join(nhlapi_folder, "teams.json"))
+        for team in teams['data']:
+            roster = self._load_json(os.path.join(nhlapi_folder, "20242025", "team_rosters", f"20242025_team_roster_{team['triCode']}.json"))
+            self.assertTrue(len(roster['forwards']) > 0)
+
+    def test_recorded_payloads(self):
+        """ Test recorded payloads are served when available. """
+        recorded_folder = os.path.join(self._test_folder, "recorded", "20242025")
+        os.makedirs(recorded_folder, exist_ok=True)
+        with open(os.path.join(recorded_folder, "20242025_league_info.json"), 'w') as f:
+            json.dump({'recorded': True}, f)
+
+        with MockApiServer(espn_fantasy_api_downloads_root_folder=os.path.join(self._test_folder, "recorded")) as server:
+            req = RequestsUtil(f"{server.base_url}apis/v3/games/fhl/seasons/2025/segments/0/leagues/{TEST_LEAGUE_ID}?")
+            self.assertEqual(req.load_json_from_endpoint("view=mSettings&view=mTeam"), {'recorded': True})
+
+            # Data that is not recorded falls back to synthetic data
+            self.assertTrue("draftDetail" in req.load_json_from_endpoint("view=mDraftDetail"))
+
+    def test_fantasy_filter(self):
+        """ Test limit and offset of the X-Fantasy-Filter header are applied. """
+        with MockApiServer() as server:
+            req = RequestsUtil(f"{server.base_url}apis/v3/games/fhl/seasons/2025/segments/0/leagues/{TEST_LEAGUE_ID}?")
+            all_players = req.load_json_from_endpoint("view=kona_playercard")['players']
+            page = req.load_json_from_endpoint("view=kona_playercard", headers={"X-Fantasy-Filter": json.dumps({"players": {"limit": 5, "offset": 10}})})['players']
+
+        self.assertEqual(page, all_players[10:15])
+
+    def test_errors_and_retries(self):
+        """ Test injected errors are retried when retries are enabled. """
+        endpoint_list = [f"scoringPeriodId={id}&view=mRoster" for id in range(1, 11)]
+
+        # Without retries, every request fails
+        with MockApiServer(error_rate=1.0) as server:
+            req = RequestsUtil(f"{server.base_url}apis/v3/games/fhl/seasons/2025/segments/0/leagues/{TEST_LEAGUE_ID}?")
+            self.assertIsNone(req.load_json_from_endpoint("view=mSettings"))
+            self.assertEqual(req.load_jsons_from_endpoints_async(endpoint_list), [{}] * len(endpoint_list))
+            self.assertEqual(server.request_counts, {500: 1 + len(endpoint_list)})
+
+        # With retries, rate limited requests eventually succeed
+        with MockApiServer(rate_limit_rate=0.5, seed=0) as server:
+            req = RequestsUtil(f"{server.base_url}apis/v3/games/fhl/seasons/2025/segments/0/leagues/{TEST_LEAGUE_ID}?", max_retries=20, retry_delay=0)
+            json_data_list = req.load_jsons_from_endpoints_async(endpoint_list)
+            self.assertEqual([d['scoringPeriodId'] for d in json_data_list], list(range(1, 11)))
+            self.assertTrue(server.request_counts[429] > 0)
+            self.assertEqual(server.request_counts[200], len(endpoint_list))
+
+    def test_max_connections(self):
+        """ Test number of concurrent requests is bounded by the requests utility. """
+        endpoint_list = [f"scoringPeriodId={id}&view=mRoster" for id in range(1, 11)]
+        with MockApiServer(latency=0.05) as server:
+            req = RequestsUtil(f"{server.base_url}apis/v3/games/fhl/seasons/2025/segments/0/leagues/{TEST_LEAGUE_ID}?", max_connections=2)
+            req.load_jsons_from_endpoints_async(endpoint_list)
+            self.assertEqual(server.max_concurrent_requests, 2)
+
+    def _load_json(self, file_path):
+        """ Helper function to load a JSON file. """
+        with open(file_path, 'r') as f:
+            return json.load(f)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+from espn_fantasy_api_scripts.espn_fantasy_api_stat_splits import EspnFantasyApiStatSplits
+import json
+from nhlapi_scripts.nhlapi_data_generator import NhlapiDataGenerator
+from nhlapi_scripts.nhlapi_downloader import NhlapiDownloader
+import os
+import pandas as pd
+import shutil
+import unittest
+from utils.mock_api_server import MockApiServer
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+class TestNhlapiDownloader(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_nhlapi_downloader")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_download_team_rosters_data_for_seasons(self):
+        """ Test rosters of multiple seasons are downloaded in a single run, only
+            for teams that existed in each season. """
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            downloader.download_teams_data()
+            downloader.download_team_seasons_data()
+            with open(os.path.join(self._test_folder, "team_seasons.json"), 'r') as f:
+                team_seasons = json.load(f)
+            self.assertFalse(20192020 in team_seasons['VAN'])
+            self.assertTrue(20192020 in team_seasons['TOR'])
+
+            # Test team that did not exist in a season is not requested
+            server.request_counts = {}
+            self.assertEqual(downloader.download_team_rosters_data_for_seasons(["20192020", "20242025"]), 7)
+            self.assertEqual(server.request_counts, {200: 7})
+            self.assertEqual(sorted(os.listdir(os.path.join(self._test_folder, "20192020", "team_rosters"))),
+                             ["20192020_team_roster_BOS.json", "20192020_team_roster_EDM.json", "20192020_team_roster_TOR.json"])
+
+            # Test existing rosters are skipped
+            server.request_counts = {}
+            downloader.overwrite = False
+            self.assertEqual(downloader.download_team_rosters_data_for_seasons(["20192020", "20242025", "20252026"]), 4)
+            self.assertEqual(server.request_counts, {200: 4})
+            self.assertEqual(instrumentation.get_counters()['nhlapi.team_rosters_skipped_existing'], 7)
+
+    def test_download_team_rosters_data_failed(self):
+        """ Test failed requests are not saved without team seasons data. """
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            downloader.download_teams_data()
+            self.assertEqual(downloader.download_team_rosters_data("20192020"), 3)
+            self.assertEqual(server.request_counts[404], 1)
+            self.assertFalse(os.path.exists(os.path.join(self._test_folder, "20192020", "team_rosters", "20192020_team_roster_VAN.json")))
+
+    def test_download_team_seasons_data_failed(self):
+        """ Test teams whose seasons request failed keep their previous seasons, and
+            teams without seasons are requested for every season. """
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            downloader.download_teams_data()
+            self.assertEqual(downloader.download_team_seasons_data(), [])
+        with open(os.path.join(self._test_folder, "team_seasons.json"), 'r') as f:
+            team_seasons = json.load(f)
+
+        with MockApiServer(error_rate=1.0) as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            self.assertEqual(downloader.download_team_seasons_data(), ["BOS", "TOR", "EDM", "VAN"])
+        with open(os.path.join(self._test_folder, "team_seasons.json"), 'r') as f:
+            self.assertEqual(json.load(f), team_seasons)
+
+        # Test team missing from team seasons is requested
+        del team_seasons['BOS']
+        with open(os.path.join(self._test_folder, "team_seasons.json"), 'w') as f:
+            json.dump(team_seasons, f)
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            self.assertEqual(downloader.download_team_rosters_data("20192020"), 3)
+            self.assertEqual(downloader.download_team_schedules_data_for_seasons(["20192020"]), 3)
+            self.assertEqual(server.request_counts, {200: 6})
+
+    def test_data_generator_multiprocess(self):
+        """ Test parsing seasons in parallel is the same as parsing serially. """
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            downloader.download_teams_data()
+            downloader.download_team_seasons_data()
+            downloader.download_team_rosters_data_for_seasons(["20192020", "20202021", "20242025"])
+
+        data_generator = NhlapiDataGenerator(self._test_folder)
+        df = data_generator.get_df(multiprocess=True)
+        pd.testing.assert_frame_equal(df, data_generator.get_df(multiprocess=False))
+        self.assertEqual(sorted(df['Season'].unique().tolist()), [20192020, 20202021, 20242025])
+        self.assertEqual(df[df['Season'] == 20192020]['Team'].unique().tolist(), ["BOS", "EDM", "TOR"])
+
+    def test_download_team_schedules_and_player_game_logs(self):
+        """ Test schedules and game logs are downloaded and aligned to scoring periods,
+            and existing files are skipped. """
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url, max_connections=2)
+            downloader.download_teams_data()
+            downloader.download_team_seasons_data()
+            downloader.download_team_rosters_data_for_seasons(["20192020", "20242025"])
+            self.assertEqual(downloader.download_team_schedules_data_for_seasons(["20192020", "20242025"]), 7)
+            self.assertEqual(downloader.download_player_game_logs_data_for_seasons(["20242025"]), 60)
+
+            server.request_counts = {}
+            downloader.overwrite = False
+            self.assertEqual(downloader.download_team_schedules_data_for_seasons(["20242025"]), 0)
+            self.assertEqual(downloader.download_player_game_logs_data_for_seasons(["20242025"]), 0)
+            self.assertEqual(server.request_counts, {})
+            self.assertEqual(instrumentation.get_counters()['nhlapi.team_schedules_skipped_existing'], 4)
+            self.assertEqual(instrumentation.get_counters()['nhlapi.player_game_logs_skipped_existing'], 60)
+
+        # Test every team plays once per scoring period, except one idle team when there is an odd number of teams
+        data_generator = NhlapiDataGenerator(self._test_folder)
+        calendar_df = data_generator.get_calendar_df("20242025")
+        self.assertEqual(calendar_df['date'].tolist()[:2], ["2024-10-08", "2024-10-09"])
+        self.assertEqual(calendar_df['scoringPeriodId'].tolist(), list(range(1, 11)))
+        self.assertEqual(calendar_df['numGames'].tolist(), [2] * 10)
+        self.assertTrue((data_generator.get_games_per_period_df("20242025").to_numpy() == 1).all())
+        self.assertEqual(data_generator.get_games_per_period_df("20192020").sum(axis=0).tolist(), [2] * 10)
+
+        # Test scoring periods can start before the first game
+        self.assertEqual(data_generator.get_calendar_df("20242025", "2024-10-06")['numGames'].tolist(), [0, 0] + [2] * 10)
+
+        game_logs_df = data_generator.get_game_logs_df("20242025")
+        self.assertEqual(game_logs_df['id'].nunique(), 60)
+        self.assertTrue(game_logs_df['scoringPeriodId'].between(1, 10).all())
+        self.assertEqual(game_logs_df['GP'].sum(), len(game_logs_df))
+        self.assertTrue((game_logs_df['PTS'] == game_logs_df['G'] + game_logs_df['A']).all())
+
+    def test_reconciliation(self):
+        """ Test game logs match the ESPN stats of the same players and scoring periods. """
+        espn_test_folder = os.path.join(self._test_folder, "espn_fantasy_api_downloads")
+        with MockApiServer() as server:
+            downloader = NhlapiDownloader(root_output_folder=self._test_folder, nhle_api_base_url=server.base_url, nhle_web_api_base_url=server.base_url)
+            downloader.download_teams_data()
+            downloader.download_team_seasons_data()
+            downloader.download_team_rosters_data_for_seasons(["20242025"])
+            downloader.download_team_schedules_data_for_seasons(["20242025"])
+            downloader.download_player_game_logs_data_for_seasons(["20242025"])
+
+            espn_downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=espn_test_folder, base_url=server.base_url)
+            espn_downloader.download_league_info()
+            espn_downloader.download_scoring_periods()
+
+        stat_splits_df = EspnFantasyApiStatSplits(espn_test_folder).get_stat_splits_df(["20242025"])
+        espn_stats_df = stat_splits_df[(stat_splits_df['statSourceId'] == 0) & (stat_splits_df['scoringPeriodId'] > 0)]
+        player_id_map = {4000000 + i: 8470000 + i for i in range(60)}
+
+        data_generator = NhlapiDataGenerator(self._test_folder)
+        df = data_generator.get_reconciliation_df("20242025", espn_stats_df, player_id_map, stat_columns=['G', 'A', 'PTS', 'SOG', 'GA', 'W', 'L', 'GP'])
+        self.assertTrue(df['Matches'].all())
+
+        # Test only players with ESPN stats are compared and differences of a single stat
+        self.assertEqual(df['id'].nunique(), 24)
+        self.assertEqual(sorted(df['espnId'].unique().tolist()), [4000000 + i for i in range(24)])
+        espn_stats_df = espn_stats_df.assign(G=espn_stats_df['G'] + (espn_stats_df['id'] == 4000000))
+        df = data_generator.get_reconciliation_df("20242025", espn_stats_df, player_id_map, stat_columns=['G', 'A'])
+        self.assertEqual(df.loc[~df['Matches'], 'espnId'].unique().tolist(), [4000000])
+        self.assertEqual(df.loc[~df['Matches'], 'G'].unique().tolist(), [-1.0])
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
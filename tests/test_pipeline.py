@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+import argparse
+from espn_fantasy_api_scripts.espn_fantasy_api_downloader import EspnFantasyApiDownloader
+import nhlapi_scripts.nhlapi_downloader as nhlapi_downloader
+import os
+import pandas as pd
+import shutil
+import threading
+import unittest
+from utils.mock_api_server import MockApiServer
+from utils.pipeline import Pipeline, PipelineStep, get_default_steps
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        """ Set-up required items. """
+        self._test_folder = os.path.join(SCRIPT_DIR, "test_pipeline")
+        os.makedirs(self._test_folder, exist_ok=True)
+
+    def test_run(self):
+        """ Test steps run in order of dependencies and only when not up-to-date. """
+        input_folder = os.path.join(self._test_folder, "inputs")
+        os.makedirs(input_folder, exist_ok=True)
+        for name in ["a.json", "b.json", "c.json"]:
+            with open(os.path.join(input_folder, name), 'w') as f:
+                f.write("{}")
+
+        steps = [PipelineStep("a", ["a"], inputs={input_folder: ["a.json"]}, outputs=[os.path.join(self._test_folder, "a.csv")]),
+                 PipelineStep("b", ["b"], inputs={input_folder: ["b.json"]}, outputs=[os.path.join(self._test_folder, "b.csv")], depends_on=["a"]),
+                 PipelineStep("c", ["c"], inputs={input_folder: ["c.json"]}, outputs=[os.path.join(self._test_folder, "c.csv")], depends_on=["a", "d"])]
+
+        # Steps b and c both wait for each other, so they must run at the same time
+        barrier = threading.Barrier(2, timeout=10)
+        ran_steps = []
+        def run_step(step):
+            ran_steps.append(step.name)
+            if step.name in ["b", "c"]:
+                barrier.wait()
+            with open(step.outputs[0], 'w') as f:
+                f.write(step.name)
+            return True
+
+        # Test all steps run (dependency on step d that isn't in the pipeline is ignored)
+        pipeline = Pipeline(steps, os.path.join(self._test_folder, "state.json"), max_workers=2, run_step_func=run_step)
+        self.assertEqual(pipeline.run(), {'a': "ran", 'b': "ran", 'c': "ran"})
+        self.assertEqual(ran_steps[0], "a")
+
+        # Test nothing runs when up-to-date
+        ran_steps.clear()
+        self.assertEqual(pipeline.run(), {'a': "skipped", 'b': "skipped", 'c': "skipped"})
+        self.assertEqual(ran_steps, [])
+
+        # Test changed input and missing output
+        with open(os.path.join(input_folder, "b.json"), 'w') as f:
+            f.write('{"changed": true}')
+        os.remove(os.path.join(self._test_folder, "c.csv"))
+        self.assertEqual(pipeline.run(), {'a': "skipped", 'b': "ran", 'c': "ran"})
+
+        # Test steps depending on a failed step are blocked and run again next time
+        pipeline = Pipeline(steps, os.path.join(self._test_folder, "state.json"), run_step_func=lambda step: False)
+        self.assertEqual(pipeline.run(force=True), {'a': "failed", 'b': "blocked", 'c': "blocked"})
+        self.assertFalse(pipeline.is_up_to_date("a"))
+        self.assertTrue(pipeline.is_up_to_date("b"))
+
+    def test_run_dependency_cycle(self):
+        """ Test steps depending on each other are blocked. """
+        steps = [PipelineStep("a", ["a"], depends_on=["b"]), PipelineStep("b", ["b"], depends_on=["a"])]
+        pipeline = Pipeline(steps, os.path.join(self._test_folder, "state.json"), run_step_func=lambda step: True)
+        self.assertEqual(pipeline.run(), {'a': "blocked", 'b': "blocked"})
+
+    def test_run_default_steps(self):
+        """ Test default steps generate outputs from downloaded data and are skipped when run again. """
+        downloads_folder = os.path.join(self._test_folder, "downloads")
+        with MockApiServer() as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, root_output_folder=downloads_folder, base_url=server.base_url)
+            downloader.download_league_info()
+            downloader.download_scoring_periods()
+            downloader.download_all_players_info()
+
+        steps = get_default_steps(espn_fantasy_api_downloads_root_folder=downloads_folder, out_dir_path=self._test_folder)
+        steps = [step for step in steps if step.name in ["generate_daily_rosters", "generate_all_players_info"]]
+        pipeline = Pipeline(steps, os.path.join(self._test_folder, "state.json"))
+        self.assertEqual(pipeline.run(), {'generate_daily_rosters': "ran", 'generate_all_players_info': "ran"})
+        self.assertFalse(pd.read_csv(os.path.join(self._test_folder, "espn_fantasy_api_daily_rosters_df.csv")).empty)
+        self.assertFalse(pd.read_csv(os.path.join(self._test_folder, "espn_fantasy_api_all_players_info_df.csv")).empty)
+
+        # Test files written by data generators in the downloads folder are not inputs
+        self.assertEqual(pipeline.run(), {'generate_daily_rosters': "skipped", 'generate_all_players_info': "skipped"})
+
+    def test_get_default_steps_download_folders(self):
+        """ Test download steps write to the folders read by generate steps. """
+        nhl_folder = os.path.join(self._test_folder, "nhlapi_downloads")
+        steps = {step.name: step for step in get_default_steps(nhlapi_downloads_root_folder=nhl_folder, start_year=2024, end_year=2025)}
+        arg_parse = argparse.ArgumentParser()
+        nhlapi_downloader.add_arguments(arg_parse)
+        self.assertEqual(arg_parse.parse_args(steps['download_nhlapi'].argv[2:]).output_path, nhl_folder)
+        self.assertIn(nhl_folder, steps['generate_draft'].inputs)
+
+    def tearDown(self):
+        """ Remove any items. """
+        shutil.rmtree(self._test_folder)
+        instrumentation.reset()
\ No newline at end of file
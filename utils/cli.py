@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+""" Single command line entry point to download, generate and parse data.
+
+    Each command runs the main function of an existing script. A script is only
+    imported when its command runs, so listing commands and showing help of a
+    command group never imports pandas, aiohttp, etc. Several commands can be
+    chained in one invocation, separated by "+", so a chain of scheduled
+    commands only pays for interpreter start-up and imports once.
+
+    Example usage:
+        espn-stats --help
+        espn-stats generate draft --help
+        espn-stats download espn -s 2026 -e 2026 + generate daily_rosters --use_store + generate league_standings
+"""
+import argparse
+import importlib
+import sys
+import timeit
+
+PROG = "espn-stats"
+COMMAND_SEPARATOR = "+"
+
+# Each command group maps each command to (<module>, <description>)
+COMMANDS = {
+    'download': {
+        'espn': ("espn_fantasy_api_scripts.espn_fantasy_api_downloader", "Downloads raw JSON files from ESPN fantasy API and ESPN API."),
+        'nhlapi': ("nhlapi_scripts.nhlapi_downloader", "Downloads teams and team rosters data from NHL API."),
+    },
+    'generate': {
+        'draft': ("data_generator_scripts.data_generator_draft", "Generates draft data."),
+        'league_standings': ("data_generator_scripts.data_generator_league_standings", "Generates league standings data."),
+        'player_index': ("data_generator_scripts.data_generator_player_index", "Generates player index data."),
+        'player_resolver': ("data_generator_scripts.data_generator_player_resolver", "Resolves a player name to an NHL player ID."),
+        'all_players_info': ("data_generator_scripts.data_generator_espn_fantasy_api_all_players_info", "Generates ESPN fantasy API all players info data."),
+        'daily_rosters': ("data_generator_scripts.data_generator_espn_fantasy_api_daily_rosters", "Generates ESPN fantasy API daily rosters data."),
+    },
+    'parse': {
+        'html': ("espn_html_parser_scripts.espn_html_parser", "Parses archived ESPN HTML files."),
+    },
+    'pipeline': {
+        'run': ("utils.pipeline", "Runs all steps of the full data refresh that aren't up-to-date."),
+    },
+}
+
+def split_commands(argv):
+    """ Returns list of argument lists of each command, split on the command separator. """
+    commands_argv = [[]]
+    for arg in argv:
+        if arg == COMMAND_SEPARATOR:
+            commands_argv.append([])
+        else:
+            commands_argv[-1].append(arg)
+    return commands_argv
+
+def get_parser():
+    """ Returns argument parser of command groups and commands. Arguments of each
+        command are parsed separately (see run_command) so their scripts don't
+        need to be imported here. """
+    parser = argparse.ArgumentParser(prog=PROG, description="Downloads, generates and parses ESPN fantasy league data.",
+                                     epilog=f"Chain multiple commands in one run by separating them with \"{COMMAND_SEPARATOR}\".")
+    group_parsers = parser.add_subparsers(dest='group', required=True, metavar="<group>")
+    for group, commands in COMMANDS.items():
+        group_parser = group_parsers.add_parser(group, help=f"Commands: {', '.join(commands)}.")
+        command_parsers = group_parser.add_subparsers(dest='command', required=True, metavar="<command>")
+        for command, (_, description) in commands.items():
+            command_parsers.add_parser(command, help=description, add_help=False)
+    return parser
+
+def run_command(group, command, argv):
+    """ Imports the script of a command and runs its main function with the given arguments. """
+    module_name, description = COMMANDS[group][command]
+    module = importlib.import_module(module_name)
+    parser = argparse.ArgumentParser(prog=f"{PROG} {group} {command}", description=description)
+    module.add_arguments(parser)
+    module.main(parser.parse_args(argv))
+
+def main(argv=None):
+    """ Main function. Runs each command given on the command line in order.
+        All command groups and commands are checked before any command runs. """
+    argv = sys.argv[1:] if argv is None else argv
+    parser = get_parser()
+    commands = []
+    for command_argv in split_commands(argv):
+        args, command_args = parser.parse_known_args(command_argv)
+        commands.append((args.group, args.command, command_args))
+
+    start_time = timeit.default_timer()
+    for group, command, command_args in commands:
+        run_command(group, command, command_args)
+
+    if len(commands) > 1:
+        print(f"Finished {len(commands)} commands in {round(timeit.default_timer() - start_time, 1)}s.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+""" Writer that appends dataframes to a CSV file one batch at a time, so a
+    large export never has to be held in memory as a single dataframe.
+
+    Columns are fixed when the writer is created. Batches missing some columns
+    are written with empty values, and columns not in the writer are dropped
+    (with a message the first time). Rows are written to a temporary file that
+    replaces the output file when the writer is closed, so a failed export
+    never leaves a partial file behind.
+
+    Example usage:
+        with CsvWriter("daily_rosters.csv", columns) as writer:
+            for df in parser.iter_daily_rosters_dfs():
+                writer.write(df)
+"""
+import os
+import pandas as pd
+import utils.instrumentation as instrumentation
+
+class CsvWriter():
+    def __init__(self, file_path, columns):
+        """ Constructor. Takes in output file path and list of columns. """
+        self._file_path = file_path
+        self._temp_file_path = f"{file_path}.tmp"
+        self._columns = list(columns)
+        self._dropped_columns = set()
+        self._num_rows = 0
+        self._file = open(self._temp_file_path, 'w', newline='')
+        pd.DataFrame(columns=self._columns).to_csv(self._file, index=False)
+
+    def __enter__(self):
+        """ Returns the writer. """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Closes the writer. Output file is only replaced if there was no exception. """
+        self.close(discard=exc_type is not None)
+        return False
+
+    def get_num_rows(self):
+        """ Returns number of rows written so far. """
+        return self._num_rows
+
+    @instrumentation.Timer("csv_writer.write")
+    def write(self, df):
+        """ Appends rows of a dataframe to the file. """
+        dropped_columns = set(df.columns) - set(self._columns) - self._dropped_columns
+        if dropped_columns:
+            print(f"Columns not written to {os.path.basename(self._file_path)}: {sorted(dropped_columns)}")
+            self._dropped_columns.update(dropped_columns)
+
+        df.reindex(columns=self._columns).to_csv(self._file, header=False, index=False)
+        self._num_rows += len(df)
+
+    def close(self, discard=False):
+        """ Closes the file and replaces the output file with it, or removes it if discarded. """
+        if self._file.closed:
+            return
+
+        self._file.close()
+        if discard:
+            os.remove(self._temp_file_path)
+        else:
+            os.replace(self._temp_file_path, self._file_path)
\ No newline at end of file
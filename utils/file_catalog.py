@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+""" Catalog of all files in a data folder tree (Example: ESPN fantasy API
+    downloads or ESPN HTML files), so loaders can look up seasons and files
+    without listing folders or checking if files exist over and over.
+
+    The catalog is built with a single os.scandir walk of the tree and keeps
+    the size and modified time of every file. Each file is classified by kind
+    (see FILE_KINDS), with its season and ID (Example: scoring period ID) if
+    the kind has one. Seasons are folders in the root in the form XXXXYYYY.
+
+    To check if the catalog is still current, only the modified time of each
+    folder is checked (adding, removing or renaming a file changes it) and
+    only changed folders are listed again. Folders that were modified very
+    recently when listed are listed again when looked up, so files being
+    added while the catalog is in use are found. Files changed in place keep
+    their previously cataloged size and modified time until refresh(force=True).
+
+    The catalog can be saved to a cache file so a new process only has to
+    check folders instead of listing the whole tree. get_catalog() shares a
+    single catalog for each root folder within a process.
+
+    Example usage:
+        catalog = get_catalog(root_folder_path)
+        catalog.exists("20242025", "scoring_periods", "20242025_scoring_period1.json")
+        catalog.get_files(kind="scoring_period", season_string="20242025")
+"""
+import json
+import os
+import re
+import time
+import utils.instrumentation as instrumentation
+
+CATALOG_VERSION = 1
+
+# Folders modified this recently when listed are listed again on the next refresh,
+# since files added within the resolution of modified times don't change them
+RECENT_MTIME_NS = 2 * 10**9
+
+# Regex pattern of season folder names
+SEASON_FOLDER_RE_PATTERN = r"[0-9]+"
+
+# Kind of each file matched by its path relative to the root (with "/" separators)
+# Patterns may capture the season and an ID
+FILE_KINDS = [
+    ('league_info', r"(?P<season>[0-9]+)/(?P=season)_league_info\.json"),
+    ('draft_details', r"(?P<season>[0-9]+)/(?P=season)_draft_details\.json"),
+    ('scoring_period', r"(?P<season>[0-9]+)/scoring_periods/(?P=season)_scoring_period(?P<id>[0-9]+)\.json"),
+    ('all_players_info', r"(?P<season>[0-9]+)/(?P=season)_all_players_info\.json"),
+    ('all_players_info_page', r"(?P<season>[0-9]+)/all_players_info/(?P=season)_all_players_info_page(?P<id>[0-9]+)\.json"),
+    ('realtime_stats', r"(?P<season>[0-9]+)/realtime_stats/(?P=season)_realtime_stats_.+\.json"),
+    ('realtime_stats_deltas', r"(?P<season>[0-9]+)/realtime_stats/(?P=season)_realtime_stats_.+_deltas\.jsonl"),
+    ('archive', r"(?P<season>[0-9]+)/(?P=season)_archive\.zip"),
+    ('athlete', r"athletes/(?P<id>[0-9]+)\.json"),
+    ('draft_recap', r"(?P<season>[0-9]+)/[^/]*Draft Recap[^/]*\.html"),
+    ('league_standings', r"(?P<season>[0-9]+)/[^/]*League Standings[^/]*\.html"),
+]
+
+_catalogs = {}
+
+def get_catalog(root_folder_path, cache_path=None):
+    """ Returns the shared catalog of a root folder, created on first use and
+        refreshed on every call after. """
+    key = os.path.abspath(root_folder_path)
+    if key not in _catalogs:
+        _catalogs[key] = FileCatalog(root_folder_path, cache_path)
+    else:
+        _catalogs[key].refresh()
+    return _catalogs[key]
+
+def get_file_kind(relative_path):
+    """ Returns tuple of (<kind>, <season string>, <ID>) of a file path relative to
+        the root. Season string and ID are None if not part of the kind. Kind is None
+        if the file doesn't match any kind. """
+    for kind, pattern in FILE_KINDS:
+        match = re.fullmatch(pattern, relative_path)
+        if match:
+            groups = match.groupdict()
+            return kind, groups.get('season'), int(groups['id']) if groups.get('id') is not None else None
+    return None, None, None
+
+class FileCatalog():
+    def __init__(self, root_folder_path, cache_path=None):
+        """ Constructor. Takes in the root folder path and optionally the path of a
+            cache file to load the catalog from and save it to. """
+        self._root_folder_path = root_folder_path
+        self._cache_path = cache_path
+
+        # Each folder path relative to the root maps to a dictionary in the form:
+        # {'mtime': <modified time>, 'folders': [<name>, ...], 'files': {<name>: [<size>, <modified time>], ...}}
+        self._folders = self._load_cache()
+        self.refresh()
+
+    def refresh(self, force=False):
+        """ Lists folders that changed since they were last listed (or all folders if
+            forced), and saves the catalog to the cache file if anything changed. """
+        with instrumentation.Timer("file_catalog.refresh"):
+            folders = {}
+            changed = self._refresh_folder("", folders, force)
+            changed = changed or set(folders) != set(self._folders)
+            self._folders = folders
+
+        if changed and self._cache_path is not None:
+            self._save_cache()
+
+    def get_seasons(self):
+        """ Returns sorted list of season folder names in the root. """
+        root_folder = self._get_folder("")
+        if root_folder is None:
+            return []
+        return sorted(name for name in root_folder['folders'] if re.fullmatch(SEASON_FOLDER_RE_PATTERN, name))
+
+    def exists(self, *args):
+        """ Returns True if a file exists, given parts of its path relative to the root.
+            Example: self.exists("20202021", "scoring_periods", "20202021_scoring_period1.json") """
+        folder = self._get_folder(self._get_relative_path(*args[:-1]))
+        return folder is not None and args[-1] in folder['files']
+
+    def list_files(self, *args):
+        """ Returns sorted names of files in a folder, given parts of its path relative
+            to the root. Returns an empty list if the folder doesn't exist. """
+        folder = self._get_folder(self._get_relative_path(*args))
+        return sorted(folder['files']) if folder is not None else []
+
+    def get_file_info(self, *args):
+        """ Returns dictionary of information of a file, given parts of its path relative
+            to the root, in the form: {'path': <relative path>, 'kind': <kind>, 'season': <season string>,
+            'id': <ID>, 'size': <size in bytes>, 'mtime': <modified time in nanoseconds>}
+            Returns None if the file doesn't exist. """
+        if not self.exists(*args):
+            return None
+
+        relative_path = self._get_relative_path(*args)
+        size, mtime = self._folders[self._get_relative_path(*args[:-1])]['files'][args[-1]]
+        kind, season_string, id = get_file_kind(relative_path)
+        return {'path': relative_path, 'kind': kind, 'season': season_string, 'id': id, 'size': size, 'mtime': mtime}
+
+    def get_files(self, kind=None, season_string=None):
+        """ Returns list of information of all files (see get_file_info) sorted by path,
+            optionally only of a kind and/or season. """
+        files = []
+        for folder_path in list(self._folders):
+            folder = self._get_folder(folder_path)
+            for name, (size, mtime) in (folder['files'].items() if folder is not None else []):
+                relative_path = f"{folder_path}/{name}" if folder_path else name
+                file_kind, file_season_string, id = get_file_kind(relative_path)
+                if (kind is None or file_kind == kind) and (season_string is None or file_season_string == season_string):
+                    files.append({'path': relative_path, 'kind': file_kind, 'season': file_season_string, 'id': id, 'size': size, 'mtime': mtime})
+        return sorted(files, key=lambda file_info: file_info['path'])
+
+    def get_ids(self, kind, season_string=None):
+        """ Returns sorted list of IDs of files of a kind (Example: scoring period IDs of a season). """
+        return sorted(file_info['id'] for file_info in self.get_files(kind, season_string))
+
+    def _get_folder(self, relative_path):
+        """ Returns cataloged folder, or None if it doesn't exist. Folders (or the parent
+            folder of a missing folder) modified recently when last listed are listed again. """
+        folder = self._folders.get(relative_path)
+        if folder is None:
+            parent_folder = self._folders.get(relative_path.rpartition("/")[0]) if relative_path else None
+            if parent_folder is None or parent_folder['mtime'] is not None:
+                return None
+        elif folder['mtime'] is not None:
+            return folder
+
+        self._refresh_folder(relative_path, self._folders, False)
+        return self._folders.get(relative_path)
+
+    def _refresh_folder(self, relative_path, folders, force):
+        """ Adds a folder and all its sub-folders to the given dictionary of folders,
+            listing only folders that changed. Returns True if any folder changed. """
+        folder_path = os.path.join(self._root_folder_path, *relative_path.split("/")) if relative_path else self._root_folder_path
+        try:
+            mtime = os.stat(folder_path).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+
+        changed = False
+        folder = self._folders.get(relative_path)
+        if force or folder is None or folder['mtime'] != mtime:
+            previous_folder = folder
+            folder = {'mtime': mtime if time.time_ns() - mtime > RECENT_MTIME_NS else None, 'folders': [], 'files': {}}
+            with os.scandir(folder_path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        folder['folders'].append(entry.name)
+                    elif entry.is_file() and (self._cache_path is None or os.path.abspath(entry.path) != os.path.abspath(self._cache_path)):
+                        stat = entry.stat()
+                        folder['files'][entry.name] = [stat.st_size, stat.st_mtime_ns]
+            folder['folders'].sort()
+            instrumentation.increment("file_catalog.folders_listed")
+            changed = previous_folder != folder
+
+        folders[relative_path] = folder
+        for name in folder['folders']:
+            changed = self._refresh_folder(f"{relative_path}/{name}" if relative_path else name, folders, force) or changed
+        return changed
+
+    def _get_relative_path(self, *args):
+        """ Returns path relative to the root with "/" separators. """
+        return "/".join(str(arg) for arg in args)
+
+    def _load_cache(self):
+        """ Returns folders saved in the cache file. Returns an empty dictionary if
+            not saved, saved for a different root folder or with a different version. """
+        if self._cache_path is None:
+            return {}
+
+        try:
+            with open(self._cache_path, 'r') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        if cache.get('version') != CATALOG_VERSION or cache.get('root') != os.path.abspath(self._root_folder_path):
+            return {}
+        return cache['folders']
+
+    def _save_cache(self):
+        """ Saves folders to the cache file. """
+        temp_path = f"{self._cache_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'version': CATALOG_VERSION, 'root': os.path.abspath(self._root_folder_path), 'folders': self._folders}, f)
+        os.replace(temp_path, self._cache_path)
\ No newline at end of file
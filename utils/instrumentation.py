@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+""" Lightweight instrumentation to see which stages of a run dominate.
+    Provides:
+    - Timer: Context manager and decorator that accumulates time per stage.
+    - increment(): Counters for bytes downloaded, files decoded, rows produced, etc.
+    - Optional cProfile and tracemalloc capture, toggled by a CLI flag (see
+      add_arguments()) or by the ESPN_STATS_PROFILE environment variable
+      (comma separated, Example: ESPN_STATS_PROFILE=cprofile,tracemalloc).
+    - A machine-readable JSON run report (see start_run() and finish_run()).
+
+    Timings and counters are kept per process. Work done in child processes
+    (Example: multiprocessing pools) is not included in the parent's report.
+
+    Example usage:
+        instrumentation.start_run("data_generator_draft", profile=["cprofile"])
+        with instrumentation.Timer("parse_html"):
+            ...
+        instrumentation.increment("rows_produced", len(df))
+        instrumentation.finish_run("run_report.json")
+"""
+import contextlib
+import cProfile
+from datetime import datetime
+import json
+import os
+import pstats
+import threading
+import timeit
+import tracemalloc
+
+PROFILE_ENV_VAR = "ESPN_STATS_PROFILE"
+PROFILE_CHOICES = ["cprofile", "tracemalloc"]
+NUM_TOP_PROFILE_ENTRIES = 20
+
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+_run = {}
+
+class Timer(contextlib.ContextDecorator):
+    """ Accumulates the elapsed time of a stage. Can be used as a context manager
+        or as a function decorator. """
+    def __init__(self, stage):
+        """ Constructor. Takes in the name of the stage to time. """
+        self._stage = stage
+        self._start_times = []
+
+    def __enter__(self):
+        """ Starts timing. A list is kept so the same instance can be re-entered
+            (Example: decorated recursive functions). """
+        self._start_times.append(timeit.default_timer())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Stops timing and records the elapsed time to the stage. """
+        elapsed = timeit.default_timer() - self._start_times.pop()
+        with _lock:
+            stage = _stages.setdefault(self._stage, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            stage['count'] += 1
+            stage['total_seconds'] += elapsed
+            stage['max_seconds'] = max(stage['max_seconds'], elapsed)
+        return False
+
+def increment(counter, amount=1):
+    """ Increments a named counter by the given amount. """
+    with _lock:
+        _counters[counter] = _counters.get(counter, 0) + amount
+
+def get_stages():
+    """ Returns a copy of the recorded stage timings. """
+    with _lock:
+        return {stage: dict(d) for stage, d in _stages.items()}
+
+def get_counters():
+    """ Returns a copy of the recorded counters. """
+    with _lock:
+        return dict(_counters)
+
+def reset():
+    """ Clears all recorded stage timings and counters. """
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+def add_arguments(arg_parser):
+    """ Adds common instrumentation arguments to a script's argument parser. """
+    arg_parser.add_argument("--profile", nargs="+", choices=PROFILE_CHOICES, default=None,
+                            help=f"Enable profilers for the run (at least one). Can also be set with the {PROFILE_ENV_VAR} environment variable.")
+    arg_parser.add_argument("--report_path", type=str, default=None,
+                            help="Path of JSON run report to write. Reports are appended as a line if the path ends with .jsonl.")
+
+def start_run(name, profile=None):
+    """ Starts a new run. Clears previously recorded data and enables the given
+        profilers. If profile is None, profilers are read from the environment
+        variable instead. """
+    if profile is None:
+        profile = [p.strip() for p in os.environ.get(PROFILE_ENV_VAR, "").split(",") if p.strip() in PROFILE_CHOICES]
+
+    reset()
+    _run.clear()
+    _run.update({'name': name, 'start_time': datetime.now().isoformat(timespec='seconds'),
+                 'start_timer': timeit.default_timer(), 'profile': list(profile)})
+
+    if "tracemalloc" in profile:
+        tracemalloc.start()
+
+    if "cprofile" in profile:
+        _run['cprofile'] = cProfile.Profile()
+        _run['cprofile'].enable()
+
+def finish_run(report_path=None):
+    """ Finishes the current run and returns a dictionary report of it. The
+        report is also written to report_path if given. If cProfile was enabled,
+        full profiling stats are saved next to the report with a .prof extension. """
+    total_seconds = timeit.default_timer() - _run.get('start_timer', timeit.default_timer())
+    report = {'name': _run.get('name'),
+              'start_time': _run.get('start_time'),
+              'total_seconds': round(total_seconds, 3),
+              'stages': {stage: {'count': d['count'],
+                                 'total_seconds': round(d['total_seconds'], 3),
+                                 'max_seconds': round(d['max_seconds'], 3),
+                                 'percent_of_total': round(100 * d['total_seconds'] / total_seconds, 1) if total_seconds > 0 else 0.0}
+                         for stage, d in sorted(get_stages().items(), key=lambda item: -item[1]['total_seconds'])},
+              'counters': get_counters()}
+
+    if 'cprofile' in _run:
+        profiler = _run.pop('cprofile')
+        profiler.disable()
+        report['cprofile'] = _get_cprofile_report(profiler, report_path)
+
+    if tracemalloc.is_tracing():
+        report['tracemalloc'] = _get_tracemalloc_report()
+        tracemalloc.stop()
+
+    if report_path is not None:
+        _write_report(report, report_path)
+
+    return report
+
+def _get_cprofile_report(profiler, report_path):
+    """ Returns a summary of the functions with highest cumulative time. """
+    stats = pstats.Stats(profiler)
+    stats_path = None
+    if report_path is not None:
+        stats_path = f"{os.path.splitext(report_path)[0]}.prof"
+        stats.dump_stats(stats_path)
+
+    top = []
+    entries = sorted(stats.stats.items(), key=lambda item: -item[1][3])
+    for (file_name, line_number, function_name), (_, num_calls, total_time, cumulative_time, _) in entries[:NUM_TOP_PROFILE_ENTRIES]:
+        top.append({'function': f"{file_name}:{line_number}({function_name})",
+                    'num_calls': num_calls,
+                    'total_seconds': round(total_time, 3),
+                    'cumulative_seconds': round(cumulative_time, 3)})
+
+    return {'stats_path': stats_path, 'top': top}
+
+def _get_tracemalloc_report():
+    """ Returns current and peak traced memory and the largest allocation sites. """
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    top = [{'location': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+           for stat in snapshot.statistics('lineno')[:NUM_TOP_PROFILE_ENTRIES]]
+
+    return {'current_bytes': current_bytes, 'peak_bytes': peak_bytes, 'top': top}
+
+def _write_report(report, report_path):
+    """ Writes report to file. JSON lines files are appended to so runs can be
+        tracked over time. Any other path is overwritten. """
+    folder_path = os.path.dirname(report_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok=True)
+
+    if report_path.endswith(".jsonl"):
+        with open(report_path, 'a') as f:
+            f.write(json.dumps(report) + "\n")
+    else:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
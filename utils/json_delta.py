@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+""" Utility file to compute and apply compact deltas between JSON documents.
+
+    A delta is a list of operations. Each operation is a list in the form:
+    - [<path>, <value>]: Set the value at the path (adds or replaces).
+    - [<path>]: Remove the value at the path.
+    Where <path> is a list of dictionary keys and list indices from the root.
+
+    Dictionaries are compared key by key. Lists of the same length are compared
+    index by index. Lists that change length are replaced as a whole.
+
+    Example:
+        old = {'a': 1, 'b': [1, 2], 'c': 3}
+        new = {'a': 2, 'b': [1, 3]}
+        diff(old, new) -> [[['a'], 2], [['b', 1], 3], [['c']]]
+"""
+import copy
+
+def diff(old, new):
+    """ Returns a delta that transforms old into new. Returns an empty list if
+        both are identical. """
+    delta = []
+    _diff(old, new, [], delta)
+    return delta
+
+def patch(doc, delta):
+    """ Returns a new document with the delta applied. Input document is not modified. """
+    doc = copy.deepcopy(doc)
+    for op in delta:
+        path = op[0]
+
+        # Operation on the root replaces the whole document
+        if not path:
+            doc = copy.deepcopy(op[1])
+            continue
+
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+
+        if len(op) == 1:
+            del parent[path[-1]]
+        else:
+            parent[path[-1]] = copy.deepcopy(op[1])
+
+    return doc
+
+def apply_deltas(doc, deltas):
+    """ Applies a list of deltas in order and returns the final document. """
+    for delta in deltas:
+        doc = patch(doc, delta)
+    return doc
+
+def _diff(old, new, path, delta):
+    """ Recursively compares old and new and appends operations to delta. """
+    if type(old) != type(new):
+        delta.append([path, new])
+    elif isinstance(old, dict):
+        for key, old_value in old.items():
+            if key not in new:
+                delta.append([path + [key]])
+            else:
+                _diff(old_value, new[key], path + [key], delta)
+
+        for key, new_value in new.items():
+            if key not in old:
+                delta.append([path + [key], new_value])
+    elif isinstance(old, list):
+        if len(old) != len(new):
+            delta.append([path, new])
+        else:
+            for i, (old_value, new_value) in enumerate(zip(old, new)):
+                _diff(old_value, new_value, path + [i], delta)
+    elif old != new:
+        delta.append([path, new])
@@ -0,0 +1,716 @@
+#!/usr/bin/env python
+""" Local stand-in server for the ESPN fantasy API, ESPN API and NHL APIs.
+    Serves recorded payloads from existing download folders when available,
+    otherwise serves small synthetic payloads in the same format. Latency,
+    error rates and rate limiting (429s) are configurable so downloaders can
+    be exercised offline for throughput, concurrency and retry behaviour.
+
+    Supported endpoints (relative to the server's base URL):
+    - apis/v3/games/fhl/seasons/<season>/segments/0/leagues/<league_id>?view=...
+    - apis/v3/games/fhl/leagueHistory/<league_id>?seasonId=<season>&view=...
+    - apis/common/v3/sports/hockey/nhl/athletes/<player_id>
+    - stats/rest/en/team
+    - v1/roster/<team_abbrev>/<season_string>
+    - v1/roster-season/<team_abbrev>
+    - v1/club-schedule-season/<team_abbrev>/<season_string>
+    - v1/player/<player_id>/game-log/<season_string>/<game_type>
+
+    Example usage:
+        with MockApiServer(latency=0.05, rate_limit_rate=0.1) as server:
+            downloader = EspnFantasyApiDownloader(2025, 54078, base_url=server.base_url)
+"""
+from aiohttp import web
+import argparse
+import asyncio
+import datetime
+import glob
+import json
+import os
+import random
+import threading
+
+# Synthetic league configuration
+SYNTHETIC_NUM_TEAMS = 4
+SYNTHETIC_NUM_PLAYERS = 60
+SYNTHETIC_NUM_SCORING_PERIODS = 10
+SYNTHETIC_SCORING_PERIODS_PER_MATCHUP = 2
+SYNTHETIC_PLAYOFF_TEAM_COUNT = 2
+SYNTHETIC_ESPN_PLAYER_ID_OFFSET = 4000000
+SYNTHETIC_NHL_PLAYER_ID_OFFSET = 8470000
+SYNTHETIC_NHL_TEAMS = ['BOS', 'TOR', 'EDM', 'VAN']
+SYNTHETIC_NHL_TEAM_FIRST_SEASONS = {'BOS': 20002001, 'TOR': 20002001, 'EDM': 20002001, 'VAN': 20202021}
+SYNTHETIC_NHL_LAST_SEASON = 20252026
+# Synthetic NHL seasons open on this month and day, with one game day per scoring period
+SYNTHETIC_NHL_OPENING_MONTH_DAY = (10, 8)
+SYNTHETIC_FIRST_NAMES = ['Alex', 'Connor', 'Sidney', 'Nathan', 'Auston', 'Leon', 'Mitch', 'Elias', 'Quinn', 'Jack']
+SYNTHETIC_LAST_NAMES = ['Smith', 'Brown', 'Tremblay', 'Martin', 'Roy', 'Wilson', 'Gagnon', 'Lee']
+
+# Scoring items in the form {statId: points}
+SYNTHETIC_SCORING_ITEMS = {1: 4.0, 4: -2.0, 6: 0.2, 13: 2.0, 14: 1.0, 29: 0.1, 31: 0.1, 32: 0.5}
+
+# Roster composition of each synthetic fantasy team
+# Each position has its ESPN default position ID, lineup slot ID and NHL position code
+SYNTHETIC_ROSTER = [{'position': "C", 'defaultPositionId': 1, 'lineupSlotId': 0},
+                    {'position': "L", 'defaultPositionId': 2, 'lineupSlotId': 1},
+                    {'position': "R", 'defaultPositionId': 3, 'lineupSlotId': 2},
+                    {'position': "D", 'defaultPositionId': 4, 'lineupSlotId': 4},
+                    {'position': "G", 'defaultPositionId': 5, 'lineupSlotId': 5},
+                    {'position': "C", 'defaultPositionId': 1, 'lineupSlotId': 7}]
+SYNTHETIC_LINEUP_SLOT_COUNTS = {'0': 1, '1': 1, '2': 1, '3': 0, '4': 1, '5': 1, '6': 0, '7': 1, '8': 0}
+
+class MockApiServer():
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                       rate_limit_rate=0.0, retry_after=0, seed=None,
+                       espn_fantasy_api_downloads_root_folder=None, nhlapi_downloads_root_folder=None):
+        """ Constructor.
+            - port: Port to listen on. Use 0 to pick any free port.
+            - latency, latency_jitter: Seconds added to every response (latency + uniform(0, jitter)).
+            - error_rate: Fraction of requests that respond with a 500 error.
+            - rate_limit_rate: Fraction of requests that respond with a 429 error.
+            - retry_after: Value of the Retry-After header sent with 429 responses.
+            - seed: Seed used for injecting errors to make runs reproducible.
+            - *_root_folder: Download folders to serve recorded payloads from. """
+        self._host = host
+        self._port = port
+        self._latency = latency
+        self._latency_jitter = latency_jitter
+        self._error_rate = error_rate
+        self._rate_limit_rate = rate_limit_rate
+        self._retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._espn_fantasy_api_downloads_root_folder = espn_fantasy_api_downloads_root_folder
+        self._nhlapi_downloads_root_folder = nhlapi_downloads_root_folder
+
+        self._loop = None
+        self._thread = None
+        self._runner = None
+        self._start_exception = None
+
+        # Statistics about requests handled (useful for load tests)
+        self.request_counts = {}
+        self.num_concurrent_requests = 0
+        self.max_concurrent_requests = 0
+
+    @property
+    def base_url(self):
+        """ Base URL of the running server that can be given to downloaders. """
+        return f"http://{self._host}:{self._port}/"
+
+    def start(self):
+        """ Starts the server on a background thread. Returns once the server
+            is ready to accept requests. """
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, args=(started,), daemon=True)
+        self._thread.start()
+        started.wait()
+
+        if self._start_exception is not None:
+            self._thread.join()
+            raise self._start_exception
+
+    def stop(self):
+        """ Stops the server and waits for the background thread to finish. """
+        if self._thread is None:
+            return
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        """ Starts server when used as a context manager. """
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Stops server when leaving context manager. """
+        self.stop()
+
+    def _run_loop(self, started):
+        """ Runs the event loop of the server. Intended to run on a separate thread. """
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._start_site())
+        # Intentional catch all to report back to the starting thread
+        except Exception as e:
+            self._start_exception = e
+            started.set()
+            self._loop.close()
+            return
+
+        started.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    async def _start_site(self):
+        """ Sets up routes and starts listening. """
+        app = web.Application(middlewares=[self._fault_injection_middleware])
+        app.router.add_get("/apis/v3/games/fhl/seasons/{season}/segments/0/leagues/{league_id}", self._handle_espn_fantasy_api)
+        app.router.add_get("/apis/v3/games/fhl/leagueHistory/{league_id}", self._handle_espn_fantasy_api_league_history)
+        app.router.add_get("/apis/common/v3/sports/hockey/nhl/athletes/{player_id}", self._handle_espn_api_athlete)
+        app.router.add_get("/stats/rest/en/team", self._handle_nhle_api_teams)
+        app.router.add_get("/v1/roster/{team_abbrev}/{season_string}", self._handle_nhle_web_api_roster)
+        app.router.add_get("/v1/roster-season/{team_abbrev}", self._handle_nhle_web_api_roster_season)
+        app.router.add_get("/v1/club-schedule-season/{team_abbrev}/{season_string}", self._handle_nhle_web_api_club_schedule_season)
+        app.router.add_get("/v1/player/{player_id}/game-log/{season_string}/{game_type}", self._handle_nhle_web_api_player_game_log)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+
+        # Update port in case any free port was requested
+        self._port = self._runner.addresses[0][1]
+
+    @web.middleware
+    async def _fault_injection_middleware(self, request, handler):
+        """ Applies latency, errors and rate limiting to every request and
+            keeps track of request statistics. """
+        self.num_concurrent_requests += 1
+        self.max_concurrent_requests = max(self.max_concurrent_requests, self.num_concurrent_requests)
+        try:
+            delay = self._latency + self._rng.uniform(0, self._latency_jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            r = self._rng.random()
+            if r < self._rate_limit_rate:
+                response = web.json_response({'error': "Too many requests."}, status=429,
+                                             headers={'Retry-After': str(self._retry_after)})
+            elif r < self._rate_limit_rate + self._error_rate:
+                response = web.json_response({'error': "Internal server error."}, status=500)
+            else:
+                try:
+                    response = await handler(request)
+                except web.HTTPException as e:
+                    response = web.json_response({'error': e.reason}, status=e.status)
+        finally:
+            self.num_concurrent_requests -= 1
+
+        self.request_counts[response.status] = self.request_counts.get(response.status, 0) + 1
+        return response
+
+    async def _handle_espn_fantasy_api(self, request):
+        """ Handles ESPN fantasy API requests for seasons 2018 and onwards. """
+        season = int(request.match_info['season'])
+        league_id = int(request.match_info['league_id'])
+        return self._espn_fantasy_api_response(request, season, league_id)
+
+    async def _handle_espn_fantasy_api_league_history(self, request):
+        """ Handles ESPN fantasy API requests for older seasons. """
+        try:
+            season = int(request.query['seasonId'])
+        except (KeyError, ValueError):
+            raise web.HTTPBadRequest()
+
+        league_id = int(request.match_info['league_id'])
+        return self._espn_fantasy_api_response(request, season, league_id)
+
+    async def _handle_espn_api_athlete(self, request):
+        """ Handles ESPN athletes API requests. """
+        player_id = request.match_info['player_id']
+        json_data = self._load_recorded_json(self._espn_fantasy_api_downloads_root_folder, "athletes", f"{player_id}.json")
+        if json_data is None:
+            index = self._synthetic_player_index_from_espn_id(player_id)
+            if index is None:
+                raise web.HTTPNotFound()
+            json_data = self._synthetic_athlete(index)
+
+        return web.json_response(json_data)
+
+    async def _handle_nhle_api_teams(self, request):
+        """ Handles NHL API teams requests. """
+        json_data = self._load_recorded_json(self._nhlapi_downloads_root_folder, "teams.json")
+        if json_data is None:
+            json_data = self._synthetic_nhl_teams()
+
+        return web.json_response(json_data)
+
+    async def _handle_nhle_web_api_roster(self, request):
+        """ Handles NHL web API team roster requests. """
+        team_abbrev = request.match_info['team_abbrev']
+        season_string = request.match_info['season_string']
+        json_data = self._load_recorded_json(self._nhlapi_downloads_root_folder, season_string, "team_rosters",
+                                             f"{season_string}_team_roster_{team_abbrev}.json")
+        if json_data is None:
+            if team_abbrev not in SYNTHETIC_NHL_TEAMS or int(season_string) not in self._synthetic_nhl_team_seasons(team_abbrev):
+                raise web.HTTPNotFound()
+            json_data = self._synthetic_nhl_roster(team_abbrev)
+
+        return web.json_response(json_data)
+
+    async def _handle_nhle_web_api_roster_season(self, request):
+        """ Handles NHL web API requests of seasons a team has rosters for. """
+        team_abbrev = request.match_info['team_abbrev']
+        team_seasons = self._load_recorded_json(self._nhlapi_downloads_root_folder, "team_seasons.json")
+        if team_seasons is not None and team_abbrev in team_seasons:
+            return web.json_response(team_seasons[team_abbrev])
+
+        if team_abbrev not in SYNTHETIC_NHL_TEAMS:
+            raise web.HTTPNotFound()
+        return web.json_response(self._synthetic_nhl_team_seasons(team_abbrev))
+
+    async def _handle_nhle_web_api_club_schedule_season(self, request):
+        """ Handles NHL web API team schedule requests. """
+        team_abbrev = request.match_info['team_abbrev']
+        season_string = request.match_info['season_string']
+        json_data = self._load_recorded_json(self._nhlapi_downloads_root_folder, season_string, "team_schedules",
+                                             f"{season_string}_team_schedule_{team_abbrev}.json")
+        if json_data is None:
+            if team_abbrev not in SYNTHETIC_NHL_TEAMS or int(season_string) not in self._synthetic_nhl_team_seasons(team_abbrev):
+                raise web.HTTPNotFound()
+            json_data = self._synthetic_nhl_schedule(team_abbrev, season_string)
+
+        return web.json_response(json_data)
+
+    async def _handle_nhle_web_api_player_game_log(self, request):
+        """ Handles NHL web API player game log requests. """
+        player_id = request.match_info['player_id']
+        season_string = request.match_info['season_string']
+        json_data = self._load_recorded_json(self._nhlapi_downloads_root_folder, season_string, "player_game_logs",
+                                             f"{season_string}_player_game_log_{player_id}.json")
+        if json_data is None:
+            try:
+                index = int(player_id) - SYNTHETIC_NHL_PLAYER_ID_OFFSET
+            except ValueError:
+                raise web.HTTPNotFound()
+            if index < 0 or index >= SYNTHETIC_NUM_PLAYERS:
+                raise web.HTTPNotFound()
+            json_data = self._synthetic_nhl_player_game_log(index, season_string, int(request.match_info['game_type']))
+
+        return web.json_response(json_data)
+
+    def _espn_fantasy_api_response(self, request, season, league_id):
+        """ Returns response for an ESPN fantasy API request. The type of data
+            returned depends on the view(s) and parameters requested. Older
+            seasons are wrapped in a list, the same as the real API. """
+        season_string = f"{season - 1}{season}"
+        views = request.query.getall('view', [])
+
+        if 'kona_playercard' in views:
+            json_data = self._load_recorded_json(self._espn_fantasy_api_downloads_root_folder, season_string, f"{season_string}_all_players_info.json")
+            if json_data is None:
+                json_data = self._wrap_older_season(season, self._synthetic_all_players_info(season))
+            json_data = self._apply_fantasy_filter(season, json_data, request.headers.get('X-Fantasy-Filter'))
+        elif 'mDraftDetail' in views:
+            json_data = self._load_recorded_json(self._espn_fantasy_api_downloads_root_folder, season_string, f"{season_string}_draft_details.json")
+            if json_data is None:
+                json_data = self._wrap_older_season(season, self._synthetic_draft_details(season, league_id))
+        elif 'mLiveScoring' in views:
+            json_data = self._load_latest_recorded_json(self._espn_fantasy_api_downloads_root_folder, season_string, "realtime_stats")
+            if json_data is None:
+                json_data = self._wrap_older_season(season, self._synthetic_realtime_stats(season, league_id))
+        elif 'scoringPeriodId' in request.query:
+            scoring_period_id = int(request.query['scoringPeriodId'])
+            json_data = self._load_recorded_json(self._espn_fantasy_api_downloads_root_folder, season_string, "scoring_periods",
+                                                 f"{season_string}_scoring_period{scoring_period_id}.json")
+            if json_data is None:
+                json_data = self._wrap_older_season(season, self._synthetic_scoring_period(season, league_id, scoring_period_id))
+        elif 'mSettings' in views:
+            json_data = self._load_recorded_json(self._espn_fantasy_api_downloads_root_folder, season_string, f"{season_string}_league_info.json")
+            if json_data is None:
+                json_data = self._wrap_older_season(season, self._synthetic_league_info(season, league_id))
+        else:
+            raise web.HTTPNotFound()
+
+        return web.json_response(json_data)
+
+    def _apply_fantasy_filter(self, season, json_data, x_fantasy_filter):
+        """ Applies limit and offset of the X-Fantasy-Filter header to the list of players. """
+        if x_fantasy_filter is None:
+            return json_data
+
+        try:
+            players_filter = json.loads(x_fantasy_filter).get('players', {})
+        except ValueError:
+            return json_data
+
+        offset = players_filter.get('offset', 0)
+        limit = players_filter.get('limit')
+        end = None if limit is None else offset + limit
+
+        data_dict = json_data[0] if season < 2018 else json_data
+        data_dict = dict(data_dict, players=data_dict.get('players', [])[offset:end])
+        return self._wrap_older_season(season, data_dict)
+
+    def _load_recorded_json(self, root_folder, *args):
+        """ Loads a recorded JSON file under the given root folder. Returns None
+            if there is no root folder or the file does not exist. """
+        if root_folder is None:
+            return None
+
+        file_path = os.path.join(root_folder, *args)
+        if not os.path.isfile(file_path):
+            return None
+
+        with open(file_path, 'r') as f:
+            return json.load(f)
+
+    def _load_latest_recorded_json(self, root_folder, *args):
+        """ Loads the most recent recorded JSON file (by name) in the given folder. """
+        if root_folder is None:
+            return None
+
+        file_paths = sorted(glob.glob(os.path.join(root_folder, *args, "*.json")))
+        if not file_paths:
+            return None
+
+        with open(file_paths[-1], 'r') as f:
+            return json.load(f)
+
+    def _wrap_older_season(self, season, data_dict):
+        """ Older seasons are returned as a list containing a single dictionary. """
+        return [data_dict] if season < 2018 else data_dict
+
+    def _synthetic_player_index_from_espn_id(self, player_id):
+        """ Returns index of a synthetic player from an ESPN player ID string,
+            or None if the ID does not belong to a synthetic player. """
+        try:
+            index = int(player_id) - SYNTHETIC_ESPN_PLAYER_ID_OFFSET
+        except ValueError:
+            return None
+
+        if index < 0 or index >= SYNTHETIC_NUM_PLAYERS:
+            return None
+        return index
+
+    def _synthetic_player(self, index):
+        """ Returns a dictionary of basic information about a synthetic player.
+            Players are spread evenly across NHL teams and roster positions. """
+        roster_spot = SYNTHETIC_ROSTER[index % len(SYNTHETIC_ROSTER)]
+        first_name = SYNTHETIC_FIRST_NAMES[index % len(SYNTHETIC_FIRST_NAMES)]
+        last_name = SYNTHETIC_LAST_NAMES[index // len(SYNTHETIC_FIRST_NAMES) % len(SYNTHETIC_LAST_NAMES)]
+        return {'espn_id': SYNTHETIC_ESPN_PLAYER_ID_OFFSET + index,
+                'nhl_id': SYNTHETIC_NHL_PLAYER_ID_OFFSET + index,
+                'first_name': first_name,
+                'last_name': last_name,
+                'full_name': f"{first_name} {last_name}",
+                'nhl_team': SYNTHETIC_NHL_TEAMS[index % len(SYNTHETIC_NHL_TEAMS)],
+                'position': roster_spot['position'],
+                'defaultPositionId': roster_spot['defaultPositionId'],
+                'birth_year': 1990 + index % 15,
+                'birth_month': 1 + index % 12,
+                'birth_day': 1 + index % 28,
+                'height': 70 + index % 8,
+                'weight': 180 + index % 40}
+
+    def _synthetic_raw_stats(self, season, scoring_period_id, index, projected=False):
+        """ Returns a dictionary of raw stats for a synthetic player for a scoring
+            period. Stats are deterministic for a given season, period and player.
+            Returns an empty dictionary if the player did not play. """
+        rng = random.Random(f"{season}-{scoring_period_id}-{index}-{projected}")
+        if rng.random() > 0.8:
+            return {}
+
+        if self._synthetic_player(index)['position'] == "G":
+            wins = rng.randint(0, 1)
+            return {'1': wins, '2': 1 - wins, '4': rng.randint(0, 5), '6': rng.randint(15, 35), '34': 1}
+
+        goals = rng.randint(0, 2)
+        assists = rng.randint(0, 2)
+        return {'13': goals, '14': assists, '16': goals + assists, '29': rng.randint(0, 6),
+                '31': rng.randint(0, 4), '32': rng.randint(0, 3), '34': 1}
+
+    def _synthetic_applied_stats(self, raw_stats):
+        """ Converts raw stats to applied stats (points) using the synthetic scoring items. """
+        return {stat_id: count * SYNTHETIC_SCORING_ITEMS[int(stat_id)]
+                for stat_id, count in raw_stats.items() if int(stat_id) in SYNTHETIC_SCORING_ITEMS}
+
+    def _synthetic_members(self):
+        """ Returns list of synthetic league members. """
+        return [{'id': f"{{MEMBER-{t + 1}}}", 'firstName': f"Owner{t + 1}", 'lastName': "Synthetic"}
+                for t in range(SYNTHETIC_NUM_TEAMS)]
+
+    def _synthetic_settings(self):
+        """ Returns synthetic league settings. """
+        num_matchup_periods = SYNTHETIC_NUM_SCORING_PERIODS // SYNTHETIC_SCORING_PERIODS_PER_MATCHUP
+        matchup_periods = {str(m + 1): [m * SYNTHETIC_SCORING_PERIODS_PER_MATCHUP + p + 1 for p in range(SYNTHETIC_SCORING_PERIODS_PER_MATCHUP)]
+                           for m in range(num_matchup_periods)}
+        return {'name': "Synthetic League",
+                'rosterSettings': {'lineupSlotCounts': SYNTHETIC_LINEUP_SLOT_COUNTS},
+                'scheduleSettings': {'matchupPeriodCount': num_matchup_periods,
+                                     'matchupPeriods': matchup_periods,
+                                     'playoffTeamCount': SYNTHETIC_PLAYOFF_TEAM_COUNT},
+                'scoringSettings': {'scoringItems': [{'statId': stat_id, 'points': points} for stat_id, points in SYNTHETIC_SCORING_ITEMS.items()]}}
+
+    def _synthetic_status(self, latest_scoring_period=SYNTHETIC_NUM_SCORING_PERIODS):
+        """ Returns synthetic league status. """
+        return {'currentMatchupPeriod': (latest_scoring_period - 1) // SYNTHETIC_SCORING_PERIODS_PER_MATCHUP + 1,
+                'firstScoringPeriod': 1,
+                'finalScoringPeriod': SYNTHETIC_NUM_SCORING_PERIODS,
+                'latestScoringPeriod': latest_scoring_period}
+
+    def _synthetic_teams(self, season, scoring_period_id=None):
+        """ Returns list of synthetic fantasy teams. Rosters are included if a
+            scoring period ID is given. """
+        teams = []
+        for t, member in enumerate(self._synthetic_members()):
+            team = {'id': t + 1, 'abbrev': f"T{t + 1}", 'name': f"Team {t + 1}", 'owners': [member['id']]}
+            if scoring_period_id is not None:
+                team['roster'] = {'entries': [self._synthetic_roster_entry(season, scoring_period_id, t * len(SYNTHETIC_ROSTER) + i)
+                                              for i in range(len(SYNTHETIC_ROSTER))]}
+            teams.append(team)
+        return teams
+
+    def _synthetic_roster_entry(self, season, scoring_period_id, index):
+        """ Returns a roster entry of a synthetic player for a scoring period. """
+        player = self._synthetic_player(index)
+        stats_list = []
+        for projected in [False, True]:
+            raw_stats = self._synthetic_raw_stats(season, scoring_period_id, index, projected=projected)
+            applied_stats = self._synthetic_applied_stats(raw_stats)
+            stats_list.append({'id': f"{int(projected)}1{season}{scoring_period_id}",
+                               'scoringPeriodId': scoring_period_id,
+                               'seasonId': season,
+                               'statSourceId': int(projected),
+                               'statSplitTypeId': 1,
+                               'appliedStats': applied_stats,
+                               'appliedTotal': sum(applied_stats.values()),
+                               'stats': raw_stats})
+
+        return {'lineupSlotId': SYNTHETIC_ROSTER[index % len(SYNTHETIC_ROSTER)]['lineupSlotId'],
+                'playerId': player['espn_id'],
+                'playerPoolEntry': {'id': player['espn_id'],
+                                    'player': {'id': player['espn_id'],
+                                               'fullName': player['full_name'],
+                                               'defaultPositionId': player['defaultPositionId'],
+                                               'stats': stats_list}}}
+
+    def _synthetic_league_info(self, season, league_id):
+        """ Returns synthetic data of the mSettings and mTeam views. """
+        return {'id': league_id, 'seasonId': season, 'members': self._synthetic_members(),
+                'settings': self._synthetic_settings(), 'status': self._synthetic_status(),
+                'teams': self._synthetic_teams(season)}
+
+    def _synthetic_draft_details(self, season, league_id):
+        """ Returns synthetic data of the mDraftDetail view. Draft is a snake
+            draft of the players on the synthetic rosters. """
+        picks = []
+        num_rounds = len(SYNTHETIC_ROSTER)
+        for round_index in range(num_rounds):
+            team_order = range(SYNTHETIC_NUM_TEAMS) if round_index % 2 == 0 else reversed(range(SYNTHETIC_NUM_TEAMS))
+            for round_pick_index, t in enumerate(team_order):
+                picks.append({'overallPickNumber': len(picks) + 1,
+                              'roundId': round_index + 1,
+                              'roundPickNumber': round_pick_index + 1,
+                              'teamId': t + 1,
+                              'playerId': SYNTHETIC_ESPN_PLAYER_ID_OFFSET + t * len(SYNTHETIC_ROSTER) + round_index})
+
+        return {'id': league_id, 'seasonId': season, 'draftDetail': {'drafted': True, 'picks': picks}}
+
+    def _synthetic_scoring_period(self, season, league_id, scoring_period_id):
+        """ Returns synthetic data of a scoring period request. """
+        return {'id': league_id, 'seasonId': season, 'scoringPeriodId': scoring_period_id,
+                'settings': self._synthetic_settings(), 'status': self._synthetic_status(),
+                'teams': self._synthetic_teams(season, scoring_period_id)}
+
+    def _synthetic_realtime_stats(self, season, league_id):
+        """ Returns synthetic data of the live scoring views. Live points increase
+            with every request to mimic games in progress. """
+        num_requests = sum(self.request_counts.values())
+        latest_scoring_period = SYNTHETIC_NUM_SCORING_PERIODS // 2
+        current_matchup_period = self._synthetic_status(latest_scoring_period)['currentMatchupPeriod']
+
+        teams = self._synthetic_teams(season, latest_scoring_period)
+        for team in teams:
+            team['record'] = {'overall': {'wins': 0, 'losses': 0, 'ties': 0, 'pointsFor': 0.0}}
+
+        # Round robin schedule where the first team plays everyone else in turn
+        schedule = []
+        for m in range(SYNTHETIC_NUM_SCORING_PERIODS // SYNTHETIC_SCORING_PERIODS_PER_MATCHUP):
+            rotation = [1] + [2 + (i + m) % (SYNTHETIC_NUM_TEAMS - 1) for i in range(SYNTHETIC_NUM_TEAMS - 1)]
+            for i in range(SYNTHETIC_NUM_TEAMS // 2):
+                home_id, away_id = rotation[i], rotation[-(i + 1)]
+                rng = random.Random(f"{season}-{m}-{home_id}-{away_id}")
+                home_points = round(rng.uniform(20, 60), 1)
+                away_points = round(rng.uniform(20, 60), 1)
+                matchup_period_id = m + 1
+
+                if matchup_period_id < current_matchup_period:
+                    winner = "HOME" if home_points > away_points else "AWAY"
+                    teams[home_id - 1]['record']['overall']['wins' if winner == "HOME" else 'losses'] += 1
+                    teams[away_id - 1]['record']['overall']['wins' if winner == "AWAY" else 'losses'] += 1
+                    teams[home_id - 1]['record']['overall']['pointsFor'] += home_points
+                    teams[away_id - 1]['record']['overall']['pointsFor'] += away_points
+                elif matchup_period_id == current_matchup_period:
+                    winner = "UNDECIDED"
+                    home_points = round(home_points * num_requests / (num_requests + 10), 1)
+                    away_points = round(away_points * num_requests / (num_requests + 10), 1)
+                else:
+                    winner = "UNDECIDED"
+                    home_points = away_points = 0.0
+
+                schedule.append({'id': len(schedule) + 1, 'matchupPeriodId': matchup_period_id, 'winner': winner,
+                                 'home': {'teamId': home_id, 'totalPoints': home_points},
+                                 'away': {'teamId': away_id, 'totalPoints': away_points}})
+
+        return {'id': league_id, 'seasonId': season, 'scoringPeriodId': latest_scoring_period,
+                'members': self._synthetic_members(), 'schedule': schedule, 'settings': self._synthetic_settings(),
+                'status': self._synthetic_status(latest_scoring_period), 'teams': teams}
+
+    def _synthetic_all_players_info(self, season):
+        """ Returns synthetic data of the kona_playercard view. """
+        players = []
+        for index in range(SYNTHETIC_NUM_PLAYERS):
+            player = self._synthetic_player(index)
+            season_stats = {}
+            for scoring_period_id in range(1, SYNTHETIC_NUM_SCORING_PERIODS + 1):
+                for stat_id, count in self._synthetic_raw_stats(season, scoring_period_id, index).items():
+                    season_stats[stat_id] = season_stats.get(stat_id, 0) + count
+            applied_stats = self._synthetic_applied_stats(season_stats)
+            players.append({'id': player['espn_id'],
+                            'player': {'id': player['espn_id'],
+                                       'fullName': player['full_name'],
+                                       'defaultPositionId': player['defaultPositionId'],
+                                       'stats': [{'id': f"00{season}", 'seasonId': season, 'statSourceId': 0, 'statSplitTypeId': 0,
+                                                  'appliedTotal': sum(applied_stats.values()), 'stats': season_stats}]}})
+
+        return {'players': players}
+
+    def _synthetic_athlete(self, index):
+        """ Returns synthetic data of the ESPN athletes API. """
+        player = self._synthetic_player(index)
+        return {'athlete': {'id': str(player['espn_id']),
+                            'fullName': player['full_name'],
+                            'displayBirthPlace': "Toronto, ON",
+                            'displayHeight': f"{player['height'] // 12}' {player['height'] % 12}\"",
+                            'displayWeight': f"{player['weight']} lbs",
+                            'displayDOB': f"{player['birth_day']}/{player['birth_month']}/{player['birth_year']}"}}
+
+    def _synthetic_nhl_teams(self):
+        """ Returns synthetic data of the NHL API teams endpoint. """
+        data = [{'id': i + 1, 'franchiseId': i + 1, 'fullName': f"Synthetic {abbrev}", 'leagueId': 133,
+                 'rawTricode': abbrev, 'triCode': abbrev} for i, abbrev in enumerate(SYNTHETIC_NHL_TEAMS)]
+        return {'data': data, 'total': len(data)}
+
+    def _synthetic_nhl_team_seasons(self, team_abbrev):
+        """ Returns list of seasons (Example: 20202021) a synthetic NHL team existed. """
+        first_year = SYNTHETIC_NHL_TEAM_FIRST_SEASONS[team_abbrev] // 10000
+        return [year * 10000 + year + 1 for year in range(first_year, SYNTHETIC_NHL_LAST_SEASON // 10000 + 1)]
+
+    def _synthetic_nhl_roster(self, team_abbrev):
+        """ Returns synthetic data of the NHL web API team roster endpoint. """
+        roster = {'forwards': [], 'defensemen': [], 'goalies': []}
+        for index in range(SYNTHETIC_NUM_PLAYERS):
+            player = self._synthetic_player(index)
+            if player['nhl_team'] != team_abbrev:
+                continue
+
+            position_group = {'G': 'goalies', 'D': 'defensemen'}.get(player['position'], 'forwards')
+            roster[position_group].append({'id': player['nhl_id'],
+                                           'firstName': {'default': player['first_name']},
+                                           'lastName': {'default': player['last_name']},
+                                           'positionCode': player['position'],
+                                           'shootsCatches': "L",
+                                           'birthCountry': "CAN",
+                                           'birthDate': f"{player['birth_year']}-{player['birth_month']:02d}-{player['birth_day']:02d}",
+                                           'heightInInches': player['height'],
+                                           'weightInPounds': player['weight']})
+        return roster
+
+    def _synthetic_nhl_games(self, season_string):
+        """ Returns list of games of a synthetic NHL regular season. Every team that
+            existed in the season plays once per scoring period (one game day per
+            scoring period), against opponents that rotate every day. """
+        season = int(season_string)
+        teams = [abbrev for abbrev in SYNTHETIC_NHL_TEAMS if season in self._synthetic_nhl_team_seasons(abbrev)]
+        opening_date = datetime.date(season // 10000, *SYNTHETIC_NHL_OPENING_MONTH_DAY)
+
+        games = []
+        for day in range(SYNTHETIC_NUM_SCORING_PERIODS):
+            rotated_teams = teams[day % len(teams):] + teams[:day % len(teams)]
+            for home_team, away_team in zip(rotated_teams[0::2], rotated_teams[1::2]):
+                games.append({'id': (season // 10000) * 1000000 + 20000 + len(games) + 1,
+                              'season': season,
+                              'gameType': 2,
+                              'gameDate': (opening_date + datetime.timedelta(days=day)).isoformat(),
+                              'homeTeam': {'abbrev': home_team},
+                              'awayTeam': {'abbrev': away_team},
+                              'gameState': "OFF"})
+        return games
+
+    def _synthetic_nhl_schedule(self, team_abbrev, season_string):
+        """ Returns synthetic data of the NHL web API team schedule endpoint. """
+        games = [game for game in self._synthetic_nhl_games(season_string)
+                 if team_abbrev in (game['homeTeam']['abbrev'], game['awayTeam']['abbrev'])]
+        return {'currentSeason': int(season_string), 'games': games}
+
+    def _synthetic_nhl_player_game_log(self, index, season_string, game_type):
+        """ Returns synthetic data of the NHL web API player game log endpoint. Stats
+            of each game are the raw stats of the scoring period of the game's date, so
+            game logs match the synthetic ESPN stats of the same season. """
+        player = self._synthetic_player(index)
+        game_log = []
+        if game_type == 2:
+            games = {}
+            for game in self._synthetic_nhl_games(season_string):
+                if player['nhl_team'] in (game['homeTeam']['abbrev'], game['awayTeam']['abbrev']):
+                    games[game['gameDate']] = game
+
+            opening_date = datetime.date(int(season_string) // 10000, *SYNTHETIC_NHL_OPENING_MONTH_DAY)
+            for scoring_period_id in range(1, SYNTHETIC_NUM_SCORING_PERIODS + 1):
+                game = games.get((opening_date + datetime.timedelta(days=scoring_period_id - 1)).isoformat())
+                raw_stats = self._synthetic_raw_stats(int(season_string) % 10000, scoring_period_id, index)
+                if game is None or not raw_stats:
+                    continue
+
+                home = game['homeTeam']['abbrev'] == player['nhl_team']
+                entry = {'gameId': game['id'],
+                         'teamAbbrev': player['nhl_team'],
+                         'homeRoadFlag': "H" if home else "R",
+                         'gameDate': game['gameDate'],
+                         'opponentAbbrev': game['awayTeam']['abbrev'] if home else game['homeTeam']['abbrev'],
+                         'goals': 0,
+                         'assists': 0,
+                         'pim': 0,
+                         'toi': "20:00"}
+                if player['position'] == "G":
+                    entry.update({'gamesStarted': 1,
+                                  'decision': "W" if raw_stats['1'] else "L",
+                                  'goalsAgainst': raw_stats['4'],
+                                  'shotsAgainst': raw_stats['4'] + raw_stats['6'],
+                                  'savePctg': raw_stats['6'] / (raw_stats['4'] + raw_stats['6']),
+                                  'shutouts': 0})
+                else:
+                    entry.update({'goals': raw_stats['13'],
+                                  'assists': raw_stats['14'],
+                                  'points': raw_stats['16'],
+                                  'plusMinus': 0,
+                                  'powerPlayGoals': 0,
+                                  'powerPlayPoints': 0,
+                                  'gameWinningGoals': 0,
+                                  'shots': raw_stats['29'],
+                                  'shorthandedGoals': 0,
+                                  'shorthandedPoints': 0})
+                game_log.append(entry)
+
+        return {'seasonId': int(season_string), 'gameTypeId': game_type, 'gameLog': game_log[::-1]}
+
+if __name__ == "__main__":
+    """ Main function. Runs the server until interrupted. """
+    arg_parse = argparse.ArgumentParser()
+    arg_parse.add_argument("--port", "-p", required=False, default=8080, type=int, help="Port to listen on.")
+    arg_parse.add_argument("--latency", required=False, default=0.0, type=float, help="Seconds of latency added to every response.")
+    arg_parse.add_argument("--latency_jitter", required=False, default=0.0, type=float, help="Maximum seconds of random latency added on top of --latency.")
+    arg_parse.add_argument("--error_rate", required=False, default=0.0, type=float, help="Fraction of requests that respond with a 500 error.")
+    arg_parse.add_argument("--rate_limit_rate", required=False, default=0.0, type=float, help="Fraction of requests that respond with a 429 error.")
+    arg_parse.add_argument("--seed", required=False, default=None, type=int, help="Seed for injecting errors.")
+    arg_parse.add_argument("--espn_fantasy_api_downloads_root_folder", required=False, default=None, type=str,
+                           help="ESPN fantasy API downloads folder to serve recorded payloads from.")
+    arg_parse.add_argument("--nhlapi_downloads_root_folder", required=False, default=None, type=str,
+                           help="NHL API downloads folder to serve recorded payloads from.")
+    args = arg_parse.parse_args()
+
+    server = MockApiServer(port=args.port, latency=args.latency, latency_jitter=args.latency_jitter,
+                           error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+                           espn_fantasy_api_downloads_root_folder=args.espn_fantasy_api_downloads_root_folder,
+                           nhlapi_downloads_root_folder=args.nhlapi_downloads_root_folder)
+    server.start()
+    print(f"Serving on {server.base_url} (Ctrl+C to stop)...")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"Request counts by status: {server.request_counts}")
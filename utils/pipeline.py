@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+""" Runs the full data refresh as a pipeline of espn-stats commands (see utils/cli.py).
+
+    Each step declares its command, the input files it reads (as glob patterns),
+    the output files it writes and the steps it depends on. A step is skipped
+    if its inputs, command and outputs are unchanged since it last succeeded,
+    so a run without new downloads only has to check file sizes and modified
+    times. Steps without declared inputs (Example: downloads) always run.
+    Steps whose dependencies are finished run concurrently, each in its own
+    process. Steps depending on a failed step are not run.
+
+    Fingerprints of each step that succeeded are saved to a state file in the
+    form: {<step name>: {'inputs': <fingerprint>, 'outputs': <fingerprint>}}
+
+    Example usage:
+        espn-stats pipeline run
+        espn-stats pipeline run -s 2026 -e 2026 --max_workers 2
+"""
+import argparse
+import concurrent.futures
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import timeit
+import utils.instrumentation as instrumentation
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(SCRIPT_DIR, "..")
+
+DEFAULT_ESPN_HTML_ROOT_FOLDER = os.path.join(ROOT_DIR, "espn_html_files")
+DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER = os.path.join(ROOT_DIR, "espn_fantasy_api_scripts", "espn_fantasy_api_downloads")
+DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER = os.path.join(ROOT_DIR, "nhlapi_scripts", "nhlapi_downloads")
+DEFAULT_OUTPUT_DIR = os.path.join(ROOT_DIR, "data_generator_scripts")
+STATE_FILE_NAME = "pipeline_state.json"
+
+# Increment to re-run all steps (Example: when generated outputs change format)
+PIPELINE_VERSION = 1
+
+# Downloaded files of each season of ESPN fantasy API downloads. Other files
+# in the folder (Example: standings state and roster stores) are written by
+# data generators and are not inputs.
+LEAGUE_INFO_PATTERNS = ["*/*_league_info.json"]
+DRAFT_DETAILS_PATTERNS = ["*/*_draft_details.json"]
+SCORING_PERIODS_PATTERNS = ["*/scoring_periods/*.json", "*/*_archive.zip"]
+ALL_PLAYERS_INFO_PATTERNS = ["*/*_all_players_info.json", "*/all_players_info/*.json"]
+ATHLETES_PATTERNS = ["athletes/*.json"]
+
+# Archived HTML files and manual metadata of each season
+ESPN_HTML_PATTERNS = ["*/*.html", "*/*.csv"]
+
+class PipelineStep():
+    def __init__(self, name, argv, inputs=None, outputs=[], depends_on=[]):
+        """ Constructor. Takes in a unique name, espn-stats command line arguments,
+            dictionary of input folders and their glob patterns in the form:
+            {<folder path>: [<pattern>, ...]}, list of output file paths and list
+            of names of steps that must finish first. A step without inputs always runs. """
+        self.name = name
+        self.argv = list(argv)
+        self.inputs = inputs
+        self.outputs = list(outputs)
+        self.depends_on = list(depends_on)
+
+    def get_input_file_paths(self):
+        """ Returns sorted list of input file paths. """
+        file_paths = set()
+        for folder_path, patterns in (self.inputs or {}).items():
+            for pattern in patterns:
+                file_paths.update(glob.glob(os.path.join(glob.escape(folder_path), pattern), recursive=True))
+        return sorted(file_paths)
+
+    def get_inputs_fingerprint(self):
+        """ Returns fingerprint of the step's command and input files. """
+        return get_fingerprint(self.get_input_file_paths(), [PIPELINE_VERSION] + self.argv)
+
+    def get_outputs_fingerprint(self):
+        """ Returns fingerprint of the step's output files. """
+        return get_fingerprint(self.outputs)
+
+def get_fingerprint(file_paths, extra=[]):
+    """ Returns a fingerprint of files (size and modified time) and any extra values.
+        Missing files are part of the fingerprint, so creating them changes it. """
+    entries = [extra]
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+            entries.append([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns])
+        except FileNotFoundError:
+            entries.append([os.path.abspath(file_path), None, None])
+    return hashlib.sha1(json.dumps(entries).encode()).hexdigest()
+
+def get_default_steps(espn_html_root_folder=DEFAULT_ESPN_HTML_ROOT_FOLDER,
+                      espn_fantasy_api_downloads_root_folder=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
+                      nhlapi_downloads_root_folder=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                      out_dir_path=DEFAULT_OUTPUT_DIR, start_year=None, end_year=None):
+    """ Returns list of steps of the full data refresh. Download steps are only
+        included if start and end years are given. """
+    html_folder = espn_html_root_folder
+    espn_folder = espn_fantasy_api_downloads_root_folder
+    nhl_folder = nhlapi_downloads_root_folder
+    html_argv = ["--espn_html_root_folder", html_folder]
+    espn_argv = ["--espn_fantasy_api_downloads_root_folder", espn_folder]
+    out_argv = ["--out_dir_path", out_dir_path]
+
+    steps = []
+    if start_year is not None and end_year is not None:
+        years_argv = ["-s", str(start_year), "-e", str(end_year)]
+        steps.append(PipelineStep("download_espn", ["download", "espn", "-o", espn_folder] + years_argv))
+        steps.append(PipelineStep("download_nhlapi", ["download", "nhlapi", "-o", nhl_folder] + years_argv))
+
+    steps.append(PipelineStep("generate_draft", ["generate", "draft"] + html_argv + espn_argv + ["--nhlapi_downloads_root_folder", nhl_folder] + out_argv,
+                              inputs={html_folder: ESPN_HTML_PATTERNS,
+                                      espn_folder: LEAGUE_INFO_PATTERNS + DRAFT_DETAILS_PATTERNS + ALL_PLAYERS_INFO_PATTERNS + ATHLETES_PATTERNS,
+                                      nhl_folder: ["**/*.json"]},
+                              outputs=[os.path.join(out_dir_path, "draft_df.csv")],
+                              depends_on=["download_espn", "download_nhlapi"]))
+    steps.append(PipelineStep("generate_league_standings", ["generate", "league_standings"] + html_argv + espn_argv + out_argv,
+                              inputs={html_folder: ESPN_HTML_PATTERNS, espn_folder: LEAGUE_INFO_PATTERNS + SCORING_PERIODS_PATTERNS},
+                              outputs=[os.path.join(out_dir_path, "standings_stats_df.csv"), os.path.join(out_dir_path, "standings_points_df.csv")],
+                              depends_on=["download_espn"]))
+    steps.append(PipelineStep("generate_daily_rosters", ["generate", "daily_rosters"] + espn_argv + out_argv,
+                              inputs={espn_folder: LEAGUE_INFO_PATTERNS + SCORING_PERIODS_PATTERNS},
+                              outputs=[os.path.join(out_dir_path, "espn_fantasy_api_daily_rosters_df.csv"),
+                                       os.path.join(out_dir_path, "espn_fantasy_api_daily_rosters_totals_df.csv")],
+                              depends_on=["download_espn"]))
+    steps.append(PipelineStep("generate_all_players_info", ["generate", "all_players_info"] + espn_argv + out_argv,
+                              inputs={espn_folder: ALL_PLAYERS_INFO_PATTERNS},
+                              outputs=[os.path.join(out_dir_path, "espn_fantasy_api_all_players_info_df.csv")],
+                              depends_on=["download_espn"]))
+    return steps
+
+def run_step_command(step):
+    """ Runs the command of a step in its own process. Returns True if successful. """
+    result = subprocess.run([sys.executable, "-m", "utils.cli"] + step.argv, cwd=ROOT_DIR)
+    return result.returncode == 0
+
+class Pipeline():
+    def __init__(self, steps, state_path, max_workers=None, run_step_func=run_step_command):
+        """ Constructor. Takes in list of steps, path of the state file and maximum
+            number of steps to run at once. Optionally takes in the function that
+            runs a step (takes in a step and returns True if successful). """
+        self._steps = {step.name: step for step in steps}
+        self._state_path = state_path
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._run_step_func = run_step_func
+        self._state_lock = threading.Lock()
+
+        # Dependencies on steps that aren't part of the pipeline are ignored
+        self._depends_on = {step.name: [name for name in step.depends_on if name in self._steps] for step in steps}
+
+    def is_up_to_date(self, step_name, state=None):
+        """ Returns True if a step's inputs, command and outputs haven't changed since it last succeeded. """
+        step = self._steps[step_name]
+        if step.inputs is None:
+            return False
+
+        saved = (state if state is not None else self._load_state()).get(step_name)
+        return (saved is not None and saved.get('inputs') == step.get_inputs_fingerprint() and
+                saved.get('outputs') == step.get_outputs_fingerprint())
+
+    def run(self, force=False):
+        """ Runs all steps that aren't up-to-date (or all steps if forced).
+            Returns dictionary of the result of each step in the form:
+            {<step name>: "ran" | "skipped" | "failed" | "blocked"} """
+        state = self._load_state()
+        results = {}
+        pending = list(self._steps)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {}
+            while pending or futures:
+                # Start steps whose dependencies are finished. Steps depending on a failed step are blocked.
+                for step_name in list(pending):
+                    depends_on_results = [results.get(name) for name in self._depends_on[step_name]]
+                    if any(result in ["failed", "blocked"] for result in depends_on_results):
+                        results[step_name] = "blocked"
+                        pending.remove(step_name)
+                        print(f"Step {step_name} blocked by a failed step.")
+                    elif all(result is not None for result in depends_on_results):
+                        futures[executor.submit(self._run_step, step_name, state, force)] = step_name
+                        pending.remove(step_name)
+
+                # Remaining steps can never start if nothing is running (Example: steps depending on each other)
+                if not futures:
+                    for step_name in pending:
+                        results[step_name] = "blocked"
+                        print(f"Step {step_name} blocked by a dependency cycle.")
+                    break
+
+                done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    results[futures.pop(future)] = future.result()
+
+        return results
+
+    def _run_step(self, step_name, state, force):
+        """ Runs a step if it isn't up-to-date. Returns result of the step. """
+        step = self._steps[step_name]
+        if not force and self.is_up_to_date(step_name, state):
+            print(f"Step {step_name} is up-to-date. Skipping...")
+            instrumentation.increment("pipeline.steps_skipped")
+            return "skipped"
+
+        # Inputs are fingerprinted before running, so inputs changed during the run are picked up next time
+        inputs_fingerprint = step.get_inputs_fingerprint() if step.inputs is not None else None
+        print(f"Running step {step_name}...")
+        start_time = timeit.default_timer()
+        with instrumentation.Timer(f"pipeline.{step_name}"):
+            success = self._run_step_func(step)
+        if not success:
+            print(f"Step {step_name} failed.")
+            instrumentation.increment("pipeline.steps_failed")
+            with self._state_lock:
+                state.pop(step_name, None)
+                self._save_state(state)
+            return "failed"
+
+        print(f"Step {step_name} finished in {round(timeit.default_timer() - start_time, 1)}s.")
+        instrumentation.increment("pipeline.steps_ran")
+        with self._state_lock:
+            state[step_name] = {'inputs': inputs_fingerprint, 'outputs': step.get_outputs_fingerprint()}
+            self._save_state(state)
+        return "ran"
+
+    def _load_state(self):
+        """ Returns saved state of all steps. Returns an empty state if not saved. """
+        try:
+            with open(self._state_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self, state):
+        """ Saves state of all steps. """
+        temp_path = f"{self._state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self._state_path)
+
+def add_arguments(parser):
+    """ Adds command line arguments to an argument parser. """
+    parser.add_argument("--start_year", "-s", type=int, default=None,
+                        help="Starting season of data to download (Example: 2026 will download 20252026). Downloads are skipped if not given.")
+    parser.add_argument("--end_year", "-e", type=int, default=None, help="End season of data to download.")
+    parser.add_argument("--espn_html_root_folder", type=str, default=DEFAULT_ESPN_HTML_ROOT_FOLDER,
+                        help="Root folder path containing ESPN HTML files.")
+    parser.add_argument("--espn_fantasy_api_downloads_root_folder", type=str, default=DEFAULT_ESPN_FANTASY_API_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing ESPN Fantasy API downloaded files.")
+    parser.add_argument("--nhlapi_downloads_root_folder", type=str, default=DEFAULT_NHLAPI_DOWNLOADS_ROOT_FOLDER,
+                        help="Root folder path containing NHL API downloaded files.")
+    parser.add_argument("--out_dir_path", type=str, default=DEFAULT_OUTPUT_DIR,
+                        help="Output directory path to save generated data.")
+    parser.add_argument("--max_workers", type=int, default=None, help="Maximum number of steps to run at once. Defaults to the number of CPUs.")
+    parser.add_argument("--force", action="store_true", help="Run all steps even if up-to-date.")
+    instrumentation.add_arguments(parser)
+
+def main(args):
+    """ Runs all steps of the full data refresh that aren't up-to-date. """
+    start_time = timeit.default_timer()
+    instrumentation.start_run("pipeline", profile=args.profile)
+
+    steps = get_default_steps(espn_html_root_folder=os.path.abspath(args.espn_html_root_folder),
+                              espn_fantasy_api_downloads_root_folder=os.path.abspath(args.espn_fantasy_api_downloads_root_folder),
+                              nhlapi_downloads_root_folder=os.path.abspath(args.nhlapi_downloads_root_folder),
+                              out_dir_path=os.path.abspath(args.out_dir_path), start_year=args.start_year, end_year=args.end_year)
+    pipeline = Pipeline(steps, os.path.join(args.out_dir_path, STATE_FILE_NAME), max_workers=args.max_workers)
+    results = pipeline.run(force=args.force)
+
+    instrumentation.finish_run(args.report_path)
+    print(f"Finished in {round(timeit.default_timer() - start_time, 1)}s. " +
+          ", ".join(f"{step_name}: {result}" for step_name, result in results.items()))
+    if any(result in ["failed", "blocked"] for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    main(parser.parse_args())
\ No newline at end of file
@@ -1,17 +1,42 @@
 #!/usr/bin/env python
 """ Utility file to help with handling requests to an API.
-    Supports JSON data loading, downloading, etc. """
-import aiohttp
+    Supports JSON data loading, downloading, etc.
+
+    requests, aiohttp and certifi are imported by the functions that use them,
+    so importing this file (Example: to show command line help) stays fast. """
 import asyncio
-import certifi
 import json
-import requests
 import ssl
 import sys
+import time
+import utils.instrumentation as instrumentation
+
+# HTTP status codes that are considered temporary and worth retrying
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
 
 class RequestsUtil():
-    def __init__(self, base_url):
+    def __init__(self, base_url, max_retries=0, retry_delay=1.0, max_connections=50, persistent_session=False):
+        """ Constructor. Takes in the base URL that all endpoints are appended to.
+            Requests that fail with a temporary error (see RETRY_STATUS_CODES) are
+            retried up to max_retries times. Delay between retries doubles each
+            attempt, unless the server provides a Retry-After header. The number
+            of simultaneous connections used for asynchronous requests is bounded
+            by max_connections. A persistent session keeps connections alive
+            between synchronous requests (useful when polling the same server). """
         self._base_url = base_url
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._max_connections = max_connections
+        self._session = None
+        if persistent_session:
+            import requests
+            self._session = requests.Session()
+
+    def close(self):
+        """ Closes the persistent session, if any. """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def load_json_from_endpoint(self, endpoint, headers=None, cookies=None):
         """ Loads JSON data from an endpoint into a dictionary. """
@@ -30,9 +55,10 @@ class RequestsUtil():
             json.dump(json_data, out_file)
         return True
 
-    def load_jsons_from_endpoints_async(self, endpoint_list, headers=None, cookies=None):
+    def load_jsons_from_endpoints_async(self, endpoint_list, headers=None, cookies=None, headers_list=None):
         """ Loads JSON data from the given list of endpoints asynchronously.
-            Returns a list of dictionaries. """
+            Optionally takes a list of headers for each endpoint, added to the
+            headers common to all endpoints. Returns a list of dictionaries. """
         # Set policy on Windows and Python 3.8+ to work around runtime exception:
         # https://github.com/encode/httpx/issues/914#issuecomment-622586610
         if (sys.version_info[0] == 3 and
@@ -41,7 +67,7 @@ class RequestsUtil():
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
         url_list = [f"{self._base_url}{endpoint}" for endpoint in endpoint_list]
-        return asyncio.run(self._load_jsons_async(url_list, headers, cookies))
+        return asyncio.run(self._load_jsons_async(url_list, headers, cookies, headers_list))
 
     def save_jsons_from_endpoints_async(self, endpoints_file_path_dict_list, headers=None, cookies=None):
         """ Saves JSON data from the given endpoints and corresponding file
@@ -74,39 +100,78 @@ class RequestsUtil():
 
         return len(json_data_list)
 
+    @instrumentation.Timer("requests.load_json")
     def _load_json(self, url, headers=None, cookies=None):
         """ Loads data from the URL as a dictionary. """
+        import requests
+
         # Send request to URL
-        response = requests.get(url, headers=headers, cookies=cookies)
+        for attempt in range(self._max_retries + 1):
+            if self._session is not None:
+                response = self._session.get(url, headers=headers, cookies=cookies)
+            else:
+                response = requests.get(url, headers=headers, cookies=cookies)
+            instrumentation.increment("requests")
+            instrumentation.increment("bytes_downloaded", len(response.content))
+            if response.status_code in RETRY_STATUS_CODES and attempt < self._max_retries:
+                time.sleep(self._get_retry_delay(response.headers, attempt))
+                continue
+            break
+
         if response.status_code != 200:
             print(f"_load_json ret={response.status_code}")
-            print(f"url={url}")            
+            print(f"url={url}")
             return None
 
         return response.json()
 
-    async def _load_jsons_async(self, url_list, headers=None, cookies=None):
+    async def _load_jsons_async(self, url_list, headers=None, cookies=None, headers_list=None):
         """ Loads data from the given URL list asynchronously. Returns
             a list of dictionaries where each dictionary is expected to
-            be in the same order as the input URL list. """
+            be in the same order as the input URL list. Optionally takes
+            a list of headers for each URL, added to the common headers. """
+        import aiohttp
+        import certifi
+
         json_data_list = []
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        connector = aiohttp.TCPConnector(ssl=ssl_context, limit=50)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            tasks = []
-            for url in url_list:
-                tasks.append(asyncio.create_task(self._load_json_from_session(session, url, headers, cookies)))
-
-            json_data_list = await asyncio.gather(*tasks)
+        with instrumentation.Timer("requests.load_jsons_async"):
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+            connector = aiohttp.TCPConnector(ssl=ssl_context, limit=self._max_connections)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                tasks = []
+                for i, url in enumerate(url_list):
+                    url_headers = headers if headers_list is None else {**(headers or {}), **headers_list[i]}
+                    tasks.append(asyncio.create_task(self._load_json_from_session(session, url, url_headers, cookies)))
+
+                json_data_list = await asyncio.gather(*tasks)
         return json_data_list
 
     async def _load_json_from_session(self, session, url, headers=None, cookies=None):
         """ Loads data from URL as dictionary from a session using the
             aiohttp library asynchronously. Intended to be used with
             asyncio event loop. """
-        async with session.get(url, headers=headers, cookies=cookies) as resp:
-            if resp.status != 200:
-                print(f"_load_json_from_session ret={resp.status}")
-                print(f"url={url}")
-                return {}
-            return await resp.json()
\ No newline at end of file
+        for attempt in range(self._max_retries + 1):
+            async with session.get(url, headers=headers, cookies=cookies) as resp:
+                instrumentation.increment("requests")
+                if resp.status in RETRY_STATUS_CODES and attempt < self._max_retries:
+                    retry_delay = self._get_retry_delay(resp.headers, attempt)
+                elif resp.status != 200:
+                    print(f"_load_json_from_session ret={resp.status}")
+                    print(f"url={url}")
+                    return {}
+                else:
+                    content = await resp.read()
+                    instrumentation.increment("bytes_downloaded", len(content))
+                    return json.loads(content)
+
+            # Wait outside of the response context so the connection is released
+            await asyncio.sleep(retry_delay)
+
+    def _get_retry_delay(self, response_headers, attempt):
+        """ Returns number of seconds to wait before retrying a request. Uses
+            the Retry-After header if the server provides one, otherwise backs
+            off exponentially based on the attempt number. """
+        try:
+            return float(response_headers['Retry-After'])
+        except (KeyError, TypeError, ValueError):
+            return self._retry_delay * (2 ** attempt)
\ No newline at end of file